@@ -3,45 +3,53 @@
 
 
 
-int Device_Parameter_Set::Seed = 123;//Seed for random number generation (used in device's random number generators)
-bool Device_Parameter_Set::Enabled_Preconditioning = true;
-NVM::NVM_Type Device_Parameter_Set::Memory_Type = NVM::NVM_Type::FLASH;
-HostInterface_Types Device_Parameter_Set::HostInterface_Type = HostInterface_Types::NVME;
-uint16_t Device_Parameter_Set::IO_Queue_Depth = 1024;//For NVMe, it determines the size of the submission/completion queues; for SATA, it determines the size of NCQ_Control_Structure
-uint16_t Device_Parameter_Set::Queue_Fetch_Size = 512;//Used in NVMe host interface
-SSD_Components::Caching_Mechanism Device_Parameter_Set::Caching_Mechanism = SSD_Components::Caching_Mechanism::ADVANCED;
-SSD_Components::Cache_Sharing_Mode Device_Parameter_Set::Data_Cache_Sharing_Mode = SSD_Components::Cache_Sharing_Mode::SHARED;//Data cache sharing among concurrently running I/O flows, if NVMe host interface is used
-unsigned int Device_Parameter_Set::Data_Cache_Capacity = 1024 * 1024 * 512;//Data cache capacity in bytes
-unsigned int Device_Parameter_Set::Data_Cache_DRAM_Row_Size = 8192;//The row size of DRAM in the data cache, the unit is bytes
-unsigned int Device_Parameter_Set::Data_Cache_DRAM_Data_Rate = 800;//Data access rate to access DRAM in the data cache, the unit is MT/s
-unsigned int Device_Parameter_Set::Data_Cache_DRAM_Data_Busrt_Size = 4;//The number of bytes that are transferred in one burst (it depends on the number of DRAM chips)
-sim_time_type Device_Parameter_Set::Data_Cache_DRAM_tRCD = 13;//tRCD parameter to access DRAM in the data cache, the unit is nano-seconds
-sim_time_type Device_Parameter_Set::Data_Cache_DRAM_tCL = 13;//tCL parameter to access DRAM in the data cache, the unit is nano-seconds
-sim_time_type Device_Parameter_Set::Data_Cache_DRAM_tRP = 13;//tRP parameter to access DRAM in the data cache, the unit is nano-seconds
-SSD_Components::Flash_Address_Mapping_Type Device_Parameter_Set::Address_Mapping = SSD_Components::Flash_Address_Mapping_Type::PAGE_LEVEL;
-bool Device_Parameter_Set::Ideal_Mapping_Table = false;//If mapping is ideal, then all the mapping entries are found in the DRAM and there is no need to read mapping entries from flash
-unsigned int Device_Parameter_Set::CMT_Capacity = 2 * 1024 * 1024;//Size of SRAM/DRAM space that is used to cache address mapping table in bytes
-SSD_Components::CMT_Sharing_Mode Device_Parameter_Set::CMT_Sharing_Mode = SSD_Components::CMT_Sharing_Mode::SHARED;//How the entire CMT space is shared among concurrently running flows
-SSD_Components::Flash_Plane_Allocation_Scheme_Type Device_Parameter_Set::Plane_Allocation_Scheme = SSD_Components::Flash_Plane_Allocation_Scheme_Type::CWDP;
-SSD_Components::Flash_Scheduling_Type Device_Parameter_Set::Transaction_Scheduling_Policy = SSD_Components::Flash_Scheduling_Type::OUT_OF_ORDER;
-double Device_Parameter_Set::Overprovisioning_Ratio = 0.07;//The ratio of spare space with respect to the whole available storage space of SSD
-double Device_Parameter_Set::GC_Exec_Threshold = 0.05;//The threshold for the ratio of free pages that used to trigger GC
-SSD_Components::GC_Block_Selection_Policy_Type Device_Parameter_Set::GC_Block_Selection_Policy = SSD_Components::GC_Block_Selection_Policy_Type::RGA;
-bool Device_Parameter_Set::Use_Copyback_for_GC = false;
-bool Device_Parameter_Set::Preemptible_GC_Enabled = true;
-double Device_Parameter_Set::GC_Hard_Threshold = 0.005;//The hard gc execution threshold, used to stop preemptible gc execution
-bool Device_Parameter_Set::Dynamic_Wearleveling_Enabled = true;
-bool Device_Parameter_Set::Static_Wearleveling_Enabled = true;
-unsigned int Device_Parameter_Set::Static_Wearleveling_Threshold = 100;
-sim_time_type Device_Parameter_Set::Preferred_suspend_erase_time_for_read = 700000;//in nano-seconds
-sim_time_type Device_Parameter_Set::Preferred_suspend_erase_time_for_write = 700000;//in nano-seconds
-sim_time_type Device_Parameter_Set::Preferred_suspend_write_time_for_read = 100000;//in nano-seconds
-unsigned int Device_Parameter_Set::Flash_Channel_Count = 8;
-unsigned int Device_Parameter_Set::Flash_Channel_Width = 1;//Channel width in byte
-unsigned int Device_Parameter_Set::Channel_Transfer_Rate = 300;//MT/s
-unsigned int Device_Parameter_Set::Chip_No_Per_Channel = 4;
-SSD_Components::ONFI_Protocol Device_Parameter_Set::Flash_Comm_Protocol = SSD_Components::ONFI_Protocol::NVDDR2;
-Flash_Parameter_Set Device_Parameter_Set::Flash_Parameters;
+thread_local int Device_Parameter_Set::Seed = 123;//Seed for random number generation (used in device's random number generators)
+thread_local bool Device_Parameter_Set::Enabled_Preconditioning = true;
+thread_local MQSimEngine::Event_List_Type Device_Parameter_Set::Event_List = MQSimEngine::Event_List_Type::RED_BLACK_TREE;
+thread_local bool Device_Parameter_Set::Enable_Block_Snapshot = false;
+thread_local sim_time_type Device_Parameter_Set::Block_Snapshot_Period = 0;//nanoseconds
+thread_local std::string Device_Parameter_Set::Block_Snapshot_File_Path;
+thread_local Checkpoint_Mode_Type Device_Parameter_Set::Checkpoint = Checkpoint_Mode_Type::NONE;
+thread_local Checkpoint_Phase_Type Device_Parameter_Set::Checkpoint_Phase = Checkpoint_Phase_Type::PRECONDITIONING;
+thread_local sim_time_type Device_Parameter_Set::Checkpoint_Time = 0;//nanoseconds
+thread_local std::string Device_Parameter_Set::Checkpoint_File_Path = "checkpoint.bin";
+thread_local NVM::NVM_Type Device_Parameter_Set::Memory_Type = NVM::NVM_Type::FLASH;
+thread_local HostInterface_Types Device_Parameter_Set::HostInterface_Type = HostInterface_Types::NVME;
+thread_local uint16_t Device_Parameter_Set::IO_Queue_Depth = 1024;//For NVMe, it determines the size of the submission/completion queues; for SATA, it determines the size of NCQ_Control_Structure
+thread_local uint16_t Device_Parameter_Set::Queue_Fetch_Size = 512;//Used in NVMe host interface
+thread_local SSD_Components::Caching_Mechanism Device_Parameter_Set::Caching_Mechanism = SSD_Components::Caching_Mechanism::ADVANCED;
+thread_local SSD_Components::Cache_Sharing_Mode Device_Parameter_Set::Data_Cache_Sharing_Mode = SSD_Components::Cache_Sharing_Mode::SHARED;//Data cache sharing among concurrently running I/O flows, if NVMe host interface is used
+thread_local unsigned int Device_Parameter_Set::Data_Cache_Capacity = 1024 * 1024 * 512;//Data cache capacity in bytes
+thread_local unsigned int Device_Parameter_Set::Data_Cache_DRAM_Row_Size = 8192;//The row size of DRAM in the data cache, the unit is bytes
+thread_local unsigned int Device_Parameter_Set::Data_Cache_DRAM_Data_Rate = 800;//Data access rate to access DRAM in the data cache, the unit is MT/s
+thread_local unsigned int Device_Parameter_Set::Data_Cache_DRAM_Data_Busrt_Size = 4;//The number of bytes that are transferred in one burst (it depends on the number of DRAM chips)
+thread_local sim_time_type Device_Parameter_Set::Data_Cache_DRAM_tRCD = 13;//tRCD parameter to access DRAM in the data cache, the unit is nano-seconds
+thread_local sim_time_type Device_Parameter_Set::Data_Cache_DRAM_tCL = 13;//tCL parameter to access DRAM in the data cache, the unit is nano-seconds
+thread_local sim_time_type Device_Parameter_Set::Data_Cache_DRAM_tRP = 13;//tRP parameter to access DRAM in the data cache, the unit is nano-seconds
+thread_local SSD_Components::Flash_Address_Mapping_Type Device_Parameter_Set::Address_Mapping = SSD_Components::Flash_Address_Mapping_Type::PAGE_LEVEL;
+thread_local bool Device_Parameter_Set::Ideal_Mapping_Table = false;//If mapping is ideal, then all the mapping entries are found in the DRAM and there is no need to read mapping entries from flash
+thread_local unsigned int Device_Parameter_Set::CMT_Capacity = 2 * 1024 * 1024;//Size of SRAM/DRAM space that is used to cache address mapping table in bytes
+thread_local SSD_Components::CMT_Sharing_Mode Device_Parameter_Set::CMT_Sharing_Mode = SSD_Components::CMT_Sharing_Mode::SHARED;//How the entire CMT space is shared among concurrently running flows
+thread_local SSD_Components::Flash_Plane_Allocation_Scheme_Type Device_Parameter_Set::Plane_Allocation_Scheme = SSD_Components::Flash_Plane_Allocation_Scheme_Type::CWDP;
+thread_local SSD_Components::Flash_Scheduling_Type Device_Parameter_Set::Transaction_Scheduling_Policy = SSD_Components::Flash_Scheduling_Type::OUT_OF_ORDER;
+thread_local double Device_Parameter_Set::Overprovisioning_Ratio = 0.07;//The ratio of spare space with respect to the whole available storage space of SSD
+thread_local double Device_Parameter_Set::GC_Exec_Threshold = 0.05;//The threshold for the ratio of free pages that used to trigger GC
+thread_local SSD_Components::GC_Block_Selection_Policy_Type Device_Parameter_Set::GC_Block_Selection_Policy = SSD_Components::GC_Block_Selection_Policy_Type::RGA;
+thread_local bool Device_Parameter_Set::Use_Copyback_for_GC = false;
+thread_local bool Device_Parameter_Set::Preemptible_GC_Enabled = true;
+thread_local double Device_Parameter_Set::GC_Hard_Threshold = 0.005;//The hard gc execution threshold, used to stop preemptible gc execution
+thread_local bool Device_Parameter_Set::Dynamic_Wearleveling_Enabled = true;
+thread_local bool Device_Parameter_Set::Static_Wearleveling_Enabled = true;
+thread_local unsigned int Device_Parameter_Set::Static_Wearleveling_Threshold = 100;
+thread_local sim_time_type Device_Parameter_Set::Preferred_suspend_erase_time_for_read = 700000;//in nano-seconds
+thread_local sim_time_type Device_Parameter_Set::Preferred_suspend_erase_time_for_write = 700000;//in nano-seconds
+thread_local sim_time_type Device_Parameter_Set::Preferred_suspend_write_time_for_read = 100000;//in nano-seconds
+thread_local unsigned int Device_Parameter_Set::Flash_Channel_Count = 8;
+thread_local unsigned int Device_Parameter_Set::Flash_Channel_Width = 1;//Channel width in byte
+thread_local unsigned int Device_Parameter_Set::Channel_Transfer_Rate = 300;//MT/s
+thread_local unsigned int Device_Parameter_Set::Chip_No_Per_Channel = 4;
+thread_local SSD_Components::ONFI_Protocol Device_Parameter_Set::Flash_Comm_Protocol = SSD_Components::ONFI_Protocol::NVDDR2;
+thread_local Flash_Parameter_Set Device_Parameter_Set::Flash_Parameters;
 
 void Device_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
 {
@@ -57,6 +65,64 @@ void Device_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
 	val = (Enabled_Preconditioning ? "true" : "false");
 	xmlwriter.Write_attribute_string(attr, val);
 
+	attr = "Event_List";
+	switch (Event_List) {
+		case MQSimEngine::Event_List_Type::RED_BLACK_TREE:
+			val = "RED_BLACK_TREE";
+			break;
+		case MQSimEngine::Event_List_Type::CALENDAR_QUEUE:
+			val = "CALENDAR_QUEUE";
+			break;
+		default:
+			break;
+	}
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Enable_Block_Snapshot";
+	val = (Enable_Block_Snapshot ? "true" : "false");
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Block_Snapshot_Period";
+	val = std::to_string(Block_Snapshot_Period);
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Checkpoint";
+	switch (Checkpoint) {
+		case Checkpoint_Mode_Type::NONE:
+			val = "NONE";
+			break;
+		case Checkpoint_Mode_Type::SAVE:
+			val = "SAVE";
+			break;
+		case Checkpoint_Mode_Type::RESTORE:
+			val = "RESTORE";
+			break;
+		default:
+			break;
+	}
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Checkpoint_Phase";
+	switch (Checkpoint_Phase) {
+		case Checkpoint_Phase_Type::PRECONDITIONING:
+			val = "PRECONDITIONING";
+			break;
+		case Checkpoint_Phase_Type::TIME:
+			val = "TIME";
+			break;
+		default:
+			break;
+	}
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Checkpoint_Time";
+	val = std::to_string(Checkpoint_Time);
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Checkpoint_File_Path";
+	val = Checkpoint_File_Path;
+	xmlwriter.Write_attribute_string(attr, val);
+
 	attr = "Memory_Type";
 	val;
 	switch (Memory_Type) {
@@ -386,6 +452,50 @@ void Device_Parameter_Set::XML_deserialize(rapidxml::xml_node<> *node)
 				std::string val = param->value();
 				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
 				Enabled_Preconditioning = (val.compare("FALSE") == 0 ? false : true);
+			} else if (strcmp(param->name(), "Event_List") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				if (strcmp(val.c_str(), "RED_BLACK_TREE") == 0) {
+					Event_List = MQSimEngine::Event_List_Type::RED_BLACK_TREE;
+				} else if (strcmp(val.c_str(), "CALENDAR_QUEUE") == 0) {
+					Event_List = MQSimEngine::Event_List_Type::CALENDAR_QUEUE;
+				} else {
+					PRINT_ERROR("Unknown event list type specified in the SSD configuration file")
+				}
+			} else if (strcmp(param->name(), "Enable_Block_Snapshot") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				Enable_Block_Snapshot = (val.compare("TRUE") == 0 ? true : false);
+			} else if (strcmp(param->name(), "Block_Snapshot_Period") == 0) {
+				std::string val = param->value();
+				Block_Snapshot_Period = std::stoull(val);
+			} else if (strcmp(param->name(), "Checkpoint") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				if (strcmp(val.c_str(), "NONE") == 0) {
+					Checkpoint = Checkpoint_Mode_Type::NONE;
+				} else if (strcmp(val.c_str(), "SAVE") == 0) {
+					Checkpoint = Checkpoint_Mode_Type::SAVE;
+				} else if (strcmp(val.c_str(), "RESTORE") == 0) {
+					Checkpoint = Checkpoint_Mode_Type::RESTORE;
+				} else {
+					PRINT_ERROR("Unknown checkpoint mode specified in the SSD configuration file")
+				}
+			} else if (strcmp(param->name(), "Checkpoint_Phase") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				if (strcmp(val.c_str(), "PRECONDITIONING") == 0) {
+					Checkpoint_Phase = Checkpoint_Phase_Type::PRECONDITIONING;
+				} else if (strcmp(val.c_str(), "TIME") == 0) {
+					Checkpoint_Phase = Checkpoint_Phase_Type::TIME;
+				} else {
+					PRINT_ERROR("Unknown checkpoint phase specified in the SSD configuration file")
+				}
+			} else if (strcmp(param->name(), "Checkpoint_Time") == 0) {
+				std::string val = param->value();
+				Checkpoint_Time = std::stoull(val);
+			} else if (strcmp(param->name(), "Checkpoint_File_Path") == 0) {
+				Checkpoint_File_Path = param->value();
 			} else if (strcmp(param->name(), "Memory_Type") == 0) {
 				std::string val = param->value();
 				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
@@ -1,8 +1,8 @@
 #include "Execution_Parameter_Set.h"
 
 
-Host_Parameter_Set Execution_Parameter_Set::Host_Configuration;
-Device_Parameter_Set Execution_Parameter_Set::SSD_Device_Configuration;
+thread_local Host_Parameter_Set Execution_Parameter_Set::Host_Configuration;
+thread_local Device_Parameter_Set Execution_Parameter_Set::SSD_Device_Configuration;
 
 
 void Execution_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
@@ -10,8 +10,8 @@
 class Execution_Parameter_Set : public Parameter_Set_Base
 {
 public:
-	static Host_Parameter_Set Host_Configuration;
-	static Device_Parameter_Set SSD_Device_Configuration;
+	static thread_local Host_Parameter_Set Host_Configuration;
+	static thread_local Device_Parameter_Set SSD_Device_Configuration;
 
 	void XML_serialize(Utils::XmlWriter& xmlwriter);
 	void XML_deserialize(rapidxml::xml_node<> *node);
@@ -3,39 +3,42 @@
 #include "../sim/Engine.h"
 #include "Flash_Parameter_Set.h"
 
-Flash_Technology_Type Flash_Parameter_Set::Flash_Technology = Flash_Technology_Type::MLC;
-NVM::FlashMemory::Command_Suspension_Mode Flash_Parameter_Set::CMD_Suspension_Support = NVM::FlashMemory::Command_Suspension_Mode::ERASE;
-sim_time_type Flash_Parameter_Set::Page_Read_Latency_LSB = 75000;
-sim_time_type Flash_Parameter_Set::Page_Read_Latency_CSB = 75000;
-sim_time_type Flash_Parameter_Set::Page_Read_Latency_MSB = 75000;
-sim_time_type Flash_Parameter_Set::Page_Program_Latency_LSB = 750000;
-sim_time_type Flash_Parameter_Set::Page_Program_Latency_CSB = 750000;
-sim_time_type Flash_Parameter_Set::Page_Program_Latency_MSB = 750000;
-sim_time_type Flash_Parameter_Set::Block_Erase_Latency = 3800000;//Block erase latency in nano-seconds
-unsigned int Flash_Parameter_Set::Block_PE_Cycles_Limit = 10000;
-sim_time_type Flash_Parameter_Set::Suspend_Erase_Time = 700000;//in nano-seconds
-sim_time_type Flash_Parameter_Set::Suspend_Program_Time = 100000;//in nano-seconds
-unsigned int Flash_Parameter_Set::Die_No_Per_Chip = 2;
-unsigned int Flash_Parameter_Set::Plane_No_Per_Die = 2;
-unsigned int Flash_Parameter_Set::Block_No_Per_Plane = 2048;
-unsigned int Flash_Parameter_Set::Page_No_Per_Block = 256;//Page no per block
-unsigned int Flash_Parameter_Set::Page_Capacity = 8192;//Flash page capacity in bytes
-unsigned int Flash_Parameter_Set::Page_Metadat_Capacity = 1872;//Flash page capacity in bytes
+thread_local Flash_Technology_Type Flash_Parameter_Set::Flash_Technology = Flash_Technology_Type::MLC;
+thread_local NVM::FlashMemory::Command_Suspension_Mode Flash_Parameter_Set::CMD_Suspension_Support = NVM::FlashMemory::Command_Suspension_Mode::ERASE;
+thread_local sim_time_type Flash_Parameter_Set::Page_Read_Latency_LSB = 75000;
+thread_local sim_time_type Flash_Parameter_Set::Page_Read_Latency_CSB = 75000;
+thread_local sim_time_type Flash_Parameter_Set::Page_Read_Latency_MSB = 75000;
+thread_local sim_time_type Flash_Parameter_Set::Page_Program_Latency_LSB = 750000;
+thread_local sim_time_type Flash_Parameter_Set::Page_Program_Latency_CSB = 750000;
+thread_local sim_time_type Flash_Parameter_Set::Page_Program_Latency_MSB = 750000;
+thread_local sim_time_type Flash_Parameter_Set::Block_Erase_Latency = 3800000;//Block erase latency in nano-seconds
+thread_local unsigned int Flash_Parameter_Set::Block_PE_Cycles_Limit = 10000;
+thread_local sim_time_type Flash_Parameter_Set::Suspend_Erase_Time = 700000;//in nano-seconds
+thread_local sim_time_type Flash_Parameter_Set::Suspend_Program_Time = 100000;//in nano-seconds
+thread_local unsigned int Flash_Parameter_Set::Die_No_Per_Chip = 2;
+thread_local unsigned int Flash_Parameter_Set::Plane_No_Per_Die = 2;
+thread_local unsigned int Flash_Parameter_Set::Block_No_Per_Plane = 2048;
+thread_local unsigned int Flash_Parameter_Set::Page_No_Per_Block = 256;//Page no per block
+thread_local unsigned int Flash_Parameter_Set::Page_Capacity = 8192;//Flash page capacity in bytes
+thread_local unsigned int Flash_Parameter_Set::Page_Metadat_Capacity = 1872;//Flash page capacity in bytes
 
 // IFP defaults
-bool Flash_Parameter_Set::IFP_Enabled = false;
-sim_time_type Flash_Parameter_Set::IFP_Dot_Product_Latency = 5000;//5 us in nano-seconds
-sim_time_type Flash_Parameter_Set::IFP_ECC_Decode_Latency = 10000;//10 us in nano-seconds
-sim_time_type Flash_Parameter_Set::IFP_ECC_Retry_Latency = 50000;//50 us in nano-seconds
-unsigned int Flash_Parameter_Set::IFP_ECC_Max_Retries = 3;
-unsigned int Flash_Parameter_Set::Read_Reclaim_Threshold = 100000;
-double Flash_Parameter_Set::ECC_Base_RBER = 1e-9;
-double Flash_Parameter_Set::ECC_Read_Count_Factor = 1e-12;
-double Flash_Parameter_Set::ECC_PE_Cycle_Factor = 1e-10;
-double Flash_Parameter_Set::ECC_Retention_Factor = 1e-20;
-unsigned int Flash_Parameter_Set::ECC_Correction_Capability = 40;//40 bits per 1 KiB codeword
-unsigned int Flash_Parameter_Set::ECC_Codeword_Size = 1024;//1 KiB
-unsigned int Flash_Parameter_Set::IFP_Aggregation_Mode = 0;
+thread_local bool Flash_Parameter_Set::IFP_Enabled = false;
+thread_local sim_time_type Flash_Parameter_Set::IFP_Dot_Product_Latency = 5000;//5 us in nano-seconds
+thread_local sim_time_type Flash_Parameter_Set::IFP_ECC_Decode_Latency = 10000;//10 us in nano-seconds
+thread_local sim_time_type Flash_Parameter_Set::IFP_ECC_Retry_Latency = 50000;//50 us in nano-seconds
+thread_local unsigned int Flash_Parameter_Set::IFP_ECC_Max_Retries = 3;
+thread_local unsigned int Flash_Parameter_Set::Read_Reclaim_Threshold = 100000;
+thread_local double Flash_Parameter_Set::ECC_Base_RBER = 1e-9;
+thread_local double Flash_Parameter_Set::ECC_Read_Count_Factor = 1e-12;
+thread_local double Flash_Parameter_Set::ECC_PE_Cycle_Factor = 1e-10;
+thread_local double Flash_Parameter_Set::ECC_Retention_Factor = 1e-20;
+thread_local unsigned int Flash_Parameter_Set::ECC_Correction_Capability = 40;//40 bits per 1 KiB codeword
+thread_local unsigned int Flash_Parameter_Set::ECC_Codeword_Size = 1024;//1 KiB
+thread_local unsigned int Flash_Parameter_Set::IFP_Aggregation_Mode = 0;
+thread_local bool Flash_Parameter_Set::ECC_RBER_Table_Enabled = false;
+thread_local unsigned int Flash_Parameter_Set::ECC_RBER_Table_Retention_Bits = 8;//~0.4% relative retention bucket width
+thread_local unsigned int Flash_Parameter_Set::ECC_RBER_Table_Validation_Interval = 1024;
 
 void Flash_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
 {
@@ -195,6 +198,18 @@ void Flash_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
 	val = std::to_string(IFP_Aggregation_Mode);
 	xmlwriter.Write_attribute_string(attr, val);
 
+	attr = "ECC_RBER_Table_Enabled";
+	val = ECC_RBER_Table_Enabled ? "true" : "false";
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "ECC_RBER_Table_Retention_Bits";
+	val = std::to_string(ECC_RBER_Table_Retention_Bits);
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "ECC_RBER_Table_Validation_Interval";
+	val = std::to_string(ECC_RBER_Table_Validation_Interval);
+	xmlwriter.Write_attribute_string(attr, val);
+
 	xmlwriter.Write_close_tag();
 }
 
@@ -314,6 +329,16 @@ void Flash_Parameter_Set::XML_deserialize(rapidxml::xml_node<> *node)
 			} else if (strcmp(param->name(), "IFP_Aggregation_Mode") == 0) {
 				std::string val = param->value();
 				IFP_Aggregation_Mode = std::stoul(val);
+			} else if (strcmp(param->name(), "ECC_RBER_Table_Enabled") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				ECC_RBER_Table_Enabled = (strcmp(val.c_str(), "TRUE") == 0);
+			} else if (strcmp(param->name(), "ECC_RBER_Table_Retention_Bits") == 0) {
+				std::string val = param->value();
+				ECC_RBER_Table_Retention_Bits = std::stoul(val);
+			} else if (strcmp(param->name(), "ECC_RBER_Table_Validation_Interval") == 0) {
+				std::string val = param->value();
+				ECC_RBER_Table_Validation_Interval = std::stoul(val);
 			}
 		}
 	} catch (...) {
@@ -2,13 +2,16 @@
 #include "Host_Parameter_Set.h"
 
 
-double Host_Parameter_Set::PCIe_Lane_Bandwidth = 0.4;//uint is GB/s
-unsigned int Host_Parameter_Set::PCIe_Lane_Count = 4;
-sim_time_type Host_Parameter_Set::SATA_Processing_Delay;//The overall hardware and software processing delay to send/receive a SATA message in nanoseconds
-bool Host_Parameter_Set::Enable_ResponseTime_Logging = false;
-sim_time_type Host_Parameter_Set::ResponseTime_Logging_Period_Length = 400000;//nanoseconds
-std::string Host_Parameter_Set::Input_file_path;
-std::vector<IO_Flow_Parameter_Set*> Host_Parameter_Set::IO_Flow_Definitions;
+thread_local double Host_Parameter_Set::PCIe_Lane_Bandwidth = 0.4;//uint is GB/s
+thread_local unsigned int Host_Parameter_Set::PCIe_Lane_Count = 4;
+thread_local sim_time_type Host_Parameter_Set::SATA_Processing_Delay;//The overall hardware and software processing delay to send/receive a SATA message in nanoseconds
+thread_local bool Host_Parameter_Set::Enable_ResponseTime_Logging = false;
+thread_local sim_time_type Host_Parameter_Set::ResponseTime_Logging_Period_Length = 400000;//nanoseconds
+thread_local bool Host_Parameter_Set::Enable_Epoch_Metrics = false;
+thread_local sim_time_type Host_Parameter_Set::Epoch_Metrics_Period_Length = 10000000;//nanoseconds
+thread_local std::string Host_Parameter_Set::Epoch_Metrics_File_Path;
+thread_local std::string Host_Parameter_Set::Input_file_path;
+thread_local std::vector<IO_Flow_Parameter_Set*> Host_Parameter_Set::IO_Flow_Definitions;
 
 void Host_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
 {
@@ -36,6 +39,14 @@ void Host_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
 	val = std::to_string(ResponseTime_Logging_Period_Length);
 	xmlwriter.Write_attribute_string(attr, val);
 
+	attr = "Enable_Epoch_Metrics";
+	val = (Enable_Epoch_Metrics ? "true" : "false");
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Epoch_Metrics_Period_Length";
+	val = std::to_string(Epoch_Metrics_Period_Length);
+	xmlwriter.Write_attribute_string(attr, val);
+
 	xmlwriter.Write_close_tag();
 }
 
@@ -59,6 +70,13 @@ void Host_Parameter_Set::XML_deserialize(rapidxml::xml_node<> *node)
 			} else if (strcmp(param->name(), "ResponseTime_Logging_Period_Length") == 0) {
 				std::string val = param->value();
 				ResponseTime_Logging_Period_Length = std::stoul(val);
+			} else if (strcmp(param->name(), "Enable_Epoch_Metrics") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				Enable_Epoch_Metrics = (val.compare("FALSE") == 0 ? false : true);
+			} else if (strcmp(param->name(), "Epoch_Metrics_Period_Length") == 0) {
+				std::string val = param->value();
+				Epoch_Metrics_Period_Length = std::stoull(val);
 			}
 		}
 	} catch (...) {
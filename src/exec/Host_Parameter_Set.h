@@ -8,13 +8,16 @@
 class Host_Parameter_Set : public Parameter_Set_Base
 {
 public:
-	static double PCIe_Lane_Bandwidth;//uint is GB/s
-	static unsigned int PCIe_Lane_Count;
-	static sim_time_type SATA_Processing_Delay;//The overall hardware and software processing delay to send/receive a SATA message in nanoseconds
-	static bool Enable_ResponseTime_Logging;
-	static sim_time_type ResponseTime_Logging_Period_Length;
-	static std::vector<IO_Flow_Parameter_Set*> IO_Flow_Definitions;
-	static std::string Input_file_path;//This parameter is not serialized. This is used to inform the Host_System class about the input file path.
+	static thread_local double PCIe_Lane_Bandwidth;//uint is GB/s
+	static thread_local unsigned int PCIe_Lane_Count;
+	static thread_local sim_time_type SATA_Processing_Delay;//The overall hardware and software processing delay to send/receive a SATA message in nanoseconds
+	static thread_local bool Enable_ResponseTime_Logging;
+	static thread_local sim_time_type ResponseTime_Logging_Period_Length;
+	static thread_local bool Enable_Epoch_Metrics;
+	static thread_local sim_time_type Epoch_Metrics_Period_Length;//nanoseconds
+	static thread_local std::vector<IO_Flow_Parameter_Set*> IO_Flow_Definitions;
+	static thread_local std::string Input_file_path;//This parameter is not serialized. This is used to inform the Host_System class about the input file path.
+	static thread_local std::string Epoch_Metrics_File_Path;//This parameter is not serialized. It is set from the output file path of each scenario.
 
 	void XML_serialize(Utils::XmlWriter& xmlwriter);
 	void XML_deserialize(rapidxml::xml_node<> *node);
@@ -1,15 +1,21 @@
+#include <algorithm>
 #include "../sim/Engine.h"
 #include "Host_System.h"
 #include "../ssd/Host_Interface_Base.h"
 #include "../ssd/Host_Interface_NVMe.h"
+#include "../ssd/FTL.h"
 #include "../host/PCIe_Root_Complex.h"
 #include "../host/IO_Flow_Synthetic.h"
 #include "../host/IO_Flow_Trace_Based.h"
 #include "../utils/StringTools.h"
 #include "../utils/Logical_Address_Partitioning_Unit.h"
 
+#define CHECKPOINT_FORMAT_VERSION 1
+#define CHECKPOINT_POLL_PERIOD 1000//in nano-seconds, used to find a quiescent point after the requested checkpoint time
+
 Host_System::Host_System(Host_Parameter_Set* parameters, bool preconditioning_required, SSD_Components::Host_Interface_Base* ssd_host_interface):
-	MQSimEngine::Sim_Object("Host"), preconditioning_required(preconditioning_required)
+	MQSimEngine::Sim_Object("Host"), epoch_metrics(NULL), preconditioning_required(preconditioning_required),
+	checkpoint_scheduled(false), checkpoint_phase(Checkpoint_Phase_Type::PRECONDITIONING), checkpoint_time(0)
 {
 	Simulator->AddObject(this);
 
@@ -67,7 +73,8 @@ Host_System::Host_System(Host_Parameter_Set* parameters, bool preconditioning_re
 					Utils::Logical_Address_Partitioning_Unit::Start_lha_available_to_flow(flow_id), Utils::Logical_Address_Partitioning_Unit::End_lha_available_to_flow(flow_id),
 					FLOW_ID_TO_Q_ID(flow_id), nvme_sq_size, nvme_cq_size,
 					flow_param->Priority_Class, flow_param->Initial_Occupancy_Percentage / double(100.0),
-					flow_param->File_Path, flow_param->Time_Unit, flow_param->Relay_Count, flow_param->Percentage_To_Be_Executed,
+					flow_param->File_Path, flow_param->Time_Unit, flow_param->Relay_Count, flow_param->Percentage_To_Be_Executed, flow_param->Replay_Drain,
+					flow_param->Fast_Forward, flow_param->Fast_Forward_Stable_Rounds, flow_param->Fast_Forward_Tolerance,
 					ssd_host_interface->GetType(), this->PCIe_root_complex, this->SATA_hba,
 					parameters->Enable_ResponseTime_Logging, parameters->ResponseTime_Logging_Period_Length, parameters->Input_file_path + ".IO_Flow.No_" + std::to_string(flow_id) + ".log");
 
@@ -80,6 +87,12 @@ Host_System::Host_System(Host_Parameter_Set* parameters, bool preconditioning_re
 		Simulator->AddObject(io_flow);
 	}
 	this->PCIe_root_complex->Set_io_flows(&this->IO_flows);
+	if (parameters->Enable_Epoch_Metrics) {
+		this->epoch_metrics = new Host_Components::Epoch_Metrics_Logger(parameters->Epoch_Metrics_File_Path, parameters->Epoch_Metrics_Period_Length);
+		for (auto &flow : IO_flows) {
+			flow->Attach_epoch_metrics_logger(this->epoch_metrics);
+		}
+	}
 	if (((SSD_Components::Host_Interface_NVMe*)ssd_host_interface)->GetType() == HostInterface_Types::SATA) {
 		this->SATA_hba->Set_io_flows(&this->IO_flows);
 		this->SATA_hba->Set_root_complex(this->PCIe_root_complex);
@@ -97,6 +110,7 @@ Host_System::~Host_System()
 	for (uint16_t flow_id = 0; flow_id < this->IO_flows.size(); flow_id++) {
 		delete this->IO_flows[flow_id];
 	}
+	delete this->epoch_metrics;
 }
 
 void Host_System::Attach_ssd_device(SSD_Device* ssd_device)
@@ -104,6 +118,14 @@ void Host_System::Attach_ssd_device(SSD_Device* ssd_device)
 	ssd_device->Attach_to_host(this->PCIe_switch);
 	this->PCIe_switch->Attach_ssd_device(ssd_device->Host_interface);
 	this->ssd_device = ssd_device;
+
+	//Fast-forward extrapolates device-wide counters from one flow's rounds, so it needs a single flow
+	if (IO_flows.size() == 1) {
+		Host_Components::IO_Flow_Trace_Based* trace_flow = dynamic_cast<Host_Components::IO_Flow_Trace_Based*>(IO_flows[0]);
+		if (trace_flow != NULL) {
+			trace_flow->Attach_fast_forward_unit(((SSD_Components::FTL*)ssd_device->Firmware)->Fast_Forward);
+		}
+	}
 }
 
 const std::vector<Host_Components::IO_Flow_Base*> Host_System::Get_io_flows()
@@ -136,6 +158,18 @@ void Host_System::Start_simulation()
 			delete stat;
 		}
 	}
+
+	if (checkpoint_scheduled) {
+		if (checkpoint_phase == Checkpoint_Phase_Type::PRECONDITIONING) {
+			save_checkpoint();
+		} else {
+			Simulator->Register_sim_event(std::max(checkpoint_time, Simulator->Time()), this);
+		}
+	}
+
+	if (epoch_metrics != NULL) {
+		epoch_metrics->Start_simulation();
+	}
 }
 
 void Host_System::Validate_simulation_config() 
@@ -159,6 +193,12 @@ void Host_System::Validate_simulation_config()
 
 void Host_System::Execute_simulator_event(MQSimEngine::Sim_Event* event)
 {
+	//The only event of the host system is the checkpoint, which waits until the device is quiescent
+	if (is_quiescent()) {
+		save_checkpoint();
+	} else {
+		Simulator->Register_sim_event(Simulator->Time() + CHECKPOINT_POLL_PERIOD, this);
+	}
 }
 
 void Host_System::Report_results_in_XML(std::string name_prefix, Utils::XmlWriter& xmlwriter)
@@ -171,9 +211,141 @@ void Host_System::Report_results_in_XML(std::string name_prefix, Utils::XmlWrite
 		flow->Report_results_in_XML("Host", xmlwriter);
 	}
 
+	Finish_simulation();
+
 	xmlwriter.Write_close_tag();
 }
 
+void Host_System::Finish_simulation()
+{
+	//The last epoch ends with the simulation
+	if (epoch_metrics != NULL) {
+		epoch_metrics->Finish();
+	}
+}
+
+void Host_System::Schedule_checkpoint(Checkpoint_Phase_Type phase, sim_time_type time, const std::string& file_path)
+{
+	if (phase == Checkpoint_Phase_Type::TIME) {
+		//Synthetic flows would also need the state of their random generators, so only the position of trace-based flows is saved
+		for (auto &flow : IO_flows) {
+			if (dynamic_cast<Host_Components::IO_Flow_Trace_Based*>(flow) == NULL) {
+				PRINT_ERROR("Checkpoints during the simulation are only supported for trace-based IO flows")
+			}
+		}
+	}
+	checkpoint_scheduled = true;
+	checkpoint_phase = phase;
+	checkpoint_time = time;
+	checkpoint_file_path = file_path;
+}
+
+void Host_System::Restore_checkpoint(const std::string& file_path)
+{
+	Utils::Checkpoint_Reader reader(file_path);
+	reader.Expect_tag("MQSim_Checkpoint");
+	reader.Expect<uint32_t>(CHECKPOINT_FORMAT_VERSION, "the format version");
+	check_configuration_fingerprint(reader);
+	Checkpoint_Phase_Type phase = (Checkpoint_Phase_Type)reader.Read<int>();
+	sim_time_type time = reader.Read<sim_time_type>();
+	Simulator->Set_start_time(time);
+	if (phase == Checkpoint_Phase_Type::TIME) {
+		for (auto &flow : IO_flows) {
+			Host_Components::IO_Flow_Trace_Based* trace_flow = dynamic_cast<Host_Components::IO_Flow_Trace_Based*>(flow);
+			if (trace_flow == NULL) {
+				PRINT_ERROR("The checkpoint " << file_path << " was taken during the simulation and can only be restored with trace-based IO flows")
+			}
+			trace_flow->Load_checkpoint(reader);
+		}
+	}
+	ssd_device->Load_checkpoint(reader);
+	reader.Close();
+	PRINT_MESSAGE("Restored the checkpoint " << file_path << ", the simulation resumes at " << time << " ns")
+}
+
+bool Host_System::is_quiescent()
+{
+	for (auto &flow : IO_flows) {
+		if (!((Host_Components::IO_Flow_Trace_Based*)flow)->Is_idle()) {
+			return false;
+		}
+	}
+
+	std::vector<MQSimEngine::Sim_Event*> events;
+	Simulator->Get_pending_events(events);
+	for (auto &event : events) {
+		if (event->Ignore || event->Target_sim_object == this) {
+			continue;
+		}
+		if (std::find(IO_flows.begin(), IO_flows.end(), event->Target_sim_object) == IO_flows.end()) {
+			return false;
+		}
+	}
+
+	return true;
+}
+
+void Host_System::save_checkpoint()
+{
+	Utils::Checkpoint_Writer writer(checkpoint_file_path);
+	writer.Write_tag("MQSim_Checkpoint");
+	writer.Write<uint32_t>(CHECKPOINT_FORMAT_VERSION);
+	write_configuration_fingerprint(writer);
+	writer.Write((int)checkpoint_phase);
+	writer.Write(Simulator->Time());
+	if (checkpoint_phase == Checkpoint_Phase_Type::TIME) {
+		for (auto &flow : IO_flows) {
+			((Host_Components::IO_Flow_Trace_Based*)flow)->Save_checkpoint(writer);
+		}
+	}
+	ssd_device->Save_checkpoint(writer);
+	writer.Close();
+	checkpoint_scheduled = false;
+	PRINT_MESSAGE("Saved the checkpoint " << checkpoint_file_path << " at " << Simulator->Time() << " ns")
+}
+
+//The parameters that determine the size and layout of the saved state. Timing, ECC and read-reclaim
+//parameters are not included, since sweeping them over a common starting state is the purpose of a checkpoint.
+void Host_System::write_configuration_fingerprint(Utils::Checkpoint_Writer& writer)
+{
+	writer.Write(Device_Parameter_Set::Flash_Channel_Count);
+	writer.Write(Device_Parameter_Set::Chip_No_Per_Channel);
+	writer.Write(Flash_Parameter_Set::Die_No_Per_Chip);
+	writer.Write(Flash_Parameter_Set::Plane_No_Per_Die);
+	writer.Write(Flash_Parameter_Set::Block_No_Per_Plane);
+	writer.Write(Flash_Parameter_Set::Page_No_Per_Block);
+	writer.Write(Flash_Parameter_Set::Page_Capacity);
+	writer.Write(Device_Parameter_Set::Overprovisioning_Ratio);
+	writer.Write((int)Device_Parameter_Set::Address_Mapping);
+	writer.Write(Device_Parameter_Set::Ideal_Mapping_Table);
+	writer.Write(Device_Parameter_Set::CMT_Capacity);
+	writer.Write((int)Device_Parameter_Set::CMT_Sharing_Mode);
+	writer.Write((int)Device_Parameter_Set::Caching_Mechanism);
+	writer.Write(Device_Parameter_Set::Data_Cache_Capacity);
+	writer.Write((int)Device_Parameter_Set::Data_Cache_Sharing_Mode);
+	writer.Write((unsigned int)IO_flows.size());
+}
+
+void Host_System::check_configuration_fingerprint(Utils::Checkpoint_Reader& reader)
+{
+	reader.Expect(Device_Parameter_Set::Flash_Channel_Count, "Flash_Channel_Count");
+	reader.Expect(Device_Parameter_Set::Chip_No_Per_Channel, "Chip_No_Per_Channel");
+	reader.Expect(Flash_Parameter_Set::Die_No_Per_Chip, "Die_No_Per_Chip");
+	reader.Expect(Flash_Parameter_Set::Plane_No_Per_Die, "Plane_No_Per_Die");
+	reader.Expect(Flash_Parameter_Set::Block_No_Per_Plane, "Block_No_Per_Plane");
+	reader.Expect(Flash_Parameter_Set::Page_No_Per_Block, "Page_No_Per_Block");
+	reader.Expect(Flash_Parameter_Set::Page_Capacity, "Page_Capacity");
+	reader.Expect(Device_Parameter_Set::Overprovisioning_Ratio, "Overprovisioning_Ratio");
+	reader.Expect((int)Device_Parameter_Set::Address_Mapping, "Address_Mapping");
+	reader.Expect(Device_Parameter_Set::Ideal_Mapping_Table, "Ideal_Mapping_Table");
+	reader.Expect(Device_Parameter_Set::CMT_Capacity, "CMT_Capacity");
+	reader.Expect((int)Device_Parameter_Set::CMT_Sharing_Mode, "CMT_Sharing_Mode");
+	reader.Expect((int)Device_Parameter_Set::Caching_Mechanism, "Caching_Mechanism");
+	reader.Expect(Device_Parameter_Set::Data_Cache_Capacity, "Data_Cache_Capacity");
+	reader.Expect((int)Device_Parameter_Set::Data_Cache_Sharing_Mode, "Data_Cache_Sharing_Mode");
+	reader.Expect((unsigned int)IO_flows.size(), "the number of IO flows");
+}
+
 std::vector<Utils::Workload_Statistics*> Host_System::get_workloads_statistics()
 {
 	std::vector<Utils::Workload_Statistics*> stats;
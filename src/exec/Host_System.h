@@ -21,21 +21,35 @@ public:
 	Host_System(Host_Parameter_Set* parameters, bool preconditioning_required, SSD_Components::Host_Interface_Base* ssd_host_interface);
 	~Host_System();
 	void Start_simulation();
+	void Finish_simulation();//Closes the last epoch of the epoch metrics stream; safe to call more than once
 	void Validate_simulation_config();
 	void Execute_simulator_event(MQSimEngine::Sim_Event* event);
 	void Report_results_in_XML(std::string name_prefix, Utils::XmlWriter& xmlwriter);
 
 	void Attach_ssd_device(SSD_Device* ssd_device);
 	const std::vector<Host_Components::IO_Flow_Base*> Get_io_flows();
+	void Schedule_checkpoint(Checkpoint_Phase_Type phase, sim_time_type time, const std::string& file_path);
+	void Restore_checkpoint(const std::string& file_path);//Must be called after the SSD device is attached and before the simulation starts
 private:
 	Host_Components::PCIe_Root_Complex* PCIe_root_complex;
 	Host_Components::PCIe_Link* Link;
 	Host_Components::PCIe_Switch* PCIe_switch;
 	Host_Components::SATA_HBA* SATA_hba;
 	std::vector<Host_Components::IO_Flow_Base*> IO_flows;
+	Host_Components::Epoch_Metrics_Logger* epoch_metrics;
 	SSD_Device* ssd_device;
 	std::vector<Utils::Workload_Statistics*> get_workloads_statistics();
 	bool preconditioning_required;
+
+	//Warm-start checkpoints of the device state
+	bool checkpoint_scheduled;
+	Checkpoint_Phase_Type checkpoint_phase;
+	sim_time_type checkpoint_time;
+	std::string checkpoint_file_path;
+	bool is_quiescent();//No request is in flight and only the IO flows have pending events
+	void save_checkpoint();
+	void write_configuration_fingerprint(Utils::Checkpoint_Writer& writer);
+	void check_configuration_fingerprint(Utils::Checkpoint_Reader& reader);
 };
 
 #endif // !HOST_SYSTEM_H
@@ -3,6 +3,19 @@
 #include <set>
 #include <cstring>
 #include <algorithm>
+#include <sstream>
+
+//Comma separated ID list of a flow parameter; strtok is not used since flows may be parsed by concurrent simulation threads
+static void parse_id_list(const char* value, std::set<int>& ids)
+{
+	std::istringstream list(value);
+	std::string id;
+	while (std::getline(list, id, ',')) {
+		if (id.find_first_not_of(" \t\r\n") != std::string::npos) {
+			ids.insert(std::stoi(id));
+		}
+	}
+}
 
 //All serialization and deserialization functions should be replaced by a C++ reflection implementation
 void IO_Flow_Parameter_Set::XML_serialize(Utils::XmlWriter& xmlwriter)
@@ -126,19 +139,7 @@ void IO_Flow_Parameter_Set::XML_deserialize(rapidxml::xml_node<> *node)
 				}
 			} else if (strcmp(param->name(), "Channel_IDs") == 0) {
 				std::set<int> ids;
-				char tmp[1000], *tmp2;
-				strncpy(tmp, param->value(), 1000);
-				std::string id = strtok(tmp, ",");
-				while (1) {
-					std::string::size_type sz;
-					ids.insert(std::stoi(id, &sz));
-					tmp2 = strtok(NULL, ",");
-					if (tmp2 == NULL) {
-						break;
-					} else {
-						id = tmp2;
-					}
-				}
+				parse_id_list(param->value(), ids);
 				Channel_No = (int)ids.size();
 				Channel_IDs = new flash_block_ID_type[Channel_No];
 				int i = 0;
@@ -147,19 +148,7 @@ void IO_Flow_Parameter_Set::XML_deserialize(rapidxml::xml_node<> *node)
 				}
 			} else if (strcmp(param->name(), "Chip_IDs") == 0) {
 				std::set<int> ids;
-				char tmp[1000], *tmp2;
-				strncpy(tmp, param->value(), 1000);
-				std::string id = strtok(tmp, ",");
-				while (1) {
-					std::string::size_type sz;
-					ids.insert(std::stoi(id, &sz));
-					tmp2 = strtok(NULL, ",");
-					if (tmp2 == NULL) {
-						break;
-					} else {
-						id = tmp2;
-					}
-				}
+				parse_id_list(param->value(), ids);
 				Chip_No = (int)ids.size();
 				Chip_IDs = new flash_block_ID_type[Chip_No];
 				int i = 0;
@@ -168,19 +157,7 @@ void IO_Flow_Parameter_Set::XML_deserialize(rapidxml::xml_node<> *node)
 				}
 			} else if (strcmp(param->name(), "Die_IDs") == 0) {
 				std::set<int> ids;
-				char tmp[1000], *tmp2;
-				strncpy(tmp, param->value(), 1000);
-				std::string id = strtok(tmp, ",");
-				while (1) {
-					std::string::size_type sz;
-					ids.insert(std::stoi(id, &sz));
-					tmp2 = strtok(NULL, ",");
-					if (tmp2 == NULL) {
-						break;
-					} else {
-						id = tmp2;
-					}
-				}
+				parse_id_list(param->value(), ids);
 				Die_No = (int)ids.size();
 				Die_IDs = new flash_block_ID_type[Die_No];
 				int i = 0;
@@ -189,19 +166,7 @@ void IO_Flow_Parameter_Set::XML_deserialize(rapidxml::xml_node<> *node)
 				}
 			} else if (strcmp(param->name(), "Plane_IDs") == 0) {
 				std::set<int> ids;
-				char tmp[1000], *tmp2;
-				strncpy(tmp, param->value(), 1000);
-				std::string id = strtok(tmp, ",");
-				while (1) {
-					std::string::size_type sz;
-					ids.insert(std::stoi(id, &sz));
-					tmp2 = strtok(NULL, ",");
-					if (tmp2 == NULL) {
-						break;
-					} else {
-						id = tmp2;
-					}
-				}
+				parse_id_list(param->value(), ids);
 				Plane_No = (int)ids.size();
 				Plane_IDs = new flash_block_ID_type[Plane_No];
 				int i = 0;
@@ -434,6 +399,22 @@ void IO_Flow_Parameter_Set_Trace_Based::XML_serialize(Utils::XmlWriter& xmlwrite
 	}
 	xmlwriter.Write_attribute_string(attr, val);
 
+	attr = "Replay_Drain";
+	val = Replay_Drain ? "true" : "false";
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Fast_Forward";
+	val = Fast_Forward ? "true" : "false";
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Fast_Forward_Stable_Rounds";
+	val = std::to_string(Fast_Forward_Stable_Rounds);
+	xmlwriter.Write_attribute_string(attr, val);
+
+	attr = "Fast_Forward_Tolerance";
+	val = std::to_string(Fast_Forward_Tolerance);
+	xmlwriter.Write_attribute_string(attr, val);
+
 	xmlwriter.Write_close_tag();
 }
 
@@ -463,6 +444,20 @@ void IO_Flow_Parameter_Set_Trace_Based::XML_deserialize(rapidxml::xml_node<> *no
 				} else {
 					PRINT_ERROR("Wrong time unit specified for the trace based flow")
 				}
+			} else if (strcmp(param->name(), "Replay_Drain") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				Replay_Drain = (strcmp(val.c_str(), "TRUE") == 0);
+			} else if (strcmp(param->name(), "Fast_Forward") == 0) {
+				std::string val = param->value();
+				std::transform(val.begin(), val.end(), val.begin(), ::toupper);
+				Fast_Forward = (strcmp(val.c_str(), "TRUE") == 0);
+			} else if (strcmp(param->name(), "Fast_Forward_Stable_Rounds") == 0) {
+				std::string val = param->value();
+				Fast_Forward_Stable_Rounds = std::stoul(val);
+			} else if (strcmp(param->name(), "Fast_Forward_Tolerance") == 0) {
+				std::string val = param->value();
+				Fast_Forward_Tolerance = std::stod(val);
 			}
 
 		}
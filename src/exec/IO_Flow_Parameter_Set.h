@@ -57,11 +57,15 @@ public:
 class IO_Flow_Parameter_Set_Trace_Based : public IO_Flow_Parameter_Set
 {
 public:
-	IO_Flow_Parameter_Set_Trace_Based() { this->Type = Flow_Type::TRACE; }
+	IO_Flow_Parameter_Set_Trace_Based() { this->Type = Flow_Type::TRACE; Replay_Drain = false; Fast_Forward = false; Fast_Forward_Stable_Rounds = 3; Fast_Forward_Tolerance = 0.01; }
 	std::string File_Path;
 	int Percentage_To_Be_Executed;
 	int Relay_Count; 
 	Trace_Time_Unit Time_Unit;
+	bool Replay_Drain;//A replay round starts only once all requests of the previous round are serviced
+	bool Fast_Forward;//Skip replay rounds analytically once consecutive rounds reach a steady state
+	unsigned int Fast_Forward_Stable_Rounds;//Consecutive matching rounds required before skipping
+	double Fast_Forward_Tolerance;//Relative difference in round duration and response time still considered a match
 	
 	void XML_serialize(Utils::XmlWriter& xmlwriter);
 	void XML_deserialize(rapidxml::xml_node<> *node);
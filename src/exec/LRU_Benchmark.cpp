@@ -0,0 +1,221 @@
+#include <chrono>
+#include <cstdint>
+#include <cstdlib>
+#include <iomanip>
+#include <iostream>
+#include <list>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "../host/Trace_File_Reader.h"
+#include "../utils/LRU_Table.h"
+
+// Replays the page accesses of a trace against an LRU cache of mapping entries, once with the
+// std::list + std::unordered_map layout that the CMT and the data cache used before and once with
+// Utils::LRU_Table, and reports the replay rate of both. Every access is a lookup that moves a hit
+// to the front and inserts a miss at the front, evicting the least recently used entry of a full
+// cache; both replays must produce the same hits and evictions.
+
+struct Bench_Slot
+{
+	uint64_t PPA;
+	unsigned long long Bitmap;
+	bool Dirty;
+};
+
+struct Bench_Access
+{
+	uint64_t Key;
+	bool Write;
+};
+
+struct Bench_Result
+{
+	uint64_t Hits = 0;
+	uint64_t Evictions = 0;
+	uint64_t Dirty_evictions = 0;
+	uint64_t Eviction_checksum = 0;//Order-sensitive hash of the evicted keys
+	double Seconds = 0;
+};
+
+//Slot layout of the old caches: a heap object that keeps its position in the list
+struct List_Slot : Bench_Slot
+{
+	std::list<std::pair<uint64_t, List_Slot*>>::iterator List_position;
+};
+
+class List_Map_Cache
+{
+public:
+	List_Map_Cache(unsigned int capacity) : capacity(capacity) {}
+	~List_Map_Cache()
+	{
+		for (auto& entry : lru_list) {
+			delete entry.second;
+		}
+	}
+	void Access(const Bench_Access& access, Bench_Result& result)
+	{
+		auto it = slots.find(access.Key);
+		if (it != slots.end()) {
+			result.Hits++;
+			lru_list.splice(lru_list.begin(), lru_list, it->second->List_position);
+			it->second->Dirty |= access.Write;
+			return;
+		}
+		if (slots.size() >= capacity) {
+			auto& victim = lru_list.back();
+			result.Evictions++;
+			result.Dirty_evictions += victim.second->Dirty;
+			result.Eviction_checksum = result.Eviction_checksum * 31 + victim.first;
+			slots.erase(victim.first);
+			delete victim.second;
+			lru_list.pop_back();
+		}
+		List_Slot* slot = new List_Slot();
+		slot->PPA = access.Key;
+		slot->Dirty = access.Write;
+		lru_list.push_front(std::make_pair(access.Key, slot));
+		slot->List_position = lru_list.begin();
+		slots[access.Key] = slot;
+	}
+private:
+	unsigned int capacity;
+	std::unordered_map<uint64_t, List_Slot*> slots;
+	std::list<std::pair<uint64_t, List_Slot*>> lru_list;
+};
+
+class Table_Cache
+{
+public:
+	Table_Cache(unsigned int capacity) : slots(capacity) {}
+	void Access(const Bench_Access& access, Bench_Result& result)
+	{
+		uint32_t slot = slots.Find(access.Key);
+		if (slot != slots.NIL) {
+			result.Hits++;
+			slots.Move_to_front(slot);
+			slots[slot].Dirty |= access.Write;
+			return;
+		}
+		if (slots.Size() >= slots.Capacity()) {
+			uint32_t victim = slots.Back();
+			result.Evictions++;
+			result.Dirty_evictions += slots[victim].Dirty;
+			result.Eviction_checksum = result.Eviction_checksum * 31 + slots.Key(victim);
+			slots.Remove(victim);
+		}
+		Bench_Slot& new_slot = slots[slots.Insert_front(access.Key)];
+		new_slot.PPA = access.Key;
+		new_slot.Bitmap = 0;
+		new_slot.Dirty = access.Write;
+	}
+private:
+	Utils::LRU_Table<Bench_Slot> slots;
+};
+
+template<typename Cache_Type>
+Bench_Result replay(const std::vector<Bench_Access>& accesses, unsigned int capacity, unsigned int rounds)
+{
+	Bench_Result result;
+	Cache_Type cache(capacity);
+	auto start = std::chrono::steady_clock::now();
+	for (unsigned int round = 0; round < rounds; round++) {
+		for (auto& access : accesses) {
+			cache.Access(access, result);
+		}
+	}
+	result.Seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+	return result;
+}
+
+void print_usage(const char* prog_name)
+{
+	std::cout << "Usage: " << prog_name << " -t <trace> [options]" << std::endl;
+	std::cout << "Options:" << std::endl;
+	std::cout << "  -t <trace>    Trace file (ASCII, binary or manifest)" << std::endl;
+	std::cout << "  -c <entries>  Cache capacity in entries (default: 65536)" << std::endl;
+	std::cout << "  -p <sectors>  Sectors per page (default: 32)" << std::endl;
+	std::cout << "  -r <rounds>   Replay rounds, the cache is kept between rounds (default: 1)" << std::endl;
+	std::cout << "  -h            Show this help message" << std::endl;
+}
+
+void print_result(const std::string& name, const Bench_Result& result, uint64_t access_count)
+{
+	std::cout << "  " << std::left << std::setw(22) << name << std::right << std::fixed << std::setprecision(3)
+		<< std::setw(10) << result.Seconds << " s"
+		<< std::setw(10) << std::setprecision(1) << (result.Seconds * 1e9 / access_count) << " ns/access"
+		<< std::setw(10) << std::setprecision(2) << (access_count / result.Seconds / 1e6) << " M accesses/s" << std::endl;
+}
+
+int main(int argc, char* argv[])
+{
+	std::string trace_path;
+	unsigned int capacity = 65536;
+	unsigned int sectors_per_page = 32;
+	unsigned int rounds = 1;
+
+	for (int i = 1; i < argc; i++) {
+		std::string arg = argv[i];
+		if (arg == "-h") {
+			print_usage(argv[0]);
+			return 0;
+		} else if (arg == "-t" && i + 1 < argc) {
+			trace_path = argv[++i];
+		} else if (arg == "-c" && i + 1 < argc) {
+			capacity = std::stoul(argv[++i]);
+		} else if (arg == "-p" && i + 1 < argc) {
+			sectors_per_page = std::stoul(argv[++i]);
+		} else if (arg == "-r" && i + 1 < argc) {
+			rounds = std::stoul(argv[++i]);
+		} else {
+			std::cerr << "Unknown option: " << arg << std::endl;
+			print_usage(argv[0]);
+			return 1;
+		}
+	}
+	if (trace_path.empty() || capacity == 0 || sectors_per_page == 0 || rounds == 0) {
+		print_usage(argv[0]);
+		return 1;
+	}
+
+	Host_Components::Trace_File_Reader reader;
+	if (!reader.Open(trace_path)) {
+		std::cerr << "Cannot open trace file: " << trace_path << std::endl;
+		return 1;
+	}
+	std::vector<Bench_Access> accesses;
+	Host_Components::Trace_Record record;
+	while (reader.Read_next(record)) {
+		if (record.LBA_count == 0) {
+			continue;
+		}
+		bool write = record.Type == Host_Components::Host_IO_Request_Type::WRITE;
+		for (LPA_type lpa = record.Start_LBA / sectors_per_page; lpa <= (record.Start_LBA + record.LBA_count - 1) / sectors_per_page; lpa++) {
+			accesses.push_back(Bench_Access{ LPN_TO_UNIQUE_KEY(0, lpa), write });
+		}
+	}
+	reader.Close();
+	if (accesses.size() == 0) {
+		std::cerr << "No requests in trace file: " << trace_path << std::endl;
+		return 1;
+	}
+	uint64_t access_count = (uint64_t)accesses.size() * rounds;
+
+	Bench_Result list_map = replay<List_Map_Cache>(accesses, capacity, rounds);
+	Bench_Result table = replay<Table_Cache>(accesses, capacity, rounds);
+
+	std::cout << "Trace: " << trace_path << ", " << access_count << " page accesses, capacity " << capacity << " entries" << std::endl;
+	std::cout << "Hits: " << table.Hits << " (" << std::fixed << std::setprecision(2) << 100.0 * table.Hits / access_count << "%)"
+		<< ", evictions: " << table.Evictions << " (" << table.Dirty_evictions << " dirty)" << std::endl;
+	print_result("std::list+unordered_map", list_map, access_count);
+	print_result("Utils::LRU_Table", table, access_count);
+	std::cout << "Speedup: " << std::setprecision(2) << list_map.Seconds / table.Seconds << "x" << std::endl;
+
+	if (list_map.Hits != table.Hits || list_map.Evictions != table.Evictions
+		|| list_map.Dirty_evictions != table.Dirty_evictions || list_map.Eviction_checksum != table.Eviction_checksum) {
+		std::cerr << "ERROR: the two caches made different replacement decisions" << std::endl;
+		return 1;
+	}
+	return 0;
+}
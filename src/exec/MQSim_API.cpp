@@ -0,0 +1,348 @@
+#include <chrono>
+#include <cstring>
+#include <iostream>
+#include <mutex>
+#include <string>
+#include <vector>
+#include "MQSim_API.h"
+#include "Execution_Parameter_Set.h"
+#include "SSD_Device.h"
+#include "Host_System.h"
+#include "../sim/Engine.h"
+#include "../ssd/FTL.h"
+#include "../ssd/Stats.h"
+#include "../utils/XMLWriter.h"
+#include "../utils/rapidxml/rapidxml.hpp"
+
+namespace
+{
+	thread_local std::string last_error;
+
+	int fail(const std::string& message)
+	{
+		last_error = message;
+		return MQSIM_ERROR;
+	}
+
+	//Silences PRINT_MESSAGE while it is in scope; errors still go to std::cerr
+	//std::cout is shared by all threads: it stays silenced while at least one quiet run is in progress
+	std::mutex silencer_lock;
+	unsigned int silenced_runs = 0;
+	std::streambuf* saved_cout_buffer = NULL;
+
+	class Cout_silencer
+	{
+	public:
+		Cout_silencer(bool enabled) : enabled(enabled)
+		{
+			if (enabled) {
+				std::lock_guard<std::mutex> guard(silencer_lock);
+				if (silenced_runs++ == 0) {
+					saved_cout_buffer = std::cout.rdbuf(NULL);
+				}
+			}
+		}
+		~Cout_silencer()
+		{
+			if (enabled) {
+				std::lock_guard<std::mutex> guard(silencer_lock);
+				if (--silenced_runs == 0) {
+					std::cout.rdbuf(saved_cout_buffer);
+				}
+			}
+		}
+	private:
+		bool enabled;
+	};
+
+	rapidxml::xml_node<>* child_node(rapidxml::xml_document<>& doc, rapidxml::xml_node<>* parent, const char* name)
+	{
+		rapidxml::xml_node<>* node = parent->first_node(name);
+		if (node == NULL) {
+			node = doc.allocate_node(rapidxml::node_element, doc.allocate_string(name));
+			parent->append_node(node);
+		}
+		return node;
+	}
+
+	void find_nodes(rapidxml::xml_node<>* parent, const char* name, std::vector<rapidxml::xml_node<>*>& found)
+	{
+		for (auto node = parent->first_node(); node; node = node->next_sibling()) {
+			if (node->type() != rapidxml::node_element) {
+				continue;
+			}
+			if (strcmp(node->name(), name) == 0) {
+				found.push_back(node);
+			}
+			find_nodes(node, name, found);
+		}
+	}
+
+	//Sets the value of a configuration tag in the tree of an <Execution_Parameter_Set>
+	bool override_parameter(rapidxml::xml_document<>& doc, rapidxml::xml_node<>* root, const mqsim_parameter& parameter)
+	{
+		if (parameter.name == NULL || parameter.value == NULL) {
+			fail("A device parameter has no name or no value");
+			return false;
+		}
+		std::vector<rapidxml::xml_node<>*> nodes;
+		if (parameter.section == NULL) {
+			find_nodes(root, parameter.name, nodes);
+			if (nodes.empty()) {
+				fail(std::string("Device parameter ") + parameter.name + " is not in the base configuration; its section must be given");
+				return false;
+			}
+		} else if (strcmp(parameter.section, "Host_Parameter_Set") == 0 || strcmp(parameter.section, "Device_Parameter_Set") == 0) {
+			nodes.push_back(child_node(doc, child_node(doc, root, parameter.section), parameter.name));
+		} else if (strcmp(parameter.section, "Flash_Parameter_Set") == 0) {
+			rapidxml::xml_node<>* device = child_node(doc, root, "Device_Parameter_Set");
+			nodes.push_back(child_node(doc, child_node(doc, device, parameter.section), parameter.name));
+		} else {
+			fail(std::string("Unknown parameter section: ") + parameter.section);
+			return false;
+		}
+		for (auto node : nodes) {
+			node->value(doc.allocate_string(parameter.value));
+		}
+		return true;
+	}
+
+	IO_Flow_Parameter_Set* make_flow(rapidxml::xml_document<>& doc, const mqsim_flow& flow)
+	{
+		const char* tag = flow.type == MQSIM_FLOW_TRACE_BASED ? "IO_Flow_Parameter_Set_Trace_Based" : "IO_Flow_Parameter_Set_Synthetic";
+		rapidxml::xml_node<>* node = doc.allocate_node(rapidxml::node_element, tag);
+		for (unsigned int i = 0; i < flow.parameter_count; i++) {
+			const mqsim_parameter& parameter = flow.parameters[i];
+			if (parameter.name == NULL || parameter.value == NULL) {
+				fail("A flow parameter has no name or no value");
+				return NULL;
+			}
+			node->append_node(doc.allocate_node(rapidxml::node_element, doc.allocate_string(parameter.name), doc.allocate_string(parameter.value)));
+		}
+
+		if (flow.type == MQSIM_FLOW_TRACE_BASED) {
+			IO_Flow_Parameter_Set_Trace_Based* definition = new IO_Flow_Parameter_Set_Trace_Based;
+			definition->XML_deserialize(node);
+			return definition;
+		}
+		IO_Flow_Parameter_Set_Synthetic* definition = new IO_Flow_Parameter_Set_Synthetic;
+		definition->XML_deserialize(node);
+		return definition;
+	}
+
+	//The parameter sets have no virtual destructor
+	void delete_flows(std::vector<IO_Flow_Parameter_Set*>& flows)
+	{
+		for (auto definition : flows) {
+			if (definition->Type == Flow_Type::TRACE) {
+				delete (IO_Flow_Parameter_Set_Trace_Based*)definition;
+			} else {
+				delete (IO_Flow_Parameter_Set_Synthetic*)definition;
+			}
+		}
+		flows.clear();
+	}
+
+	//A run that ends before the first event has no elapsed time to divide by
+	double per_second(double value, double seconds)
+	{
+		return seconds > 0 ? value / seconds : 0;
+	}
+
+	void copy_flow_result(Host_Components::IO_Flow_Base* flow, mqsim_flow_result& result)
+	{
+		double seconds = (double)Simulator->Time() / SIM_TIME_TO_SECONDS_COEFF;
+		strncpy(result.id, flow->ID().c_str(), MQSIM_FLOW_ID_LENGTH - 1);
+		result.id[MQSIM_FLOW_ID_LENGTH - 1] = '\0';
+		result.request_count = flow->Get_generated_request_count();
+		result.read_request_count = flow->Get_generated_read_request_count();
+		result.write_request_count = flow->Get_generated_write_request_count();
+		result.serviced_request_count = flow->Get_serviced_request_count();
+		result.iops = per_second((double)result.request_count, seconds);
+		result.iops_read = per_second((double)result.read_request_count, seconds);
+		result.iops_write = per_second((double)result.write_request_count, seconds);
+		result.bytes_transferred = (double)flow->Get_transferred_bytes_total();
+		result.bytes_transferred_read = (double)flow->Get_transferred_bytes_read();
+		result.bytes_transferred_write = (double)flow->Get_transferred_bytes_write();
+		result.bandwidth = per_second(result.bytes_transferred, seconds);
+		result.bandwidth_read = per_second(result.bytes_transferred_read, seconds);
+		result.bandwidth_write = per_second(result.bytes_transferred_write, seconds);
+
+		result.device_response_time = flow->Get_device_response_time();
+		result.min_device_response_time = flow->Get_min_device_response_time();
+		result.max_device_response_time = flow->Get_max_device_response_time();
+		const Utils::Latency_Histogram& response_time = flow->Get_device_response_time_histogram();
+		result.device_response_time_p50 = (double)response_time.Value_at_percentile(50) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.device_response_time_p90 = (double)response_time.Value_at_percentile(90) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.device_response_time_p99 = (double)response_time.Value_at_percentile(99) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.device_response_time_p99_9 = (double)response_time.Value_at_percentile(99.9) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.device_response_time_p99_99 = (double)response_time.Value_at_percentile(99.99) / SIM_TIME_TO_MICROSECONDS_COEFF;
+
+		result.end_to_end_request_delay = flow->Get_end_to_end_request_delay();
+		result.min_end_to_end_request_delay = flow->Get_min_end_to_end_request_delay();
+		result.max_end_to_end_request_delay = flow->Get_max_end_to_end_request_delay();
+		const Utils::Latency_Histogram& delay = flow->Get_end_to_end_request_delay_histogram();
+		result.end_to_end_request_delay_p50 = (double)delay.Value_at_percentile(50) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.end_to_end_request_delay_p90 = (double)delay.Value_at_percentile(90) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.end_to_end_request_delay_p99 = (double)delay.Value_at_percentile(99) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.end_to_end_request_delay_p99_9 = (double)delay.Value_at_percentile(99.9) / SIM_TIME_TO_MICROSECONDS_COEFF;
+		result.end_to_end_request_delay_p99_99 = (double)delay.Value_at_percentile(99.99) / SIM_TIME_TO_MICROSECONDS_COEFF;
+	}
+
+	void copy_ftl_result(mqsim_ftl_result& result)
+	{
+		using SSD_Components::Stats;
+		result.issued_flash_read_cmd = Stats::IssuedReadCMD;
+		result.issued_flash_interleaved_read_cmd = Stats::IssuedInterleaveReadCMD;
+		result.issued_flash_multiplane_read_cmd = Stats::IssuedMultiplaneReadCMD;
+		result.issued_flash_copyback_read_cmd = Stats::IssuedCopybackReadCMD;
+		result.issued_flash_multiplane_copyback_read_cmd = Stats::IssuedMultiplaneCopybackReadCMD;
+		result.issued_flash_program_cmd = Stats::IssuedProgramCMD;
+		result.issued_flash_interleaved_program_cmd = Stats::IssuedInterleaveProgramCMD;
+		result.issued_flash_multiplane_program_cmd = Stats::IssuedMultiplaneProgramCMD;
+		result.issued_flash_interleaved_multiplane_program_cmd = Stats::IssuedInterleaveMultiplaneProgramCMD;
+		result.issued_flash_copyback_program_cmd = Stats::IssuedCopybackProgramCMD;
+		result.issued_flash_multiplane_copyback_program_cmd = Stats::IssuedMultiplaneCopybackProgramCMD;
+		result.issued_flash_erase_cmd = Stats::IssuedEraseCMD;
+		result.issued_flash_interleaved_erase_cmd = Stats::IssuedInterleaveEraseCMD;
+		result.issued_flash_multiplane_erase_cmd = Stats::IssuedMultiplaneEraseCMD;
+		result.issued_flash_interleaved_multiplane_erase_cmd = Stats::IssuedInterleaveMultiplaneEraseCMD;
+		result.issued_flash_suspend_program_cmd = Stats::IssuedSuspendProgramCMD;
+		result.issued_flash_suspend_erase_cmd = Stats::IssuedSuspendEraseCMD;
+		result.issued_flash_read_cmd_for_mapping = Stats::Total_flash_reads_for_mapping;
+		result.issued_flash_program_cmd_for_mapping = Stats::Total_flash_writes_for_mapping;
+		result.cmt_hits = Stats::CMT_hits;
+		result.cmt_hits_for_read = Stats::readTR_CMT_hits;
+		result.cmt_hits_for_write = Stats::writeTR_CMT_hits;
+		result.cmt_misses = Stats::CMT_miss;
+		result.cmt_misses_for_read = Stats::readTR_CMT_miss;
+		result.cmt_misses_for_write = Stats::writeTR_CMT_miss;
+		result.total_cmt_queries = Stats::total_CMT_queries;
+		result.total_cmt_queries_for_reads = Stats::total_readTR_CMT_queries;
+		result.total_cmt_queries_for_writes = Stats::total_writeTR_CMT_queries;
+		result.total_gc_executions = Stats::Total_gc_executions;
+		result.total_page_movements_for_gc = Stats::Total_page_movements_for_gc;
+		result.total_wl_executions = Stats::Total_wl_executions;
+		result.total_page_movements_for_wl = Stats::Total_page_movements_for_wl;
+		result.issued_ifp_gemv_cmd = Stats::IssuedIFPGemvCMD;
+		result.total_ecc_retries = Stats::Total_ECC_retries;
+		result.total_ecc_failures = Stats::Total_ECC_failures;
+		result.total_ecc_uncorrectable = Stats::Total_ECC_uncorrectable;
+		result.total_read_reclaim_migrations = Stats::Total_read_reclaim_migrations;
+	}
+}
+
+extern "C" int mqsim_api_version(void)
+{
+	return MQSIM_API_VERSION;
+}
+
+extern "C" const char* mqsim_last_error(void)
+{
+	return last_error.c_str();
+}
+
+extern "C" int mqsim_run(const mqsim_run_config* config, mqsim_result* result)
+{
+	last_error.clear();
+	if (config == NULL || result == NULL) {
+		return fail("mqsim_run needs a configuration and a result structure");
+	}
+	if (config->flow_count == 0 || config->flow_count > MQSIM_MAX_FLOWS) {
+		return fail("A scenario needs between 1 and " + std::to_string(MQSIM_MAX_FLOWS) + " IO flows");
+	}
+	Cout_silencer silencer(config->quiet != 0);
+
+	//The device configuration is assembled as the XML tree of a configuration file and deserialized by the same code
+	rapidxml::xml_document<> doc;
+	std::vector<char> base_text;
+	rapidxml::xml_node<>* root = NULL;
+	if (config->device_config_xml != NULL) {
+		base_text.assign(config->device_config_xml, config->device_config_xml + strlen(config->device_config_xml) + 1);
+		try {
+			doc.parse<0>(base_text.data());
+		} catch (const rapidxml::parse_error& e) {
+			return fail(std::string("Error in the device configuration: ") + e.what());
+		}
+		root = doc.first_node("Execution_Parameter_Set");
+		if (root == NULL) {
+			return fail("The device configuration has no Execution_Parameter_Set");
+		}
+	} else {
+		root = child_node(doc, &doc, "Execution_Parameter_Set");
+	}
+	for (unsigned int i = 0; i < config->device_parameter_count; i++) {
+		if (!override_parameter(doc, root, config->device_parameters[i])) {
+			return MQSIM_ERROR;
+		}
+	}
+	Execution_Parameter_Set exec_params;
+	exec_params.XML_deserialize(root);
+
+	rapidxml::xml_document<> flow_doc;
+	std::vector<IO_Flow_Parameter_Set*> flows;
+	for (unsigned int i = 0; i < config->flow_count; i++) {
+		IO_Flow_Parameter_Set* flow = make_flow(flow_doc, config->flows[i]);
+		if (flow == NULL) {
+			delete_flows(flows);
+			return MQSIM_ERROR;
+		}
+		flows.push_back(flow);
+	}
+
+	auto start_time = std::chrono::steady_clock::now();
+	Simulator->Reset();
+	Simulator->Set_event_list_type(exec_params.SSD_Device_Configuration.Event_List);
+	exec_params.Host_Configuration.IO_Flow_Definitions = flows;
+
+	std::string path_stem = config->output_path_stem != NULL ? config->output_path_stem : "mqsim";
+	exec_params.SSD_Device_Configuration.Block_Snapshot_File_Path = path_stem + ".blocks.bin";
+	exec_params.Host_Configuration.Epoch_Metrics_File_Path = path_stem + ".epochs.csv";
+	exec_params.Host_Configuration.Input_file_path = path_stem;
+
+	memset(result, 0, sizeof(mqsim_result));
+	{
+		SSD_Device ssd(&exec_params.SSD_Device_Configuration, &exec_params.Host_Configuration.IO_Flow_Definitions);
+		//A restored checkpoint already holds the preconditioned device state
+		bool restore_checkpoint = exec_params.SSD_Device_Configuration.Checkpoint == Checkpoint_Mode_Type::RESTORE;
+		Host_System host(&exec_params.Host_Configuration, exec_params.SSD_Device_Configuration.Enabled_Preconditioning && !restore_checkpoint, ssd.Host_interface);
+		host.Attach_ssd_device(&ssd);
+		if (exec_params.SSD_Device_Configuration.Checkpoint == Checkpoint_Mode_Type::SAVE) {
+			host.Schedule_checkpoint(exec_params.SSD_Device_Configuration.Checkpoint_Phase, exec_params.SSD_Device_Configuration.Checkpoint_Time,
+				exec_params.SSD_Device_Configuration.Checkpoint_File_Path);
+		} else if (restore_checkpoint) {
+			host.Restore_checkpoint(exec_params.SSD_Device_Configuration.Checkpoint_File_Path);
+		}
+
+		Simulator->Start_simulation();
+		ssd.Finish_simulation();
+		host.Finish_simulation();
+
+		result->api_version = MQSIM_API_VERSION;
+		result->simulated_time = Simulator->Time();
+		result->executed_events = Simulator->Executed_event_count();
+		result->wall_time = std::chrono::duration<double>(std::chrono::steady_clock::now() - start_time).count();
+		copy_ftl_result(result->ftl);
+		std::vector<Host_Components::IO_Flow_Base*> io_flows = host.Get_io_flows();
+		result->flow_count = (unsigned int)io_flows.size();
+		for (unsigned int flow_id = 0; flow_id < io_flows.size() && flow_id < MQSIM_MAX_FLOWS; flow_id++) {
+			copy_flow_result(io_flows[flow_id], result->flows[flow_id]);
+		}
+
+		if (config->result_xml_path != NULL) {
+			Utils::XmlWriter xmlwriter;
+			xmlwriter.Open(config->result_xml_path);
+			std::string tmp("MQSim_Results");
+			xmlwriter.Write_open_tag(tmp);
+			host.Report_results_in_XML("", xmlwriter);
+			ssd.Report_results_in_XML("", xmlwriter);
+			xmlwriter.Write_close_tag();
+			xmlwriter.Close();
+		}
+	}
+
+	exec_params.Host_Configuration.IO_Flow_Definitions.clear();
+	delete_flows(flows);
+
+	return MQSIM_OK;
+}
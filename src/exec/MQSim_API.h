@@ -0,0 +1,121 @@
+#ifndef MQSIM_API_H
+#define MQSIM_API_H
+
+/*********************************************************************************************************
+* C API of the MQSim shared library (libmqsim.so, built with `make libmqsim`).
+*
+* One call runs one IO scenario in-process and returns the host and device counters as plain structures,
+* without writing configuration files, spawning ./mqsim or serializing a result XML.
+*
+* Parameters are given by the tag names of the XML configuration files. The device configuration starts
+* from an optional base configuration (the text of an SSD configuration file) whose tags are then
+* overridden; a flow is the list of tags of one <IO_Flow_Parameter_Set_Synthetic> or
+* <IO_Flow_Parameter_Set_Trace_Based> element. Values are parsed by the same code as the XML files.
+*
+* The simulator state is kept per thread, so calls from different threads run independent devices
+* concurrently. Within one thread, device parameters that are neither in the base configuration nor
+* overridden keep their values from the previous call of that thread (a new thread starts from the
+* defaults). While a quiet run is in progress, std::cout is silenced for all threads.
+* Configuration errors found by the API are returned as MQSIM_ERROR with a message from
+* mqsim_last_error(); errors detected inside the simulator still terminate the process like in ./mqsim.
+*********************************************************************************************************/
+
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+#define MQSIM_API_VERSION 1
+#define MQSIM_MAX_FLOWS 8
+#define MQSIM_FLOW_ID_LENGTH 64
+
+#define MQSIM_OK 0
+#define MQSIM_ERROR -1
+
+typedef enum mqsim_flow_type
+{
+	MQSIM_FLOW_SYNTHETIC = 0,
+	MQSIM_FLOW_TRACE_BASED = 1
+} mqsim_flow_type;
+
+typedef struct mqsim_parameter
+{
+	const char* section;//Host_Parameter_Set, Device_Parameter_Set or Flash_Parameter_Set; NULL to override the tag wherever it appears in the base configuration
+	const char* name;//XML tag name, e.g. Read_Reclaim_Threshold
+	const char* value;//XML tag text
+} mqsim_parameter;
+
+typedef struct mqsim_flow
+{
+	mqsim_flow_type type;
+	const mqsim_parameter* parameters;//The section of flow parameters is ignored
+	unsigned int parameter_count;
+} mqsim_flow;
+
+typedef struct mqsim_run_config
+{
+	const char* device_config_xml;//Text of an SSD configuration file (<Execution_Parameter_Set>); NULL to start from the current parameters of the calling thread
+	const mqsim_parameter* device_parameters;
+	unsigned int device_parameter_count;
+	const mqsim_flow* flows;
+	unsigned int flow_count;
+	const char* output_path_stem;//Stem of the side files (epoch metrics, block snapshots, response time logs); NULL for "mqsim"
+	const char* result_xml_path;//If not NULL, the result XML of ./mqsim is written as well
+	int quiet;//Nonzero to silence the progress messages of the simulator
+} mqsim_run_config;
+
+typedef struct mqsim_flow_result
+{
+	char id[MQSIM_FLOW_ID_LENGTH];
+	uint64_t request_count, read_request_count, write_request_count;
+	uint64_t serviced_request_count;
+	double iops, iops_read, iops_write;
+	double bytes_transferred, bytes_transferred_read, bytes_transferred_write;
+	double bandwidth, bandwidth_read, bandwidth_write;//bytes per second
+	//Latencies in microseconds
+	double device_response_time, min_device_response_time, max_device_response_time;
+	double device_response_time_p50, device_response_time_p90, device_response_time_p99, device_response_time_p99_9, device_response_time_p99_99;
+	double end_to_end_request_delay, min_end_to_end_request_delay, max_end_to_end_request_delay;
+	double end_to_end_request_delay_p50, end_to_end_request_delay_p90, end_to_end_request_delay_p99, end_to_end_request_delay_p99_9, end_to_end_request_delay_p99_99;
+} mqsim_flow_result;
+
+typedef struct mqsim_ftl_result
+{
+	uint64_t issued_flash_read_cmd, issued_flash_interleaved_read_cmd, issued_flash_multiplane_read_cmd;
+	uint64_t issued_flash_copyback_read_cmd, issued_flash_multiplane_copyback_read_cmd;
+	uint64_t issued_flash_program_cmd, issued_flash_interleaved_program_cmd, issued_flash_multiplane_program_cmd;
+	uint64_t issued_flash_interleaved_multiplane_program_cmd, issued_flash_copyback_program_cmd, issued_flash_multiplane_copyback_program_cmd;
+	uint64_t issued_flash_erase_cmd, issued_flash_interleaved_erase_cmd, issued_flash_multiplane_erase_cmd, issued_flash_interleaved_multiplane_erase_cmd;
+	uint64_t issued_flash_suspend_program_cmd, issued_flash_suspend_erase_cmd;
+	uint64_t issued_flash_read_cmd_for_mapping, issued_flash_program_cmd_for_mapping;
+	uint64_t cmt_hits, cmt_hits_for_read, cmt_hits_for_write;
+	uint64_t cmt_misses, cmt_misses_for_read, cmt_misses_for_write;
+	uint64_t total_cmt_queries, total_cmt_queries_for_reads, total_cmt_queries_for_writes;
+	uint64_t total_gc_executions, total_page_movements_for_gc;
+	uint64_t total_wl_executions, total_page_movements_for_wl;
+	uint64_t issued_ifp_gemv_cmd;
+	uint64_t total_ecc_retries, total_ecc_failures, total_ecc_uncorrectable;
+	uint64_t total_read_reclaim_migrations;
+} mqsim_ftl_result;
+
+typedef struct mqsim_result
+{
+	uint32_t api_version;//MQSIM_API_VERSION of the library that filled the result
+	uint64_t simulated_time;//nanoseconds
+	uint64_t executed_events;
+	double wall_time;//seconds
+	mqsim_ftl_result ftl;
+	unsigned int flow_count;
+	mqsim_flow_result flows[MQSIM_MAX_FLOWS];
+} mqsim_result;
+
+int mqsim_api_version(void);
+int mqsim_run(const mqsim_run_config* config, mqsim_result* result);
+const char* mqsim_last_error(void);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // !MQSIM_API_H
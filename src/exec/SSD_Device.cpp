@@ -17,7 +17,7 @@
 #include "../ssd/NVM_PHY_ONFI_NVDDR2.h"
 #include "../utils/Logical_Address_Partitioning_Unit.h"
 
-SSD_Device *SSD_Device::my_instance; //Used in static functions
+thread_local SSD_Device *SSD_Device::my_instance; //Used in static functions
 
 SSD_Device::SSD_Device(Device_Parameter_Set *parameters, std::vector<IO_Flow_Parameter_Set *> *io_flows) : MQSimEngine::Sim_Object("SSDDevice")
 {
@@ -188,6 +188,9 @@ SSD_Device::SSD_Device(Device_Parameter_Set *parameters, std::vector<IO_Flow_Par
 													  parameters->Flash_Parameters.Die_No_Per_Chip, parameters->Flash_Parameters.Plane_No_Per_Die,
 													  parameters->Flash_Parameters.Block_No_Per_Plane, parameters->Flash_Parameters.Page_No_Per_Block);
 		ftl->BlockManager = fbm;
+		if (parameters->Enable_Block_Snapshot) {
+			fbm->Enable_block_snapshots(parameters->Block_Snapshot_File_Path, parameters->Block_Snapshot_Period);
+		}
 
 		//Step 7: create Address_Mapping_Unit
 		SSD_Components::Address_Mapping_Unit_Base *amu;
@@ -320,6 +323,7 @@ SSD_Device::SSD_Device(Device_Parameter_Set *parameters, std::vector<IO_Flow_Par
 		static_cast<SSD_Components::NVM_PHY_ONFI_NVDDR2*>(device->PHY)->ecc_engine = ftl->ECC;
 		static_cast<SSD_Components::NVM_PHY_ONFI_NVDDR2*>(device->PHY)->block_manager_ref = fbm;
 		static_cast<SSD_Components::NVM_PHY_ONFI_NVDDR2*>(device->PHY)->gc_wl_unit_ref = gcwl;
+		static_cast<SSD_Components::NVM_PHY_ONFI_NVDDR2*>(device->PHY)->fast_forward_ref = ftl->Fast_Forward;
 
 		//Step 9: create Data_Cache_Manager
 		SSD_Components::Data_Cache_Manager_Base *dcm;
@@ -420,10 +424,55 @@ void SSD_Device::Perform_preconditioning(std::vector<Utils::Workload_Statistics
 	}
 }
 
+void SSD_Device::Save_checkpoint(Utils::Checkpoint_Writer &writer)
+{
+	if (Memory_Type != NVM::NVM_Type::FLASH)
+	{
+		PRINT_ERROR("Checkpoints are only supported for flash based devices")
+	}
+	writer.Write_tag("SSD_Device");
+	((SSD_Components::FTL *)this->Firmware)->Save_checkpoint(writer);
+	this->Cache_manager->Save_checkpoint(writer);
+	for (unsigned int channel_cntr = 0; channel_cntr < Channel_count; channel_cntr++)
+	{
+		for (unsigned int chip_cntr = 0; chip_cntr < Chip_no_per_channel; chip_cntr++)
+		{
+			((SSD_Components::ONFI_Channel_NVDDR2 *)Channels[channel_cntr])->Chips[chip_cntr]->Save_checkpoint(writer);
+		}
+	}
+}
+
+void SSD_Device::Load_checkpoint(Utils::Checkpoint_Reader &reader)
+{
+	if (Memory_Type != NVM::NVM_Type::FLASH)
+	{
+		PRINT_ERROR("Checkpoints are only supported for flash based devices")
+	}
+	reader.Expect_tag("SSD_Device");
+	((SSD_Components::FTL *)this->Firmware)->Load_checkpoint(reader);
+	this->Cache_manager->Load_checkpoint(reader);
+	for (unsigned int channel_cntr = 0; channel_cntr < Channel_count; channel_cntr++)
+	{
+		for (unsigned int chip_cntr = 0; chip_cntr < Chip_no_per_channel; chip_cntr++)
+		{
+			((SSD_Components::ONFI_Channel_NVDDR2 *)Channels[channel_cntr])->Chips[chip_cntr]->Load_checkpoint(reader);
+		}
+	}
+}
+
 void SSD_Device::Start_simulation()
 {
 }
 
+void SSD_Device::Finish_simulation()
+{
+	//End-of-run block snapshot (no-op unless Enable_Block_Snapshot is set)
+	if (Memory_Type == NVM::NVM_Type::FLASH)
+	{
+		((SSD_Components::FTL *)this->Firmware)->BlockManager->Write_block_snapshot();
+	}
+}
+
 void SSD_Device::Validate_simulation_config()
 {
 }
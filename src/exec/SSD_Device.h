@@ -43,7 +43,10 @@ public:
 
 	void Attach_to_host(Host_Components::PCIe_Switch* pcie_switch);
 	void Perform_preconditioning(std::vector<Utils::Workload_Statistics*> workload_stats);
+	void Save_checkpoint(Utils::Checkpoint_Writer& writer);//Only valid when no request is in flight inside the device
+	void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 	void Start_simulation();
+	void Finish_simulation();//Called once the simulator has executed its last event, before the results are reported
 	void Validate_simulation_config();
 	void Execute_simulator_event(MQSimEngine::Sim_Event* event);
 	static LPA_type Convert_host_logical_address_to_device_address(LHA_type lha);
@@ -53,7 +56,7 @@ public:
 	unsigned int Chip_no_per_channel;
 
 private:
-	static SSD_Device * my_instance;//Used in static functions
+	static thread_local SSD_Device * my_instance;//Used in static functions
 };
 
 #endif //!SSD_DEVICE_H
@@ -0,0 +1,33 @@
+#ifndef BINARY_TRACE_DEFINITION_H
+#define BINARY_TRACE_DEFINITION_H
+
+#include <cstdint>
+
+//Fixed-record binary trace format: one Binary_Trace_Header followed by Record_count Binary_Trace_Record entries.
+//All fields are little-endian. Request types use the same codes as the ASCII format (0 = write, 1 = read, 2 = IFP GEMV)
+//and arrival times are in nanoseconds, so an ASCII trace and its binary conversion produce identical simulations.
+#define BinaryTraceMagic "MQSIMTRC"
+#define BinaryTraceMagicLength 8
+#define BinaryTraceVersion 1
+
+#pragma pack(push, 1)
+struct Binary_Trace_Header
+{
+	char Magic[BinaryTraceMagicLength];
+	uint32_t Version;
+	uint32_t Record_size;//sizeof(Binary_Trace_Record), checked by the reader
+	uint64_t Record_count;
+	uint64_t Reserved;
+};
+
+struct Binary_Trace_Record
+{
+	uint64_t Arrival_time;
+	uint64_t Start_LBA;
+	uint32_t LBA_count;
+	uint16_t Device;
+	uint16_t Type;
+};
+#pragma pack(pop)
+
+#endif // !BINARY_TRACE_DEFINITION_H
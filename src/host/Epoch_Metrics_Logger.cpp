@@ -0,0 +1,195 @@
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <iomanip>
+#include "../sim/Engine.h"
+#include "../ssd/Stats.h"
+#include "Epoch_Metrics_Logger.h"
+
+namespace Host_Components
+{
+	Epoch_Metrics_Logger::Epoch_Metrics_Logger(const std::string& file_path, sim_time_type epoch_length) :
+		file_path(file_path), epoch_length(epoch_length), epoch_start(0), skipped_time(0), finished(false)
+	{
+		if (epoch_length == 0) {
+			PRINT_ERROR("The epoch length of the epoch metrics log must be greater than zero!")
+		}
+		memset(counters, 0, sizeof(counters));
+		memset(device_counters, 0, sizeof(device_counters));
+	}
+
+	Epoch_Metrics_Logger::~Epoch_Metrics_Logger()
+	{
+		file.close();
+	}
+
+	void Epoch_Metrics_Logger::Start_simulation()
+	{
+		file.open(file_path, std::ofstream::out | std::ofstream::trunc);
+		if (!file) {
+			PRINT_ERROR("Cannot open the epoch metrics file " << file_path)
+		}
+		file << std::fixed << std::setprecision(3);
+		file << "Epoch_Start(us),Epoch_End(us),Request_Count,Read_Request_Count,Write_Request_Count,"
+			<< "Bytes_Transferred_Read,Bytes_Transferred_Write,IOPS,Bandwidth,"
+			<< "Device_Response_Time(us),Device_Response_Time_P50(us),Device_Response_Time_P99(us),Device_Response_Time_P999(us),Max_Device_Response_Time(us),"
+			<< "Flash_Read_CMDs,ECC_Retries,ECC_Uncorrectable,Read_Reclaim_Migrations,GC_Executions,GC_Page_Movements,Fast_Forwarded_Time(us)" << std::endl;
+
+		epoch_start = (Simulator->Time() / epoch_length) * epoch_length;//Not zero if the simulation resumes from a checkpoint
+		skipped_time = 0;
+		finished = false;
+		memset(counters, 0, sizeof(counters));
+		read_device_counters(device_counters);
+		response_times.clear();
+	}
+
+	void Epoch_Metrics_Logger::Record_request(Host_IO_Request_Type type, unsigned int bytes, sim_time_type device_response_time)
+	{
+		advance(Simulator->Time());
+
+		counters[EPOCH_REQUESTS]++;
+		if (type == Host_IO_Request_Type::WRITE) {
+			counters[EPOCH_WRITE_REQUESTS]++;
+			counters[EPOCH_BYTES_WRITTEN] += bytes;
+		} else {
+			counters[EPOCH_READ_REQUESTS]++;
+			counters[EPOCH_BYTES_READ] += bytes;
+		}
+		counters[EPOCH_DEVICE_RESPONSE_TIME] += device_response_time;
+		response_times.push_back(device_response_time);
+	}
+
+	void Epoch_Metrics_Logger::Begin_skip()
+	{
+		advance(Simulator->Time());
+		sample_device_counters();
+	}
+
+	void Epoch_Metrics_Logger::Record_skip(sim_time_type skip_length, uint64_t requests, uint64_t read_requests, uint64_t write_requests,
+		uint64_t bytes_read, uint64_t bytes_written, sim_time_type device_response_time)
+	{
+		if (skip_length == 0) {
+			return;
+		}
+
+		uint64_t totals[EPOCH_COUNTER_COUNT];
+		uint64_t now_counters[EPOCH_COUNTER_COUNT];
+		read_device_counters(now_counters);
+		for (int i = EPOCH_FLASH_READ_CMDS; i < EPOCH_COUNTER_COUNT; i++) {
+			totals[i] = now_counters[i] - device_counters[i];
+			device_counters[i] = now_counters[i];
+		}
+		totals[EPOCH_REQUESTS] = requests;
+		totals[EPOCH_READ_REQUESTS] = read_requests;
+		totals[EPOCH_WRITE_REQUESTS] = write_requests;
+		totals[EPOCH_BYTES_READ] = bytes_read;
+		totals[EPOCH_BYTES_WRITTEN] = bytes_written;
+		totals[EPOCH_DEVICE_RESPONSE_TIME] = device_response_time;
+
+		//Each epoch gets the difference of the rounded cumulative shares at its ends, so the column sums stay exact
+		sim_time_type skip_start = Simulator->Time(), skip_end = skip_start + skip_length;
+		uint64_t assigned[EPOCH_COUNTER_COUNT] = {};
+		sim_time_type segment_start = skip_start;
+		while (segment_start < skip_end) {
+			sim_time_type segment_end = std::min(epoch_start + epoch_length, skip_end);
+			double share = double(segment_end - skip_start) / double(skip_length);
+			for (int i = 0; i < EPOCH_COUNTER_COUNT; i++) {
+				uint64_t cumulative = (segment_end == skip_end ? totals[i] : (uint64_t)std::floor(share * double(totals[i])));
+				counters[i] += cumulative - assigned[i];
+				assigned[i] = cumulative;
+			}
+			skipped_time += segment_end - segment_start;
+			if (segment_end == epoch_start + epoch_length) {
+				write_epoch(segment_end);
+			}
+			segment_start = segment_end;
+		}
+	}
+
+	void Epoch_Metrics_Logger::Finish()
+	{
+		if (finished || !file.is_open()) {
+			return;
+		}
+		//Requests in flight at a fast-forward may complete before the start of the epoch that the skip ended in
+		sim_time_type end_time = std::max(Simulator->Time(), epoch_start);
+		advance(end_time);
+		sample_device_counters();
+		if (end_time > epoch_start || counters[EPOCH_REQUESTS] > 0) {
+			write_epoch(end_time);
+		}
+		finished = true;
+	}
+
+	void Epoch_Metrics_Logger::read_device_counters(uint64_t* values)
+	{
+		values[EPOCH_FLASH_READ_CMDS] = SSD_Components::Stats::IssuedReadCMD + SSD_Components::Stats::IssuedInterleaveReadCMD
+			+ SSD_Components::Stats::IssuedMultiplaneReadCMD + SSD_Components::Stats::IssuedIFPGemvCMD;
+		values[EPOCH_ECC_RETRIES] = SSD_Components::Stats::Total_ECC_retries;
+		values[EPOCH_ECC_UNCORRECTABLE] = SSD_Components::Stats::Total_ECC_uncorrectable;
+		values[EPOCH_READ_RECLAIM_MIGRATIONS] = SSD_Components::Stats::Total_read_reclaim_migrations;
+		values[EPOCH_GC_EXECUTIONS] = SSD_Components::Stats::Total_gc_executions;
+		values[EPOCH_GC_PAGE_MOVEMENTS] = SSD_Components::Stats::Total_page_movements_for_gc;
+	}
+
+	void Epoch_Metrics_Logger::sample_device_counters()
+	{
+		uint64_t now_counters[EPOCH_COUNTER_COUNT];
+		read_device_counters(now_counters);
+		for (int i = EPOCH_FLASH_READ_CMDS; i < EPOCH_COUNTER_COUNT; i++) {
+			counters[i] += now_counters[i] - device_counters[i];
+			device_counters[i] = now_counters[i];
+		}
+	}
+
+	//Closes every epoch that ends at or before time; device activity since the last sample goes to the first of them
+	void Epoch_Metrics_Logger::advance(sim_time_type time)
+	{
+		if (time < epoch_start + epoch_length) {
+			return;
+		}
+		sample_device_counters();
+		while (time >= epoch_start + epoch_length) {
+			write_epoch(epoch_start + epoch_length);
+		}
+	}
+
+	void Epoch_Metrics_Logger::write_epoch(sim_time_type epoch_end)
+	{
+		double duration = double(epoch_end - epoch_start) / SIM_TIME_TO_SECONDS_COEFF;
+		uint64_t bytes = counters[EPOCH_BYTES_READ] + counters[EPOCH_BYTES_WRITTEN];
+
+		file << double(epoch_start) / SIM_TIME_TO_MICROSECONDS_COEFF << "," << double(epoch_end) / SIM_TIME_TO_MICROSECONDS_COEFF << ","
+			<< counters[EPOCH_REQUESTS] << "," << counters[EPOCH_READ_REQUESTS] << "," << counters[EPOCH_WRITE_REQUESTS] << ","
+			<< counters[EPOCH_BYTES_READ] << "," << counters[EPOCH_BYTES_WRITTEN] << ","
+			<< (duration > 0 ? counters[EPOCH_REQUESTS] / duration : 0) << "," << (duration > 0 ? bytes / duration : 0) << ",";
+		if (counters[EPOCH_REQUESTS] > 0) {
+			file << double(counters[EPOCH_DEVICE_RESPONSE_TIME]) / counters[EPOCH_REQUESTS] / SIM_TIME_TO_MICROSECONDS_COEFF;
+		}
+		file << ",";
+		//Percentiles only cover requests simulated in detail; they are left empty for an epoch without any
+		if (response_times.size() > 0) {
+			file << percentile(0.5) << "," << percentile(0.99) << "," << percentile(0.999) << ","
+				<< double(*std::max_element(response_times.begin(), response_times.end())) / SIM_TIME_TO_MICROSECONDS_COEFF << ",";
+		} else {
+			file << ",,,,";
+		}
+		file << counters[EPOCH_FLASH_READ_CMDS] << "," << counters[EPOCH_ECC_RETRIES] << "," << counters[EPOCH_ECC_UNCORRECTABLE] << ","
+			<< counters[EPOCH_READ_RECLAIM_MIGRATIONS] << "," << counters[EPOCH_GC_EXECUTIONS] << "," << counters[EPOCH_GC_PAGE_MOVEMENTS] << ","
+			<< double(skipped_time) / SIM_TIME_TO_MICROSECONDS_COEFF << std::endl;
+
+		epoch_start = epoch_end;
+		skipped_time = 0;
+		memset(counters, 0, sizeof(counters));
+		response_times.clear();
+	}
+
+	//Nearest-rank percentile of the current epoch's response times, in microseconds
+	double Epoch_Metrics_Logger::percentile(double p)
+	{
+		size_t rank = (size_t)std::ceil(p * response_times.size());
+		size_t index = (rank > 0 ? rank - 1 : 0);
+		std::nth_element(response_times.begin(), response_times.begin() + index, response_times.end());
+		return double(response_times[index]) / SIM_TIME_TO_MICROSECONDS_COEFF;
+	}
+}
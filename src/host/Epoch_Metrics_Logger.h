@@ -0,0 +1,62 @@
+#ifndef EPOCH_METRICS_LOGGER_H
+#define EPOCH_METRICS_LOGGER_H
+
+#include <string>
+#include <fstream>
+#include <vector>
+#include "../sim/Sim_Defs.h"
+#include "Host_IO_Request.h"
+
+namespace Host_Components
+{
+	enum Epoch_Counter
+	{
+		EPOCH_REQUESTS, EPOCH_READ_REQUESTS, EPOCH_WRITE_REQUESTS,
+		EPOCH_BYTES_READ, EPOCH_BYTES_WRITTEN, EPOCH_DEVICE_RESPONSE_TIME,
+		EPOCH_FLASH_READ_CMDS, EPOCH_ECC_RETRIES, EPOCH_ECC_UNCORRECTABLE,
+		EPOCH_READ_RECLAIM_MIGRATIONS, EPOCH_GC_EXECUTIONS, EPOCH_GC_PAGE_MOVEMENTS,
+		EPOCH_COUNTER_COUNT
+	};//Counters from EPOCH_FLASH_READ_CMDS on are sampled from SSD_Components::Stats
+
+	/*
+	* Streams host and device metrics of all IO flows as one CSV row per fixed-length epoch, so a
+	* single long run yields the bandwidth/latency-vs-time curve. Like the response time log, epochs
+	* are closed lazily by the first request completion after their end, and device counters are
+	* sampled at that point. Rounds skipped by fast-forward are spread evenly over the time they span.
+	*/
+	class Epoch_Metrics_Logger
+	{
+	public:
+		Epoch_Metrics_Logger(const std::string& file_path, sim_time_type epoch_length);
+		~Epoch_Metrics_Logger();
+		void Start_simulation();
+		void Record_request(Host_IO_Request_Type type, unsigned int bytes, sim_time_type device_response_time);
+
+		//Called right before fast-forward adds the skipped rounds' device counters
+		void Begin_skip();
+		//Spreads the skipped rounds' host totals and the device counters added since Begin_skip over [Now, Now + skip_length)
+		void Record_skip(sim_time_type skip_length, uint64_t requests, uint64_t read_requests, uint64_t write_requests,
+			uint64_t bytes_read, uint64_t bytes_written, sim_time_type device_response_time);
+
+		//Writes the last, possibly partial, epoch
+		void Finish();
+	private:
+		std::string file_path;
+		std::ofstream file;
+		sim_time_type epoch_length;
+		sim_time_type epoch_start;
+		uint64_t counters[EPOCH_COUNTER_COUNT];
+		uint64_t device_counters[EPOCH_COUNTER_COUNT];//Cumulative Stats values at the last sample
+		sim_time_type skipped_time;//Part of the current epoch covered by fast-forwarded rounds
+		std::vector<sim_time_type> response_times;//Response times of the requests completed in the current epoch
+		bool finished;
+
+		void read_device_counters(uint64_t* values);
+		void sample_device_counters();
+		void advance(sim_time_type time);
+		void write_epoch(sim_time_type epoch_end);
+		double percentile(double p);
+	};
+}
+
+#endif // !EPOCH_METRICS_LOGGER_H
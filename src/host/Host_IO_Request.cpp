@@ -0,0 +1,17 @@
+#include "Host_IO_Request.h"
+#include "../utils/Object_Pool.h"
+
+namespace Host_Components
+{
+	static thread_local Utils::Object_Pool host_io_request_pool("Host_IO_Request", sizeof(Host_IO_Request));
+
+	void* Host_IO_Request::operator new(size_t size)
+	{
+		return host_io_request_pool.Allocate(size);
+	}
+
+	void Host_IO_Request::operator delete(void* request)
+	{
+		host_io_request_pool.Release(request);
+	}
+}
@@ -1,6 +1,7 @@
 #ifndef HOST_IO_REQUEST_H
 #define HOST_IO_REQUEST_H
 
+#include <cstddef>
 #include "../ssd/SSD_Defs.h"
 
 namespace Host_Components
@@ -16,6 +17,10 @@ namespace Host_Components
 		Host_IO_Request_Type Type;
 		uint16_t IO_queue_info;
 		uint16_t Source_flow_id;//Only used in SATA host interface
+
+		//Host requests are allocated from a pool of the simulation thread (see Utils::Object_Pool)
+		static void* operator new(size_t size);
+		static void operator delete(void* request);
 	};
 }
 
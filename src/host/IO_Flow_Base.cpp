@@ -21,7 +21,7 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 																												STAT_min_request_delay(MAXIMUM_TIME), STAT_min_request_delay_read(MAXIMUM_TIME), STAT_min_request_delay_write(MAXIMUM_TIME),
 																												STAT_max_request_delay(0), STAT_max_request_delay_read(0), STAT_max_request_delay_write(0),
 																												STAT_transferred_bytes_total(0), STAT_transferred_bytes_read(0), STAT_transferred_bytes_write(0), progress(0), next_progress_step(0),
-																												enabled_logging(enabled_logging), logging_period(logging_period), logging_file_path(logging_file_path)
+																												enabled_logging(enabled_logging), logging_period(logging_period), logging_file_path(logging_file_path), epoch_metrics(NULL)
 {
 	Host_IO_Request *t = NULL;
 
@@ -158,6 +158,8 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 		STAT_sum_device_response_time_short_term += device_response_time;
 		STAT_sum_request_delay += request_delay;
 		STAT_sum_request_delay_short_term += request_delay;
+		STAT_device_response_time_histogram.Record(device_response_time);
+		STAT_request_delay_histogram.Record(request_delay);
 		if (device_response_time > STAT_max_device_response_time) {
 			STAT_max_device_response_time = device_response_time;
 		}
@@ -207,6 +209,9 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 			}
 			STAT_transferred_bytes_write += request->LBA_count * SECTOR_SIZE_IN_BYTE;
 		}
+		if (epoch_metrics != NULL) {
+			epoch_metrics->Record_request(request->Type, request->LBA_count * SECTOR_SIZE_IN_BYTE, device_response_time);
+		}
 
 		delete request;
 
@@ -259,6 +264,8 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 		STAT_sum_device_response_time_short_term += device_response_time;
 		STAT_sum_request_delay += request_delay;
 		STAT_sum_request_delay_short_term += request_delay;
+		STAT_device_response_time_histogram.Record(device_response_time);
+		STAT_request_delay_histogram.Record(request_delay);
 		if (device_response_time > STAT_max_device_response_time) {
 			STAT_max_device_response_time = device_response_time;
 		}
@@ -308,6 +315,9 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 			}
 			STAT_transferred_bytes_write += request->LBA_count * SECTOR_SIZE_IN_BYTE;
 		}
+		if (epoch_metrics != NULL) {
+			epoch_metrics->Record_request(request->Type, request->LBA_count * SECTOR_SIZE_IN_BYTE, device_response_time);
+		}
 
 		delete request;
 
@@ -373,6 +383,11 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 		}
 	}
 	
+	void IO_Flow_Base::Attach_epoch_metrics_logger(Epoch_Metrics_Logger* logger)
+	{
+		epoch_metrics = logger;
+	}
+
 	Submission_Queue_Entry* IO_Flow_Base::NVMe_read_sqe(uint64_t address)
 	{
 		Submission_Queue_Entry* sqe = new Submission_Queue_Entry;
@@ -509,6 +524,41 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 		return (uint32_t)(STAT_max_request_delay / SIM_TIME_TO_MICROSECONDS_COEFF);
 	}
 
+	uint32_t IO_Flow_Base::Get_generated_read_request_count()
+	{
+		return STAT_generated_read_request_count;
+	}
+
+	uint32_t IO_Flow_Base::Get_generated_write_request_count()
+	{
+		return STAT_generated_write_request_count;
+	}
+
+	sim_time_type IO_Flow_Base::Get_transferred_bytes_total()
+	{
+		return STAT_transferred_bytes_total;
+	}
+
+	sim_time_type IO_Flow_Base::Get_transferred_bytes_read()
+	{
+		return STAT_transferred_bytes_read;
+	}
+
+	sim_time_type IO_Flow_Base::Get_transferred_bytes_write()
+	{
+		return STAT_transferred_bytes_write;
+	}
+
+	const Utils::Latency_Histogram& IO_Flow_Base::Get_device_response_time_histogram()
+	{
+		return STAT_device_response_time_histogram;
+	}
+
+	const Utils::Latency_Histogram& IO_Flow_Base::Get_end_to_end_request_delay_histogram()
+	{
+		return STAT_request_delay_histogram;
+	}
+
 	uint32_t IO_Flow_Base::Get_device_response_time_short_term()
 	{
 		if (STAT_serviced_request_count_short_term == 0) {
@@ -598,6 +648,8 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 		val = std::to_string(Get_max_device_response_time());
 		xmlwriter.Write_attribute_string(attr, val);
 
+		STAT_device_response_time_histogram.Report_percentiles_in_XML("Device_Response_Time", xmlwriter);
+
 		attr = "End_to_End_Request_Delay";
 		val = std::to_string(Get_end_to_end_request_delay());
 		xmlwriter.Write_attribute_string(attr, val);
@@ -610,6 +662,8 @@ IO_Flow_Base::IO_Flow_Base(const sim_object_id_type &name, uint16_t flow_id, LHA
 		val = std::to_string(Get_max_end_to_end_request_delay());
 		xmlwriter.Write_attribute_string(attr, val);
 
+		STAT_request_delay_histogram.Report_percentiles_in_XML("End_to_End_Request_Delay", xmlwriter);
+
 		xmlwriter.Write_close_tag();
 	}
 }
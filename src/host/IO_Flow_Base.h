@@ -15,7 +15,9 @@
 #include "Host_IO_Request.h"
 #include "PCIe_Root_Complex.h"
 #include "SATA_HBA.h"
+#include "Epoch_Metrics_Logger.h"
 #include "../utils/Workload_Statistics.h"
+#include "../utils/Latency_Histogram.h"
 
 namespace Host_Components
 {
@@ -65,7 +67,15 @@ namespace Host_Components
 		uint32_t Get_end_to_end_request_delay();//in microseconds
 		uint32_t Get_min_end_to_end_request_delay();//in microseconds
 		uint32_t Get_max_end_to_end_request_delay();//in microseconds
+		uint32_t Get_generated_read_request_count();
+		uint32_t Get_generated_write_request_count();
+		sim_time_type Get_transferred_bytes_total();
+		sim_time_type Get_transferred_bytes_read();
+		sim_time_type Get_transferred_bytes_write();
+		const Utils::Latency_Histogram& Get_device_response_time_histogram();
+		const Utils::Latency_Histogram& Get_end_to_end_request_delay_histogram();
 		void Report_results_in_XML(std::string name_prefix, Utils::XmlWriter& xmlwriter);
+		void Attach_epoch_metrics_logger(Epoch_Metrics_Logger* logger);
 		virtual void Get_statistics(Utils::Workload_Statistics& stats, LPA_type(*Convert_host_logical_address_to_device_address)(LHA_type lha),
 			page_status_type(*Find_NVM_subunit_access_bitmap)(LHA_type lha)) = 0;
 	protected:
@@ -103,6 +113,7 @@ namespace Host_Components
 		sim_time_type STAT_min_request_delay, STAT_min_request_delay_read, STAT_min_request_delay_write;
 		sim_time_type STAT_max_request_delay, STAT_max_request_delay_read, STAT_max_request_delay_write;
 		sim_time_type STAT_transferred_bytes_total, STAT_transferred_bytes_read, STAT_transferred_bytes_write;
+		Utils::Latency_Histogram STAT_device_response_time_histogram, STAT_request_delay_histogram;
 		int progress;
 		int next_progress_step = 0;
 
@@ -117,6 +128,7 @@ namespace Host_Components
 		sim_time_type STAT_sum_device_response_time_short_term, STAT_sum_request_delay_short_term;
 		unsigned int STAT_serviced_request_count_short_term;
 
+		Epoch_Metrics_Logger* epoch_metrics;//Shared by all flows of the host, NULL if epoch metrics are disabled
 	};
 }
 
@@ -1,4 +1,6 @@
+#include <algorithm>
 #include "IO_Flow_Trace_Based.h"
+#include "../ssd/Fast_Forward_Unit.h"
 #include "../utils/StringTools.h"
 #include "ASCII_Trace_Definition.h"
 #include "../utils/DistributionTypes.h"
@@ -7,11 +9,16 @@ namespace Host_Components
 {
 IO_Flow_Trace_Based::IO_Flow_Trace_Based(const sim_object_id_type &name, uint16_t flow_id, LHA_type start_lsa_on_device, LHA_type end_lsa_on_device, uint16_t io_queue_id,
 										 uint16_t nvme_submission_queue_size, uint16_t nvme_completion_queue_size, IO_Flow_Priority_Class::Priority priority_class, double initial_occupancy_ratio,
-										 std::string trace_file_path, Trace_Time_Unit time_unit, unsigned int total_replay_count, unsigned int percentage_to_be_simulated,
+										 std::string trace_file_path, Trace_Time_Unit time_unit, unsigned int total_replay_count, unsigned int percentage_to_be_simulated, bool replay_drain,
+										 bool fast_forward, unsigned int fast_forward_stable_rounds, double fast_forward_tolerance,
 										 HostInterface_Types SSD_device_type, PCIe_Root_Complex *pcie_root_complex, SATA_HBA *sata_hba,
 										 bool enabled_logging, sim_time_type logging_period, std::string logging_file_path) : IO_Flow_Base(name, flow_id, start_lsa_on_device, end_lsa_on_device, io_queue_id, nvme_submission_queue_size, nvme_completion_queue_size, priority_class, 0, initial_occupancy_ratio, 0, SSD_device_type, pcie_root_complex, sata_hba, enabled_logging, logging_period, logging_file_path),
 																															  trace_file_path(trace_file_path), time_unit(time_unit), total_replay_no(total_replay_count), percentage_to_be_simulated(percentage_to_be_simulated),
-																															  total_requests_in_file(0), time_offset(0)
+																															  total_requests_in_file(0), has_current_record(false), current_record_index(0), time_offset(0), replay_counter(0),
+																															  replay_drain(replay_drain), waiting_for_drain(false), next_request_event(NULL),
+																												  restore_position(false), restored_trace_length(0), restored_generated_request_count(0), restored_record_index(0),
+																															  fast_forward(fast_forward), fast_forward_stable_rounds(fast_forward_stable_rounds), fast_forward_tolerance(fast_forward_tolerance),
+																															  fast_forward_unit(NULL), has_last_round(false), stable_rounds(0), round_close_pending(false)
 {
 	if (percentage_to_be_simulated > 100)
 	{
@@ -26,32 +33,25 @@ IO_Flow_Trace_Based::~IO_Flow_Trace_Based()
 
 Host_IO_Request *IO_Flow_Trace_Based::Generate_next_request()
 {
-	if (current_trace_line.size() == 0 || STAT_generated_request_count >= total_requests_to_be_generated)
+	if (!has_current_record || STAT_generated_request_count >= total_requests_to_be_generated)
 	{
 		return NULL;
 	}
 
 	Host_IO_Request *request = new Host_IO_Request;
-	if (current_trace_line[ASCIITraceTypeColumn].compare(ASCIITraceWriteCode) == 0)
+	request->Type = current_record.Type;
+	if (request->Type == Host_IO_Request_Type::WRITE)
 	{
-		request->Type = Host_IO_Request_Type::WRITE;
 		STAT_generated_write_request_count++;
 	}
-	else if (current_trace_line[ASCIITraceTypeColumn].compare(ASCIITraceGemvCode) == 0)
-	{
-		request->Type = Host_IO_Request_Type::IFP_GEMV;
-		STAT_generated_read_request_count++;
-	}
 	else
 	{
-		request->Type = Host_IO_Request_Type::READ;
 		STAT_generated_read_request_count++;
 	}
 
-	char *pEnd;
-	request->LBA_count = std::strtoul(current_trace_line[ASCIITraceSizeColumn].c_str(), &pEnd, 0);
+	request->LBA_count = current_record.LBA_count;
 
-	request->Start_LBA = std::strtoull(current_trace_line[ASCIITraceAddressColumn].c_str(), &pEnd, 0);
+	request->Start_LBA = current_record.Start_LBA;
 	if (request->Start_LBA <= (end_lsa_on_device - start_lsa_on_device))
 	{
 		request->Start_LBA += start_lsa_on_device;
@@ -61,7 +61,7 @@ Host_IO_Request *IO_Flow_Trace_Based::Generate_next_request()
 		request->Start_LBA = start_lsa_on_device + request->Start_LBA % (end_lsa_on_device - start_lsa_on_device);
 	}
 
-	request->Arrival_time = time_offset + Simulator->Time();
+	request->Arrival_time = Simulator->Time();
 	STAT_generated_request_count++;
 
 	return request;
@@ -70,48 +70,47 @@ Host_IO_Request *IO_Flow_Trace_Based::Generate_next_request()
 void IO_Flow_Trace_Based::NVMe_consume_io_request(Completion_Queue_Entry *io_request)
 {
 	IO_Flow_Base::NVMe_consume_io_request(io_request);
+	//Checked before the completion queue head is written back, which is the only device access left at a drain point
+	if ((waiting_for_drain || round_close_pending) && Is_idle())
+	{
+		handle_drain_point();
+	}
 	IO_Flow_Base::NVMe_update_and_submit_completion_queue_tail();
 }
 
 void IO_Flow_Trace_Based::SATA_consume_io_request(Host_IO_Request *io_request)
 {
 	IO_Flow_Base::SATA_consume_io_request(io_request);
+	if ((waiting_for_drain || round_close_pending) && Is_idle())
+	{
+		handle_drain_point();
+	}
 }
 
 void IO_Flow_Trace_Based::Start_simulation()
 {
 	IO_Flow_Base::Start_simulation();
-	std::string trace_line;
-	char *pEnd;
 
-	trace_file.open(trace_file_path, std::ios::in);
-	if (!trace_file.is_open())
+	if (!trace_reader.Open(trace_file_path))
 	{
 		PRINT_ERROR("Error while opening input trace file: " << trace_file_path)
 	}
 	PRINT_MESSAGE("Investigating input trace file: " << trace_file_path);
 
+	Trace_Record record;
 	sim_time_type last_request_arrival_time = 0;
-	while (std::getline(trace_file, trace_line))
+	while (trace_reader.Read_next(record))
 	{
-		Utils::Helper_Functions::Remove_cr(trace_line);
-		current_trace_line.clear();
-		Utils::Helper_Functions::Tokenize(trace_line, ASCIILineDelimiter, current_trace_line);
-		if (current_trace_line.size() != ASCIIItemsPerLine)
-		{
-			break;
-		}
 		total_requests_in_file++;
 		sim_time_type prev_time = last_request_arrival_time;
-		last_request_arrival_time = std::strtoll(current_trace_line[ASCIITraceTimeColumn].c_str(), &pEnd, 10);
+		last_request_arrival_time = record.Arrival_time;
 		if (last_request_arrival_time < prev_time)
 		{
 			PRINT_ERROR("Unexpected request arrival time: " << last_request_arrival_time << "\nMQSim expects request arrival times to be monotonically increasing in the input trace!")
 		}
 	}
 
-	trace_file.close();
-	PRINT_MESSAGE("Trace file: " << trace_file_path << " seems healthy");
+	PRINT_MESSAGE("Trace file: " << trace_file_path << " seems healthy" << (trace_reader.Is_binary() ? " (binary format)" : trace_reader.Is_manifest() ? " (manifest)" : ""));
 
 	if (total_replay_no == 1)
 	{
@@ -122,20 +121,272 @@ void IO_Flow_Trace_Based::Start_simulation()
 		total_requests_to_be_generated = total_requests_in_file * total_replay_no;
 	}
 
-	trace_file.open(trace_file_path);
-	current_trace_line.clear();
-	std::getline(trace_file, trace_line);
-	Utils::Helper_Functions::Remove_cr(trace_line);
-	Utils::Helper_Functions::Tokenize(trace_line, ASCIILineDelimiter, current_trace_line);
-	Simulator->Register_sim_event(std::strtoll(current_trace_line[ASCIITraceTimeColumn].c_str(), &pEnd, 10), this);
+	trace_reader.Rewind();
+	has_current_record = trace_reader.Read_next(current_record);
+	current_record_index = 0;
+	if (restore_position)
+	{
+		//The requests that were generated before the checkpoint are not generated again
+		if (restored_trace_length != total_requests_in_file || restored_generated_request_count > total_requests_to_be_generated)
+		{
+			PRINT_ERROR("The checkpoint does not match the trace file of " << ID() << ": " << trace_file_path)
+		}
+		total_requests_to_be_generated -= restored_generated_request_count;
+		while (has_current_record && current_record_index < restored_record_index)
+		{
+			has_current_record = trace_reader.Read_next(current_record);
+			current_record_index++;
+		}
+		if (has_current_record && total_requests_to_be_generated > 0)
+		{
+			next_request_event = Simulator->Register_sim_event(time_offset + current_record.Arrival_time, this);
+		}
+	}
+	else if (has_current_record)
+	{
+		next_request_event = Simulator->Register_sim_event(current_record.Arrival_time, this);
+	}
+
+	if (fast_forward_unit != NULL)
+	{
+		fast_forward_unit->Start_recording();
+		round_start = read_round_counters();
+		round_start_device_response_time_histogram = STAT_device_response_time_histogram;
+		round_start_request_delay_histogram = STAT_request_delay_histogram;
+	}
+}
+
+void IO_Flow_Trace_Based::Attach_fast_forward_unit(SSD_Components::Fast_Forward_Unit *unit)
+{
+	if (fast_forward && total_replay_no > 1)
+	{
+		fast_forward_unit = unit;
+	}
+}
+
+Replay_Round_Counters IO_Flow_Trace_Based::read_round_counters()
+{
+	Replay_Round_Counters counters = {Simulator->Time(),
+									  STAT_generated_request_count, STAT_generated_read_request_count, STAT_generated_write_request_count,
+									  STAT_serviced_request_count, STAT_serviced_read_request_count, STAT_serviced_write_request_count,
+									  STAT_sum_device_response_time, STAT_sum_device_response_time_read, STAT_sum_device_response_time_write,
+									  STAT_sum_request_delay, STAT_sum_request_delay_read, STAT_sum_request_delay_write,
+									  STAT_transferred_bytes_total, STAT_transferred_bytes_read, STAT_transferred_bytes_write};
+	return counters;
+}
+
+bool IO_Flow_Trace_Based::rounds_match(const Replay_Round_Counters &a, const Replay_Round_Counters &b)
+{
+	if (a.Generated != b.Generated || a.Serviced != b.Serviced || a.Serviced_read != b.Serviced_read)
+	{
+		return false;
+	}
+	double time_difference = a.Time > b.Time ? double(a.Time - b.Time) : double(b.Time - a.Time);
+	double response_time_difference = a.Device_response_time > b.Device_response_time ? double(a.Device_response_time - b.Device_response_time) : double(b.Device_response_time - a.Device_response_time);
+	return time_difference <= fast_forward_tolerance * double(std::max(a.Time, b.Time))
+		&& response_time_difference <= fast_forward_tolerance * double(std::max(a.Device_response_time, b.Device_response_time));
+}
+
+//Called when a replay round is closed: at the first drain point after its last request is generated (drained),
+//or when the next round starts before that point. Once fast_forward_stable_rounds consecutive rounds match on both
+//the host and the device side, skips as many rounds as the device allows and returns the simulation time they span.
+sim_time_type IO_Flow_Trace_Based::fast_forward_replay_rounds(bool drained)
+{
+	Replay_Round_Counters now = read_round_counters();
+	bool device_stable = fast_forward_unit->Close_round();
+	bool device_idle = drained && device_is_idle();
+	Replay_Round_Counters round = {now.Time - round_start.Time,
+								   now.Generated - round_start.Generated, now.Generated_read - round_start.Generated_read, now.Generated_write - round_start.Generated_write,
+								   now.Serviced - round_start.Serviced, now.Serviced_read - round_start.Serviced_read, now.Serviced_write - round_start.Serviced_write,
+								   now.Device_response_time - round_start.Device_response_time, now.Device_response_time_read - round_start.Device_response_time_read, now.Device_response_time_write - round_start.Device_response_time_write,
+								   now.Request_delay - round_start.Request_delay, now.Request_delay_read - round_start.Request_delay_read, now.Request_delay_write - round_start.Request_delay_write,
+								   now.Transferred_bytes - round_start.Transferred_bytes, now.Transferred_bytes_read - round_start.Transferred_bytes_read, now.Transferred_bytes_write - round_start.Transferred_bytes_write};
+	//Only rounds that start and end with nothing in flight have the same profile in the steady state
+	std::string rejection_reason;
+	if (!drained)
+	{
+		rejection_reason = "requests of the round were still in flight when the next round started (see Replay_Drain)";
+	}
+	else if (!device_idle)
+	{
+		rejection_reason = "the device still had work queued when the requests of the round were serviced";
+	}
+	else if (!device_stable)
+	{
+		rejection_reason = fast_forward_unit->Rejection_reason();
+	}
+	else if (has_last_round && !rounds_match(round, last_round))
+	{
+		rejection_reason = "the request counts, duration or device response time differ from the previous round";
+	}
+	if (has_last_round && device_stable && device_idle && rejection_reason.empty())
+	{
+		stable_rounds++;
+	}
+	else
+	{
+		stable_rounds = 0;
+		reject_replay_round(rejection_reason);
+	}
+	last_round = round;
+	has_last_round = true;
+	round_start = now;
+	Utils::Latency_Histogram round_device_response_time_histogram = STAT_device_response_time_histogram;
+	round_device_response_time_histogram.Subtract(round_start_device_response_time_histogram);
+	Utils::Latency_Histogram round_request_delay_histogram = STAT_request_delay_histogram;
+	round_request_delay_histogram.Subtract(round_start_request_delay_histogram);
+	round_start_device_response_time_histogram = STAT_device_response_time_histogram;
+	round_start_request_delay_histogram = STAT_request_delay_histogram;
+
+	//The last round is always simulated in detail
+	if (stable_rounds < fast_forward_stable_rounds || replay_counter + 1 >= total_replay_no)
+	{
+		return 0;
+	}
+	unsigned int rounds = fast_forward_unit->Safe_rounds(total_replay_no - replay_counter - 1, round.Time);
+	if (rounds == 0)
+	{
+		reject_replay_round("a read-reclaim or ECC retry step is less than one round away");
+		return 0;
+	}
+
+	if (epoch_metrics != NULL)
+	{
+		epoch_metrics->Begin_skip();
+	}
+	fast_forward_unit->Fast_forward(rounds);
+	STAT_generated_request_count += rounds * round.Generated;
+	STAT_generated_read_request_count += rounds * round.Generated_read;
+	STAT_generated_write_request_count += rounds * round.Generated_write;
+	STAT_serviced_request_count += rounds * round.Serviced;
+	STAT_serviced_read_request_count += rounds * round.Serviced_read;
+	STAT_serviced_write_request_count += rounds * round.Serviced_write;
+	STAT_sum_device_response_time += rounds * round.Device_response_time;
+	STAT_sum_device_response_time_read += rounds * round.Device_response_time_read;
+	STAT_sum_device_response_time_write += rounds * round.Device_response_time_write;
+	STAT_sum_request_delay += rounds * round.Request_delay;
+	STAT_sum_request_delay_read += rounds * round.Request_delay_read;
+	STAT_sum_request_delay_write += rounds * round.Request_delay_write;
+	STAT_transferred_bytes_total += rounds * round.Transferred_bytes;
+	STAT_transferred_bytes_read += rounds * round.Transferred_bytes_read;
+	STAT_transferred_bytes_write += rounds * round.Transferred_bytes_write;
+	STAT_device_response_time_histogram.Add(round_device_response_time_histogram, rounds);
+	STAT_request_delay_histogram.Add(round_request_delay_histogram, rounds);
+	replay_counter += rounds;
+
+	//Detection starts over after the skip
+	sim_time_type skipped_time = rounds * round.Time;
+	if (epoch_metrics != NULL)
+	{
+		epoch_metrics->Record_skip(skipped_time, (uint64_t)rounds * round.Serviced, (uint64_t)rounds * round.Serviced_read, (uint64_t)rounds * round.Serviced_write,
+								   rounds * round.Transferred_bytes_read, rounds * round.Transferred_bytes_write, rounds * round.Device_response_time);
+	}
+	stable_rounds = 0;
+	has_last_round = false;
+	round_start = read_round_counters();
+	round_start.Time += skipped_time;
+	round_start_device_response_time_histogram = STAT_device_response_time_histogram;
+	round_start_request_delay_histogram = STAT_request_delay_histogram;
+	last_rejection_reason.clear();
+	PRINT_MESSAGE("* Fast-forwarded " << rounds << " replay rounds for " << ID())
+
+	return skipped_time;
+}
+
+//Logs why a round did not count toward a skip, once per change of the reason
+void IO_Flow_Trace_Based::reject_replay_round(const std::string &reason)
+{
+	if (!reason.empty() && reason != last_rejection_reason)
+	{
+		PRINT_MESSAGE("* Fast-forward: replay round " << replay_counter << " of " << ID() << " does not count toward a skip: " << reason)
+	}
+	last_rejection_reason = reason;
+}
+
+//True if no event of the device or the interconnect is pending, i.e., the device has no queued or executing work
+bool IO_Flow_Trace_Based::device_is_idle()
+{
+	std::vector<MQSimEngine::Sim_Event *> events;
+	Simulator->Get_pending_events(events);
+	for (auto &event : events)
+	{
+		if (event->Ignore || event->Target_sim_object == this)
+		{
+			continue;
+		}
+		return false;
+	}
+	return true;
+}
+
+//Called when the flow becomes idle while the next round waits for it or the last round is not closed yet
+void IO_Flow_Trace_Based::handle_drain_point()
+{
+	sim_time_type skipped_time = 0;
+	if (round_close_pending)
+	{
+		round_close_pending = false;
+		skipped_time = fast_forward_replay_rounds(true);
+	}
+	if (waiting_for_drain)
+	{
+		waiting_for_drain = false;
+		time_offset = Simulator->Time() + skipped_time;
+		next_request_event = Simulator->Register_sim_event(time_offset + current_record.Arrival_time, this);
+	}
+	else if (skipped_time > 0)
+	{
+		//The first request of the next round moves past the skipped rounds
+		Simulator->Ignore_sim_event(next_request_event);
+		time_offset += skipped_time;
+		next_request_event = Simulator->Register_sim_event(time_offset + current_record.Arrival_time, this);
+	}
 }
 
 void IO_Flow_Trace_Based::Validate_simulation_config()
 {
 }
 
+bool IO_Flow_Trace_Based::Is_idle()
+{
+	return STAT_generated_request_count == STAT_serviced_request_count + STAT_ignored_request_count;
+}
+
+void IO_Flow_Trace_Based::Save_checkpoint(Utils::Checkpoint_Writer &writer)
+{
+	if (!Is_idle())
+	{
+		PRINT_ERROR("A checkpoint cannot be taken while " << ID() << " has outstanding requests")
+	}
+	writer.Write_tag("IO_Flow_Trace_Based");
+	writer.Write(total_requests_in_file);
+	writer.Write(restored_generated_request_count + STAT_generated_request_count);
+	writer.Write(has_current_record ? current_record_index : total_requests_in_file);
+	writer.Write(replay_counter);
+	writer.Write(time_offset);
+}
+
+void IO_Flow_Trace_Based::Load_checkpoint(Utils::Checkpoint_Reader &reader)
+{
+	reader.Expect_tag("IO_Flow_Trace_Based");
+	//The trace is only read in Start_simulation, so its length is checked there
+	restored_trace_length = reader.Read<unsigned int>();
+	restored_generated_request_count = reader.Read<unsigned int>();
+	restored_record_index = reader.Read<unsigned int>();
+	replay_counter = reader.Read<unsigned int>();
+	time_offset = reader.Read<sim_time_type>();
+	restore_position = true;
+}
+
 void IO_Flow_Trace_Based::Execute_simulator_event(MQSimEngine::Sim_Event *)
 {
+	//The next round started before the requests of the previous one were all serviced
+	if (round_close_pending)
+	{
+		round_close_pending = false;
+		fast_forward_replay_rounds(false);
+	}
+
 	Host_IO_Request *request = Generate_next_request();
 	if (request != NULL)
 	{
@@ -144,27 +395,29 @@ void IO_Flow_Trace_Based::Execute_simulator_event(MQSimEngine::Sim_Event *)
 
 	if (STAT_generated_request_count < total_requests_to_be_generated)
 	{
-		std::string trace_line;
-		if (std::getline(trace_file, trace_line))
+		current_record_index++;
+		if (!trace_reader.Read_next(current_record))
 		{
-			Utils::Helper_Functions::Remove_cr(trace_line);
-			current_trace_line.clear();
-			Utils::Helper_Functions::Tokenize(trace_line, ASCIILineDelimiter, current_trace_line);
-		}
-		else
-		{
-			trace_file.close();
-			trace_file.open(trace_file_path);
+			trace_reader.Rewind();
+			current_record_index = 0;
 			replay_counter++;
-			time_offset = Simulator->Time();
-			std::getline(trace_file, trace_line);
-			Utils::Helper_Functions::Remove_cr(trace_line);
-			current_trace_line.clear();
-			Utils::Helper_Functions::Tokenize(trace_line, ASCIILineDelimiter, current_trace_line);
+			has_current_record = trace_reader.Read_next(current_record);
 			PRINT_MESSAGE("* Replay round " << replay_counter << "of " << total_replay_no << " started  for" << ID())
+			//Fast-forward compares rounds at drain points, where none of their requests is in flight
+			round_close_pending = fast_forward_unit != NULL;
+			if (replay_drain && !Is_idle())
+			{
+				waiting_for_drain = true;
+				return;
+			}
+			time_offset = Simulator->Time();
+			if (round_close_pending && Is_idle())
+			{
+				round_close_pending = false;
+				time_offset += fast_forward_replay_rounds(true);
+			}
 		}
-		char *pEnd;
-		Simulator->Register_sim_event(time_offset + std::strtoll(current_trace_line[ASCIITraceTimeColumn].c_str(), &pEnd, 10), this);
+		next_request_event = Simulator->Register_sim_event(time_offset + current_record.Arrival_time, this);
 	}
 }
 
@@ -188,30 +441,20 @@ void IO_Flow_Trace_Based::Get_statistics(Utils::Workload_Statistics &stats, LPA_
 	stats.Total_generated_requests = 0;
 	stats.Total_accessed_lbas = 0;
 
-	std::ifstream trace_file_temp;
-	trace_file_temp.open(trace_file_path, std::ios::in);
-	if (!trace_file_temp.is_open())
+	Trace_File_Reader trace_reader_temp;
+	if (!trace_reader_temp.Open(trace_file_path))
 	{
 		PRINT_ERROR("Error while opening the input trace file!")
 	}
 
-	std::string trace_line;
-	char *pEnd;
+	Trace_Record record;
 	sim_time_type last_request_arrival_time = 0;
 	sim_time_type sum_inter_arrival = 0;
 	uint64_t sum_request_size = 0;
-	std::vector<std::string> line_splitted;
-	while (std::getline(trace_file_temp, trace_line))
+	while (trace_reader_temp.Read_next(record))
 	{
-		Utils::Helper_Functions::Remove_cr(trace_line);
-		line_splitted.clear();
-		Utils::Helper_Functions::Tokenize(trace_line, ASCIILineDelimiter, line_splitted);
-		if (line_splitted.size() != ASCIIItemsPerLine)
-		{
-			break;
-		}
 		sim_time_type prev_time = last_request_arrival_time;
-		last_request_arrival_time = std::strtoull(line_splitted[ASCIITraceTimeColumn].c_str(), &pEnd, 10);
+		last_request_arrival_time = record.Arrival_time;
 		if (last_request_arrival_time < prev_time)
 		{
 			PRINT_ERROR("Unexpected request arrival time: " << last_request_arrival_time << "\nMQSim expects request arrival times to be monotonic increasing in the input trace!")
@@ -219,9 +462,9 @@ void IO_Flow_Trace_Based::Get_statistics(Utils::Workload_Statistics &stats, LPA_
 		sim_time_type diff = (last_request_arrival_time - prev_time) / 1000; //The arrival rate histogram is stored in the microsecond unit
 		sum_inter_arrival += last_request_arrival_time - prev_time;
 
-		unsigned int LBA_count = std::strtoul(line_splitted[ASCIITraceSizeColumn].c_str(), &pEnd, 0);
+		unsigned int LBA_count = record.LBA_count;
 		sum_request_size += LBA_count;
-		LHA_type start_LBA = std::strtoull(line_splitted[ASCIITraceAddressColumn].c_str(), &pEnd, 0);
+		LHA_type start_LBA = record.Start_LBA;
 		if (start_LBA <= (end_lsa_on_device - start_lsa_on_device))
 		{
 			start_LBA += start_lsa_on_device;
@@ -241,7 +484,7 @@ void IO_Flow_Trace_Based::Get_statistics(Utils::Workload_Statistics &stats, LPA_
 		{
 			LPA_type device_address = Convert_host_logical_address_to_device_address(start_LBA);
 			page_status_type access_status_bitmap = Find_NVM_subunit_access_bitmap(start_LBA);
-			if (line_splitted[ASCIITraceTypeColumn].compare(ASCIITraceWriteCode) == 0)
+			if (record.Type == Host_IO_Request_Type::WRITE)
 			{
 				if (stats.Write_address_access_pattern.find(device_address) == stats.Write_address_access_pattern.end())
 				{
@@ -290,7 +533,7 @@ void IO_Flow_Trace_Based::Get_statistics(Utils::Workload_Statistics &stats, LPA_
 		}
 
 		//Request size statistics
-		if (line_splitted[ASCIITraceTypeColumn].compare(ASCIITraceWriteCode) == 0)
+		if (record.Type == Host_IO_Request_Type::WRITE)
 		{
 			if (diff < MAX_ARRIVAL_TIME_HISTOGRAM)
 			{
@@ -332,7 +575,7 @@ void IO_Flow_Trace_Based::Get_statistics(Utils::Workload_Statistics &stats, LPA_
 		}
 		stats.Total_generated_requests++;
 	}
-	trace_file_temp.close();
+	trace_reader_temp.Close();
 	stats.Average_request_size_sector = (unsigned int)(sum_request_size / stats.Total_generated_requests);
 	stats.Average_inter_arrival_time_nano_sec = sum_inter_arrival / stats.Total_generated_requests;
 
@@ -6,15 +6,34 @@
 #include <fstream>
 #include "IO_Flow_Base.h"
 #include "ASCII_Trace_Definition.h"
+#include "Trace_File_Reader.h"
+#include "../utils/Checkpoint_Stream.h"
+
+namespace SSD_Components
+{
+class Fast_Forward_Unit;
+}
 
 namespace Host_Components
 {
+//Per-round totals of the flow statistics, used to detect steady state across replay rounds and to extrapolate skipped rounds
+struct Replay_Round_Counters
+{
+	sim_time_type Time;//Snapshot time, or the round length for a difference of two snapshots
+	unsigned int Generated, Generated_read, Generated_write;
+	unsigned int Serviced, Serviced_read, Serviced_write;
+	sim_time_type Device_response_time, Device_response_time_read, Device_response_time_write;
+	sim_time_type Request_delay, Request_delay_read, Request_delay_write;
+	sim_time_type Transferred_bytes, Transferred_bytes_read, Transferred_bytes_write;
+};
+
 class IO_Flow_Trace_Based : public IO_Flow_Base
 {
 public:
 	IO_Flow_Trace_Based(const sim_object_id_type &name, uint16_t flow_id, LHA_type start_lsa_on_device, LHA_type end_lsa_on_device, uint16_t io_queue_id,
 						uint16_t nvme_submission_queue_size, uint16_t nvme_completion_queue_size, IO_Flow_Priority_Class::Priority priority_class, double initial_occupancy_ratio,
-						std::string trace_file_path, Trace_Time_Unit time_unit, unsigned int total_replay_count, unsigned int percentage_to_be_simulated,
+						std::string trace_file_path, Trace_Time_Unit time_unit, unsigned int total_replay_count, unsigned int percentage_to_be_simulated, bool replay_drain,
+						bool fast_forward, unsigned int fast_forward_stable_rounds, double fast_forward_tolerance,
 						HostInterface_Types SSD_device_type, PCIe_Root_Complex *pcie_root_complex, SATA_HBA *sata_hba,
 						bool enabled_logging, sim_time_type logging_period, std::string logging_file_path);
 	~IO_Flow_Trace_Based();
@@ -26,16 +45,47 @@ public:
 	void Execute_simulator_event(MQSimEngine::Sim_Event *);
 	void Get_statistics(Utils::Workload_Statistics &stats, LPA_type (*Convert_host_logical_address_to_device_address)(LHA_type lha),
 						page_status_type (*Find_NVM_subunit_access_bitmap)(LHA_type lha));
+	void Attach_fast_forward_unit(SSD_Components::Fast_Forward_Unit *unit);//Only used if fast-forward is enabled for this flow
+	bool Is_idle();//True if all generated requests are serviced
+	void Save_checkpoint(Utils::Checkpoint_Writer &writer);//Position of the flow in the trace
+	void Load_checkpoint(Utils::Checkpoint_Reader &reader);//Applied when the simulation starts; the flow statistics start from zero
 
 private:
 	Trace_Time_Unit time_unit;
 	unsigned int percentage_to_be_simulated;
 	std::string trace_file_path;
-	std::ifstream trace_file;
+	Trace_File_Reader trace_reader;
 	unsigned int total_replay_no, replay_counter;
 	unsigned int total_requests_in_file;
-	std::vector<std::string> current_trace_line;
+	Trace_Record current_record;
+	bool has_current_record;
+	unsigned int current_record_index;//Index of current_record in the trace file
 	sim_time_type time_offset;
+	bool replay_drain;
+	bool waiting_for_drain;//The next round starts once the flow is idle
+	MQSimEngine::Sim_Event *next_request_event;
+
+	//Trace position loaded from a checkpoint
+	bool restore_position;
+	unsigned int restored_trace_length, restored_generated_request_count, restored_record_index;
+
+	//Fast-forward over steady-state replay rounds
+	bool fast_forward;
+	unsigned int fast_forward_stable_rounds;
+	double fast_forward_tolerance;
+	SSD_Components::Fast_Forward_Unit *fast_forward_unit;
+	Replay_Round_Counters round_start, last_round;
+	Utils::Latency_Histogram round_start_device_response_time_histogram, round_start_request_delay_histogram;
+	bool has_last_round;
+	unsigned int stable_rounds;
+	bool round_close_pending;//The generation of a round ended and the round is closed at the next drain point
+	std::string last_rejection_reason;
+	Replay_Round_Counters read_round_counters();
+	bool rounds_match(const Replay_Round_Counters &a, const Replay_Round_Counters &b);
+	bool device_is_idle();
+	void handle_drain_point();
+	void reject_replay_round(const std::string &reason);
+	sim_time_type fast_forward_replay_rounds(bool drained);
 };
 } // namespace Host_Components
 
@@ -0,0 +1,343 @@
+#include <cstdlib>
+#include <cstring>
+#include <sstream>
+#ifdef _WIN32
+#include <iterator>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+#include "Trace_File_Reader.h"
+#include "../utils/StringTools.h"
+
+namespace Host_Components
+{
+	Trace_File_Reader::Trace_File_Reader() : binary(false), manifest(false), segment_reader(NULL), segment_index(0), segment_repetition(0), segment_records_read(0),
+		records(NULL), record_count(0), cursor(0), mapped_region(NULL), mapped_size(0)
+	{
+	}
+
+	Trace_File_Reader::~Trace_File_Reader()
+	{
+		Close();
+	}
+
+	bool Trace_File_Reader::Open(const std::string& file_path)
+	{
+		Close();
+		this->file_path = file_path;
+
+		char magic[TraceManifestMagicLength];
+		std::ifstream probe(file_path, std::ios::in | std::ios::binary);
+		if (!probe.is_open())
+		{
+			return false;
+		}
+		probe.read(magic, TraceManifestMagicLength);
+		std::streamsize magic_length = probe.gcount();
+		binary = magic_length >= BinaryTraceMagicLength && std::memcmp(magic, BinaryTraceMagic, BinaryTraceMagicLength) == 0;
+		manifest = magic_length == TraceManifestMagicLength && std::memcmp(magic, TraceManifestMagic, TraceManifestMagicLength) == 0;
+		probe.close();
+
+		if (binary)
+		{
+			return open_binary();
+		}
+		if (manifest)
+		{
+			return open_manifest();
+		}
+
+		ascii_file.open(file_path, std::ios::in);
+		return ascii_file.is_open();
+	}
+
+	bool Trace_File_Reader::open_binary()
+	{
+#ifdef _WIN32
+		std::ifstream input(file_path, std::ios::in | std::ios::binary);
+		if (!input.is_open())
+		{
+			return false;
+		}
+		file_buffer.assign(std::istreambuf_iterator<char>(input), std::istreambuf_iterator<char>());
+		const char* base = file_buffer.data();
+		size_t file_size = file_buffer.size();
+#else
+		int fd = open(file_path.c_str(), O_RDONLY);
+		if (fd < 0)
+		{
+			return false;
+		}
+		struct stat file_stat;
+		if (fstat(fd, &file_stat) != 0)
+		{
+			close(fd);
+			return false;
+		}
+		size_t file_size = (size_t)file_stat.st_size;
+		mapped_region = mmap(NULL, file_size, PROT_READ, MAP_PRIVATE, fd, 0);
+		close(fd);
+		if (mapped_region == MAP_FAILED)
+		{
+			mapped_region = NULL;
+			PRINT_ERROR("Could not memory-map binary trace file: " << file_path)
+		}
+		mapped_size = file_size;
+		madvise(mapped_region, mapped_size, MADV_SEQUENTIAL);
+		const char* base = (const char*)mapped_region;
+#endif
+		if (file_size < sizeof(Binary_Trace_Header))
+		{
+			PRINT_ERROR("Truncated header in binary trace file: " << file_path)
+		}
+		const Binary_Trace_Header* header = (const Binary_Trace_Header*)base;
+		if (header->Version != BinaryTraceVersion || header->Record_size != sizeof(Binary_Trace_Record))
+		{
+			PRINT_ERROR("Unsupported binary trace file " << file_path << " (version " << header->Version << ", record size " << header->Record_size << ")")
+		}
+		if (header->Record_count > (file_size - sizeof(Binary_Trace_Header)) / sizeof(Binary_Trace_Record))
+		{
+			PRINT_ERROR("Binary trace file " << file_path << " declares " << header->Record_count << " records but is truncated")
+		}
+		records = (const Binary_Trace_Record*)(base + sizeof(Binary_Trace_Header));
+		record_count = header->Record_count;
+		cursor = 0;
+
+		return true;
+	}
+
+	bool Trace_File_Reader::open_manifest()
+	{
+		std::ifstream input(file_path, std::ios::in);
+		if (!input.is_open())
+		{
+			return false;
+		}
+		std::string directory;
+		size_t separator = file_path.find_last_of("/\\");
+		if (separator != std::string::npos)
+		{
+			directory = file_path.substr(0, separator + 1);
+		}
+
+		std::string line, magic;
+		unsigned int version = 0;
+		std::getline(input, line);
+		std::istringstream header(line);
+		header >> magic >> version;
+		if (version != TraceManifestVersion)
+		{
+			PRINT_ERROR("Unsupported trace manifest " << file_path << " (version " << version << ")")
+		}
+
+		unsigned int line_no = 1;
+		while (std::getline(input, line))
+		{
+			line_no++;
+			Utils::Helper_Functions::Remove_cr(line);
+			size_t first = line.find_first_not_of(" \t");
+			if (first == std::string::npos || line[first] == TraceManifestCommentCharacter)
+			{
+				continue;
+			}
+			std::istringstream fields(line);
+			Trace_Segment segment;
+			if (!(fields >> segment.File_path >> segment.Start_time >> segment.Repeat_count >> segment.Period))
+			{
+				PRINT_ERROR("Malformed segment at line " << line_no << " of trace manifest " << file_path << ": expected <file> <start time> <repeat count> <period>")
+			}
+			bool absolute = segment.File_path[0] == '/' || segment.File_path[0] == '\\' || (segment.File_path.size() > 1 && segment.File_path[1] == ':');
+			if (!absolute)
+			{
+				segment.File_path = directory + segment.File_path;
+			}
+			if (segment.Repeat_count > 0)
+			{
+				segments.push_back(segment);
+			}
+		}
+		if (segments.empty())
+		{
+			PRINT_ERROR("Trace manifest " << file_path << " has no segments")
+		}
+
+		segment_reader = new Trace_File_Reader;
+		segment_index = segments.size();
+		return open_segment(0);
+	}
+
+	bool Trace_File_Reader::open_segment(size_t index)
+	{
+		bool same_file = segment_index < segments.size() && index < segments.size() && segments[index].File_path == segments[segment_index].File_path;
+		segment_index = index;
+		segment_repetition = 0;
+		segment_records_read = 0;
+		if (index >= segments.size())
+		{
+			return false;
+		}
+		if (same_file)
+		{
+			segment_reader->Rewind();
+			return true;
+		}
+		if (!segment_reader->Open(segments[index].File_path))
+		{
+			PRINT_ERROR("Cannot open segment " << segments[index].File_path << " of trace manifest " << file_path)
+		}
+		if (segment_reader->Is_manifest())
+		{
+			PRINT_ERROR("Trace manifest " << file_path << " names another manifest as a segment: " << segments[index].File_path)
+		}
+		return true;
+	}
+
+	void Trace_File_Reader::Close()
+	{
+		if (segment_reader != NULL)
+		{
+			delete segment_reader;
+			segment_reader = NULL;
+		}
+		segments.clear();
+		segment_index = 0;
+		segment_repetition = 0;
+		segment_records_read = 0;
+
+		if (ascii_file.is_open())
+		{
+			ascii_file.close();
+		}
+#ifdef _WIN32
+		file_buffer.clear();
+		file_buffer.shrink_to_fit();
+#else
+		if (mapped_region != NULL)
+		{
+			munmap(mapped_region, mapped_size);
+		}
+#endif
+		mapped_region = NULL;
+		mapped_size = 0;
+		records = NULL;
+		record_count = 0;
+		cursor = 0;
+	}
+
+	void Trace_File_Reader::Rewind()
+	{
+		if (manifest)
+		{
+			open_segment(0);
+			return;
+		}
+		if (binary)
+		{
+			cursor = 0;
+			return;
+		}
+		ascii_file.clear();
+		ascii_file.seekg(0, std::ios::beg);
+	}
+
+	bool Trace_File_Reader::Read_next(Trace_Record& record)
+	{
+		if (manifest)
+		{
+			while (segment_index < segments.size())
+			{
+				const Trace_Segment& segment = segments[segment_index];
+				if (segment_reader->Read_next(record))
+				{
+					record.Arrival_time += segment.Start_time + segment_repetition * segment.Period;
+					segment_records_read++;
+					return true;
+				}
+				//An empty segment is not replayed
+				if (segment_records_read > 0 && segment_repetition + 1 < segment.Repeat_count)
+				{
+					segment_repetition++;
+					segment_records_read = 0;
+					segment_reader->Rewind();
+				}
+				else
+				{
+					open_segment(segment_index + 1);
+				}
+			}
+			return false;
+		}
+
+		if (binary)
+		{
+			if (cursor >= record_count)
+			{
+				return false;
+			}
+			const Binary_Trace_Record& entry = records[cursor++];
+			record.Arrival_time = entry.Arrival_time;
+			record.Start_LBA = entry.Start_LBA;
+			record.LBA_count = entry.LBA_count;
+			switch (entry.Type)
+			{
+			case ASCIITraceWriteCodeInteger:
+				record.Type = Host_IO_Request_Type::WRITE;
+				break;
+			case ASCIITraceGemvCodeInteger:
+				record.Type = Host_IO_Request_Type::IFP_GEMV;
+				break;
+			default:
+				record.Type = Host_IO_Request_Type::READ;
+			}
+			return true;
+		}
+
+		if (!std::getline(ascii_file, ascii_line) || ascii_line.empty())
+		{
+			return false;
+		}
+		Utils::Helper_Functions::Remove_cr(ascii_line);
+		ascii_tokens.clear();
+		Utils::Helper_Functions::Tokenize(ascii_line, ASCIILineDelimiter, ascii_tokens);
+		if (ascii_tokens.size() != ASCIIItemsPerLine)
+		{
+			return false;
+		}
+
+		char* pEnd;
+		record.Arrival_time = std::strtoll(ascii_tokens[ASCIITraceTimeColumn].c_str(), &pEnd, 10);
+		record.Start_LBA = std::strtoull(ascii_tokens[ASCIITraceAddressColumn].c_str(), &pEnd, 0);
+		record.LBA_count = std::strtoul(ascii_tokens[ASCIITraceSizeColumn].c_str(), &pEnd, 0);
+		if (ascii_tokens[ASCIITraceTypeColumn].compare(ASCIITraceWriteCode) == 0)
+		{
+			record.Type = Host_IO_Request_Type::WRITE;
+		}
+		else if (ascii_tokens[ASCIITraceTypeColumn].compare(ASCIITraceGemvCode) == 0)
+		{
+			record.Type = Host_IO_Request_Type::IFP_GEMV;
+		}
+		else
+		{
+			record.Type = Host_IO_Request_Type::READ;
+		}
+		return true;
+	}
+
+	bool Trace_File_Reader::Is_binary() const
+	{
+		return binary;
+	}
+
+	bool Trace_File_Reader::Is_manifest() const
+	{
+		return manifest;
+	}
+
+	uint64_t Trace_File_Reader::Record_count() const
+	{
+		return record_count;
+	}
+}
@@ -0,0 +1,78 @@
+#ifndef TRACE_FILE_READER_H
+#define TRACE_FILE_READER_H
+
+#include <string>
+#include <fstream>
+#include <vector>
+#include "../sim/Sim_Defs.h"
+#include "../ssd/SSD_Defs.h"
+#include "Host_IO_Request.h"
+#include "ASCII_Trace_Definition.h"
+#include "Binary_Trace_Definition.h"
+#include "Trace_Manifest_Definition.h"
+
+namespace Host_Components
+{
+	struct Trace_Record
+	{
+		sim_time_type Arrival_time;
+		LHA_type Start_LBA;
+		unsigned int LBA_count;
+		Host_IO_Request_Type Type;
+	};
+
+	struct Trace_Segment
+	{
+		std::string File_path;
+		sim_time_type Start_time;
+		unsigned int Repeat_count;
+		sim_time_type Period;
+	};
+
+	//Sequential reader for trace files in either the ASCII format or the binary format of Binary_Trace_Definition.h.
+	//The format is detected from the file header. Binary traces are memory-mapped, so reading a record is a pointer
+	//increment and rewinding for another replay round does not touch the file again.
+	//A trace manifest (Trace_Manifest_Definition.h) is streamed segment by segment: each segment file is rewound for
+	//its repetitions and only reopened when the next segment names a different file.
+	class Trace_File_Reader
+	{
+	public:
+		Trace_File_Reader();
+		~Trace_File_Reader();
+		bool Open(const std::string& file_path);
+		void Close();
+		void Rewind();
+		bool Read_next(Trace_Record& record);//Returns false at the end of the trace or at the first malformed ASCII line
+		bool Is_binary() const;
+		bool Is_manifest() const;
+		uint64_t Record_count() const;//Only known in advance for binary traces
+	private:
+		bool open_binary();
+		bool open_manifest();
+		bool open_segment(size_t index);
+		std::string file_path;
+		bool binary;
+
+		bool manifest;
+		std::vector<Trace_Segment> segments;
+		Trace_File_Reader* segment_reader;
+		size_t segment_index;
+		unsigned int segment_repetition;
+		uint64_t segment_records_read;//Records read in the current repetition of the segment
+
+		std::ifstream ascii_file;
+		std::string ascii_line;
+		std::vector<std::string> ascii_tokens;
+
+		const Binary_Trace_Record* records;
+		uint64_t record_count;
+		uint64_t cursor;
+		void* mapped_region;
+		size_t mapped_size;
+#ifdef _WIN32
+		std::vector<char> file_buffer;
+#endif
+	};
+}
+
+#endif // !TRACE_FILE_READER_H
@@ -0,0 +1,17 @@
+#ifndef TRACE_MANIFEST_DEFINITION_H
+#define TRACE_MANIFEST_DEFINITION_H
+
+//Trace manifest: a text file that composes a trace from segment trace files (ASCII or binary) without materializing it.
+//The first line is TraceManifestMagic followed by the version. Every following non-empty line that does not start
+//with '#' names one segment:
+//    <segment file> <start time> <repeat count> <period>
+//The records of the segment are replayed repeat count times; the records of repetition i (from 0) arrive at
+//start time + i * period + their own arrival time. Times use the unit of the trace, and relative segment paths are
+//resolved against the directory of the manifest. Segments are read in order, so the composed arrival times must be
+//monotonically increasing like in any other trace.
+#define TraceManifestMagic "MQSIM_TRACE_MANIFEST"
+#define TraceManifestMagicLength 20
+#define TraceManifestVersion 1
+#define TraceManifestCommentCharacter '#'
+
+#endif // !TRACE_MANIFEST_DEFINITION_H
@@ -3,17 +3,24 @@
 #include <ctime>
 #include <string>
 #include <cstring>
+#include <atomic>
+#include <mutex>
+#include <thread>
+#include <vector>
 #include "ssd/SSD_Defs.h"
 #include "exec/Execution_Parameter_Set.h"
 #include "exec/SSD_Device.h"
 #include "exec/Host_System.h"
 #include "utils/rapidxml/rapidxml.hpp"
 #include "utils/DistributionTypes.h"
+#include "utils/Object_Pool.h"
 
 using namespace std;
 
+//Scenarios may run in parallel threads; console reports and ctime() are serialized
+static std::mutex report_lock;
 
-void command_line_args(int argc, char* argv[], string& input_file_path, string& workload_file_path, string& output_file_path)
+void command_line_args(int argc, char* argv[], string& input_file_path, string& workload_file_path, string& output_file_path, unsigned int& thread_count)
 {
     // [수정됨] 고정값 5 대신 argc를 사용하여 유동적인 인자 개수 처리
     for (int arg_cntr = 1; arg_cntr < argc; arg_cntr++) {
@@ -37,10 +44,33 @@ void command_line_args(int argc, char* argv[], string& input_file_path, string&
             output_file_path.assign(argv[++arg_cntr]);
             continue;
         }
+
+		char thread_count_switch[] = "-j";
+		if (arg.compare(0, strlen(thread_count_switch), thread_count_switch) == 0) {
+			thread_count = (unsigned int)std::stoul(argv[++arg_cntr]);
+			continue;
+		}
     }
 }
 
-void read_configuration_parameters(const string ssd_config_file_path, Execution_Parameter_Set* exec_params)
+//Deserializes an SSD configuration file text into the parameters of the calling thread
+bool deserialize_configuration_parameters(const string& config_text)
+{
+	rapidxml::xml_document<> doc;    // character type defaults to char
+	std::vector<char> temp_string(config_text.begin(), config_text.end());
+	temp_string.push_back('\0');
+	doc.parse<0>(temp_string.data());
+	rapidxml::xml_node<> *mqsim_config = doc.first_node("Execution_Parameter_Set");
+	if (mqsim_config == NULL) {
+		return false;
+	}
+	Execution_Parameter_Set exec_params;
+	exec_params.XML_deserialize(mqsim_config);
+	return true;
+}
+
+//config_text keeps the deserialized configuration, so that scenario threads can load it again; it is empty if the defaults are used
+void read_configuration_parameters(const string ssd_config_file_path, Execution_Parameter_Set* exec_params, string& config_text)
 {
 	ifstream ssd_config_file;
 	ssd_config_file.open(ssd_config_file_path.c_str());
@@ -62,14 +92,8 @@ void read_configuration_parameters(const string ssd_config_file_path, Execution_
 			std::istreambuf_iterator<char>());
 		ssd_config_file >> line;
 		if (line.compare("USE_INTERNAL_PARAMS") != 0) {
-			rapidxml::xml_document<> doc;    // character type defaults to char
-			char* temp_string = new char[line.length() + 1];
-			strcpy(temp_string, line.c_str());
-			doc.parse<0>(temp_string);
-			rapidxml::xml_node<> *mqsim_config = doc.first_node("Execution_Parameter_Set");
-			if (mqsim_config != NULL) {
-				exec_params = new Execution_Parameter_Set;
-				exec_params->XML_deserialize(mqsim_config);
+			if (deserialize_configuration_parameters(line)) {
+				config_text = line;
 			} else {
 				PRINT_MESSAGE("Error in the SSD configuration file!")
 				PRINT_MESSAGE("Using MQSim's default configuration.")
@@ -260,16 +284,102 @@ void print_help()
     // [수정됨] 도움말에 -o 옵션 추가
     cout << "MQSim - SSD simulator with both NVMe and SATA host interface behavior, see ReadMe.md for details" << endl <<
         "Standalone Usage:" << endl <<
-        "./MQSim [-i path/to/config/file] [-w path/to/workload/file] [-o path/to/output/file]" << endl;
+        "./MQSim [-i path/to/config/file] [-w path/to/workload/file] [-o path/to/output/file] [-j number/of/threads]" << endl <<
+        "  -j runs the IO scenarios of the workload file in parallel threads (default 1)" << endl;
+}
+
+//Runs one IO scenario on the simulator of the calling thread, whose parameters are already loaded into exec_params
+void run_scenario(Execution_Parameter_Set* exec_params, std::vector<IO_Flow_Parameter_Set*>* io_scen, int cntr, size_t scenario_count,
+	const string& workload_defs_file_path, const string& output_file_path)
+{
+	time_t start_time = time(0);
+	{
+		std::lock_guard<std::mutex> guard(report_lock);
+		char* dt = ctime(&start_time);
+		PRINT_MESSAGE("MQSim started at " << dt)
+		PRINT_MESSAGE("******************************")
+		PRINT_MESSAGE("Executing scenario " << cntr << " out of " << scenario_count << " .......")
+	}
+
+	//The simulator should always be reset, before starting the actual simulation
+	Simulator->Reset();
+	Simulator->Set_event_list_type(exec_params->SSD_Device_Configuration.Event_List);
+
+	exec_params->Host_Configuration.IO_Flow_Definitions.clear();
+	for (auto io_flow_def = io_scen->begin(); io_flow_def != io_scen->end(); io_flow_def++) {
+		exec_params->Host_Configuration.IO_Flow_Definitions.push_back(*io_flow_def);
+	}
+
+	// [수정됨] output_file_path가 제공되었는지 확인하여 파일 이름 결정
+    string final_output_path;
+    if (output_file_path.empty()) {
+        // 인자가 없으면 기존 방식대로 자동 생성
+        final_output_path = workload_defs_file_path.substr(0, workload_defs_file_path.find_last_of(".")) + "_scenario_" + std::to_string(cntr) + ".xml";
+    } else {
+        // 인자가 있으면 해당 경로 사용
+        // 만약 시나리오가 여러 개인데 파일명이 하나라면, 덮어쓰기 방지를 위해 접미사 추가를 고려할 수 있으나,
+        // 사용자의 요청("경로+이름을 인수로 주고 싶어")을 정확히 따르기 위해 입력값을 그대로 사용 (또는 필요시 아래처럼 처리 가능)
+        if (scenario_count > 1) {
+            final_output_path = output_file_path + "_scenario_" + std::to_string(cntr) + ".xml";
+        } else {
+            final_output_path = output_file_path;
+        }
+    }
+
+	//Per-block snapshots and epoch metrics are written next to the result file
+	string result_path_stem = final_output_path;
+	if (result_path_stem.size() > 4 && result_path_stem.compare(result_path_stem.size() - 4, 4, ".xml") == 0) {
+		result_path_stem.erase(result_path_stem.size() - 4);
+	}
+	exec_params->SSD_Device_Configuration.Block_Snapshot_File_Path = result_path_stem + ".blocks.bin";
+	exec_params->Host_Configuration.Epoch_Metrics_File_Path = result_path_stem + ".epochs.csv";
+
+	SSD_Device ssd(&exec_params->SSD_Device_Configuration, &exec_params->Host_Configuration.IO_Flow_Definitions);//Create SSD_Device based on the specified parameters
+	exec_params->Host_Configuration.Input_file_path = workload_defs_file_path.substr(0, workload_defs_file_path.find_last_of("."));//Create Host_System based on the specified parameters
+	//A restored checkpoint already holds the preconditioned device state
+	bool restore_checkpoint = exec_params->SSD_Device_Configuration.Checkpoint == Checkpoint_Mode_Type::RESTORE;
+	Host_System host(&exec_params->Host_Configuration, exec_params->SSD_Device_Configuration.Enabled_Preconditioning && !restore_checkpoint, ssd.Host_interface);
+	host.Attach_ssd_device(&ssd);
+	string checkpoint_file_path = exec_params->SSD_Device_Configuration.Checkpoint_File_Path;
+	if (scenario_count > 1) {
+		checkpoint_file_path += "_scenario_" + std::to_string(cntr);
+	}
+	if (exec_params->SSD_Device_Configuration.Checkpoint == Checkpoint_Mode_Type::SAVE) {
+		host.Schedule_checkpoint(exec_params->SSD_Device_Configuration.Checkpoint_Phase, exec_params->SSD_Device_Configuration.Checkpoint_Time, checkpoint_file_path);
+	} else if (restore_checkpoint) {
+		host.Restore_checkpoint(checkpoint_file_path);
+	}
+
+	Simulator->Start_simulation();
+	ssd.Finish_simulation();
+	host.Finish_simulation();
+
+	time_t end_time = time(0);
+	std::lock_guard<std::mutex> guard(report_lock);
+	char* dt = ctime(&end_time);
+	if (scenario_count > 1) {
+		PRINT_MESSAGE("Scenario " << cntr << " out of " << scenario_count)
+	}
+	PRINT_MESSAGE("MQSim finished at " << dt)
+	uint64_t duration = (uint64_t)difftime(end_time, start_time);
+	PRINT_MESSAGE("Total simulation time: " << duration / 3600 << ":" << (duration % 3600) / 60 << ":" << ((duration % 3600) % 60))
+	PRINT_MESSAGE("Executed simulation events: " << Simulator->Executed_event_count())
+	Utils::Object_Pool::Print_statistics();
+	PRINT_MESSAGE("");
+
+	PRINT_MESSAGE("Writing results to output file .......");
+
+	collect_results(ssd, host, final_output_path.c_str());
 }
 
 int main(int argc, char* argv[])
 {
-	string ssd_config_file_path, workload_defs_file_path, output_file_path;
+	string ssd_config_file_path, workload_defs_file_path, output_file_path, config_text;
+	unsigned int thread_count = 1;
     
     // [수정됨] 단순히 argc != 5로 체크하면 optional 인자(-o)를 처리할 수 없으므로 제거하고,
     // command_line_args 호출 후 필수 인자 확인 방식으로 변경
-    command_line_args(argc, argv, ssd_config_file_path, workload_defs_file_path, output_file_path);
+    command_line_args(argc, argv, ssd_config_file_path, workload_defs_file_path, output_file_path, thread_count);
 
     if (ssd_config_file_path.empty() || workload_defs_file_path.empty()) {
         print_help();
@@ -277,58 +387,33 @@ int main(int argc, char* argv[])
     }
 
 	Execution_Parameter_Set* exec_params = new Execution_Parameter_Set;
-	read_configuration_parameters(ssd_config_file_path, exec_params);
+	read_configuration_parameters(ssd_config_file_path, exec_params, config_text);
 	std::vector<std::vector<IO_Flow_Parameter_Set*>*>* io_scenarios = read_workload_definitions(workload_defs_file_path);
 
-	int cntr = 1;
-	for (auto io_scen = io_scenarios->begin(); io_scen != io_scenarios->end(); io_scen++, cntr++) {
-		time_t start_time = time(0);
-		char* dt = ctime(&start_time);
-		PRINT_MESSAGE("MQSim started at " << dt)
-		PRINT_MESSAGE("******************************")
-		PRINT_MESSAGE("Executing scenario " << cntr << " out of " << io_scenarios->size() << " .......")
-
-		//The simulator should always be reset, before starting the actual simulation
-		Simulator->Reset();
-
-		exec_params->Host_Configuration.IO_Flow_Definitions.clear();
-		for (auto io_flow_def = (*io_scen)->begin(); io_flow_def != (*io_scen)->end(); io_flow_def++) {
-			exec_params->Host_Configuration.IO_Flow_Definitions.push_back(*io_flow_def);
+	if (thread_count <= 1 || io_scenarios->size() <= 1) {
+		int cntr = 1;
+		for (auto io_scen = io_scenarios->begin(); io_scen != io_scenarios->end(); io_scen++, cntr++) {
+			run_scenario(exec_params, *io_scen, cntr, io_scenarios->size(), workload_defs_file_path, output_file_path);
+		}
+	} else {
+		//The simulator state is per thread: every worker loads the SSD configuration into its own parameters and runs whole scenarios
+		std::atomic<size_t> next_scenario(0);
+		std::vector<std::thread> workers;
+		for (unsigned int i = 0; i < thread_count && i < io_scenarios->size(); i++) {
+			workers.push_back(std::thread([&]() {
+				Execution_Parameter_Set* thread_exec_params = new Execution_Parameter_Set;
+				if (!config_text.empty()) {
+					deserialize_configuration_parameters(config_text);
+				}
+				for (size_t scenario_id = next_scenario++; scenario_id < io_scenarios->size(); scenario_id = next_scenario++) {
+					run_scenario(thread_exec_params, (*io_scenarios)[scenario_id], (int)scenario_id + 1, io_scenarios->size(), workload_defs_file_path, output_file_path);
+				}
+				delete thread_exec_params;
+			}));
+		}
+		for (auto worker = workers.begin(); worker != workers.end(); worker++) {
+			worker->join();
 		}
-
-		SSD_Device ssd(&exec_params->SSD_Device_Configuration, &exec_params->Host_Configuration.IO_Flow_Definitions);//Create SSD_Device based on the specified parameters
-		exec_params->Host_Configuration.Input_file_path = workload_defs_file_path.substr(0, workload_defs_file_path.find_last_of("."));//Create Host_System based on the specified parameters
-		Host_System host(&exec_params->Host_Configuration, exec_params->SSD_Device_Configuration.Enabled_Preconditioning, ssd.Host_interface);
-		host.Attach_ssd_device(&ssd);
-
-		Simulator->Start_simulation();
-
-		time_t end_time = time(0);
-		dt = ctime(&end_time);
-		PRINT_MESSAGE("MQSim finished at " << dt)
-		uint64_t duration = (uint64_t)difftime(end_time, start_time);
-		PRINT_MESSAGE("Total simulation time: " << duration / 3600 << ":" << (duration % 3600) / 60 << ":" << ((duration % 3600) % 60))
-		PRINT_MESSAGE("");
-
-		PRINT_MESSAGE("Writing results to output file .......");
-
-		// [수정됨] output_file_path가 제공되었는지 확인하여 파일 이름 결정
-        string final_output_path;
-        if (output_file_path.empty()) {
-            // 인자가 없으면 기존 방식대로 자동 생성
-            final_output_path = workload_defs_file_path.substr(0, workload_defs_file_path.find_last_of(".")) + "_scenario_" + std::to_string(cntr) + ".xml";
-        } else {
-            // 인자가 있으면 해당 경로 사용
-            // 만약 시나리오가 여러 개인데 파일명이 하나라면, 덮어쓰기 방지를 위해 접미사 추가를 고려할 수 있으나,
-            // 사용자의 요청("경로+이름을 인수로 주고 싶어")을 정확히 따르기 위해 입력값을 그대로 사용 (또는 필요시 아래처럼 처리 가능)
-            if (io_scenarios->size() > 1) {
-                final_output_path = output_file_path + "_scenario_" + std::to_string(cntr) + ".xml";
-            } else {
-                final_output_path = output_file_path;
-            }
-        }
-        
-        collect_results(ssd, host, final_output_path.c_str());
 	}
     cout << "Simulation complete; Press any key to exit." << endl;
 
@@ -277,6 +277,75 @@ namespace NVM
 			return _suspendEraseLatency;
 		}
 
+		void Flash_Chip::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+		{
+			if (status != Internal_Status::IDLE) {
+				PRINT_ERROR("A checkpoint cannot be taken while flash chip " << ID() << " is busy")
+			}
+			writer.Write(STAT_readCount);
+			writer.Write(STAT_progamCount);
+			writer.Write(STAT_eraseCount);
+			writer.Write(STAT_totalSuspensionCount);
+			writer.Write(STAT_totalResumeCount);
+			writer.Write(STAT_totalExecTime);
+			writer.Write(STAT_totalXferTime);
+			writer.Write(STAT_totalOverlappedXferExecTime);
+			std::vector<LPA_type> page_lpas(page_no_per_block);
+			for (unsigned int die_id = 0; die_id < die_no; die_id++) {
+				Die* die = Dies[die_id];
+				writer.Write(die->STAT_TotalProgramTime);
+				writer.Write(die->STAT_TotalReadTime);
+				writer.Write(die->STAT_TotalEraseTime);
+				writer.Write(die->STAT_TotalXferTime);
+				for (unsigned int plane_id = 0; plane_id < plane_no_in_die; plane_id++) {
+					Plane* plane = die->Planes[plane_id];
+					writer.Write(plane->Healthy_block_no);
+					writer.Write(plane->Read_count);
+					writer.Write(plane->Progam_count);
+					writer.Write(plane->Erase_count);
+					for (unsigned int block_id = 0; block_id < block_no_in_plane; block_id++) {
+						for (unsigned int page_id = 0; page_id < page_no_per_block; page_id++) {
+							page_lpas[page_id] = plane->Blocks[block_id]->Pages[page_id].Metadata.LPA;
+						}
+						writer.Write_array(page_lpas.data(), page_no_per_block);
+					}
+				}
+			}
+		}
+
+		void Flash_Chip::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+		{
+			STAT_readCount = reader.Read<unsigned long>();
+			STAT_progamCount = reader.Read<unsigned long>();
+			STAT_eraseCount = reader.Read<unsigned long>();
+			STAT_totalSuspensionCount = reader.Read<unsigned long>();
+			STAT_totalResumeCount = reader.Read<unsigned long>();
+			STAT_totalExecTime = reader.Read<sim_time_type>();
+			STAT_totalXferTime = reader.Read<sim_time_type>();
+			STAT_totalOverlappedXferExecTime = reader.Read<sim_time_type>();
+			std::vector<LPA_type> page_lpas(page_no_per_block);
+			for (unsigned int die_id = 0; die_id < die_no; die_id++) {
+				Die* die = Dies[die_id];
+				die->STAT_TotalProgramTime = reader.Read<sim_time_type>();
+				die->STAT_TotalReadTime = reader.Read<sim_time_type>();
+				die->STAT_TotalEraseTime = reader.Read<sim_time_type>();
+				die->STAT_TotalXferTime = reader.Read<sim_time_type>();
+				for (unsigned int plane_id = 0; plane_id < plane_no_in_die; plane_id++) {
+					Plane* plane = die->Planes[plane_id];
+					plane->Healthy_block_no = reader.Read<unsigned int>();
+					plane->Read_count = reader.Read<unsigned long>();
+					plane->Progam_count = reader.Read<unsigned long>();
+					plane->Erase_count = reader.Read<unsigned long>();
+					for (unsigned int block_id = 0; block_id < block_no_in_plane; block_id++) {
+						reader.Read_array(page_lpas.data(), page_no_per_block);
+						for (unsigned int page_id = 0; page_id < page_no_per_block; page_id++) {
+							plane->Blocks[block_id]->Pages[page_id].Metadata.LPA = page_lpas[page_id];
+						}
+					}
+				}
+			}
+		}
+
 		void Flash_Chip::Report_results_in_XML(std::string name_prefix, Utils::XmlWriter& xmlwriter)
 		{
 			std::string tmp = name_prefix;
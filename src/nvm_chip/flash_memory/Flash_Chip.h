@@ -5,6 +5,7 @@
 #include "../../sim/Sim_Event.h"
 #include "../../sim/Engine.h"
 #include "../../sim/Sim_Reporter.h"
+#include "../../utils/Checkpoint_Stream.h"
 #include "../NVM_Chip.h"
 #include "FlashTypes.h"
 #include "Die.h"
@@ -121,6 +122,8 @@ namespace NVM
 			sim_time_type GetSuspendProgramTime();
 			sim_time_type GetSuspendEraseTime();
 			void Report_results_in_XML(std::string name_prefix, Utils::XmlWriter& xmlwriter);
+			void Save_checkpoint(Utils::Checkpoint_Writer& writer);//Page metadata and the operation counters and times; only valid when the chip is idle
+			void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 			LPA_type Get_metadata(flash_die_ID_type die_id, flash_plane_ID_type plane_id, flash_block_ID_type block_id, flash_page_ID_type page_id);//A simplification to decrease the complexity of GC execution! The GC unit may need to know the metadata of a page to decide if a page is valid or invalid. 
 		private:
 			Flash_Technology_Type flash_technology;
@@ -4,6 +4,6 @@ namespace NVM
 {
 	namespace FlashMemory
 	{
-		bool Physical_Page_Address::block_address_constraint_for_multiplane = true;
+		thread_local bool Physical_Page_Address::block_address_constraint_for_multiplane = true;
 	}
 }
\ No newline at end of file
@@ -11,7 +11,7 @@ namespace NVM
 		class Physical_Page_Address : public NVM_Memory_Address
 		{
 		private:
-			static bool block_address_constraint_for_multiplane;//Block address of the commands to neighbor planes must be identical for multiplane command execution
+			static thread_local bool block_address_constraint_for_multiplane;//Block address of the commands to neighbor planes must be identical for multiplane command execution
 		public:
 			flash_channel_ID_type ChannelID;
 			flash_chip_ID_type ChipID;        //The flashchip ID inside its channel
@@ -1,26 +1,27 @@
 #include <stdexcept>
 #include "Engine.h"
 #include "../utils/Logical_Address_Partitioning_Unit.h"
+#include "../utils/Object_Pool.h"
 
 namespace MQSimEngine
 {
-	Engine* Engine::_instance = NULL;
-
 	Engine* Engine::Instance() {
-		if (_instance == 0) {
-			_instance = new Engine;
-		}
-		return _instance;
+		static thread_local Engine instance;
+		return &instance;
 	}
 
 	void Engine::Reset()
 	{
 		_EventList->Clear();
+		_EventCalendar->Clear();
 		_ObjectList.clear();
 		_sim_time = 0;
+		executed_event_count = 0;
+		executing_event = NULL;
 		stop = false;
 		started = false;
 		Utils::Logical_Address_Partitioning_Unit::Reset();
+		Utils::Object_Pool::Reset_statistics();
 	}
 
 
@@ -77,27 +78,45 @@ namespace MQSimEngine
 			obj->second->Start_simulation();
 		}
 		
-		Sim_Event* ev = NULL;
 		while (true) {
-			if (_EventList->Count == 0 || stop) {
+			if (stop) {
 				break;
 			}
 
-			EventTreeNode* minNode = _EventList->Get_min_node();
-			ev = minNode->FirstSimEvent;
-
-			_sim_time = ev->Fire_time;
-
-			while (ev != NULL) {
-				if(!ev->Ignore) {
-					ev->Target_sim_object->Execute_simulator_event(ev);
+			if (_event_list_type == Event_List_Type::CALENDAR_QUEUE) {
+				if (_EventCalendar->Count == 0) {
+					break;
 				}
-				Sim_Event* consumed_event = ev;
-				ev = ev->Next_event;
-				delete consumed_event;
+				EventCalendarNode* minNode = _EventCalendar->Get_min_node();
+				_sim_time = minNode->Key;
+				execute_events(minNode->FirstSimEvent);
+				_EventCalendar->Remove(minNode);
+			} else {
+				if (_EventList->Count == 0) {
+					break;
+				}
+				EventTreeNode* minNode = _EventList->Get_min_node();
+				_sim_time = minNode->Key;
+				execute_events(minNode->FirstSimEvent);
+				_EventList->Remove(minNode);
+			}
+		}
+	}
+
+	//Executes the events of one fire time, including those registered for the same time while executing
+	void Engine::execute_events(Sim_Event* ev)
+	{
+		while (ev != NULL) {
+			if(!ev->Ignore) {
+				executing_event = ev;
+				ev->Target_sim_object->Execute_simulator_event(ev);
+				executed_event_count++;
 			}
-			_EventList->Remove(minNode);
+			Sim_Event* consumed_event = ev;
+			ev = ev->Next_event;
+			delete consumed_event;
 		}
+		executing_event = NULL;
 	}
 
 	void Engine::Stop_simulation()
@@ -119,7 +138,11 @@ namespace MQSimEngine
 	{
 		Sim_Event* ev = new Sim_Event(fireTime, targetObject, parameters, type);
 		DEBUG("RegisterEvent " << fireTime << " " << targetObject)
-		_EventList->Insert_sim_event(ev);
+		if (_event_list_type == Event_List_Type::CALENDAR_QUEUE) {
+			_EventCalendar->Insert_sim_event(ev);
+		} else {
+			_EventList->Insert_sim_event(ev);
+		}
 		return ev;
 	}
 
@@ -128,6 +151,49 @@ namespace MQSimEngine
 		ev->Ignore = true;
 	}
 
+	void Engine::Set_event_list_type(Event_List_Type type)
+	{
+		if (_EventList->Count != 0 || _EventCalendar->Count != 0) {
+			PRINT_ERROR("The event list type cannot be changed while simulation events are pending!")
+		}
+		_event_list_type = type;
+	}
+
+	Event_List_Type Engine::Get_event_list_type()
+	{
+		return _event_list_type;
+	}
+
+	unsigned long long Engine::Executed_event_count()
+	{
+		return executed_event_count;
+	}
+
+	void Engine::Set_start_time(sim_time_type time)
+	{
+		if (started || _EventList->Count != 0 || _EventCalendar->Count != 0) {
+			PRINT_ERROR("The start time of the simulation cannot be changed after events are registered!")
+		}
+		_sim_time = time;
+	}
+
+	void Engine::Get_pending_events(std::vector<Sim_Event*>& events)
+	{
+		//The events of the current time that were already executed are deleted, but their list node is not removed yet
+		sim_time_type min_key = 0;
+		if (executing_event != NULL) {
+			for (Sim_Event* ev = executing_event->Next_event; ev != NULL; ev = ev->Next_event) {
+				events.push_back(ev);
+			}
+			min_key = _sim_time + 1;
+		}
+		if (_event_list_type == Event_List_Type::CALENDAR_QUEUE) {
+			_EventCalendar->Get_pending_events(events, min_key);
+		} else {
+			_EventList->Get_pending_events(events, min_key);
+		}
+	}
+
 	bool Engine::Is_integrated_execution_mode()
 	{
 		return false;
@@ -3,11 +3,15 @@
 
 #include <iostream>
 #include <unordered_map>
+#include <vector>
 #include "Sim_Defs.h"
 #include "EventTree.h"
+#include "EventCalendar.h"
 #include "Sim_Object.h"
 
 namespace MQSimEngine {
+	enum class Event_List_Type { RED_BLACK_TREE, CALENDAR_QUEUE };
+
 	class Engine
 	{
 		friend class EventTree;
@@ -15,14 +19,19 @@ namespace MQSimEngine {
 		Engine()
 		{
 			this->_EventList = new EventTree;
+			this->_EventCalendar = new EventCalendar;
+			_event_list_type = Event_List_Type::RED_BLACK_TREE;
 			started = false;
+			executed_event_count = 0;
+			executing_event = NULL;
 		}
 
 		~Engine() {
 			delete _EventList;
+			delete _EventCalendar;
 		}
 		
-		static Engine* Instance();
+		static Engine* Instance();//Each thread has its own engine, so a thread is the context of one simulation
 		sim_time_type Time();
 		Sim_Event* Register_sim_event(sim_time_type fireTime, Sim_Object* targetObject, void* parameters = NULL, int type = 0);
 		void Ignore_sim_event(Sim_Event*);
@@ -34,13 +43,22 @@ namespace MQSimEngine {
 		void Stop_simulation();
 		bool Has_started();
 		bool Is_integrated_execution_mode();
+		void Set_event_list_type(Event_List_Type type);//Must be called before any event is registered
+		Event_List_Type Get_event_list_type();
+		unsigned long long Executed_event_count();
+		void Set_start_time(sim_time_type time);//Used to resume from a checkpoint; must be called before Start_simulation
+		void Get_pending_events(std::vector<Sim_Event*>& events);//Events that have not been executed yet, including those of the current time
 	private:
 		sim_time_type _sim_time;
+		Event_List_Type _event_list_type;
 		EventTree* _EventList;
+		EventCalendar* _EventCalendar;
+		unsigned long long executed_event_count;
+		Sim_Event* executing_event;
+		void execute_events(Sim_Event* ev);
 		std::unordered_map<sim_object_id_type, Sim_Object*> _ObjectList;
 		bool stop;
 		bool started;
-		static Engine* _instance;
 	};
 }
 
@@ -0,0 +1,210 @@
+#include <algorithm>
+#include "EventCalendar.h"
+#include "Engine.h"
+
+namespace MQSimEngine
+{
+	static const unsigned int MIN_BUCKET_COUNT = 16;
+	static const unsigned int INITIAL_WIDTH_SHIFT = 10;//1.024 us
+	static const unsigned int WIDTH_SAMPLE_SIZE = 25;
+
+	EventCalendar::EventCalendar() : Count(0), buckets(MIN_BUCKET_COUNT, NULL), bucket_mask(MIN_BUCKET_COUNT - 1),
+		width_shift(INITIAL_WIDTH_SHIFT), free_nodes(NULL), last_min_key(0)
+	{
+		set_current_bucket(0);
+	}
+
+	EventCalendar::~EventCalendar()
+	{
+		Clear();
+		while (free_nodes != NULL) {
+			EventCalendarNode* node = free_nodes;
+			free_nodes = node->Next;
+			delete node;
+		}
+	}
+
+	void EventCalendar::Insert_sim_event(Sim_Event* event)
+	{
+		if (event->Fire_time < Engine::Instance()->Time()) {
+			PRINT_ERROR("Illegal request to register a simulation event before Now!")
+		}
+
+		sim_time_type key = event->Fire_time;
+		EventCalendarNode** link = &buckets[bucket_of(key)];
+		while (*link != NULL && (*link)->Key < key) {
+			link = &(*link)->Next;
+		}
+		if (*link != NULL && (*link)->Key == key) {
+			(*link)->LastSimEvent->Next_event = event;
+			(*link)->LastSimEvent = event;
+			return;
+		}
+
+		EventCalendarNode* node = free_nodes;
+		if (node != NULL) {
+			free_nodes = node->Next;
+		} else {
+			node = new EventCalendarNode;
+		}
+		node->Key = key;
+		node->FirstSimEvent = event;
+		node->LastSimEvent = event;
+		node->Next = *link;
+		*link = node;
+		Count++;
+
+		if ((unsigned int)Count > 2 * buckets.size()) {
+			resize((unsigned int)buckets.size() * 2);
+		}
+	}
+
+	EventCalendarNode* EventCalendar::Get_min_node()
+	{
+		if (Count == 0) {
+			return NULL;
+		}
+
+		// All pending keys are at or after the start of the current bucket's time slot, so the first
+		// bucket head that falls inside its own slot is the minimum
+		unsigned int bucket = current_bucket;
+		sim_time_type top = current_bucket_top;
+		sim_time_type width = (sim_time_type)1 << width_shift;
+		for (unsigned int i = 0; i < buckets.size(); i++) {
+			EventCalendarNode* node = buckets[bucket];
+			if (node != NULL && node->Key < top) {
+				current_bucket = bucket;
+				current_bucket_top = top;
+				last_min_key = node->Key;
+				return node;
+			}
+			bucket = (bucket + 1) & bucket_mask;
+			top += width;
+		}
+
+		// Nothing within one pass over the calendar: jump directly to the earliest bucket head
+		EventCalendarNode* min_node = NULL;
+		for (auto head = buckets.begin(); head != buckets.end(); head++) {
+			if (*head != NULL && (min_node == NULL || (*head)->Key < min_node->Key)) {
+				min_node = *head;
+			}
+		}
+		last_min_key = min_node->Key;
+		set_current_bucket(last_min_key);
+
+		return min_node;
+	}
+
+	void EventCalendar::Remove(EventCalendarNode* node)
+	{
+		EventCalendarNode** link = &buckets[bucket_of(node->Key)];
+		while (*link != node) {
+			link = &(*link)->Next;
+		}
+		*link = node->Next;
+		node->Next = free_nodes;
+		free_nodes = node;
+		Count--;
+
+		if (buckets.size() > MIN_BUCKET_COUNT && (unsigned int)Count < buckets.size() / 2) {
+			resize((unsigned int)buckets.size() / 2);
+		}
+	}
+
+	void EventCalendar::Clear()
+	{
+		for (auto head = buckets.begin(); head != buckets.end(); head++) {
+			while (*head != NULL) {
+				EventCalendarNode* node = *head;
+				*head = node->Next;
+				node->Next = free_nodes;
+				free_nodes = node;
+			}
+		}
+		Count = 0;
+		last_min_key = 0;
+		set_current_bucket(0);
+	}
+
+	void EventCalendar::Get_pending_events(std::vector<Sim_Event*>& events, sim_time_type min_key)
+	{
+		for (auto head = buckets.begin(); head != buckets.end(); head++) {
+			for (EventCalendarNode* node = *head; node != NULL; node = node->Next) {
+				if (node->Key < min_key) {
+					continue;
+				}
+				for (Sim_Event* ev = node->FirstSimEvent; ev != NULL; ev = ev->Next_event) {
+					events.push_back(ev);
+				}
+			}
+		}
+	}
+
+	void EventCalendar::insert_node(EventCalendarNode* node)
+	{
+		EventCalendarNode** link = &buckets[bucket_of(node->Key)];
+		while (*link != NULL && (*link)->Key < node->Key) {
+			link = &(*link)->Next;
+		}
+		node->Next = *link;
+		*link = node;
+	}
+
+	void EventCalendar::resize(unsigned int bucket_count)
+	{
+		std::vector<EventCalendarNode*> nodes;
+		nodes.reserve(Count);
+		for (auto head = buckets.begin(); head != buckets.end(); head++) {
+			for (EventCalendarNode* node = *head; node != NULL; node = node->Next) {
+				nodes.push_back(node);
+			}
+		}
+
+		width_shift = estimate_width_shift(nodes);
+		buckets.assign(bucket_count, NULL);
+		bucket_mask = bucket_count - 1;
+		for (auto node = nodes.begin(); node != nodes.end(); node++) {
+			insert_node(*node);
+		}
+		set_current_bucket(last_min_key);
+	}
+
+	// Brown's heuristic: three times the average gap between the earliest pending fire times,
+	// ignoring gaps larger than twice the overall average, rounded up to a power of two
+	unsigned int EventCalendar::estimate_width_shift(std::vector<EventCalendarNode*>& nodes)
+	{
+		size_t sample_size = std::min(nodes.size(), (size_t)WIDTH_SAMPLE_SIZE);
+		if (sample_size < 2) {
+			return width_shift;
+		}
+
+		auto by_key = [](const EventCalendarNode* a, const EventCalendarNode* b) { return a->Key < b->Key; };
+		std::nth_element(nodes.begin(), nodes.begin() + (sample_size - 1), nodes.end(), by_key);
+		std::sort(nodes.begin(), nodes.begin() + sample_size, by_key);
+
+		double average_gap = (double)(nodes[sample_size - 1]->Key - nodes[0]->Key) / (sample_size - 1);
+		double gap_sum = 0;
+		unsigned int gap_count = 0;
+		for (size_t i = 1; i < sample_size; i++) {
+			sim_time_type gap = nodes[i]->Key - nodes[i - 1]->Key;
+			if (gap <= 2 * average_gap) {
+				gap_sum += gap;
+				gap_count++;
+			}
+		}
+
+		double width = gap_count > 0 ? 3 * gap_sum / gap_count : 1;
+		unsigned int shift = 0;
+		while (shift < 62 && (double)((sim_time_type)1 << shift) < width) {
+			shift++;
+		}
+
+		return shift;
+	}
+
+	void EventCalendar::set_current_bucket(sim_time_type time)
+	{
+		current_bucket = bucket_of(time);
+		current_bucket_top = ((time >> width_shift) + 1) << width_shift;
+	}
+}
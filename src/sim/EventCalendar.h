@@ -0,0 +1,65 @@
+#ifndef EVENT_CALENDAR_H
+#define EVENT_CALENDAR_H
+
+#include <vector>
+#include "Sim_Defs.h"
+#include "Sim_Event.h"
+
+namespace MQSimEngine
+{
+	class EventCalendarNode
+	{
+	public:
+		sim_time_type Key;
+		// Events firing at Key, in registration order
+		Sim_Event* FirstSimEvent;
+		Sim_Event* LastSimEvent;
+		// Next node (larger key) in the same bucket
+		EventCalendarNode* Next;
+	};
+
+	/*
+	* Calendar queue event list (R. Brown, CACM 1988): an alternative to EventTree with amortized O(1)
+	* insert and remove-min. Nodes (one per distinct fire time, as in EventTree) are hashed by
+	* (Key / width) into a circular array of buckets, each a short list sorted by key. Remove-min scans
+	* forward from the bucket of the current simulation time. The bucket array doubles or halves as the
+	* node count grows or shrinks, and the bucket width is then re-estimated from the gaps between the
+	* earliest pending fire times.
+	*/
+	class EventCalendar
+	{
+	public:
+		EventCalendar();
+		~EventCalendar();
+
+		// The number of nodes (distinct fire times) contained in the calendar
+		int Count;
+		void Insert_sim_event(Sim_Event* event);
+		EventCalendarNode* Get_min_node();
+		// Removes a node returned by Get_min_node
+		void Remove(EventCalendarNode* node);
+		void Clear();
+		// Appends the events firing at or after min_key, in no particular order
+		void Get_pending_events(std::vector<Sim_Event*>& events, sim_time_type min_key);
+	private:
+		std::vector<EventCalendarNode*> buckets;
+		unsigned int bucket_mask;
+		// Bucket width is 2^width_shift nanoseconds, so hashing is a shift instead of a division
+		unsigned int width_shift;
+		// The bucket that holds the last minimum, and the (exclusive) end of its time slot
+		unsigned int current_bucket;
+		sim_time_type current_bucket_top;
+		// Removed nodes are reused to avoid one allocation per distinct fire time
+		EventCalendarNode* free_nodes;
+		// Key of the last node returned by Get_min_node, i.e., the current simulation time
+		sim_time_type last_min_key;
+
+		unsigned int bucket_of(sim_time_type key) { return (unsigned int)(key >> width_shift) & bucket_mask; }
+		void insert_node(EventCalendarNode* node);
+		void resize(unsigned int bucket_count);
+		unsigned int estimate_width_shift(std::vector<EventCalendarNode*>& nodes);
+		void set_current_bucket(sim_time_type time);
+	};
+}
+
+#endif // !EVENT_CALENDAR_H
@@ -6,7 +6,7 @@ namespace MQSimEngine
 {
 	class Engine;
 
-	EventTreeNode* EventTree::SentinelNode = NULL;
+	thread_local EventTreeNode* EventTree::SentinelNode = NULL;
 
 	EventTree::EventTree()
 	{
@@ -501,4 +501,25 @@ namespace MQSimEngine
 		rbTree = SentinelNode;
 		Count = 0;
 	}
-}
\ No newline at end of file
+
+	void EventTree::Get_pending_events(std::vector<Sim_Event*>& events, sim_time_type min_key)
+	{
+		collect_events(rbTree, events, min_key);
+	}
+
+	void EventTree::collect_events(EventTreeNode* node, std::vector<Sim_Event*>& events, sim_time_type min_key)
+	{
+		if (node == SentinelNode) {
+			return;
+		}
+		if (node->Key > min_key) {
+			collect_events(node->Left, events, min_key);
+		}
+		if (node->Key >= min_key) {
+			for (Sim_Event* ev = node->FirstSimEvent; ev != NULL; ev = ev->Next_event) {
+				events.push_back(ev);
+			}
+		}
+		collect_events(node->Right, events, min_key);
+	}
+}
@@ -1,6 +1,7 @@
 #ifndef EVENT_TREE_H
 #define EVENT_TREE_H
 
+#include <vector>
 #include "Sim_Defs.h"
 #include "Sim_Event.h"
 
@@ -42,7 +43,7 @@ namespace MQSimEngine
 		// the number of nodes contained in the tree
 		int Count;
 		//  sentinelNode is convenient way of indicating a leaf node.
-		static EventTreeNode* SentinelNode;
+		static thread_local EventTreeNode* SentinelNode;
 		void Add(sim_time_type key, Sim_Event* data);
 		void RotateLeft(EventTreeNode* x);
 		void RotateRight(EventTreeNode* x);
@@ -55,6 +56,7 @@ namespace MQSimEngine
 		void Remove(EventTreeNode* node);
 		void Remove_min();
 		void Clear();
+		void Get_pending_events(std::vector<Sim_Event*>& events, sim_time_type min_key);//Appends the events firing at or after min_key in fire time order
 	private:
 		// the tree
 		EventTreeNode* rbTree;
@@ -63,6 +65,7 @@ namespace MQSimEngine
 		void RestoreAfterInsert(EventTreeNode* x);
 		void Delete(EventTreeNode* z);
 		void Restore_after_delete(EventTreeNode* x);
+		void collect_events(EventTreeNode* node, std::vector<Sim_Event*>& events, sim_time_type min_key);
 	};
 }
 
@@ -0,0 +1,17 @@
+#include "Sim_Event.h"
+#include "../utils/Object_Pool.h"
+
+namespace MQSimEngine
+{
+	static thread_local Utils::Object_Pool sim_event_pool("Sim_Event", sizeof(Sim_Event));
+
+	void* Sim_Event::operator new(size_t size)
+	{
+		return sim_event_pool.Allocate(size);
+	}
+
+	void Sim_Event::operator delete(void* event)
+	{
+		sim_event_pool.Release(event);
+	}
+}
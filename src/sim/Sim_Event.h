@@ -1,6 +1,7 @@
 #ifndef SIMULATOR_EVENT_H
 #define SIMULATOR_EVENT_H
 
+#include <cstddef>
 #include "Sim_Defs.h"
 #include "Sim_Object.h"
 
@@ -18,6 +19,10 @@ namespace MQSimEngine
 		int Type;
 		Sim_Event* Next_event;//Used to store event list in the MQSim's engine
 		bool Ignore;//If true, this event will not be executed
+
+		//Events are allocated from a pool of the simulation thread (see Utils::Object_Pool)
+		static void* operator new(size_t size);
+		static void operator delete(void* event);
 	};
 }
 
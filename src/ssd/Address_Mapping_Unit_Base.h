@@ -9,6 +9,7 @@
 #include "NVM_PHY_ONFI_NVDDR2.h"
 #include "FTL.h"
 #include "Flash_Block_Manager_Base.h"
+#include "../utils/Checkpoint_Stream.h"
 
 namespace SSD_Components
 {
@@ -46,6 +47,8 @@ namespace SSD_Components
 		virtual void Allocate_address_for_preconditioning(const stream_id_type stream_id, std::map<LPA_type, page_status_type>& lpa_list, std::vector<double>& steady_state_distribution) = 0;
 		virtual int Bring_to_CMT_for_preconditioning(stream_id_type stream_id, LPA_type lpa) = 0;//Used for warming up the cached mapping table during preconditioning
 		virtual void Store_mapping_table_on_flash_at_start() = 0; //It should only be invoked at the begenning of the simulation to store mapping table entries on the flash space
+		virtual void Save_checkpoint(Utils::Checkpoint_Writer& writer) = 0;//Only valid when no address translation is in progress
+		virtual void Load_checkpoint(Utils::Checkpoint_Reader& reader) = 0;
 
 		
 		virtual unsigned int Get_cmt_capacity() = 0;//Returns the maximum number of entries that could be stored in the cached mapping table
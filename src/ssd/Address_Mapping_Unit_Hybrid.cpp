@@ -40,6 +40,14 @@ namespace SSD_Components
 	void Address_Mapping_Unit_Hybrid::Convert_ppa_to_address(const PPA_type ppa, NVM::FlashMemory::Physical_Page_Address& address) {}
 	PPA_type Address_Mapping_Unit_Hybrid::Convert_address_to_ppa(const NVM::FlashMemory::Physical_Page_Address& pageAddress) { return 0; }
 	void Address_Mapping_Unit_Hybrid::Store_mapping_table_on_flash_at_start() {}
+	void Address_Mapping_Unit_Hybrid::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		PRINT_ERROR("Checkpoints are not supported with hybrid address mapping")
+	}
+	void Address_Mapping_Unit_Hybrid::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		PRINT_ERROR("Checkpoints are not supported with hybrid address mapping")
+	}
 	void Address_Mapping_Unit_Hybrid::Allocate_new_page_for_gc(NVM_Transaction_Flash_WR* transaction, bool is_translation_page) {}
 	void Address_Mapping_Unit_Hybrid::Set_barrier_for_accessing_physical_block(const NVM::FlashMemory::Physical_Page_Address& block_address) {}
 	void Address_Mapping_Unit_Hybrid::Set_barrier_for_accessing_lpa(stream_id_type stream_id, LPA_type lpa) {}
@@ -28,6 +28,8 @@ namespace SSD_Components
 		void Allocate_new_page_for_gc(NVM_Transaction_Flash_WR* transaction, bool is_translation_page);
 
 		void Store_mapping_table_on_flash_at_start();
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 		LPA_type Get_logical_pages_count(stream_id_type stream_id);
 		NVM::FlashMemory::Physical_Page_Address Convert_ppa_to_address(const PPA_type ppa);
 		void Convert_ppa_to_address(const PPA_type ppn, NVM::FlashMemory::Physical_Page_Address& address);
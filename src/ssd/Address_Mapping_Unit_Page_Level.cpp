@@ -9,31 +9,23 @@
 
 namespace SSD_Components
 {
-	Cached_Mapping_Table::Cached_Mapping_Table(unsigned int capacity) : capacity(capacity)
+	Cached_Mapping_Table::Cached_Mapping_Table(unsigned int capacity) : slots(capacity), capacity(capacity)
 	{
 	}
 
 	Cached_Mapping_Table::~Cached_Mapping_Table()
 	{
-		std::unordered_map<LPA_type, CMTSlotType*> addressMap;
-		std::list<std::pair<LPA_type, CMTSlotType*>> lruList;
-
-		auto entry = addressMap.begin();
-		while (entry != addressMap.end()) {
-			delete (*entry).second;
-			addressMap.erase(entry++);
-		}
 	}
 
 	inline bool Cached_Mapping_Table::Exists(const stream_id_type streamID, const LPA_type lpa)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpa);
-		auto it = addressMap.find(key);
-		if (it == addressMap.end()) {
+		uint32_t slot = slots.Find(key);
+		if (slot == slots.NIL) {
 			DEBUG("Address mapping table query - Stream ID:" << streamID << ", LPA:" << lpa << ", MISS")
 				return false;
 		}
-		if (it->second->Status != CMTEntryStatus::VALID) {
+		if (slots[slot].Status != CMTEntryStatus::VALID) {
 			DEBUG("Address mapping table query - Stream ID:" << streamID << ", LPA:" << lpa << ", MISS")
 			return false;
 		}
@@ -45,58 +37,60 @@ namespace SSD_Components
 	PPA_type Cached_Mapping_Table::Retrieve_ppa(const stream_id_type streamID, const LPA_type lpn)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpn);
-		auto it = addressMap.find(key);
-		assert(it != addressMap.end());
-		assert(it->second->Status == CMTEntryStatus::VALID);
-		lruList.splice(lruList.begin(), lruList, it->second->listPtr);
+		uint32_t slot = slots.Find(key);
+		assert(slot != slots.NIL);
+		assert(slots[slot].Status == CMTEntryStatus::VALID);
+		slots.Move_to_front(slot);
 		
-		return it->second->PPA;
+		return slots[slot].PPA;
 	}
 
 	page_status_type Cached_Mapping_Table::Get_bitmap_vector_of_written_sectors(const stream_id_type streamID, const LPA_type lpn)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpn);
-		auto it = addressMap.find(key);
-		assert(it != addressMap.end());
-		assert(it->second->Status == CMTEntryStatus::VALID);
+		uint32_t slot = slots.Find(key);
+		assert(slot != slots.NIL);
+		assert(slots[slot].Status == CMTEntryStatus::VALID);
 
-		return it->second->WrittenStateBitmap;
+		return slots[slot].WrittenStateBitmap;
 	}
 
 	void Cached_Mapping_Table::Update_mapping_info(const stream_id_type streamID, const LPA_type lpa, const PPA_type ppa, const page_status_type pageWriteState)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpa);
-		auto it = addressMap.find(key);
-		assert(it != addressMap.end());
-		assert(it->second->Status == CMTEntryStatus::VALID);
-		it->second->PPA = ppa;
-		it->second->WrittenStateBitmap = pageWriteState;
-		it->second->Dirty = true;
-		it->second->Stream_id = streamID;
+		uint32_t slot = slots.Find(key);
+		assert(slot != slots.NIL);
+		CMTSlotType& cmtEnt = slots[slot];
+		assert(cmtEnt.Status == CMTEntryStatus::VALID);
+		cmtEnt.PPA = ppa;
+		cmtEnt.WrittenStateBitmap = pageWriteState;
+		cmtEnt.Dirty = true;
+		cmtEnt.Stream_id = streamID;
 		DEBUG("Address mapping table update entry - Stream ID:" << streamID << ", LPA:" << lpa << ", PPA:" << ppa)
 	}
 
 	void Cached_Mapping_Table::Insert_new_mapping_info(const stream_id_type streamID, const LPA_type lpa, const PPA_type ppa, const unsigned long long pageWriteState)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpa);
-		auto it = addressMap.find(key);
-		if (it == addressMap.end()) {
+		uint32_t slot = slots.Find(key);
+		if (slot == slots.NIL) {
 			throw std::logic_error("No slot is reserved!");
 		}
 
-		it->second->Status = CMTEntryStatus::VALID;
-		it->second->PPA = ppa;
-		it->second->WrittenStateBitmap = pageWriteState;
-		it->second->Dirty = false;
-		it->second->Stream_id = streamID;
+		CMTSlotType& cmtEnt = slots[slot];
+		cmtEnt.Status = CMTEntryStatus::VALID;
+		cmtEnt.PPA = ppa;
+		cmtEnt.WrittenStateBitmap = pageWriteState;
+		cmtEnt.Dirty = false;
+		cmtEnt.Stream_id = streamID;
 		DEBUG("Address mapping table insert entry - Stream ID:" << streamID << ", LPA:" << lpa << ", PPA:" << ppa)
 	}
 	bool Cached_Mapping_Table::Is_slot_reserved_for_lpn_and_waiting(const stream_id_type streamID, const LPA_type lpn)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpn);
-		auto it = addressMap.find(key);
-		if (it != addressMap.end()) {
-			if (it->second->Status == CMTEntryStatus::WAITING) {
+		uint32_t slot = slots.Find(key);
+		if (slot != slots.NIL) {
+			if (slots[slot].Status == CMTEntryStatus::WAITING) {
 				return true;
 			}
 		}
@@ -106,37 +100,33 @@ namespace SSD_Components
 
 	inline bool Cached_Mapping_Table::Check_free_slot_availability()
 	{
-		return addressMap.size() < capacity;
+		return slots.Size() < capacity;
 	}
 	
 	void Cached_Mapping_Table::Reserve_slot_for_lpn(const stream_id_type streamID, const LPA_type lpn)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpn);
 
-		if (addressMap.find(key) != addressMap.end()) {
+		if (slots.Find(key) != slots.NIL) {
 			throw std::logic_error("Duplicate lpa insertion into CMT!");
 		}
-		if (addressMap.size() >= capacity) {
+		if (slots.Size() >= capacity) {
 			throw std::logic_error("CMT overfull!");
 		}
 
-		CMTSlotType* cmtEnt = new CMTSlotType();
-		cmtEnt->Dirty = false;
-		cmtEnt->Stream_id = streamID;
-		lruList.push_front(std::pair<LPA_type, CMTSlotType*>(key, cmtEnt));
-		cmtEnt->Status = CMTEntryStatus::WAITING;
-		cmtEnt->listPtr = lruList.begin();
-		addressMap[key] = cmtEnt;
+		CMTSlotType& cmtEnt = slots[slots.Insert_front(key)];
+		cmtEnt.Dirty = false;
+		cmtEnt.Stream_id = streamID;
+		cmtEnt.Status = CMTEntryStatus::WAITING;
 	}
 
 	CMTSlotType Cached_Mapping_Table::Evict_one_slot(LPA_type& lpa)
 	{
-		assert(addressMap.size() > 0);
-		addressMap.erase(lruList.back().first);
-		lpa = UNIQUE_KEY_TO_LPN(lruList.back().second->Stream_id,lruList.back().first);
-		CMTSlotType evictedItem = *lruList.back().second;
-		delete lruList.back().second;
-		lruList.pop_back();
+		assert(slots.Size() > 0);
+		uint32_t slot = slots.Back();
+		CMTSlotType evictedItem = slots[slot];
+		lpa = UNIQUE_KEY_TO_LPN(evictedItem.Stream_id, slots.Key(slot));
+		slots.Remove(slot);
 	
 		return evictedItem;
 	}
@@ -144,27 +134,60 @@ namespace SSD_Components
 	bool Cached_Mapping_Table::Is_dirty(const stream_id_type streamID, const LPA_type lpa)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpa);
-		auto it = addressMap.find(key);
-		if (it == addressMap.end())
+		uint32_t slot = slots.Find(key);
+		if (slot == slots.NIL)
 		{
 			throw std::logic_error("The requested slot does not exist!");
 		}
 
-		return it->second->Dirty;
+		return slots[slot].Dirty;
 	}
 
 	void Cached_Mapping_Table::Make_clean(const stream_id_type streamID, const LPA_type lpn)
 	{
 		LPA_type key = LPN_TO_UNIQUE_KEY(streamID, lpn);
-		auto it = addressMap.find(key);
-		if (it == addressMap.end()) {
+		uint32_t slot = slots.Find(key);
+		if (slot == slots.NIL) {
 			throw std::logic_error("The requested slot does not exist!");
 		}
 
-		it->second->Dirty = false;
+		slots[slot].Dirty = false;
 	}
 
 
+	void Cached_Mapping_Table::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		writer.Write(capacity);
+		writer.Write((uint64_t)slots.Size());
+		for (uint32_t slot = slots.Front(); slot != slots.NIL; slot = slots.Next(slot)) {
+			const CMTSlotType& cmtEnt = slots[slot];
+			if (cmtEnt.Status != CMTEntryStatus::VALID) {
+				PRINT_ERROR("A checkpoint cannot be taken while mapping entries are being read from flash")
+			}
+			writer.Write(slots.Key(slot));
+			writer.Write(cmtEnt.PPA);
+			writer.Write(cmtEnt.WrittenStateBitmap);
+			writer.Write(cmtEnt.Dirty);
+			writer.Write(cmtEnt.Stream_id);
+		}
+	}
+
+	void Cached_Mapping_Table::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		reader.Expect(capacity, "the CMT capacity in entries");
+		slots.Clear();
+		uint64_t entry_count = reader.Read<uint64_t>();
+		for (uint64_t i = 0; i < entry_count; i++) {
+			LPA_type key = reader.Read<LPA_type>();
+			CMTSlotType& cmtEnt = slots[slots.Insert_back(key)];
+			cmtEnt.PPA = reader.Read<PPA_type>();
+			cmtEnt.WrittenStateBitmap = reader.Read<unsigned long long>();
+			cmtEnt.Dirty = reader.Read<bool>();
+			cmtEnt.Stream_id = reader.Read<stream_id_type>();
+			cmtEnt.Status = CMTEntryStatus::VALID;
+		}
+	}
+
 	AddressMappingDomain::AddressMappingDomain(unsigned int cmt_capacity, unsigned int cmt_entry_size, unsigned int no_of_translation_entries_per_page,
 		Cached_Mapping_Table* CMT,
 		Flash_Plane_Allocation_Scheme_Type PlaneAllocationScheme,
@@ -289,7 +312,7 @@ namespace SSD_Components
 		}
 	}
 
-	Address_Mapping_Unit_Page_Level* Address_Mapping_Unit_Page_Level::_my_instance = NULL;
+	thread_local Address_Mapping_Unit_Page_Level* Address_Mapping_Unit_Page_Level::_my_instance = NULL;
 	Address_Mapping_Unit_Page_Level::Address_Mapping_Unit_Page_Level(const sim_object_id_type& id, FTL* ftl, NVM_PHY_ONFI* flash_controller, Flash_Block_Manager_Base* block_manager,
 		bool ideal_mapping_table, unsigned int cmt_capacity_in_byte, Flash_Plane_Allocation_Scheme_Type PlaneAllocationScheme,
 		unsigned int concurrent_stream_no,
@@ -1425,6 +1448,44 @@ namespace SSD_Components
 		return (MVPN_type)(mvpn * no_of_translation_entries_per_page + no_of_translation_entries_per_page - 1);
 	}
 
+	void Address_Mapping_Unit_Page_Level::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		writer.Write_tag("Address_Mapping_Unit_Page_Level");
+		writer.Write(no_of_input_streams);
+		writer.Write(mapping_table_stored_on_flash);
+		for (unsigned int stream_id = 0; stream_id < no_of_input_streams; stream_id++) {
+			AddressMappingDomain* domain = domains[stream_id];
+			if (domain->Waiting_unmapped_read_transactions.size() > 0 || domain->Waiting_unmapped_program_transactions.size() > 0
+				|| domain->ArrivingMappingEntries.size() > 0 || domain->DepartingMappingEntries.size() > 0
+				|| domain->Locked_LPAs.size() > 0 || domain->Locked_MVPNs.size() > 0
+				|| domain->Read_transactions_behind_LPA_barrier.size() > 0 || domain->Write_transactions_behind_LPA_barrier.size() > 0) {
+				PRINT_ERROR("A checkpoint cannot be taken while address translations are in progress")
+			}
+			writer.Write(domain->Total_logical_pages_no);
+			writer.Write(domain->Total_translation_pages_no);
+			writer.Write(domain->No_of_inserted_entries_in_preconditioning);
+			writer.Write_array(domain->GlobalMappingTable, domain->Total_logical_pages_no);
+			writer.Write_array(domain->GlobalTranslationDirectory, domain->Total_translation_pages_no + 1);
+			domain->CMT->Save_checkpoint(writer);
+		}
+	}
+
+	void Address_Mapping_Unit_Page_Level::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		reader.Expect_tag("Address_Mapping_Unit_Page_Level");
+		reader.Expect(no_of_input_streams, "the number of I/O flows");
+		mapping_table_stored_on_flash = reader.Read<bool>();
+		for (unsigned int stream_id = 0; stream_id < no_of_input_streams; stream_id++) {
+			AddressMappingDomain* domain = domains[stream_id];
+			reader.Expect(domain->Total_logical_pages_no, "the number of logical pages of a flow");
+			reader.Expect(domain->Total_translation_pages_no, "the number of translation pages of a flow");
+			domain->No_of_inserted_entries_in_preconditioning = reader.Read<unsigned int>();
+			reader.Read_array(domain->GlobalMappingTable, domain->Total_logical_pages_no);
+			reader.Read_array(domain->GlobalTranslationDirectory, domain->Total_translation_pages_no + 1);
+			domain->CMT->Load_checkpoint(reader);
+		}
+	}
+
 	LPA_type Address_Mapping_Unit_Page_Level::Get_logical_pages_count(stream_id_type stream_id)
 	{
 		return this->domains[stream_id]->Total_logical_pages_no;
@@ -11,6 +11,7 @@
 #include "SSD_Defs.h"
 #include "NVM_Transaction_Flash_RD.h"
 #include "NVM_Transaction_Flash_WR.h"
+#include "../utils/LRU_Table.h"
 
 namespace SSD_Components
 {
@@ -30,7 +31,6 @@ namespace SSD_Components
 		unsigned long long WrittenStateBitmap;
 		bool Dirty;
 		CMTEntryStatus Status;
-		std::list<std::pair<LPA_type, CMTSlotType*>>::iterator listPtr;//used for fast implementation of LRU
 		stream_id_type Stream_id;
 	};
 
@@ -59,9 +59,10 @@ namespace SSD_Components
 		
 		bool Is_dirty(const stream_id_type streamID, const LPA_type lpa);
 		void Make_clean(const stream_id_type streamID, const LPA_type lpa);
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);//Entries are stored from the most to the least recently used
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 	private:
-		std::unordered_map<LPA_type, CMTSlotType*> addressMap;
-		std::list<std::pair<LPA_type, CMTSlotType*>> lruList;
+		Utils::LRU_Table<CMTSlotType> slots;//Keyed by LPN_TO_UNIQUE_KEY(stream, lpa)
 		unsigned int capacity;
 	};
 
@@ -156,6 +157,8 @@ namespace SSD_Components
 		void Allocate_new_page_for_gc(NVM_Transaction_Flash_WR* transaction, bool is_translation_page);
 
 		void Store_mapping_table_on_flash_at_start();
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 		LPA_type Get_logical_pages_count(stream_id_type stream_id);
 		NVM::FlashMemory::Physical_Page_Address Convert_ppa_to_address(const PPA_type ppa);
 		void Convert_ppa_to_address(const PPA_type ppn, NVM::FlashMemory::Physical_Page_Address& address);
@@ -168,7 +171,7 @@ namespace SSD_Components
 		void Remove_barrier_for_accessing_mvpn(stream_id_type stream_id, MVPN_type mpvn);
 		void Start_servicing_writes_for_overfull_plane(const NVM::FlashMemory::Physical_Page_Address plane_address);
 	private:
-		static Address_Mapping_Unit_Page_Level* _my_instance;
+		static thread_local Address_Mapping_Unit_Page_Level* _my_instance;
 		unsigned int cmt_capacity;
 		AddressMappingDomain** domains;
 		unsigned int CMT_entry_size, GTD_entry_size;//In CMT MQSim stores (lpn, ppn, page status bits) but in GTD it only stores (ppn, page status bits)
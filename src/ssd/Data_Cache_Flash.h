@@ -1,13 +1,13 @@
 #ifndef DATA_CACHE_FLASH_H
 #define DATA_CACHE_FLASH_H
 
-#include <list>
 #include <queue>
-#include <unordered_map>
 #include "../nvm_chip/flash_memory/FlashTypes.h"
 #include "SSD_Defs.h"
 #include "Data_Cache_Manager_Base.h"
 #include "NVM_Transaction_Flash.h"
+#include "../utils/Checkpoint_Stream.h"
+#include "../utils/LRU_Table.h"
 
 namespace SSD_Components
 {
@@ -19,7 +19,6 @@ namespace SSD_Components
 		data_cache_content_type Content;
 		data_timestamp_type Timestamp;
 		Cache_Slot_Status Status;
-		std::list<std::pair<LPA_type, Data_Cache_Slot_Type*>>::iterator lru_list_ptr;//used for fast implementation of LRU
 	};
 
 	enum class Data_Cache_Simulation_Event_Type {
@@ -55,9 +54,10 @@ namespace SSD_Components
 		void Insert_read_data(const stream_id_type stream_id, const LPA_type lpn, const data_cache_content_type content, const data_timestamp_type timestamp, const page_status_type state_bitmap_of_read_sectors);
 		void Insert_write_data(const stream_id_type stream_id, const LPA_type lpn, const data_cache_content_type content, const data_timestamp_type timestamp, const page_status_type state_bitmap_of_write_sectors);
 		void Update_data(const stream_id_type stream_id, const LPA_type lpn, const data_cache_content_type content, const data_timestamp_type timestamp, const page_status_type state_bitmap_of_write_sectors);
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);//Slots are stored from the most to the least recently used
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 	private:
-		std::unordered_map<LPA_type, Data_Cache_Slot_Type*> slots;
-		std::list<std::pair<LPA_type, Data_Cache_Slot_Type*>> lru_list;
+		Utils::LRU_Table<Data_Cache_Slot_Type> slots;//Keyed by LPN_TO_UNIQUE_KEY(stream, lpn)
 		unsigned int capacity_in_pages;
 	};
 }
@@ -3,8 +3,8 @@
 
 namespace SSD_Components
 {
-	Data_Cache_Manager_Base* Data_Cache_Manager_Base::_my_instance = NULL;
-	Caching_Mode* Data_Cache_Manager_Base::caching_mode_per_input_stream;
+	thread_local Data_Cache_Manager_Base* Data_Cache_Manager_Base::_my_instance = NULL;
+	thread_local Caching_Mode* Data_Cache_Manager_Base::caching_mode_per_input_stream;
 
 	Data_Cache_Manager_Base::Data_Cache_Manager_Base(const sim_object_id_type& id, Host_Interface_Base* host_interface, NVM_Firmware* nvm_firmware,
 		unsigned int dram_row_size, unsigned int dram_data_rate, unsigned int dram_busrt_size, sim_time_type dram_tRCD, sim_time_type dram_tCL, sim_time_type dram_tRP,
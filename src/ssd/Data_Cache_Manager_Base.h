@@ -8,6 +8,7 @@
 #include "NVM_Firmware.h"
 #include "NVM_PHY_ONFI.h"
 #include "../utils/Workload_Statistics.h"
+#include "../utils/Checkpoint_Stream.h"
 
 namespace SSD_Components
 {
@@ -37,8 +38,10 @@ namespace SSD_Components
 		void Connect_to_user_memory_transaction_serviced_signal(MemoryTransactionServicedSignalHanderType);
 		void Set_host_interface(Host_Interface_Base* host_interface);
 		virtual void Do_warmup(std::vector<Utils::Workload_Statistics*> workload_stats) = 0;
+		virtual void Save_checkpoint(Utils::Checkpoint_Writer& writer) = 0;//Only valid when no DRAM access is in progress
+		virtual void Load_checkpoint(Utils::Checkpoint_Reader& reader) = 0;
 	protected:
-		static Data_Cache_Manager_Base* _my_instance;
+		static thread_local Data_Cache_Manager_Base* _my_instance;
 		Host_Interface_Base* host_interface;
 		NVM_Firmware* nvm_firmware;
 		unsigned int dram_row_size;//The size of the DRAM rows in bytes
@@ -47,7 +50,7 @@ namespace SSD_Components
 		double dram_burst_transfer_time_ddr;//The transfer time of two bursts, changed from sim_time_type to double to increase precision
 		sim_time_type dram_tRCD, dram_tCL, dram_tRP;//DRAM access parameters in nano-seconds
 		Cache_Sharing_Mode sharing_mode;
-		static Caching_Mode* caching_mode_per_input_stream;
+		static thread_local Caching_Mode* caching_mode_per_input_stream;
 		unsigned int stream_count;
 
 		std::vector<UserRequestServicedSignalHanderType> connected_user_request_serviced_signal_handlers;
@@ -97,6 +97,50 @@ namespace SSD_Components
 		flash_controller->ConnectToTransactionServicedSignal(handle_transaction_serviced_signal_from_PHY);
 	}
 
+	void Data_Cache_Manager_Flash_Advanced::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		writer.Write_tag("Data_Cache_Manager_Flash_Advanced");
+		unsigned int queue_count = (shared_dram_request_queue ? 1 : stream_count);
+		for (unsigned int i = 0; i < queue_count; i++) {
+			if (dram_execution_queue[i].size() > 0 || waiting_user_requests_queue_for_dram_free_slot[i].size() > 0) {
+				PRINT_ERROR("A checkpoint cannot be taken while DRAM accesses are in progress")
+			}
+		}
+		for (unsigned int stream_id = 0; stream_id < stream_count; stream_id++) {
+			if (stream_id == 0 || per_stream_cache[stream_id] != per_stream_cache[0]) {
+				per_stream_cache[stream_id]->Save_checkpoint(writer);
+			}
+		}
+		writer.Write_array(back_pressure_buffer_depth, queue_count);
+		for (unsigned int stream_id = 0; stream_id < stream_count; stream_id++) {
+			writer.Write((uint64_t)bloom_filter[stream_id].size());
+			for (auto lpa : bloom_filter[stream_id]) {
+				writer.Write(lpa);
+			}
+		}
+		writer.Write(next_bloom_filter_reset_milestone);
+	}
+
+	void Data_Cache_Manager_Flash_Advanced::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		reader.Expect_tag("Data_Cache_Manager_Flash_Advanced");
+		unsigned int queue_count = (shared_dram_request_queue ? 1 : stream_count);
+		for (unsigned int stream_id = 0; stream_id < stream_count; stream_id++) {
+			if (stream_id == 0 || per_stream_cache[stream_id] != per_stream_cache[0]) {
+				per_stream_cache[stream_id]->Load_checkpoint(reader);
+			}
+		}
+		reader.Read_array(back_pressure_buffer_depth, queue_count);
+		for (unsigned int stream_id = 0; stream_id < stream_count; stream_id++) {
+			bloom_filter[stream_id].clear();
+			uint64_t size = reader.Read<uint64_t>();
+			for (uint64_t i = 0; i < size; i++) {
+				bloom_filter[stream_id].insert(reader.Read<LPA_type>());
+			}
+		}
+		next_bloom_filter_reset_milestone = reader.Read<sim_time_type>();
+	}
+
 	void Data_Cache_Manager_Flash_Advanced::Do_warmup(std::vector<Utils::Workload_Statistics*> workload_stats)
 	{
 		double total_write_arrival_rate = 0, total_read_arrival_rate = 0;
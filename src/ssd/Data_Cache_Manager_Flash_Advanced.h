@@ -38,6 +38,8 @@ namespace SSD_Components
 		void Execute_simulator_event(MQSimEngine::Sim_Event* ev);
 		void Setup_triggers();
 		void Do_warmup(std::vector<Utils::Workload_Statistics*> workload_stats);
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 	private:
 		NVM_PHY_ONFI * flash_controller;
 		unsigned int capacity_in_bytes, capacity_in_pages;
@@ -46,6 +46,38 @@ namespace SSD_Components
 		flash_controller->ConnectToTransactionServicedSignal(handle_transaction_serviced_signal_from_PHY);
 	}
 
+	void Data_Cache_Manager_Flash_Simple::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		writer.Write_tag("Data_Cache_Manager_Flash_Simple");
+		if (dram_execution_queue->size() > 0 || waiting_user_requests_queue_for_dram_free_slot->size() > 0) {
+			PRINT_ERROR("A checkpoint cannot be taken while DRAM accesses are in progress")
+		}
+		data_cache->Save_checkpoint(writer);
+		writer.Write(back_pressure_buffer_depth);
+		for (unsigned int stream_id = 0; stream_id < stream_count; stream_id++) {
+			writer.Write((uint64_t)bloom_filter[stream_id].size());
+			for (auto lpa : bloom_filter[stream_id]) {
+				writer.Write(lpa);
+			}
+		}
+		writer.Write(next_bloom_filter_reset_milestone);
+	}
+
+	void Data_Cache_Manager_Flash_Simple::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		reader.Expect_tag("Data_Cache_Manager_Flash_Simple");
+		data_cache->Load_checkpoint(reader);
+		back_pressure_buffer_depth = reader.Read<unsigned int>();
+		for (unsigned int stream_id = 0; stream_id < stream_count; stream_id++) {
+			bloom_filter[stream_id].clear();
+			uint64_t size = reader.Read<uint64_t>();
+			for (uint64_t i = 0; i < size; i++) {
+				bloom_filter[stream_id].insert(reader.Read<LPA_type>());
+			}
+		}
+		next_bloom_filter_reset_milestone = reader.Read<sim_time_type>();
+	}
+
 	void Data_Cache_Manager_Flash_Simple::Do_warmup(std::vector<Utils::Workload_Statistics*> workload_stats)
 	{
 	}
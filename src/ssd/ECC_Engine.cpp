@@ -1,5 +1,8 @@
 #include "ECC_Engine.h"
+#include <algorithm>
 #include <cmath>
+#include <cstring>
+#include <limits>
 
 namespace SSD_Components
 {
@@ -12,10 +15,54 @@ namespace SSD_Components
 		beta(beta), m(m), n(n),
 		gamma(gamma), p(p), q(q),
 		page_size_in_bits(page_size_in_bits), correction_capability(correction_capability),
-		decode_latency(decode_latency), max_retries(max_retries)
+		decode_latency(decode_latency), max_retries(max_retries),
+		use_lookup_table(false), retention_bucket_shift(0), validation_interval(0),
+		last_key(0), last_steps(NULL), table_lookups(0), table_validations(0), table_mismatches(0)
 	{
 	}
 
+	void ECC_Engine::Enable_lookup_table(unsigned int retention_precision_bits, unsigned int validation_interval)
+	{
+		// The step thresholds only exist if RBER grows monotonically with the read count
+		if (gamma < 0 || q <= 0) {
+			PRINT_MESSAGE("ECC RBER lookup table needs gamma >= 0 and q > 0, using the exact RBER model")
+			return;
+		}
+		if (retention_precision_bits > 20) {
+			retention_precision_bits = 20;
+		}
+		use_lookup_table = true;
+		retention_bucket_shift = 52 - retention_precision_bits;
+		this->validation_interval = validation_interval;
+		read_count_steps.clear();
+		last_steps = NULL;
+	}
+
+	bool ECC_Engine::Lookup_table_enabled()
+	{
+		return use_lookup_table;
+	}
+
+	unsigned long long ECC_Engine::Table_lookups()
+	{
+		return table_lookups;
+	}
+
+	unsigned long long ECC_Engine::Table_validations()
+	{
+		return table_validations;
+	}
+
+	unsigned long long ECC_Engine::Table_mismatches()
+	{
+		return table_mismatches;
+	}
+
+	size_t ECC_Engine::Table_entries()
+	{
+		return read_count_steps.size();
+	}
+
 	double ECC_Engine::Calculate_RBER(unsigned int pe_cycles, double retention_time_hours, double avg_reads_per_page)
 	{
 		// Power-law RBER model: RBER = epsilon + wear-out + retention loss + read disturb
@@ -29,7 +76,117 @@ namespace SSD_Components
 		return rber;
 	}
 
+	double ECC_Engine::Effective_capability(unsigned int retry)
+	{
+		if (retry == 0) {
+			return correction_capability;
+		}
+		return correction_capability * (1.0 + 0.5 * retry);
+	}
+
+	uint64_t ECC_Engine::Retention_bucket(double retention_time_hours)
+	{
+		// Geometric buckets straight from the IEEE-754 bits: exponent plus the top
+		// mantissa bits, so every bucket has the same relative width and no log() is needed.
+		// Bucket 0 is reserved for zero retention.
+		if (!(retention_time_hours > 0)) {
+			return 0;
+		}
+		uint64_t bits;
+		std::memcpy(&bits, &retention_time_hours, sizeof(bits));
+		return (bits >> retention_bucket_shift) + 1;
+	}
+
+	double ECC_Engine::Retention_bucket_upper_edge(uint64_t retention_bucket)
+	{
+		if (retention_bucket == 0) {
+			return 0;
+		}
+		// First value of the next bucket: never below any retention time mapped to this one
+		uint64_t bits = retention_bucket << retention_bucket_shift;
+		double hours;
+		std::memcpy(&hours, &bits, sizeof(hours));
+		return hours;
+	}
+
+	double ECC_Engine::Largest_correctable_read_count(unsigned int pe_cycles, double retention_time_hours, unsigned int retry)
+	{
+		double capability = Effective_capability(retry);
+		double base_rber = Calculate_RBER(pe_cycles, retention_time_hours, 0);
+		if (base_rber * page_size_in_bits > capability) {
+			return -1; // Not correctable at this level even without reads
+		}
+		double read_slope = gamma * pow(pe_cycles, p);
+		if (read_slope <= 0) {
+			return std::numeric_limits<double>::infinity(); // Read count has no effect
+		}
+
+		// Closed-form inverse of the read-disturb term, then settle on the largest
+		// integer read count the exact model still corrects at this level
+		double headroom = std::max(0.0, capability / page_size_in_bits - base_rber);
+		double reads = floor(pow(headroom / read_slope, 1.0 / q));
+		if (!(reads < 9007199254740992.0)) {
+			return std::numeric_limits<double>::infinity();
+		}
+		while (reads > 0 && Calculate_RBER(pe_cycles, retention_time_hours, reads) * page_size_in_bits > capability) {
+			reads--;
+		}
+		while (Calculate_RBER(pe_cycles, retention_time_hours, reads + 1) * page_size_in_bits <= capability) {
+			reads++;
+		}
+
+		return reads;
+	}
+
+	const std::vector<double>& ECC_Engine::Get_read_count_steps(unsigned int pe_cycles, uint64_t retention_bucket)
+	{
+		uint64_t key = ((uint64_t)pe_cycles << 32) | retention_bucket;
+		if (last_steps != NULL && key == last_key) {
+			return *last_steps;
+		}
+
+		auto entry = read_count_steps.find(key);
+		if (entry == read_count_steps.end()) {
+			double hours = Retention_bucket_upper_edge(retention_bucket);
+			std::vector<double> steps(max_retries + 1);
+			for (unsigned int retry = 0; retry <= max_retries; retry++) {
+				steps[retry] = Largest_correctable_read_count(pe_cycles, hours, retry);
+			}
+			entry = read_count_steps.emplace(key, steps).first;
+		}
+
+		last_key = key;
+		last_steps = &entry->second;
+		return entry->second;
+	}
+
 	int ECC_Engine::Attempt_correction(unsigned int pe_cycles, double retention_time_hours, double avg_reads_per_page)
+	{
+		if (!use_lookup_table) {
+			return Attempt_correction_exact(pe_cycles, retention_time_hours, avg_reads_per_page);
+		}
+
+		const std::vector<double>& steps = Get_read_count_steps(pe_cycles, Retention_bucket(retention_time_hours));
+		int retry_count = -1;
+		for (unsigned int retry = 0; retry <= max_retries; retry++) {
+			if (avg_reads_per_page <= steps[retry]) {
+				retry_count = (int)retry;
+				break;
+			}
+		}
+
+		table_lookups++;
+		if (validation_interval > 0 && table_lookups % validation_interval == 0) {
+			table_validations++;
+			if (retry_count != Attempt_correction_exact(pe_cycles, retention_time_hours, avg_reads_per_page)) {
+				table_mismatches++;
+			}
+		}
+
+		return retry_count;
+	}
+
+	int ECC_Engine::Attempt_correction_exact(unsigned int pe_cycles, double retention_time_hours, double avg_reads_per_page)
 	{
 		double rber = Calculate_RBER(pe_cycles, retention_time_hours, avg_reads_per_page);
 		double expected_errors = rber * page_size_in_bits;
@@ -1,6 +1,8 @@
 #ifndef ECC_ENGINE_H
 #define ECC_ENGINE_H
 
+#include <unordered_map>
+#include <vector>
 #include "../sim/Sim_Defs.h"
 
 namespace SSD_Components
@@ -26,6 +28,26 @@ namespace SSD_Components
 		// Returns total ECC decode latency in nanoseconds based on retry count.
 		// retry_count=0 means first-pass decode; each retry adds decode_latency.
 		sim_time_type Get_ECC_latency(int retry_count);
+		unsigned int Get_max_retries() { return max_retries; }
+
+		// Largest integer read count a read still passes with at most retry soft-decode retries
+		// (-1 if it fails even without reads, +inf if reads do not matter). Assumes gamma >= 0 and q > 0,
+		// i.e., RBER grows with the read count.
+		double Largest_correctable_read_count(unsigned int pe_cycles, double retention_time_hours, unsigned int retry);
+
+		// Switches Attempt_correction to the tabulated mode: for each (pe_cycles, retention bucket)
+		// pair the read counts at which the retry count steps up are computed once and cached, so a
+		// read costs a hash lookup and a few comparisons instead of the pow() calls of Calculate_RBER.
+		// Retention time is bucketed geometrically with retention_precision_bits mantissa bits
+		// (relative bucket width 2^-bits) and rounded up to the bucket edge, which is conservative;
+		// for integer read counts the decision is exact at zero retention and at bucket edges.
+		// validation_interval > 0 also runs the exact path on every N-th read and counts mismatches.
+		void Enable_lookup_table(unsigned int retention_precision_bits, unsigned int validation_interval);
+		bool Lookup_table_enabled();
+		unsigned long long Table_lookups();
+		unsigned long long Table_validations();
+		unsigned long long Table_mismatches();
+		size_t Table_entries();
 
 	private:
 		// Power-law RBER model coefficients
@@ -40,6 +62,22 @@ namespace SSD_Components
 		unsigned int max_retries;           // Max soft-decode retries before failure
 
 		double Calculate_RBER(unsigned int pe_cycles, double retention_time_hours, double avg_reads_per_page);
+		int Attempt_correction_exact(unsigned int pe_cycles, double retention_time_hours, double avg_reads_per_page);
+
+		// Tabulated mode
+		bool use_lookup_table;
+		unsigned int retention_bucket_shift;
+		unsigned int validation_interval;
+		// Key: pe_cycles << 32 | retention bucket. Value: for each retry level 0..max_retries,
+		// the largest read count that level still corrects (-1 if none, +inf if all)
+		std::unordered_map<uint64_t, std::vector<double>> read_count_steps;
+		uint64_t last_key;
+		const std::vector<double>* last_steps;
+		unsigned long long table_lookups, table_validations, table_mismatches;
+		const std::vector<double>& Get_read_count_steps(unsigned int pe_cycles, uint64_t retention_bucket);
+		uint64_t Retention_bucket(double retention_time_hours);
+		double Retention_bucket_upper_edge(uint64_t retention_bucket);
+		double Effective_capability(unsigned int retry);
 	};
 }
 
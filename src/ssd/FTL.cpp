@@ -46,6 +46,13 @@ namespace SSD_Components
 			Flash_Parameter_Set::IFP_ECC_Decode_Latency,     // decode_latency (from XML config)
 			Flash_Parameter_Set::IFP_ECC_Max_Retries         // max_retries (from XML config)
 		);
+		if (Flash_Parameter_Set::ECC_RBER_Table_Enabled) {
+			ECC->Enable_lookup_table(Flash_Parameter_Set::ECC_RBER_Table_Retention_Bits,
+				Flash_Parameter_Set::ECC_RBER_Table_Validation_Interval);
+		}
+
+		// Fast-forward support for replayed traces; idle until a trace flow starts recording
+		Fast_Forward = new Fast_Forward_Unit(ECC, Flash_Parameter_Set::Read_Reclaim_Threshold);
 
 		// IFP Aggregation Unit: controller-level mode, 100ns DRAM access per partial result
 		Aggregation_Unit = new IFP_Aggregation_Unit(IFP_Aggregation_Mode::CONTROLLER_LEVEL, 100);
@@ -55,6 +62,7 @@ namespace SSD_Components
 	{
 		Stats::Clear_stats(channel_no, chip_no_per_channel, die_no_per_chip, plane_no_per_die, block_no_per_plane, page_no_per_block, max_allowed_block_erase_count);
 		delete ECC;
+		delete Fast_Forward;
 		delete Aggregation_Unit;
 	}
 
@@ -931,6 +939,34 @@ namespace SSD_Components
 		val = std::to_string(Stats::Total_read_reclaim_migrations);
 		xmlwriter.Write_attribute_string_inline(attr, val);
 
+		if (ECC->Lookup_table_enabled()) {
+			attr = "ECC_Table_Entries";
+			val = std::to_string(ECC->Table_entries());
+			xmlwriter.Write_attribute_string_inline(attr, val);
+
+			attr = "ECC_Table_Lookups";
+			val = std::to_string(ECC->Table_lookups());
+			xmlwriter.Write_attribute_string_inline(attr, val);
+
+			attr = "ECC_Table_Validations";
+			val = std::to_string(ECC->Table_validations());
+			xmlwriter.Write_attribute_string_inline(attr, val);
+
+			attr = "ECC_Table_Mismatches";
+			val = std::to_string(ECC->Table_mismatches());
+			xmlwriter.Write_attribute_string_inline(attr, val);
+		}
+
+		if (Fast_Forward->Is_recording()) {
+			attr = "Fast_Forward_Count";
+			val = std::to_string(Fast_Forward->Fast_forward_count());
+			xmlwriter.Write_attribute_string_inline(attr, val);
+
+			attr = "Fast_Forward_Skipped_Rounds";
+			val = std::to_string(Fast_Forward->Skipped_rounds());
+			xmlwriter.Write_attribute_string_inline(attr, val);
+		}
+
 		xmlwriter.Write_end_element_tag();
 	}
 
@@ -938,6 +974,26 @@ namespace SSD_Components
 	{
 	}
 
+	void FTL::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		//A checkpoint taken right after preconditioning must not store the mapping table a second time when it is restored
+		Address_Mapping_Unit->Store_mapping_table_on_flash_at_start();
+		writer.Write_tag("FTL");
+		Stats::Save_checkpoint(writer, channel_no, chip_no_per_channel, die_no_per_chip, plane_no_per_die, max_allowed_block_erase_count);
+		BlockManager->Save_checkpoint(writer);
+		Address_Mapping_Unit->Save_checkpoint(writer);
+		GC_and_WL_Unit->Save_checkpoint(writer);
+	}
+
+	void FTL::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		reader.Expect_tag("FTL");
+		Stats::Load_checkpoint(reader, channel_no, chip_no_per_channel, die_no_per_chip, plane_no_per_die, max_allowed_block_erase_count);
+		BlockManager->Load_checkpoint(reader);
+		Address_Mapping_Unit->Load_checkpoint(reader);
+		GC_and_WL_Unit->Load_checkpoint(reader);
+	}
+
 	void FTL::Execute_simulator_event(MQSimEngine::Sim_Event*)
 	{
 	}
@@ -11,6 +11,7 @@
 #include "NVM_PHY_ONFI.h"
 #include "Stats.h"
 #include "ECC_Engine.h"
+#include "Fast_Forward_Unit.h"
 #include "IFP_Aggregation_Unit.h"
 
 namespace SSD_Components
@@ -42,8 +43,11 @@ namespace SSD_Components
 		TSU_Base * TSU;
 		NVM_PHY_ONFI* PHY;
 		ECC_Engine* ECC;
+		Fast_Forward_Unit* Fast_Forward;
 		IFP_Aggregation_Unit* Aggregation_Unit;
 		void Report_results_in_XML(std::string name_prefix, Utils::XmlWriter& xmlwriter);
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);//Mapping, block bookkeeping, wear and read disturb state of the device
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 	private:
 		unsigned int channel_no, chip_no_per_channel, die_no_per_chip, plane_no_per_die;
 		unsigned int block_no_per_plane, page_no_per_block, page_size_in_sectors;
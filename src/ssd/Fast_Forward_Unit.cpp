@@ -0,0 +1,303 @@
+#include <algorithm>
+#include <cmath>
+#include "../sim/Engine.h"
+#include "Fast_Forward_Unit.h"
+#include "Flash_Block_Manager_Base.h"
+#include "Stats.h"
+
+namespace SSD_Components
+{
+	Fast_Forward_Unit::Fast_Forward_Unit(ECC_Engine* ecc, unsigned int read_reclaim_threshold)
+		: ecc(ecc), read_reclaim_threshold(read_reclaim_threshold),
+		recording(false), has_last_round(false), last_round_stable(false), fast_forward_count(0), skipped_rounds(0)
+	{
+		// Read-path counters that keep growing by the same amount in every stable round
+		extrapolated_counters = { &Stats::IssuedReadCMD, &Stats::IssuedInterleaveReadCMD, &Stats::IssuedMultiplaneReadCMD,
+			&Stats::IssuedIFPGemvCMD, &Stats::Total_flash_reads_for_mapping,
+			&Stats::Total_ECC_retries, &Stats::Total_ECC_failures, &Stats::Total_ECC_uncorrectable };
+		extrapolated_int_counters = { &Stats::CMT_hits, &Stats::readTR_CMT_hits, &Stats::writeTR_CMT_hits,
+			&Stats::CMT_miss, &Stats::readTR_CMT_miss, &Stats::writeTR_CMT_miss,
+			&Stats::total_CMT_queries, &Stats::total_readTR_CMT_queries, &Stats::total_writeTR_CMT_queries };
+
+		// Any change in these means data moved, so the round's read profile does not carry over
+		disruptive_counters = { &Stats::IssuedCopybackReadCMD, &Stats::IssuedMultiplaneCopybackReadCMD,
+			&Stats::IssuedProgramCMD, &Stats::IssuedInterleaveProgramCMD, &Stats::IssuedMultiplaneProgramCMD,
+			&Stats::IssuedInterleaveMultiplaneProgramCMD, &Stats::IssuedCopybackProgramCMD, &Stats::IssuedMultiplaneCopybackProgramCMD,
+			&Stats::IssuedEraseCMD, &Stats::IssuedInterleaveEraseCMD, &Stats::IssuedMultiplaneEraseCMD, &Stats::IssuedInterleaveMultiplaneEraseCMD,
+			&Stats::Total_flash_writes_for_mapping, &Stats::Total_read_reclaim_migrations };
+		disruptive_int_counters = { &Stats::Total_gc_executions, &Stats::Total_wl_executions };
+	}
+
+	void Fast_Forward_Unit::Start_recording()
+	{
+		recording = true;
+		has_last_round = false;
+		last_round_stable = false;
+		read_log.clear();
+		take_counter_snapshot(counter_snapshot);
+	}
+
+	bool Fast_Forward_Unit::Is_recording()
+	{
+		return recording;
+	}
+
+	void Fast_Forward_Unit::Record_read(Block_Pool_Slot_Type* block, flash_page_ID_type page_id, int retry_count)
+	{
+		Read_Record record = { block, page_id, retry_count };
+		read_log.push_back(record);
+	}
+
+	void Fast_Forward_Unit::take_counter_snapshot(std::vector<uint64_t>& snapshot)
+	{
+		snapshot.clear();
+		for (auto counter : extrapolated_counters) {
+			snapshot.push_back(*counter);
+		}
+		for (auto counter : extrapolated_int_counters) {
+			snapshot.push_back(*counter);
+		}
+		for (auto counter : disruptive_counters) {
+			snapshot.push_back(*counter);
+		}
+		for (auto counter : disruptive_int_counters) {
+			snapshot.push_back(*counter);
+		}
+	}
+
+	bool Fast_Forward_Unit::Close_round()
+	{
+		std::sort(read_log.begin(), read_log.end(), [](const Read_Record& a, const Read_Record& b) {
+			return a.Block < b.Block || (a.Block == b.Block && a.Page_id < b.Page_id);
+		});
+
+		std::vector<Page_Read_Profile> pages;
+		std::vector<Block_Read_Profile> blocks;
+		for (auto& record : read_log) {
+			Block_Pool_Slot_Type* block = record.Block;
+			if (pages.empty() || pages.back().Block != block || pages.back().Page_id != record.Page_id) {
+				Page_Read_Profile page = { block, record.Page_id, 0, 0, 0, 0, 0 };
+				if (record.Page_id < Block_Pool_Slot_Type::Page_read_counter_count) {
+					page.Page_read_count = block->Get_page_read_count(record.Page_id);
+				}
+				pages.push_back(page);
+			}
+			Page_Read_Profile& page = pages.back();
+			page.Reads++;
+			if (record.Retry_count > 0) {
+				page.Retries += (unsigned long)record.Retry_count;
+			} else if (record.Retry_count < 0) {
+				page.Uncorrectable++;
+			}
+
+			if (blocks.empty() || blocks.back().Block != block) {
+				Block_Read_Profile block_record = { block, block->Erase_count,
+					block->Read_count, block->Read_count_since_program, block->Read_count_since_reclaim,
+					block->Recent_ecc_retries, block->Total_ecc_retries, block->Uncorrectable_errors,
+					0, 0, 0, 0, 0, 0 };
+				blocks.push_back(block_record);
+			}
+		}
+		read_log.clear();
+
+		std::vector<uint64_t> snapshot;
+		take_counter_snapshot(snapshot);
+		counter_delta.resize(snapshot.size());
+		for (size_t i = 0; i < snapshot.size(); i++) {
+			counter_delta[i] = snapshot[i] - counter_snapshot[i];
+		}
+		counter_snapshot = snapshot;
+
+		bool stable = has_last_round && !pages.empty();
+		rejection_reason.clear();
+		if (has_last_round && pages.empty()) {
+			rejection_reason = "the round read no flash page";
+		}
+		for (size_t i = extrapolated_counters.size() + extrapolated_int_counters.size(); stable && i < counter_delta.size(); i++) {
+			if (counter_delta[i] != 0) {
+				stable = false;
+				rejection_reason = "the round programmed, erased, garbage collected or read-reclaimed flash blocks";
+			}
+		}
+		if (stable && (pages.size() != last_round_pages.size() || blocks.size() != last_round_blocks.size())) {
+			stable = false;
+		}
+		for (size_t i = 0; stable && i < pages.size(); i++) {
+			Page_Read_Profile& page = pages[i];
+			Page_Read_Profile& last = last_round_pages[i];
+			if (page.Block != last.Block || page.Page_id != last.Page_id || page.Reads != last.Reads
+				|| page.Retries != last.Retries || page.Uncorrectable != last.Uncorrectable
+				|| page.Page_read_count < last.Page_read_count) {
+				stable = false;
+				break;
+			}
+			page.Page_read_delta = page.Page_read_count - last.Page_read_count;
+		}
+		for (size_t i = 0; stable && i < blocks.size(); i++) {
+			Block_Read_Profile& block = blocks[i];
+			Block_Read_Profile& last = last_round_blocks[i];
+			if (block.Block != last.Block || block.Erase_count != last.Erase_count
+				|| block.Read_count < last.Read_count || block.Read_count_since_program < last.Read_count_since_program
+				|| block.Read_count_since_reclaim < last.Read_count_since_reclaim || block.Recent_ecc_retries < last.Recent_ecc_retries
+				|| block.Total_ecc_retries < last.Total_ecc_retries || block.Uncorrectable_errors < last.Uncorrectable_errors) {
+				stable = false;
+				break;
+			}
+			block.Read_count_delta = block.Read_count - last.Read_count;
+			block.Read_count_since_program_delta = block.Read_count_since_program - last.Read_count_since_program;
+			block.Read_count_since_reclaim_delta = block.Read_count_since_reclaim - last.Read_count_since_reclaim;
+			block.Recent_ecc_retries_delta = block.Recent_ecc_retries - last.Recent_ecc_retries;
+			block.Total_ecc_retries_delta = block.Total_ecc_retries - last.Total_ecc_retries;
+			block.Uncorrectable_errors_delta = block.Uncorrectable_errors - last.Uncorrectable_errors;
+		}
+
+		if (!stable && rejection_reason.empty() && has_last_round) {
+			rejection_reason = "the pages read, their ECC outcomes or the read-disturb counter increments differ from the previous round";
+		}
+		last_round_pages.swap(pages);
+		last_round_blocks.swap(blocks);
+		has_last_round = true;
+		last_round_stable = stable;
+
+		return stable;
+	}
+
+	double Fast_Forward_Unit::retention_time_hours(Block_Pool_Slot_Type* block, sim_time_type time)
+	{
+		// Same conversion as the ECC check in NVM_PHY_ONFI_NVDDR2
+		if (block->First_write_time == INVALID_TIME) {
+			return 0.0;
+		}
+		return (time - block->First_write_time) / (3600.0 * 1e9);
+	}
+
+	unsigned int Fast_Forward_Unit::Safe_rounds(unsigned int max_rounds, sim_time_type round_period)
+	{
+		if (!last_round_stable || max_rounds == 0) {
+			return 0;
+		}
+
+		// Read-reclaim: every block read in the round must stay below the threshold, so the round
+		// that crosses it is simulated in detail. A block that was already over the threshold for the
+		// whole round was checked on each of its reads and not reclaimed (no valid pages, a write
+		// frontier, ...); without programs or erases that does not change, so it does not limit the skip.
+		unsigned int rounds = max_rounds;
+		for (auto& block : last_round_blocks) {
+			if (block.Read_count_delta == 0 || block.Read_count - block.Read_count_delta >= read_reclaim_threshold) {
+				continue;
+			}
+			if (block.Read_count >= read_reclaim_threshold) {
+				return 0;
+			}
+			rounds = std::min(rounds, (read_reclaim_threshold - 1 - block.Read_count) / block.Read_count_delta);
+		}
+
+		// ECC: retention keeps growing over the skipped time, which lowers the read-count steps,
+		// so shrink the skip until the steps at its end still cover every page
+		while (rounds > 0) {
+			unsigned int fit = ecc_safe_rounds(rounds, round_period);
+			if (fit >= rounds) {
+				break;
+			}
+			rounds = fit;
+		}
+
+		return rounds;
+	}
+
+	unsigned int Fast_Forward_Unit::ecc_safe_rounds(unsigned int rounds, sim_time_type round_period)
+	{
+		sim_time_type now = Simulator->Time();
+		sim_time_type end = now + rounds * round_period;
+		unsigned int levels = ecc->Get_max_retries() + 1;
+		std::vector<double> steps_now(levels), steps_end(levels);
+		unsigned int fit = rounds;
+
+		size_t i = 0;
+		while (i < last_round_pages.size()) {
+			Block_Pool_Slot_Type* block = last_round_pages[i].Block;
+			double hours_now = retention_time_hours(block, now);
+			double hours_end = retention_time_hours(block, end);
+			for (unsigned int retry = 0; retry < levels; retry++) {
+				steps_now[retry] = ecc->Largest_correctable_read_count(block->Erase_count, hours_now, retry);
+				steps_end[retry] = ecc->Largest_correctable_read_count(block->Erase_count, hours_end, retry);
+			}
+
+			for (; i < last_round_pages.size() && last_round_pages[i].Block == block; i++) {
+				Page_Read_Profile& page = last_round_pages[i];
+				if (page.Page_read_delta == 0 || page.Page_id >= Block_Pool_Slot_Type::Page_read_counter_count) {
+					continue;
+				}
+				double reads = block->Get_page_read_count(page.Page_id);
+				unsigned int level = levels;
+				for (unsigned int retry = 0; retry < levels; retry++) {
+					if (reads <= steps_now[retry]) {
+						level = retry;
+						break;
+					}
+				}
+				if (level == levels) {
+					continue; // Already uncorrectable, which more reads or retention cannot change
+				}
+				double headroom = steps_end[level] - reads;
+				if (headroom < 0) {
+					return 0;
+				}
+				double page_rounds = floor(headroom / page.Page_read_delta);
+				if (page_rounds < fit) {
+					fit = (unsigned int)page_rounds;
+				}
+			}
+		}
+
+		return fit;
+	}
+
+	void Fast_Forward_Unit::Fast_forward(unsigned int rounds)
+	{
+		for (auto& page : last_round_pages) {
+			if (page.Page_id < Block_Pool_Slot_Type::Page_read_counter_count) {
+				page.Block->Add_page_reads(page.Page_id, rounds * page.Page_read_delta);
+			}
+		}
+		for (auto& block : last_round_blocks) {
+			block.Block->Read_count += rounds * block.Read_count_delta;
+			block.Block->Read_count_since_program += rounds * block.Read_count_since_program_delta;
+			block.Block->Read_count_since_reclaim += rounds * block.Read_count_since_reclaim_delta;
+			block.Block->Recent_ecc_retries += rounds * block.Recent_ecc_retries_delta;
+			block.Block->Total_ecc_retries += rounds * block.Total_ecc_retries_delta;
+			block.Block->Uncorrectable_errors += rounds * block.Uncorrectable_errors_delta;
+		}
+
+		size_t i = 0;
+		for (auto counter : extrapolated_counters) {
+			*counter += rounds * counter_delta[i++];
+		}
+		for (auto counter : extrapolated_int_counters) {
+			*counter += (unsigned int)(rounds * counter_delta[i++]);
+		}
+
+		// The next round is compared against a fresh baseline
+		take_counter_snapshot(counter_snapshot);
+		has_last_round = false;
+		last_round_stable = false;
+
+		fast_forward_count++;
+		skipped_rounds += rounds;
+	}
+
+	const std::string& Fast_Forward_Unit::Rejection_reason()
+	{
+		return rejection_reason;
+	}
+
+	unsigned long long Fast_Forward_Unit::Fast_forward_count()
+	{
+		return fast_forward_count;
+	}
+
+	unsigned long long Fast_Forward_Unit::Skipped_rounds()
+	{
+		return skipped_rounds;
+	}
+}
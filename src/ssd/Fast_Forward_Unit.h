@@ -0,0 +1,103 @@
+#ifndef FAST_FORWARD_UNIT_H
+#define FAST_FORWARD_UNIT_H
+
+#include <string>
+#include <vector>
+#include "../sim/Sim_Defs.h"
+#include "SSD_Defs.h"
+#include "ECC_Engine.h"
+
+namespace SSD_Components
+{
+	class Block_Pool_Slot_Type;
+
+	/*
+	* Device side of the fast-forward mode for replayed traces (e.g., one LLM token's weight scan
+	* repeated Relay_Count times). While recording, the PHY reports every ECC-checked read. At each
+	* replay round boundary, the trace flow closes the round. The unit then compares the round's
+	* per-page read/ECC profile and its read-disturb counter increments with the previous round's.
+	* Once rounds repeat, Safe_rounds() finds how many rounds can be skipped before any block reaches
+	* the read-reclaim threshold or any page read in the round changes its ECC retry count.
+	* Fast_forward() then adds those rounds' counter increments analytically.
+	*/
+	class Fast_Forward_Unit
+	{
+	public:
+		Fast_Forward_Unit(ECC_Engine* ecc, unsigned int read_reclaim_threshold);
+
+		void Start_recording();
+		bool Is_recording();
+		void Record_read(Block_Pool_Slot_Type* block, flash_page_ID_type page_id, int retry_count);
+
+		// Ends the current round and starts the next one. Returns true if the round read the same
+		// pages with the same ECC outcomes and counter increments as the previous one, and did not
+		// program, erase, garbage collect or read-reclaim.
+		bool Close_round();
+		// Why the last closed round did not match the previous one; empty if it did or if there was no previous round
+		const std::string& Rejection_reason();
+
+		// Largest number of rounds (at most max_rounds) that can be skipped without crossing a
+		// read-reclaim or ECC retry step. Retention is evaluated at the end of the skipped time.
+		unsigned int Safe_rounds(unsigned int max_rounds, sim_time_type round_period);
+
+		// Adds rounds times the last round's block, page and Stats counter increments
+		void Fast_forward(unsigned int rounds);
+
+		unsigned long long Fast_forward_count();
+		unsigned long long Skipped_rounds();
+
+	private:
+		struct Page_Read_Profile
+		{
+			Block_Pool_Slot_Type* Block;
+			flash_page_ID_type Page_id;
+			unsigned int Reads;            // ECC-checked reads in the round
+			unsigned long Retries;         // ECC retries of those reads
+			unsigned int Uncorrectable;    // Reads that were uncorrectable
+			unsigned int Page_read_count;  // Get_page_read_count(Page_id) at the end of the round
+			unsigned int Page_read_delta;
+		};
+
+		struct Block_Read_Profile
+		{
+			Block_Pool_Slot_Type* Block;
+			unsigned int Erase_count;
+			unsigned int Read_count, Read_count_since_program, Read_count_since_reclaim;
+			unsigned int Recent_ecc_retries, Total_ecc_retries, Uncorrectable_errors;
+			unsigned int Read_count_delta, Read_count_since_program_delta, Read_count_since_reclaim_delta;
+			unsigned int Recent_ecc_retries_delta, Total_ecc_retries_delta, Uncorrectable_errors_delta;
+		};
+
+		struct Read_Record
+		{
+			Block_Pool_Slot_Type* Block;
+			flash_page_ID_type Page_id;
+			int Retry_count;
+		};
+
+		ECC_Engine* ecc;
+		unsigned int read_reclaim_threshold;
+		bool recording;
+		bool has_last_round, last_round_stable;
+		std::string rejection_reason;
+		std::vector<Read_Record> read_log;
+		// Profile of the last closed round, sorted by block and page
+		std::vector<Page_Read_Profile> last_round_pages;
+		std::vector<Block_Read_Profile> last_round_blocks;
+
+		// Stats counters extrapolated by Fast_forward, and those that must not change in a stable round
+		std::vector<unsigned long*> extrapolated_counters;
+		std::vector<unsigned int*> extrapolated_int_counters;
+		std::vector<unsigned long*> disruptive_counters;
+		std::vector<unsigned int*> disruptive_int_counters;
+		std::vector<uint64_t> counter_snapshot, counter_delta;
+		void take_counter_snapshot(std::vector<uint64_t>& snapshot);
+
+		unsigned long long fast_forward_count, skipped_rounds;
+
+		unsigned int ecc_safe_rounds(unsigned int rounds, sim_time_type round_period);
+		double retention_time_hours(Block_Pool_Slot_Type* block, sim_time_type time);
+	};
+}
+
+#endif // !FAST_FORWARD_UNIT_H
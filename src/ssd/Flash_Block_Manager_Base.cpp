@@ -1,18 +1,23 @@
 #include "Flash_Block_Manager.h"
 #include <cmath>      // for std::pow
-#include <algorithm>  // for std::max_element, std::fill
+#include <algorithm>  // for std::fill
+#include <cstring>
 
 
 namespace SSD_Components
 {
-	unsigned int Block_Pool_Slot_Type::Page_vector_size = 0;
+	thread_local unsigned int Block_Pool_Slot_Type::Page_vector_size = 0;
+	thread_local unsigned int Block_Pool_Slot_Type::Page_read_counter_count = 0;
 	Flash_Block_Manager_Base::Flash_Block_Manager_Base(GC_and_WL_Unit_Base* gc_and_wl_unit, unsigned int max_allowed_block_erase_count, unsigned int total_concurrent_streams_no,
 		unsigned int channel_count, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die,
 		unsigned int block_no_per_plane, unsigned int page_no_per_block)
 		: gc_and_wl_unit(gc_and_wl_unit), max_allowed_block_erase_count(max_allowed_block_erase_count), total_concurrent_streams_no(total_concurrent_streams_no),
 		channel_count(channel_count), chip_no_per_channel(chip_no_per_channel), die_no_per_chip(die_no_per_chip), plane_no_per_die(plane_no_per_die),
-		block_no_per_plane(block_no_per_plane), pages_no_per_block(page_no_per_block)
+		block_no_per_plane(block_no_per_plane), pages_no_per_block(page_no_per_block), block_snapshot_period(0), next_block_snapshot_time(0)
 	{
+		Block_Pool_Slot_Type::Page_read_counter_count = pages_no_per_block;
+		page_read_count_arena = new uint16_t[(size_t)channel_count * chip_no_per_channel * die_no_per_chip * plane_no_per_die * block_no_per_plane * pages_no_per_block]();
+		uint16_t* next_page_read_counts = page_read_count_arena;
 		plane_manager = new PlaneBookKeepingType***[channel_count];
 		for (unsigned int channelID = 0; channelID < channel_count; channelID++) {
 			plane_manager[channelID] = new PlaneBookKeepingType**[chip_no_per_channel];
@@ -53,8 +58,11 @@ namespace SSD_Components
 							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Total_ecc_retries = 0;
 							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Uncorrectable_errors = 0;
 							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Has_uncorrectable_errors = false;
-							// Initialize per-page read counts vector
-							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Page_read_counts.resize(pages_no_per_block, 0);
+							// Assign the block its slice of the per-page read counter arena
+							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Page_read_counts = next_page_read_counts;
+							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Page_read_count_overflow = NULL;
+							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Max_page_read_count = 0;
+							next_page_read_counts += pages_no_per_block;
 
 							Block_Pool_Slot_Type::Page_vector_size = pages_no_per_block / (sizeof(uint64_t) * 8) + (pages_no_per_block % (sizeof(uint64_t) * 8) == 0 ? 0 : 1);
 							plane_manager[channelID][chipID][dieID][planeID].Blocks[blockID].Invalid_page_bitmap = new uint64_t[Block_Pool_Slot_Type::Page_vector_size];
@@ -85,6 +93,7 @@ namespace SSD_Components
 					for (unsigned int plane_id = 0; plane_id < plane_no_per_die; plane_id++) {
 						for (unsigned int blockID = 0; blockID < block_no_per_plane; blockID++) {
 							delete[] plane_manager[channel_id][chip_id][die_id][plane_id].Blocks[blockID].Invalid_page_bitmap;
+							delete plane_manager[channel_id][chip_id][die_id][plane_id].Blocks[blockID].Page_read_count_overflow;
 						}
 						delete[] plane_manager[channel_id][chip_id][die_id][plane_id].Blocks;
 						delete[] plane_manager[channel_id][chip_id][die_id][plane_id].GC_wf;
@@ -98,6 +107,223 @@ namespace SSD_Components
 			delete[] plane_manager[channel_id];
 		}
 		delete[] plane_manager;
+		delete[] page_read_count_arena;
+	}
+
+	/*
+	* Block snapshot file layout (little-endian), read by tools/analysis/block_snapshot.py:
+	* Header (BLOCK_SNAPSHOT_HEADER_SIZE bytes): "MQSIMBLK", format version, header size, then channel count,
+	* chips per channel, dies per chip, planes per die, blocks per plane, pages per block and the number of
+	* counters per block record, all uint32, zero padded.
+	* Each snapshot appends one frame: the simulation time (uint64, ns) followed by one record per block,
+	* ordered by (channel, chip, die, plane, block). A record holds BLOCK_SNAPSHOT_FIELD_COUNT uint32 counters:
+	* Read_count, Read_count_since_reclaim, Max_page_read_count, Erase_count, Total_ecc_retries, Uncorrectable_errors.
+	*/
+#define BLOCK_SNAPSHOT_HEADER_SIZE 64
+#define BLOCK_SNAPSHOT_FORMAT_VERSION 1
+#define BLOCK_SNAPSHOT_FIELD_COUNT 6
+
+	void Flash_Block_Manager_Base::Enable_block_snapshots(const std::string& file_path, sim_time_type period)
+	{
+		block_snapshot_file.open(file_path, std::ofstream::out | std::ofstream::binary | std::ofstream::trunc);
+		if (!block_snapshot_file) {
+			PRINT_ERROR("Cannot open the block snapshot file " << file_path)
+		}
+
+		char header[BLOCK_SNAPSHOT_HEADER_SIZE] = {};
+		memcpy(header, "MQSIMBLK", 8);
+		uint32_t fields[] = { BLOCK_SNAPSHOT_FORMAT_VERSION, BLOCK_SNAPSHOT_HEADER_SIZE, channel_count, chip_no_per_channel,
+			die_no_per_chip, plane_no_per_die, block_no_per_plane, pages_no_per_block, BLOCK_SNAPSHOT_FIELD_COUNT };
+		memcpy(header + 8, fields, sizeof(fields));
+		block_snapshot_file.write(header, BLOCK_SNAPSHOT_HEADER_SIZE);
+
+		block_snapshot_period = period;
+		next_block_snapshot_time = period;
+	}
+
+	bool Flash_Block_Manager_Base::Block_snapshots_enabled()
+	{
+		return block_snapshot_file.is_open();
+	}
+
+	void Flash_Block_Manager_Base::Write_block_snapshot()
+	{
+		if (!block_snapshot_file.is_open()) {
+			return;
+		}
+
+		uint64_t time = Simulator->Time();
+		block_snapshot_file.write((char*)&time, sizeof(time));
+
+		std::vector<uint32_t> records(block_no_per_plane * BLOCK_SNAPSHOT_FIELD_COUNT);
+		for (unsigned int channel_id = 0; channel_id < channel_count; channel_id++) {
+			for (unsigned int chip_id = 0; chip_id < chip_no_per_channel; chip_id++) {
+				for (unsigned int die_id = 0; die_id < die_no_per_chip; die_id++) {
+					for (unsigned int plane_id = 0; plane_id < plane_no_per_die; plane_id++) {
+						Block_Pool_Slot_Type* blocks = plane_manager[channel_id][chip_id][die_id][plane_id].Blocks;
+						uint32_t* record = records.data();
+						for (unsigned int block_id = 0; block_id < block_no_per_plane; block_id++, record += BLOCK_SNAPSHOT_FIELD_COUNT) {
+							record[0] = blocks[block_id].Read_count;
+							record[1] = blocks[block_id].Read_count_since_reclaim;
+							record[2] = blocks[block_id].Max_page_read_count;
+							record[3] = blocks[block_id].Erase_count;
+							record[4] = blocks[block_id].Total_ecc_retries;
+							record[5] = blocks[block_id].Uncorrectable_errors;
+						}
+						block_snapshot_file.write((char*)records.data(), records.size() * sizeof(uint32_t));
+					}
+				}
+			}
+		}
+		block_snapshot_file.flush();
+	}
+
+	void Flash_Block_Manager_Base::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		writer.Write_tag("Flash_Block_Manager");
+		writer.Write(block_no_per_plane);
+		writer.Write(pages_no_per_block);
+		writer.Write(total_concurrent_streams_no);
+		for (unsigned int channel_id = 0; channel_id < channel_count; channel_id++) {
+			for (unsigned int chip_id = 0; chip_id < chip_no_per_channel; chip_id++) {
+				for (unsigned int die_id = 0; die_id < die_no_per_chip; die_id++) {
+					for (unsigned int plane_id = 0; plane_id < plane_no_per_die; plane_id++) {
+						PlaneBookKeepingType* plane_record = &plane_manager[channel_id][chip_id][die_id][plane_id];
+						if (plane_record->Ongoing_erase_operations.size() > 0) {
+							PRINT_ERROR("A checkpoint cannot be taken while erase operations are in progress")
+						}
+						writer.Write(plane_record->Free_pages_count);
+						writer.Write(plane_record->Valid_pages_count);
+						writer.Write(plane_record->Invalid_pages_count);
+						for (unsigned int block_id = 0; block_id < block_no_per_plane; block_id++) {
+							Block_Pool_Slot_Type* block = &plane_record->Blocks[block_id];
+							if (block->Has_ongoing_gc_wl) {
+								PRINT_ERROR("A checkpoint cannot be taken while garbage collection is in progress")
+							}
+							//Translation pages that are stored on flash at start are never serviced, so the counters may be non-zero on an idle device
+							writer.Write(block->Ongoing_user_read_count);
+							writer.Write(block->Ongoing_user_program_count);
+							writer.Write(block->Current_page_write_index);
+							writer.Write(block->Invalid_page_count);
+							writer.Write(block->Erase_count);
+							writer.Write_array(block->Invalid_page_bitmap, Block_Pool_Slot_Type::Page_vector_size);
+							writer.Write(block->Stream_id);
+							writer.Write(block->Holds_mapping_data);
+							writer.Write(block->Hot_block);
+							writer.Write(block->Read_count);
+							writer.Write(block->First_write_time);
+							writer.Write(block->Read_count_since_program);
+							writer.Write(block->Read_count_since_reclaim);
+							writer.Write(block->Last_read_time);
+							writer.Write(block->Max_page_read_count);
+							writer.Write(block->Recent_ecc_retries);
+							writer.Write(block->Total_ecc_retries);
+							writer.Write(block->Uncorrectable_errors);
+							writer.Write(block->Has_uncorrectable_errors);
+							uint32_t overflow_count = (block->Page_read_count_overflow == NULL ? 0 : (uint32_t)block->Page_read_count_overflow->size());
+							writer.Write(overflow_count);
+							if (overflow_count > 0) {
+								for (auto& entry : *block->Page_read_count_overflow) {
+									writer.Write(entry.first);
+									writer.Write(entry.second);
+								}
+							}
+						}
+
+						//Free blocks with the same erase count are taken in insertion order, so the pool is stored in iteration order
+						writer.Write((uint32_t)plane_record->Free_block_pool.size());
+						for (auto& entry : plane_record->Free_block_pool) {
+							writer.Write(entry.first);
+							writer.Write(entry.second->BlockID);
+						}
+						for (unsigned int stream_id = 0; stream_id < total_concurrent_streams_no; stream_id++) {
+							writer.Write(plane_record->Data_wf[stream_id]->BlockID);
+							writer.Write(plane_record->GC_wf[stream_id]->BlockID);
+							writer.Write(plane_record->Translation_wf[stream_id]->BlockID);
+						}
+						std::queue<flash_block_ID_type> history = plane_record->Block_usage_history;
+						writer.Write((uint32_t)history.size());
+						while (!history.empty()) {
+							writer.Write(history.front());
+							history.pop();
+						}
+					}
+				}
+			}
+		}
+		writer.Write_array(page_read_count_arena, (uint64_t)channel_count * chip_no_per_channel * die_no_per_chip * plane_no_per_die * block_no_per_plane * pages_no_per_block);
+	}
+
+	void Flash_Block_Manager_Base::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		reader.Expect_tag("Flash_Block_Manager");
+		reader.Expect(block_no_per_plane, "Block_No_Per_Plane");
+		reader.Expect(pages_no_per_block, "Page_No_Per_Block");
+		reader.Expect(total_concurrent_streams_no, "the number of I/O flows");
+		for (unsigned int channel_id = 0; channel_id < channel_count; channel_id++) {
+			for (unsigned int chip_id = 0; chip_id < chip_no_per_channel; chip_id++) {
+				for (unsigned int die_id = 0; die_id < die_no_per_chip; die_id++) {
+					for (unsigned int plane_id = 0; plane_id < plane_no_per_die; plane_id++) {
+						PlaneBookKeepingType* plane_record = &plane_manager[channel_id][chip_id][die_id][plane_id];
+						plane_record->Free_pages_count = reader.Read<unsigned int>();
+						plane_record->Valid_pages_count = reader.Read<unsigned int>();
+						plane_record->Invalid_pages_count = reader.Read<unsigned int>();
+						for (unsigned int block_id = 0; block_id < block_no_per_plane; block_id++) {
+							Block_Pool_Slot_Type* block = &plane_record->Blocks[block_id];
+							block->Ongoing_user_read_count = reader.Read<int>();
+							block->Ongoing_user_program_count = reader.Read<int>();
+							block->Current_page_write_index = reader.Read<flash_page_ID_type>();
+							block->Invalid_page_count = reader.Read<unsigned int>();
+							block->Erase_count = reader.Read<unsigned int>();
+							reader.Read_array(block->Invalid_page_bitmap, Block_Pool_Slot_Type::Page_vector_size);
+							block->Stream_id = reader.Read<stream_id_type>();
+							block->Holds_mapping_data = reader.Read<bool>();
+							block->Hot_block = reader.Read<bool>();
+							block->Read_count = reader.Read<unsigned int>();
+							block->First_write_time = reader.Read<sim_time_type>();
+							block->Read_count_since_program = reader.Read<unsigned int>();
+							block->Read_count_since_reclaim = reader.Read<unsigned int>();
+							block->Last_read_time = reader.Read<sim_time_type>();
+							block->Max_page_read_count = reader.Read<unsigned int>();
+							block->Recent_ecc_retries = reader.Read<unsigned int>();
+							block->Total_ecc_retries = reader.Read<unsigned int>();
+							block->Uncorrectable_errors = reader.Read<unsigned int>();
+							block->Has_uncorrectable_errors = reader.Read<bool>();
+							uint32_t overflow_count = reader.Read<uint32_t>();
+							if (block->Page_read_count_overflow != NULL) {
+								block->Page_read_count_overflow->clear();
+							}
+							if (overflow_count > 0 && block->Page_read_count_overflow == NULL) {
+								block->Page_read_count_overflow = new std::unordered_map<flash_page_ID_type, unsigned int>;
+							}
+							for (uint32_t i = 0; i < overflow_count; i++) {
+								flash_page_ID_type page_id = reader.Read<flash_page_ID_type>();
+								(*block->Page_read_count_overflow)[page_id] = reader.Read<unsigned int>();
+							}
+						}
+
+						plane_record->Free_block_pool.clear();
+						uint32_t pool_size = reader.Read<uint32_t>();
+						for (uint32_t i = 0; i < pool_size; i++) {
+							unsigned int erase_count = reader.Read<unsigned int>();
+							flash_block_ID_type block_id = reader.Read<flash_block_ID_type>();
+							plane_record->Free_block_pool.insert(std::pair<unsigned int, Block_Pool_Slot_Type*>(erase_count, &plane_record->Blocks[block_id]));
+						}
+						for (unsigned int stream_id = 0; stream_id < total_concurrent_streams_no; stream_id++) {
+							plane_record->Data_wf[stream_id] = &plane_record->Blocks[reader.Read<flash_block_ID_type>()];
+							plane_record->GC_wf[stream_id] = &plane_record->Blocks[reader.Read<flash_block_ID_type>()];
+							plane_record->Translation_wf[stream_id] = &plane_record->Blocks[reader.Read<flash_block_ID_type>()];
+						}
+						plane_record->Block_usage_history = std::queue<flash_block_ID_type>();
+						uint32_t history_size = reader.Read<uint32_t>();
+						for (uint32_t i = 0; i < history_size; i++) {
+							plane_record->Block_usage_history.push(reader.Read<flash_block_ID_type>());
+						}
+					}
+				}
+			}
+		}
+		reader.Read_array(page_read_count_arena, (uint64_t)channel_count * chip_no_per_channel * die_no_per_chip * plane_no_per_die * block_no_per_plane * pages_no_per_block);
 	}
 
 	void Flash_Block_Manager_Base::Set_GC_and_WL_Unit(GC_and_WL_Unit_Base* gcwl)
@@ -126,7 +352,11 @@ namespace SSD_Components
 		Recent_ecc_retries = 0;
 		// Note: Total_ecc_retries and Uncorrectable_errors are cumulative, don't reset
 		// Clear per-page read counts
-		std::fill(Page_read_counts.begin(), Page_read_counts.end(), 0);
+		std::fill(Page_read_counts, Page_read_counts + Page_read_counter_count, 0);
+		if (Page_read_count_overflow != NULL) {
+			Page_read_count_overflow->clear();
+		}
+		Max_page_read_count = 0;
 	}
 
 	Block_Pool_Slot_Type* PlaneBookKeepingType::Get_a_free_block(stream_id_type stream_id, bool for_mapping_data)
@@ -236,6 +466,11 @@ namespace SSD_Components
 		PlaneBookKeepingType *plane_record = &plane_manager[page_address.ChannelID][page_address.ChipID][page_address.DieID][page_address.PlaneID];
 		Block_Pool_Slot_Type* block = &plane_record->Blocks[page_address.BlockID];
 
+		if (block_snapshot_period > 0 && Simulator->Time() >= next_block_snapshot_time) {
+			Write_block_snapshot();
+			next_block_snapshot_time = Simulator->Time() + block_snapshot_period;
+		}
+
 		block->Ongoing_user_read_count++;
 		block->Read_count++;  // Keep existing Read_count tracking
 
@@ -293,8 +528,35 @@ namespace SSD_Components
 		Last_read_time = current_time;
 
 		// Update per-page read count (for accurate read-disturb modeling)
-		if (page_id < Page_read_counts.size()) {
-			Page_read_counts[page_id]++;
+		if (page_id < Page_read_counter_count) {
+			Add_page_reads(page_id, 1);
+		}
+	}
+
+	unsigned int Block_Pool_Slot_Type::Get_page_read_count(flash_page_ID_type page_id) const
+	{
+		if (Page_read_counts[page_id] < PAGE_READ_COUNTER_LIMIT) {
+			return Page_read_counts[page_id];
+		}
+		return PAGE_READ_COUNTER_LIMIT + Page_read_count_overflow->at(page_id);
+	}
+
+	void Block_Pool_Slot_Type::Add_page_reads(flash_page_ID_type page_id, unsigned int reads)
+	{
+		unsigned int count;
+		if (reads < (unsigned int)(PAGE_READ_COUNTER_LIMIT - Page_read_counts[page_id])) {
+			Page_read_counts[page_id] += reads;
+			count = Page_read_counts[page_id];
+		} else {
+			count = Get_page_read_count(page_id) + reads;
+			if (Page_read_count_overflow == NULL) {
+				Page_read_count_overflow = new std::unordered_map<flash_page_ID_type, unsigned int>;
+			}
+			Page_read_counts[page_id] = PAGE_READ_COUNTER_LIMIT;
+			(*Page_read_count_overflow)[page_id] = count - PAGE_READ_COUNTER_LIMIT;
+		}
+		if (count > Max_page_read_count) {
+			Max_page_read_count = count;
 		}
 	}
 
@@ -317,13 +579,7 @@ namespace SSD_Components
 	{
 		// Calculate read-disturb BER using power-law model: γ(PE^p)(r^q)
 		// Use maximum page read count (worst case for the block)
-		unsigned int max_page_reads = 0;
-		if (!Page_read_counts.empty()) {
-			max_page_reads = *std::max_element(Page_read_counts.begin(), Page_read_counts.end());
-		}
-
-		// Power-law read-disturb formula
-		double read_disturb_ber = gamma * std::pow((double)Erase_count, p) * std::pow((double)max_page_reads, q);
+		double read_disturb_ber = gamma * std::pow((double)Erase_count, p) * std::pow((double)Max_page_read_count, q);
 
 		return read_disturb_ber;
 	}
@@ -3,16 +3,21 @@
 
 #include <list>
 #include <cstdint>
+#include <fstream>
+#include <string>
 #include <queue>
 #include <set>
+#include <unordered_map>
 #include "../nvm_chip/flash_memory/FlashTypes.h"
 #include "../nvm_chip/flash_memory/Physical_Page_Address.h"
 #include "GC_and_WL_Unit_Base.h"
+#include "../utils/Checkpoint_Stream.h"
 #include "../nvm_chip/flash_memory/FlashTypes.h"
 
 namespace SSD_Components
 {
 #define All_VALID_PAGE 0x0000000000000000ULL
+#define PAGE_READ_COUNTER_LIMIT 0xFFFF
 	class GC_and_WL_Unit_Base;
 	/*
 	* Block_Service_Status is used to impelement a state machine for each physical block in order to
@@ -34,7 +39,8 @@ namespace SSD_Components
 		Block_Service_Status Current_status;
 		unsigned int Invalid_page_count;
 		unsigned int Erase_count;
-		static unsigned int Page_vector_size;
+		static thread_local unsigned int Page_vector_size;
+		static thread_local unsigned int Page_read_counter_count;//The number of per-page read counters in each block (i.e., pages per block)
 		uint64_t* Invalid_page_bitmap;//A bit sequence that keeps track of valid/invalid status of pages in the block. A "0" means valid, and a "1" means invalid.
 		stream_id_type Stream_id = NO_STREAM;
 		bool Holds_mapping_data = false;
@@ -50,7 +56,12 @@ namespace SSD_Components
 		unsigned int Read_count_since_program;      // Reads since last program/erase (for read-disturb)
 		unsigned int Read_count_since_reclaim;      // Reads since last read-reclaim (for policy evaluation)
 		sim_time_type Last_read_time;              // Timestamp of most recent read
-		std::vector<unsigned int> Page_read_counts; // Per-page read tracking (for accurate read-disturb modeling)
+		// Per-page read tracking (for accurate read-disturb modeling). The 16-bit counters are this block's
+		// slice of the block manager's arena; counts from PAGE_READ_COUNTER_LIMIT up are kept exactly in
+		// the sparse overflow map, which is only allocated once a page reaches the limit.
+		uint16_t* Page_read_counts;
+		std::unordered_map<flash_page_ID_type, unsigned int>* Page_read_count_overflow;
+		unsigned int Max_page_read_count;          // Largest per-page read count, maintained incrementally
 
 		// ECC retry tracking for reliability analysis
 		unsigned int Recent_ecc_retries;            // ECC retries in recent window (sliding)
@@ -60,6 +71,8 @@ namespace SSD_Components
 
 		// Helper methods for read-disturb tracking
 		void Record_read(flash_page_ID_type page_id, sim_time_type current_time);
+		unsigned int Get_page_read_count(flash_page_ID_type page_id) const;
+		void Add_page_reads(flash_page_ID_type page_id, unsigned int reads);
 		void Record_ecc_retry();
 		void Reset_for_reclaim();
 		double Calculate_read_disturb_BER(double gamma, double p, double q) const;
@@ -118,6 +131,11 @@ namespace SSD_Components
 		bool Is_having_ongoing_program(const NVM::FlashMemory::Physical_Page_Address& block_address);//Cheks if block has any ongoing program request
 		bool Is_page_valid(Block_Pool_Slot_Type* block, flash_page_ID_type page_id);//Make the page invalid in the block bookkeeping record
 		unsigned int Get_pages_per_block() const { return pages_no_per_block; }//Returns the number of pages per block
+		void Enable_block_snapshots(const std::string& file_path, sim_time_type period);//Period 0 only writes the snapshots requested through Write_block_snapshot
+		bool Block_snapshots_enabled();
+		void Write_block_snapshot();//Appends the read, erase and ECC counters of all blocks to the snapshot file
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);//Only valid when no flash operation is in progress
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 	protected:
 		PlaneBookKeepingType ****plane_manager;//Keeps track of plane block usage information
 		GC_and_WL_Unit_Base *gc_and_wl_unit;
@@ -129,6 +147,10 @@ namespace SSD_Components
 		unsigned int plane_no_per_die;
 		unsigned int block_no_per_plane;
 		unsigned int pages_no_per_block;
+		uint16_t* page_read_count_arena;//Per-page read counters of all blocks, pages_no_per_block per block
+		std::ofstream block_snapshot_file;
+		sim_time_type block_snapshot_period;
+		sim_time_type next_block_snapshot_time;
 		void program_transaction_issued(const NVM::FlashMemory::Physical_Page_Address& page_address);//Updates the block bookkeeping record
 	};
 }
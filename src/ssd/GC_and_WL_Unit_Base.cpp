@@ -2,7 +2,7 @@
 
 namespace SSD_Components
 {
-	GC_and_WL_Unit_Base* GC_and_WL_Unit_Base::_my_instance;
+	thread_local GC_and_WL_Unit_Base* GC_and_WL_Unit_Base::_my_instance;
 	
 	GC_and_WL_Unit_Base::GC_and_WL_Unit_Base(const sim_object_id_type& id,
 		Address_Mapping_Unit_Base* address_mapping_unit, Flash_Block_Manager_Base* block_manager, TSU_Base* tsu, NVM_PHY_ONFI* flash_controller,
@@ -177,6 +177,18 @@ namespace SSD_Components
 	{
 	}
 
+	void GC_and_WL_Unit_Base::Save_checkpoint(Utils::Checkpoint_Writer& writer)
+	{
+		writer.Write_tag("GC_and_WL_Unit");
+		random_generator.Save_checkpoint(writer);
+	}
+
+	void GC_and_WL_Unit_Base::Load_checkpoint(Utils::Checkpoint_Reader& reader)
+	{
+		reader.Expect_tag("GC_and_WL_Unit");
+		random_generator.Load_checkpoint(reader);
+	}
+
 	void GC_and_WL_Unit_Base::Execute_simulator_event(MQSimEngine::Sim_Event* ev)
 	{
 	}
@@ -60,9 +60,11 @@ namespace SSD_Components
 		bool Use_dynamic_wearleveling();
 		bool Use_static_wearleveling();
 		bool Stop_servicing_writes(const NVM::FlashMemory::Physical_Page_Address& plane_address);
+		void Save_checkpoint(Utils::Checkpoint_Writer& writer);
+		void Load_checkpoint(Utils::Checkpoint_Reader& reader);
 	protected:
 		GC_Block_Selection_Policy_Type block_selection_policy;
-		static GC_and_WL_Unit_Base * _my_instance;
+		static thread_local GC_and_WL_Unit_Base * _my_instance;
 		Address_Mapping_Unit_Base* address_mapping_unit;
 		Flash_Block_Manager_Base* block_manager;
 		TSU_Base* tsu;
@@ -28,7 +28,7 @@ namespace SSD_Components
 		}
 	}
 
-	Host_Interface_Base* Host_Interface_Base::_my_instance = NULL;
+	thread_local Host_Interface_Base* Host_Interface_Base::_my_instance = NULL;
 
 	Host_Interface_Base::Host_Interface_Base(const sim_object_id_type& id, HostInterface_Types type, LHA_type max_logical_sector_address, unsigned int sectors_per_page, 
 		Data_Cache_Manager_Base* cache)
@@ -105,17 +105,29 @@ namespace SSD_Components
 				this->input_streams[transaction->Stream_id]->STAT_sum_of_read_transactions_execution_time += transaction->STAT_execution_time;
 				this->input_streams[transaction->Stream_id]->STAT_sum_of_read_transactions_transfer_time += transaction->STAT_transfer_time;
 				this->input_streams[transaction->Stream_id]->STAT_sum_of_read_transactions_waiting_time += (Simulator->Time() - transaction->Issue_time) - transaction->STAT_execution_time - transaction->STAT_transfer_time;
+				this->input_streams[transaction->Stream_id]->STAT_read_transaction_turnaround_time_histogram.Record(Simulator->Time() - transaction->Issue_time);
 				break;
 			case Transaction_Type::WRITE:
 				this->input_streams[transaction->Stream_id]->STAT_sum_of_write_transactions_execution_time += transaction->STAT_execution_time;
 				this->input_streams[transaction->Stream_id]->STAT_sum_of_write_transactions_transfer_time += transaction->STAT_transfer_time;
 				this->input_streams[transaction->Stream_id]->STAT_sum_of_write_transactions_waiting_time += (Simulator->Time() - transaction->Issue_time) - transaction->STAT_execution_time - transaction->STAT_transfer_time;
+				this->input_streams[transaction->Stream_id]->STAT_write_transaction_turnaround_time_histogram.Record(Simulator->Time() - transaction->Issue_time);
 				break;
 			default:
 				break;
 		}
 	}
 
+	const Utils::Latency_Histogram& Input_Stream_Manager_Base::Get_read_transaction_turnaround_time_histogram(stream_id_type stream_id)
+	{
+		return input_streams[stream_id]->STAT_read_transaction_turnaround_time_histogram;
+	}
+
+	const Utils::Latency_Histogram& Input_Stream_Manager_Base::Get_write_transaction_turnaround_time_histogram(stream_id_type stream_id)
+	{
+		return input_streams[stream_id]->STAT_write_transaction_turnaround_time_histogram;
+	}
+
 	uint32_t Input_Stream_Manager_Base::Get_average_read_transaction_turnaround_time(stream_id_type stream_id)//in microseconds
 	{
 		if (input_streams[stream_id]->STAT_number_of_read_transactions == 0) {
@@ -8,6 +8,7 @@
 #include "../host/PCIe_Message.h"
 #include "User_Request.h"
 #include "Data_Cache_Manager_Base.h"
+#include "../utils/Latency_Histogram.h"
 #include <stdint.h>
 #include <cstring>
 
@@ -40,6 +41,7 @@ namespace SSD_Components
 		unsigned int STAT_number_of_write_transactions;
 		sim_time_type STAT_sum_of_read_transactions_execution_time, STAT_sum_of_read_transactions_transfer_time, STAT_sum_of_read_transactions_waiting_time;
 		sim_time_type STAT_sum_of_write_transactions_execution_time, STAT_sum_of_write_transactions_transfer_time, STAT_sum_of_write_transactions_waiting_time;
+		Utils::Latency_Histogram STAT_read_transaction_turnaround_time_histogram, STAT_write_transaction_turnaround_time_histogram;
 	};
 
 	class Input_Stream_Manager_Base
@@ -62,6 +64,8 @@ namespace SSD_Components
 		uint32_t Get_average_write_transaction_execution_time(stream_id_type stream_id);//in microseconds
 		uint32_t Get_average_write_transaction_transfer_time(stream_id_type stream_id);//in microseconds
 		uint32_t Get_average_write_transaction_waiting_time(stream_id_type stream_id);//in microseconds
+		const Utils::Latency_Histogram& Get_read_transaction_turnaround_time_histogram(stream_id_type stream_id);
+		const Utils::Latency_Histogram& Get_write_transaction_turnaround_time_histogram(stream_id_type stream_id);
 	protected:
 		Host_Interface_Base* host_interface;
 		virtual void segment_user_request(User_Request* user_request) = 0;
@@ -131,7 +135,7 @@ namespace SSD_Components
 		HostInterface_Types type;
 		LHA_type max_logical_sector_address;
 		unsigned int sectors_per_page;
-		static Host_Interface_Base* _my_instance;
+		static thread_local Host_Interface_Base* _my_instance;
 		Input_Stream_Manager_Base* input_stream_manager;
 		Request_Fetch_Unit_Base* request_fetch_unit;
 		Data_Cache_Manager_Base* cache;
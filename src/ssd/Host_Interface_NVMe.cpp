@@ -483,6 +483,9 @@ void Host_Interface_NVMe::Report_results_in_XML(std::string name_prefix, Utils::
 		val = std::to_string(input_stream_manager->Get_average_write_transaction_waiting_time(stream_id));
 		xmlwriter.Write_attribute_string(attr, val);
 
+		input_stream_manager->Get_read_transaction_turnaround_time_histogram(stream_id).Report_percentiles_in_XML("Read_Transaction_Turnaround_Time", xmlwriter);
+		input_stream_manager->Get_write_transaction_turnaround_time_histogram(stream_id).Report_percentiles_in_XML("Write_Transaction_Turnaround_Time", xmlwriter);
+
 		xmlwriter.Write_close_tag();
 	}
 
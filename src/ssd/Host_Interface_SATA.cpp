@@ -352,6 +352,9 @@ namespace SSD_Components
 		val = std::to_string(input_stream_manager->Get_average_write_transaction_waiting_time(SATA_STREAM_ID));
 		xmlwriter.Write_attribute_string(attr, val);
 
+		input_stream_manager->Get_read_transaction_turnaround_time_histogram(SATA_STREAM_ID).Report_percentiles_in_XML("Read_Transaction_Turnaround_Time", xmlwriter);
+		input_stream_manager->Get_write_transaction_turnaround_time_histogram(SATA_STREAM_ID).Report_percentiles_in_XML("Write_Transaction_Turnaround_Time", xmlwriter);
+
 		xmlwriter.Write_close_tag();
 	}
 
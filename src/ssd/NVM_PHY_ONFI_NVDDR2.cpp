@@ -8,7 +8,7 @@
 
 namespace SSD_Components {
 	/*hack: using this style to emulate event/delegate*/
-	NVM_PHY_ONFI_NVDDR2* NVM_PHY_ONFI_NVDDR2::_my_instance;
+	thread_local NVM_PHY_ONFI_NVDDR2* NVM_PHY_ONFI_NVDDR2::_my_instance;
 
 	NVM_PHY_ONFI_NVDDR2::NVM_PHY_ONFI_NVDDR2(const sim_object_id_type& id, ONFI_Channel_NVDDR2** channels,
 		unsigned int ChannelCount, unsigned int chip_no_per_channel, unsigned int DieNoPerChip, unsigned int PlaneNoPerDie)
@@ -17,6 +17,7 @@ namespace SSD_Components {
 		ecc_engine = NULL;
 		block_manager_ref = NULL;
 		gc_wl_unit_ref = NULL;
+		fast_forward_ref = NULL;
 		WaitingReadTX = new Flash_Transaction_Queue[channel_count];
 		WaitingGCRead_TX = new Flash_Transaction_Queue[channel_count];
 		WaitingMappingRead_TX = new Flash_Transaction_Queue[channel_count];
@@ -577,8 +578,8 @@ namespace SSD_Components {
 						// Get the specific page's read count from our new tracking
 						unsigned int page_id = tr->Address.PageID;
 						double page_reads = 0.0;
-						if (page_id < block->Page_read_counts.size()) {
-							page_reads = (double)block->Page_read_counts[page_id];
+						if (page_id < Block_Pool_Slot_Type::Page_read_counter_count) {
+							page_reads = (double)block->Get_page_read_count(page_id);
 						} else {
 							// Fallback to average if page_id is out of range (shouldn't happen)
 							unsigned int pages_per_block = _my_instance->block_manager_ref->Get_pages_per_block();
@@ -612,6 +613,10 @@ namespace SSD_Components {
 							block->Uncorrectable_errors++;
 						}
 
+						if (_my_instance->fast_forward_ref != NULL && _my_instance->fast_forward_ref->Is_recording()) {
+							_my_instance->fast_forward_ref->Record_read(block, page_id, retry_count);
+						}
+
 						// Check read-reclaim on EVERY read completion (not just ECC failures)
 						// Read-reclaim is proactive: triggers based on read count threshold alone
 						if (_my_instance->gc_wl_unit_ref != NULL) {
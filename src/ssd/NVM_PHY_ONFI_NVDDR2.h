@@ -10,6 +10,7 @@
 #include "ONFI_Channel_NVDDR2.h"
 #include "Flash_Transaction_Queue.h"
 #include "ECC_Engine.h"
+#include "Fast_Forward_Unit.h"
 
 namespace SSD_Components
 {
@@ -102,6 +103,7 @@ namespace SSD_Components
 		ECC_Engine* ecc_engine;
 		Flash_Block_Manager_Base* block_manager_ref;
 		GC_and_WL_Unit_Base* gc_wl_unit_ref;
+		Fast_Forward_Unit* fast_forward_ref;
 		void Change_flash_page_status_for_preconditioning(const NVM::FlashMemory::Physical_Page_Address& page_address, const LPA_type lpa);
 		void Execute_simulator_event(MQSimEngine::Sim_Event*);
 		BusChannelStatus Get_channel_status(flash_channel_ID_type channelID);
@@ -121,7 +123,7 @@ namespace SSD_Components
 		void send_resume_command_to_chip(NVM::FlashMemory::Flash_Chip* chip, ChipBookKeepingEntry* chipBKE);
 		static void handle_ready_signal_from_chip(NVM::FlashMemory::Flash_Chip* chip, NVM::FlashMemory::Flash_Command* command);
 
-		static NVM_PHY_ONFI_NVDDR2* _my_instance;
+		static thread_local NVM_PHY_ONFI_NVDDR2* _my_instance;
 		ONFI_Channel_NVDDR2** channels;
 		ChipBookKeepingEntry** bookKeepingTable;
 		Flash_Transaction_Queue *WaitingReadTX, *WaitingGCRead_TX, *WaitingMappingRead_TX;
@@ -1,8 +1,27 @@
+#include <algorithm>
 #include "NVM_Transaction_Flash.h"
-
+#include "NVM_Transaction_Flash_RD.h"
+#include "NVM_Transaction_Flash_WR.h"
+#include "NVM_Transaction_Flash_ER.h"
+#include "NVM_Transaction_Flash_IFP.h"
+#include "../utils/Object_Pool.h"
 
 namespace SSD_Components
 {
+	static thread_local Utils::Object_Pool transaction_pool("NVM_Transaction_Flash",
+		std::max(std::max(sizeof(NVM_Transaction_Flash_RD), sizeof(NVM_Transaction_Flash_WR)),
+			std::max(sizeof(NVM_Transaction_Flash_ER), sizeof(NVM_Transaction_Flash_IFP))));
+
+	void* NVM_Transaction_Flash::operator new(size_t size)
+	{
+		return transaction_pool.Allocate(size);
+	}
+
+	void NVM_Transaction_Flash::operator delete(void* transaction)
+	{
+		transaction_pool.Release(transaction);
+	}
+
 	NVM_Transaction_Flash::NVM_Transaction_Flash(Transaction_Source_Type source, Transaction_Type type, stream_id_type stream_id,
 		unsigned int data_size_in_byte, LPA_type lpa, PPA_type ppa, User_Request* user_request, IO_Flow_Priority_Class::Priority priority_class) :
 		NVM_Transaction(stream_id, source, type, user_request, priority_class),
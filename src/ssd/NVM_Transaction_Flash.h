@@ -35,6 +35,11 @@ namespace SSD_Components
 		sim_time_type Estimated_alone_waiting_time;//Used in scheduling methods, such as FLIN, where fairness and QoS is considered in scheduling
 		bool FLIN_Barrier;//Especially used in queue reordering in FLIN scheduler
 		sim_time_type ECC_decode_latency;//ECC decode latency including retries (ns), used to delay data transfer
+
+		//Transactions of all types share the blocks of one pool of the simulation thread (see Utils::Object_Pool),
+		//since they are deleted through NVM_Transaction_Flash pointers
+		static void* operator new(size_t size);
+		static void operator delete(void* transaction);
 	private:
 
 	};
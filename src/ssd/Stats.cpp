@@ -3,47 +3,47 @@
 
 namespace SSD_Components
 {
-	unsigned long Stats::IssuedReadCMD = 0;
-	unsigned long Stats::IssuedCopybackReadCMD = 0;
-	unsigned long Stats::IssuedInterleaveReadCMD = 0;
-	unsigned long Stats::IssuedMultiplaneReadCMD = 0;
-	unsigned long Stats::IssuedMultiplaneCopybackReadCMD = 0;
-	unsigned long Stats::IssuedProgramCMD = 0;
-	unsigned long Stats::IssuedInterleaveProgramCMD = 0;
-	unsigned long Stats::IssuedMultiplaneProgramCMD = 0;
-	unsigned long Stats::IssuedMultiplaneCopybackProgramCMD = 0;
-	unsigned long Stats::IssuedInterleaveMultiplaneProgramCMD = 0;
-	unsigned long Stats::IssuedSuspendProgramCMD = 0;
-	unsigned long Stats::IssuedCopybackProgramCMD = 0;
-	unsigned long Stats::IssuedEraseCMD = 0;
-	unsigned long Stats::IssuedInterleaveEraseCMD = 0;
-	unsigned long Stats::IssuedMultiplaneEraseCMD = 0;
-	unsigned long Stats::IssuedInterleaveMultiplaneEraseCMD = 0;
-	unsigned long Stats::IssuedSuspendEraseCMD = 0;
-	unsigned long Stats::Total_flash_reads_for_mapping = 0;
-	unsigned long Stats::Total_flash_writes_for_mapping = 0;
-	unsigned long Stats::Total_flash_reads_for_mapping_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
-	unsigned long Stats::Total_flash_writes_for_mapping_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
-	unsigned int***** Stats::Block_erase_histogram;
+	thread_local unsigned long Stats::IssuedReadCMD = 0;
+	thread_local unsigned long Stats::IssuedCopybackReadCMD = 0;
+	thread_local unsigned long Stats::IssuedInterleaveReadCMD = 0;
+	thread_local unsigned long Stats::IssuedMultiplaneReadCMD = 0;
+	thread_local unsigned long Stats::IssuedMultiplaneCopybackReadCMD = 0;
+	thread_local unsigned long Stats::IssuedProgramCMD = 0;
+	thread_local unsigned long Stats::IssuedInterleaveProgramCMD = 0;
+	thread_local unsigned long Stats::IssuedMultiplaneProgramCMD = 0;
+	thread_local unsigned long Stats::IssuedMultiplaneCopybackProgramCMD = 0;
+	thread_local unsigned long Stats::IssuedInterleaveMultiplaneProgramCMD = 0;
+	thread_local unsigned long Stats::IssuedSuspendProgramCMD = 0;
+	thread_local unsigned long Stats::IssuedCopybackProgramCMD = 0;
+	thread_local unsigned long Stats::IssuedEraseCMD = 0;
+	thread_local unsigned long Stats::IssuedInterleaveEraseCMD = 0;
+	thread_local unsigned long Stats::IssuedMultiplaneEraseCMD = 0;
+	thread_local unsigned long Stats::IssuedInterleaveMultiplaneEraseCMD = 0;
+	thread_local unsigned long Stats::IssuedSuspendEraseCMD = 0;
+	thread_local unsigned long Stats::Total_flash_reads_for_mapping = 0;
+	thread_local unsigned long Stats::Total_flash_writes_for_mapping = 0;
+	thread_local unsigned long Stats::Total_flash_reads_for_mapping_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned long Stats::Total_flash_writes_for_mapping_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int***** Stats::Block_erase_histogram;
 
-	unsigned long Stats::IssuedIFPGemvCMD = 0;
-	unsigned long Stats::Total_read_reclaim_migrations = 0;
-	unsigned long Stats::Total_ECC_failures = 0;
-	unsigned long Stats::Total_ECC_retries = 0;
-	unsigned long Stats::Total_ECC_uncorrectable = 0;
-	unsigned int  Stats::CMT_hits = 0, Stats::readTR_CMT_hits = 0, Stats::writeTR_CMT_hits = 0;
-	unsigned int  Stats::CMT_miss = 0, Stats::readTR_CMT_miss = 0, Stats::writeTR_CMT_miss = 0;
-	unsigned int  Stats::total_CMT_queries = 0, Stats::total_readTR_CMT_queries = 0, Stats::total_writeTR_CMT_queries = 0;
+	thread_local unsigned long Stats::IssuedIFPGemvCMD = 0;
+	thread_local unsigned long Stats::Total_read_reclaim_migrations = 0;
+	thread_local unsigned long Stats::Total_ECC_failures = 0;
+	thread_local unsigned long Stats::Total_ECC_retries = 0;
+	thread_local unsigned long Stats::Total_ECC_uncorrectable = 0;
+	thread_local unsigned int  Stats::CMT_hits = 0, Stats::readTR_CMT_hits = 0, Stats::writeTR_CMT_hits = 0;
+	thread_local unsigned int  Stats::CMT_miss = 0, Stats::readTR_CMT_miss = 0, Stats::writeTR_CMT_miss = 0;
+	thread_local unsigned int  Stats::total_CMT_queries = 0, Stats::total_readTR_CMT_queries = 0, Stats::total_writeTR_CMT_queries = 0;
 
-	unsigned int Stats::Total_gc_executions = 0, Stats::Total_gc_executions_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
-	unsigned int Stats::Total_page_movements_for_gc = 0, Stats::Total_gc_page_movements_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int Stats::Total_gc_executions = 0, Stats::Total_gc_executions_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int Stats::Total_page_movements_for_gc = 0, Stats::Total_gc_page_movements_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
 
-	unsigned int Stats::Total_wl_executions = 0, Stats::Total_wl_executions_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
-	unsigned int Stats::Total_page_movements_for_wl = 0, Stats::Total_wl_page_movements_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int Stats::Total_wl_executions = 0, Stats::Total_wl_executions_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int Stats::Total_page_movements_for_wl = 0, Stats::Total_wl_page_movements_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
 
-	unsigned int Stats::CMT_hits_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::readTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::writeTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
-	unsigned int Stats::CMT_miss_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::readTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::writeTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
-	unsigned int Stats::total_CMT_queries_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::total_readTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::total_writeTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int Stats::CMT_hits_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::readTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::writeTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int Stats::CMT_miss_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::readTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::writeTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
+	thread_local unsigned int Stats::total_CMT_queries_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::total_readTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS] = { 0 }, Stats::total_writeTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS] = { 0 };
 
 
 	void Stats::Init_stats(unsigned int channel_no, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die, 
@@ -115,4 +115,138 @@ namespace SSD_Components
 		}
 		delete[] Block_erase_histogram;
 	}
+
+	void Stats::Save_checkpoint(Utils::Checkpoint_Writer& writer, unsigned int channel_no, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die,
+		unsigned int max_allowed_block_erase_count)
+	{
+		writer.Write_tag("Stats");
+		writer.Write(IssuedReadCMD);
+		writer.Write(IssuedCopybackReadCMD);
+		writer.Write(IssuedInterleaveReadCMD);
+		writer.Write(IssuedMultiplaneReadCMD);
+		writer.Write(IssuedMultiplaneCopybackReadCMD);
+		writer.Write(IssuedProgramCMD);
+		writer.Write(IssuedInterleaveProgramCMD);
+		writer.Write(IssuedMultiplaneProgramCMD);
+		writer.Write(IssuedInterleaveMultiplaneProgramCMD);
+		writer.Write(IssuedCopybackProgramCMD);
+		writer.Write(IssuedMultiplaneCopybackProgramCMD);
+		writer.Write(IssuedEraseCMD);
+		writer.Write(IssuedInterleaveEraseCMD);
+		writer.Write(IssuedMultiplaneEraseCMD);
+		writer.Write(IssuedInterleaveMultiplaneEraseCMD);
+		writer.Write(IssuedSuspendProgramCMD);
+		writer.Write(IssuedSuspendEraseCMD);
+		writer.Write(Total_flash_reads_for_mapping);
+		writer.Write(Total_flash_writes_for_mapping);
+		writer.Write(IssuedIFPGemvCMD);
+		writer.Write(Total_read_reclaim_migrations);
+		writer.Write(Total_ECC_failures);
+		writer.Write(Total_ECC_retries);
+		writer.Write(Total_ECC_uncorrectable);
+		writer.Write(CMT_hits);
+		writer.Write(readTR_CMT_hits);
+		writer.Write(writeTR_CMT_hits);
+		writer.Write(CMT_miss);
+		writer.Write(readTR_CMT_miss);
+		writer.Write(writeTR_CMT_miss);
+		writer.Write(total_CMT_queries);
+		writer.Write(total_readTR_CMT_queries);
+		writer.Write(total_writeTR_CMT_queries);
+		writer.Write(Total_gc_executions);
+		writer.Write(Total_page_movements_for_gc);
+		writer.Write(Total_wl_executions);
+		writer.Write(Total_page_movements_for_wl);
+		writer.Write_array(Total_flash_reads_for_mapping_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(Total_flash_writes_for_mapping_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(CMT_hits_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(readTR_CMT_hits_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(writeTR_CMT_hits_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(CMT_miss_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(readTR_CMT_miss_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(writeTR_CMT_miss_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(total_CMT_queries_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(total_readTR_CMT_queries_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(total_writeTR_CMT_queries_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(Total_gc_executions_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(Total_gc_page_movements_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(Total_wl_executions_per_stream, MAX_SUPPORT_STREAMS);
+		writer.Write_array(Total_wl_page_movements_per_stream, MAX_SUPPORT_STREAMS);
+		for (unsigned int channel_cntr = 0; channel_cntr < channel_no; channel_cntr++) {
+			for (unsigned int chip_cntr = 0; chip_cntr < chip_no_per_channel; chip_cntr++) {
+				for (unsigned int die_cntr = 0; die_cntr < die_no_per_chip; die_cntr++) {
+					for (unsigned int plane_cntr = 0; plane_cntr < plane_no_per_die; plane_cntr++) {
+						writer.Write_array(Block_erase_histogram[channel_cntr][chip_cntr][die_cntr][plane_cntr], max_allowed_block_erase_count);
+					}
+				}
+			}
+		}
+	}
+
+	void Stats::Load_checkpoint(Utils::Checkpoint_Reader& reader, unsigned int channel_no, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die,
+		unsigned int max_allowed_block_erase_count)
+	{
+		reader.Expect_tag("Stats");
+		IssuedReadCMD = reader.Read<unsigned long>();
+		IssuedCopybackReadCMD = reader.Read<unsigned long>();
+		IssuedInterleaveReadCMD = reader.Read<unsigned long>();
+		IssuedMultiplaneReadCMD = reader.Read<unsigned long>();
+		IssuedMultiplaneCopybackReadCMD = reader.Read<unsigned long>();
+		IssuedProgramCMD = reader.Read<unsigned long>();
+		IssuedInterleaveProgramCMD = reader.Read<unsigned long>();
+		IssuedMultiplaneProgramCMD = reader.Read<unsigned long>();
+		IssuedInterleaveMultiplaneProgramCMD = reader.Read<unsigned long>();
+		IssuedCopybackProgramCMD = reader.Read<unsigned long>();
+		IssuedMultiplaneCopybackProgramCMD = reader.Read<unsigned long>();
+		IssuedEraseCMD = reader.Read<unsigned long>();
+		IssuedInterleaveEraseCMD = reader.Read<unsigned long>();
+		IssuedMultiplaneEraseCMD = reader.Read<unsigned long>();
+		IssuedInterleaveMultiplaneEraseCMD = reader.Read<unsigned long>();
+		IssuedSuspendProgramCMD = reader.Read<unsigned long>();
+		IssuedSuspendEraseCMD = reader.Read<unsigned long>();
+		Total_flash_reads_for_mapping = reader.Read<unsigned long>();
+		Total_flash_writes_for_mapping = reader.Read<unsigned long>();
+		IssuedIFPGemvCMD = reader.Read<unsigned long>();
+		Total_read_reclaim_migrations = reader.Read<unsigned long>();
+		Total_ECC_failures = reader.Read<unsigned long>();
+		Total_ECC_retries = reader.Read<unsigned long>();
+		Total_ECC_uncorrectable = reader.Read<unsigned long>();
+		CMT_hits = reader.Read<unsigned int>();
+		readTR_CMT_hits = reader.Read<unsigned int>();
+		writeTR_CMT_hits = reader.Read<unsigned int>();
+		CMT_miss = reader.Read<unsigned int>();
+		readTR_CMT_miss = reader.Read<unsigned int>();
+		writeTR_CMT_miss = reader.Read<unsigned int>();
+		total_CMT_queries = reader.Read<unsigned int>();
+		total_readTR_CMT_queries = reader.Read<unsigned int>();
+		total_writeTR_CMT_queries = reader.Read<unsigned int>();
+		Total_gc_executions = reader.Read<unsigned int>();
+		Total_page_movements_for_gc = reader.Read<unsigned int>();
+		Total_wl_executions = reader.Read<unsigned int>();
+		Total_page_movements_for_wl = reader.Read<unsigned int>();
+		reader.Read_array(Total_flash_reads_for_mapping_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(Total_flash_writes_for_mapping_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(CMT_hits_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(readTR_CMT_hits_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(writeTR_CMT_hits_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(CMT_miss_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(readTR_CMT_miss_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(writeTR_CMT_miss_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(total_CMT_queries_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(total_readTR_CMT_queries_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(total_writeTR_CMT_queries_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(Total_gc_executions_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(Total_gc_page_movements_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(Total_wl_executions_per_stream, MAX_SUPPORT_STREAMS);
+		reader.Read_array(Total_wl_page_movements_per_stream, MAX_SUPPORT_STREAMS);
+		for (unsigned int channel_cntr = 0; channel_cntr < channel_no; channel_cntr++) {
+			for (unsigned int chip_cntr = 0; chip_cntr < chip_no_per_channel; chip_cntr++) {
+				for (unsigned int die_cntr = 0; die_cntr < die_no_per_chip; die_cntr++) {
+					for (unsigned int plane_cntr = 0; plane_cntr < plane_no_per_die; plane_cntr++) {
+						reader.Read_array(Block_erase_histogram[channel_cntr][chip_cntr][die_cntr][plane_cntr], max_allowed_block_erase_count);
+					}
+				}
+			}
+		}
+	}
 }
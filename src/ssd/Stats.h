@@ -2,6 +2,7 @@
 #define STATS_H
 
 #include "SSD_Defs.h"
+#include "../utils/Checkpoint_Stream.h"
 
 namespace SSD_Components
 {
@@ -10,39 +11,42 @@ namespace SSD_Components
 	public:
 		static void Init_stats(unsigned int channel_no, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die, unsigned int block_no_per_plane, unsigned int page_no_per_block, unsigned int max_allowed_block_erase_count);
 		static void Clear_stats(unsigned int channel_no, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die, unsigned int block_no_per_plane, unsigned int page_no_per_block, unsigned int max_allowed_block_erase_count);
-		static unsigned long IssuedReadCMD, IssuedCopybackReadCMD, IssuedInterleaveReadCMD, IssuedMultiplaneReadCMD, IssuedMultiplaneCopybackReadCMD;
-		static unsigned long IssuedProgramCMD, IssuedInterleaveProgramCMD, IssuedMultiplaneProgramCMD, IssuedInterleaveMultiplaneProgramCMD, IssuedCopybackProgramCMD, IssuedMultiplaneCopybackProgramCMD;
-		static unsigned long IssuedEraseCMD, IssuedInterleaveEraseCMD, IssuedMultiplaneEraseCMD, IssuedInterleaveMultiplaneEraseCMD;
+		//Device counters are part of a checkpoint, so a resumed simulation reports the totals of the whole run
+		static void Save_checkpoint(Utils::Checkpoint_Writer& writer, unsigned int channel_no, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die, unsigned int max_allowed_block_erase_count);
+		static void Load_checkpoint(Utils::Checkpoint_Reader& reader, unsigned int channel_no, unsigned int chip_no_per_channel, unsigned int die_no_per_chip, unsigned int plane_no_per_die, unsigned int max_allowed_block_erase_count);
+		static thread_local unsigned long IssuedReadCMD, IssuedCopybackReadCMD, IssuedInterleaveReadCMD, IssuedMultiplaneReadCMD, IssuedMultiplaneCopybackReadCMD;
+		static thread_local unsigned long IssuedProgramCMD, IssuedInterleaveProgramCMD, IssuedMultiplaneProgramCMD, IssuedInterleaveMultiplaneProgramCMD, IssuedCopybackProgramCMD, IssuedMultiplaneCopybackProgramCMD;
+		static thread_local unsigned long IssuedEraseCMD, IssuedInterleaveEraseCMD, IssuedMultiplaneEraseCMD, IssuedInterleaveMultiplaneEraseCMD;
 
-		static unsigned long IssuedSuspendProgramCMD, IssuedSuspendEraseCMD;
+		static thread_local unsigned long IssuedSuspendProgramCMD, IssuedSuspendEraseCMD;
 
-		static unsigned long Total_flash_reads_for_mapping, Total_flash_writes_for_mapping;
-		static unsigned long Total_flash_reads_for_mapping_per_stream[MAX_SUPPORT_STREAMS], Total_flash_writes_for_mapping_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned long Total_flash_reads_for_mapping, Total_flash_writes_for_mapping;
+		static thread_local unsigned long Total_flash_reads_for_mapping_per_stream[MAX_SUPPORT_STREAMS], Total_flash_writes_for_mapping_per_stream[MAX_SUPPORT_STREAMS];
 
-		static unsigned int CMT_hits, readTR_CMT_hits, writeTR_CMT_hits;
-		static unsigned int CMT_miss, readTR_CMT_miss, writeTR_CMT_miss;
-		static unsigned int total_CMT_queries, total_readTR_CMT_queries, total_writeTR_CMT_queries;
+		static thread_local unsigned int CMT_hits, readTR_CMT_hits, writeTR_CMT_hits;
+		static thread_local unsigned int CMT_miss, readTR_CMT_miss, writeTR_CMT_miss;
+		static thread_local unsigned int total_CMT_queries, total_readTR_CMT_queries, total_writeTR_CMT_queries;
 		
-		static unsigned int CMT_hits_per_stream[MAX_SUPPORT_STREAMS], readTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS], writeTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS];
-		static unsigned int CMT_miss_per_stream[MAX_SUPPORT_STREAMS], readTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS], writeTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS];
-		static unsigned int total_CMT_queries_per_stream[MAX_SUPPORT_STREAMS], total_readTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS], total_writeTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned int CMT_hits_per_stream[MAX_SUPPORT_STREAMS], readTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS], writeTR_CMT_hits_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned int CMT_miss_per_stream[MAX_SUPPORT_STREAMS], readTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS], writeTR_CMT_miss_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned int total_CMT_queries_per_stream[MAX_SUPPORT_STREAMS], total_readTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS], total_writeTR_CMT_queries_per_stream[MAX_SUPPORT_STREAMS];
 		
 
-		static unsigned int Total_gc_executions, Total_gc_executions_per_stream[MAX_SUPPORT_STREAMS];
-		static unsigned int Total_page_movements_for_gc, Total_gc_page_movements_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned int Total_gc_executions, Total_gc_executions_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned int Total_page_movements_for_gc, Total_gc_page_movements_per_stream[MAX_SUPPORT_STREAMS];
 
-		static unsigned int Total_wl_executions, Total_wl_executions_per_stream[MAX_SUPPORT_STREAMS];
-		static unsigned int Total_page_movements_for_wl, Total_wl_page_movements_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned int Total_wl_executions, Total_wl_executions_per_stream[MAX_SUPPORT_STREAMS];
+		static thread_local unsigned int Total_page_movements_for_wl, Total_wl_page_movements_per_stream[MAX_SUPPORT_STREAMS];
 
-		static unsigned int***** Block_erase_histogram;
+		static thread_local unsigned int***** Block_erase_histogram;
 
 		// IFP statistics
-		static unsigned long IssuedIFPGemvCMD;
+		static thread_local unsigned long IssuedIFPGemvCMD;
 		// ECC/read-reclaim statistics (applies to both regular reads and IFP reads)
-		static unsigned long Total_read_reclaim_migrations;
-		static unsigned long Total_ECC_failures;
-		static unsigned long Total_ECC_retries;
-		static unsigned long Total_ECC_uncorrectable;
+		static thread_local unsigned long Total_read_reclaim_migrations;
+		static thread_local unsigned long Total_ECC_failures;
+		static thread_local unsigned long Total_ECC_retries;
+		static thread_local unsigned long Total_ECC_uncorrectable;
 	};
 }
 
@@ -5,7 +5,7 @@
 
 namespace SSD_Components
 {
-	TSU_Base* TSU_Base::_my_instance = NULL;
+	thread_local TSU_Base* TSU_Base::_my_instance = NULL;
 
 	TSU_Base::TSU_Base(const sim_object_id_type& id, FTL* ftl, NVM_PHY_ONFI_NVDDR2* NVMController, Flash_Scheduling_Type Type,
 		unsigned int ChannelCount, unsigned int chip_no_per_channel, unsigned int DieNoPerChip, unsigned int PlaneNoPerDie,
@@ -81,7 +81,8 @@ namespace SSD_Components
 			transaction_dispatch_slots.clear();
 			planeVector = 0;
 
-			for (Flash_Transaction_Queue::iterator it = sourceQueue1->begin(); it != sourceQueue1->end();)
+			//Every selected transaction occupies a distinct plane, so the scan ends once all planes of the die are taken
+			for (Flash_Transaction_Queue::iterator it = sourceQueue1->begin(); it != sourceQueue1->end() && transaction_dispatch_slots.size() < plane_no_per_die;)
 			{
 				if (transaction_is_ready(*it) && (*it)->Address.DieID == dieID && !(planeVector & 1 << (*it)->Address.PlaneID))
 				{
@@ -101,7 +102,7 @@ namespace SSD_Components
 
 			if (sourceQueue2 != NULL && transaction_dispatch_slots.size() < plane_no_per_die)
 			{
-				for (Flash_Transaction_Queue::iterator it = sourceQueue2->begin(); it != sourceQueue2->end();)
+				for (Flash_Transaction_Queue::iterator it = sourceQueue2->begin(); it != sourceQueue2->end() && transaction_dispatch_slots.size() < plane_no_per_die;)
 				{
 					if (transaction_is_ready(*it) && (*it)->Address.DieID == dieID && !(planeVector & 1 << (*it)->Address.PlaneID))
 					{
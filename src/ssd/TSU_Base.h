@@ -79,7 +79,7 @@ protected:
 	sim_time_type eraseReasonableSuspensionTimeForWrite;
 	flash_chip_ID_type *Round_robin_turn_of_channel; //Used for round-robin service of the chips in channels
 
-	static TSU_Base *_my_instance;
+	static thread_local TSU_Base *_my_instance;
 	std::list<NVM_Transaction_Flash *> transaction_receive_slots;  //Stores the transactions that are received for sheduling
 	std::list<NVM_Transaction_Flash *> transaction_dispatch_slots; //Used to submit transactions to the channel controller
 	virtual bool service_read_transaction(NVM::FlashMemory::Flash_Chip *chip) = 0;
@@ -1,8 +1,20 @@
 #include "User_Request.h"
+#include "../utils/Object_Pool.h"
 
 namespace SSD_Components
 {
-	unsigned int User_Request::lastId = 0;
+	thread_local unsigned int User_Request::lastId = 0;
+	static thread_local Utils::Object_Pool user_request_pool("User_Request", sizeof(User_Request));
+
+	void* User_Request::operator new(size_t size)
+	{
+		return user_request_pool.Allocate(size);
+	}
+
+	void User_Request::operator delete(void* request)
+	{
+		user_request_pool.Release(request);
+	}
 
 	User_Request::User_Request() : Sectors_serviced_from_cache(0)
 	{
@@ -32,8 +32,12 @@ namespace SSD_Components
 		bool ToBeIgnored;
 		void* IO_command_info;//used to store host I/O command info
 		void* Data;
+
+		//User requests are allocated from a pool of the simulation thread (see Utils::Object_Pool)
+		static void* operator new(size_t size);
+		static void operator delete(void* request);
 	private:
-		static unsigned int lastId;
+		static thread_local unsigned int lastId;
 	};
 }
 
@@ -7,6 +7,7 @@ namespace Utils
 {
 	class CMRRandomGenerator
 	{
+		friend class RandomGenerator;
 		public:
 			CMRRandomGenerator(int64_t n, int e);
 			void Advance(int64_t n, int e);
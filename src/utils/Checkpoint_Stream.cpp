@@ -0,0 +1,77 @@
+#include "Checkpoint_Stream.h"
+
+namespace Utils
+{
+	Checkpoint_Writer::Checkpoint_Writer(const std::string& file_path) : file_path(file_path)
+	{
+		file.open(file_path, std::ofstream::out | std::ofstream::binary | std::ofstream::trunc);
+		if (!file) {
+			PRINT_ERROR("Cannot open the checkpoint file " << file_path)
+		}
+	}
+
+	Checkpoint_Writer::~Checkpoint_Writer()
+	{
+		if (file.is_open()) {
+			file.close();
+		}
+	}
+
+	void Checkpoint_Writer::Write_tag(const std::string& section)
+	{
+		uint32_t length = (uint32_t)section.size();
+		Write(length);
+		file.write(section.data(), length);
+	}
+
+	void Checkpoint_Writer::Close()
+	{
+		file.close();
+		if (!file) {
+			PRINT_ERROR("Error while writing the checkpoint file " << file_path)
+		}
+	}
+
+	Checkpoint_Reader::Checkpoint_Reader(const std::string& file_path) : file_path(file_path)
+	{
+		file.open(file_path, std::ifstream::in | std::ifstream::binary);
+		if (!file) {
+			PRINT_ERROR("Cannot open the checkpoint file " << file_path)
+		}
+	}
+
+	Checkpoint_Reader::~Checkpoint_Reader()
+	{
+		if (file.is_open()) {
+			file.close();
+		}
+	}
+
+	void Checkpoint_Reader::Expect_tag(const std::string& section)
+	{
+		uint32_t length = Read<uint32_t>();
+		std::string tag(length < 256 ? length : 0, '\0');
+		if (length < 256) {
+			file.read(&tag[0], length);
+			check_stream();
+		}
+		if (tag != section) {
+			PRINT_ERROR("The checkpoint " << file_path << " is corrupt or was written by a different simulator version: expected the " << section << " section")
+		}
+	}
+
+	void Checkpoint_Reader::Close()
+	{
+		if (file.peek() != std::ifstream::traits_type::eof()) {
+			PRINT_ERROR("The checkpoint " << file_path << " has unexpected data after its last section")
+		}
+		file.close();
+	}
+
+	void Checkpoint_Reader::check_stream()
+	{
+		if (!file) {
+			PRINT_ERROR("The checkpoint " << file_path << " is truncated")
+		}
+	}
+}
@@ -0,0 +1,72 @@
+#ifndef CHECKPOINT_STREAM_H
+#define CHECKPOINT_STREAM_H
+
+#include <cstdint>
+#include <fstream>
+#include <string>
+#include "../sim/Sim_Defs.h"
+
+namespace Utils
+{
+	/*
+	* Binary streams of a simulation checkpoint file. Values are written in the host byte order with
+	* their in-memory layout, so a checkpoint can only be restored by a build of the same simulator on
+	* the same platform. Every component writes a named section tag first; the reader checks the tags
+	* and the configuration values that determine the size of the state, so a checkpoint taken with a
+	* different device geometry is rejected instead of being loaded into the wrong structures.
+	*/
+	class Checkpoint_Writer
+	{
+	public:
+		Checkpoint_Writer(const std::string& file_path);
+		~Checkpoint_Writer();
+		void Write_tag(const std::string& section);
+		template<typename T> void Write(const T& value)
+		{
+			file.write((const char*)&value, sizeof(T));
+		}
+		template<typename T> void Write_array(const T* values, uint64_t count)
+		{
+			file.write((const char*)values, count * sizeof(T));
+		}
+		void Close();
+	private:
+		std::string file_path;
+		std::ofstream file;
+	};
+
+	class Checkpoint_Reader
+	{
+	public:
+		Checkpoint_Reader(const std::string& file_path);
+		~Checkpoint_Reader();
+		void Expect_tag(const std::string& section);
+		template<typename T> T Read()
+		{
+			T value;
+			file.read((char*)&value, sizeof(T));
+			check_stream();
+			return value;
+		}
+		template<typename T> void Read_array(T* values, uint64_t count)
+		{
+			file.read((char*)values, count * sizeof(T));
+			check_stream();
+		}
+		//Reads a configuration value and stops the simulation if it differs from the current configuration
+		template<typename T> void Expect(const T& expected, const char* name)
+		{
+			T value = Read<T>();
+			if (value != expected) {
+				PRINT_ERROR("The checkpoint " << file_path << " does not match the simulation configuration: " << name << " is " << value << " in the checkpoint and " << expected << " in this simulation")
+			}
+		}
+		void Close();
+	private:
+		std::string file_path;
+		std::ifstream file;
+		void check_stream();
+	};
+}
+
+#endif // !CHECKPOINT_STREAM_H
@@ -0,0 +1,246 @@
+#ifndef LRU_TABLE_H
+#define LRU_TABLE_H
+
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+namespace Utils
+{
+	/*
+	* Fixed-capacity table of slots kept in least recently used order, used by the cached mapping table
+	* and the data cache. The slots live in one array and are chained by intrusive prev/next indices, so
+	* a recency update or an eviction only rewrites a few indices; keys are found through an open
+	* addressing index of slot numbers (linear probing in Robin Hood order, with backward shift deletion).
+	* Both arrays grow with the number of slots in use up to the capacity, and removed slots are reused
+	* through a free list.
+	*
+	* Keys are hashed in groups of Key_group_size consecutive keys: a group is placed by Fibonacci hashing
+	* and its keys take adjacent index positions, so the sequential LPAs of a large request or a scan share
+	* cache lines of the index.
+	*
+	* Slots are addressed by their index, which stays valid until the slot is removed. The order is
+	* from the front (most recently used) to the back (least recently used); the table does not change
+	* the order by itself, the owner decides which accesses count as a use.
+	*/
+	template<typename Slot_Type>
+	class LRU_Table
+	{
+	public:
+		static const uint32_t NIL = UINT32_MAX;
+		static const unsigned int Key_group_bits = 3;
+		static const unsigned int Key_group_size = 1 << Key_group_bits;
+
+		LRU_Table(unsigned int capacity) : capacity(capacity), size(0), head(NIL), tail(NIL), free_slot(NIL), index_mask(0), index_shift(64) {}
+
+		unsigned int Capacity() const { return capacity; }
+		unsigned int Size() const { return size; }
+		uint32_t Front() const { return head; }
+		uint32_t Back() const { return tail; }
+		uint32_t Next(uint32_t slot) const { return nodes[slot].Next; }//Toward the back
+		uint32_t Previous(uint32_t slot) const { return nodes[slot].Previous; }//Toward the front
+		uint64_t Key(uint32_t slot) const { return nodes[slot].Key; }
+		Slot_Type& operator[](uint32_t slot) { return nodes[slot].Value; }
+
+		//Slot of key, or NIL
+		uint32_t Find(uint64_t key) const
+		{
+			if (size == 0) {
+				return NIL;
+			}
+			uint32_t position = home(key);
+			for (uint32_t distance = 0;; distance++, position = (position + 1) & index_mask) {
+				const Index_Entry& entry = index[position];
+				//Robin Hood order: the key would have displaced any entry that is closer to its home
+				if (entry.Slot == NIL || displacement(entry.Key, position) < distance) {
+					return NIL;
+				}
+				if (entry.Key == key) {
+					return entry.Slot;
+				}
+			}
+		}
+
+		//The key must not be in the table, and the table must not be full
+		uint32_t Insert_front(uint64_t key)
+		{
+			uint32_t slot = allocate_slot(key);
+			link_front(slot);
+			return slot;
+		}
+
+		uint32_t Insert_back(uint64_t key)
+		{
+			uint32_t slot = allocate_slot(key);
+			Node& node = nodes[slot];
+			node.Previous = tail;
+			node.Next = NIL;
+			if (tail != NIL) {
+				nodes[tail].Next = slot;
+			} else {
+				head = slot;
+			}
+			tail = slot;
+			return slot;
+		}
+
+		void Move_to_front(uint32_t slot)
+		{
+			if (slot != head) {
+				unlink(slot);
+				link_front(slot);
+			}
+		}
+
+		void Remove(uint32_t slot)
+		{
+			unlink(slot);
+			remove_from_index(nodes[slot].Key);
+			nodes[slot].Value = Slot_Type();
+			nodes[slot].Next = free_slot;
+			free_slot = slot;
+			size--;
+		}
+
+		void Clear()
+		{
+			nodes.clear();
+			index.clear();
+			size = 0;
+			head = tail = free_slot = NIL;
+			index_mask = 0;
+			index_shift = 64;
+		}
+	private:
+		struct Node
+		{
+			uint64_t Key;
+			uint32_t Previous;
+			uint32_t Next;
+			Slot_Type Value;
+		};
+		struct Index_Entry
+		{
+			uint64_t Key;
+			uint32_t Slot;
+		};
+		unsigned int capacity;
+		unsigned int size;
+		uint32_t head, tail;
+		uint32_t free_slot;//Removed slots are chained through Next
+		std::vector<Node> nodes;
+		std::vector<Index_Entry> index;//Power-of-two size (at least 32), at most half full
+		uint64_t index_mask;
+		unsigned int index_shift;//64 - log2(index size), to take the hash from the high bits of the product
+
+		uint32_t home(uint64_t key) const
+		{
+			uint64_t group_position = ((key >> Key_group_bits) * 0x9E3779B97F4A7C15ULL) >> (index_shift + Key_group_bits);
+			return (uint32_t)((group_position << Key_group_bits) | (key & (Key_group_size - 1)));
+		}
+
+		uint32_t allocate_slot(uint64_t key)
+		{
+			if ((uint64_t)(size + 1) * 2 > index.size()) {
+				grow_index();
+			}
+			uint32_t slot;
+			if (free_slot != NIL) {
+				slot = free_slot;
+				free_slot = nodes[slot].Next;
+			} else {
+				slot = (uint32_t)nodes.size();
+				nodes.push_back(Node());
+			}
+			nodes[slot].Key = key;
+			insert_into_index(key, slot);
+			size++;
+			return slot;
+		}
+
+		void link_front(uint32_t slot)
+		{
+			Node& node = nodes[slot];
+			node.Previous = NIL;
+			node.Next = head;
+			if (head != NIL) {
+				nodes[head].Previous = slot;
+			} else {
+				tail = slot;
+			}
+			head = slot;
+		}
+
+		void unlink(uint32_t slot)
+		{
+			Node& node = nodes[slot];
+			if (node.Previous != NIL) {
+				nodes[node.Previous].Next = node.Next;
+			} else {
+				head = node.Next;
+			}
+			if (node.Next != NIL) {
+				nodes[node.Next].Previous = node.Previous;
+			} else {
+				tail = node.Previous;
+			}
+		}
+
+		uint32_t displacement(uint64_t key, uint32_t position) const
+		{
+			return (uint32_t)((position - home(key)) & index_mask);
+		}
+
+		//Robin Hood insertion: an entry that is further from its home takes the position of one that is closer to its own
+		void insert_into_index(uint64_t key, uint32_t slot)
+		{
+			Index_Entry entry = { key, slot };
+			uint32_t position = home(key);
+			for (uint32_t distance = 0; index[position].Slot != NIL; distance++, position = (position + 1) & index_mask) {
+				uint32_t resident_distance = displacement(index[position].Key, position);
+				if (resident_distance < distance) {
+					std::swap(entry, index[position]);
+					distance = resident_distance;
+				}
+			}
+			index[position] = entry;
+		}
+
+		//Backward shift deletion: the following entries move back by one until an empty position or an entry at its home
+		void remove_from_index(uint64_t key)
+		{
+			uint32_t position = home(key);
+			while (index[position].Key != key || index[position].Slot == NIL) {
+				position = (position + 1) & index_mask;
+			}
+			uint32_t next = (position + 1) & index_mask;
+			while (index[next].Slot != NIL && displacement(index[next].Key, next) > 0) {
+				index[position] = index[next];
+				position = next;
+				next = (next + 1) & index_mask;
+			}
+			index[position].Slot = NIL;
+		}
+
+		void grow_index()
+		{
+			uint64_t new_size = index.size() == 0 ? 32 : index.size() * 2;
+			std::vector<Index_Entry> old_index;
+			old_index.swap(index);
+			Index_Entry empty = { 0, NIL };
+			index.assign(new_size, empty);
+			index_mask = new_size - 1;
+			index_shift = 64;
+			for (uint64_t s = new_size; s > 1; s >>= 1) {
+				index_shift--;
+			}
+			for (auto entry = old_index.begin(); entry != old_index.end(); entry++) {
+				if (entry->Slot != NIL) {
+					insert_into_index(entry->Key, entry->Slot);
+				}
+			}
+		}
+	};
+}
+
+#endif // !LRU_TABLE_H
@@ -0,0 +1,121 @@
+#include <cmath>
+#include "Latency_Histogram.h"
+
+namespace Utils
+{
+	static const unsigned int SUB_BUCKET_BITS = 7;
+	static const unsigned int SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS;
+	static const double REPORTED_PERCENTILES[] = { 50, 90, 99, 99.9, 99.99 };
+	static const char* REPORTED_PERCENTILE_NAMES[] = { "_P50", "_P90", "_P99", "_P99_9", "_P99_99" };
+
+	static inline unsigned int most_significant_bit(uint64_t value)
+	{
+#if defined(__GNUC__)
+		return 63 - __builtin_clzll(value);
+#else
+		unsigned int bit = 0;
+		while (value >>= 1) {
+			bit++;
+		}
+		return bit;
+#endif
+	}
+
+	Latency_Histogram::Latency_Histogram() : total_count(0), max_value(0)
+	{
+	}
+
+	unsigned int Latency_Histogram::bucket_index(sim_time_type value)
+	{
+		if (value < 2 * SUB_BUCKET_COUNT) {
+			return (unsigned int)value;
+		}
+		unsigned int shift = most_significant_bit(value) - SUB_BUCKET_BITS;
+		return ((shift + 1) << SUB_BUCKET_BITS) + (unsigned int)(value >> shift) - SUB_BUCKET_COUNT;
+	}
+
+	sim_time_type Latency_Histogram::bucket_highest_value(unsigned int index)
+	{
+		if (index < 2 * SUB_BUCKET_COUNT) {
+			return index;
+		}
+		unsigned int shift = (index >> SUB_BUCKET_BITS) - 1;
+		sim_time_type lowest = (sim_time_type)((index & (SUB_BUCKET_COUNT - 1)) + SUB_BUCKET_COUNT) << shift;
+		return lowest + ((sim_time_type)1 << shift) - 1;
+	}
+
+	void Latency_Histogram::Record(sim_time_type value)
+	{
+		unsigned int index = bucket_index(value);
+		if (index >= counts.size()) {
+			counts.resize(index + 1, 0);
+		}
+		counts[index]++;
+		total_count++;
+		if (value > max_value) {
+			max_value = value;
+		}
+	}
+
+	void Latency_Histogram::Add(const Latency_Histogram& other, uint64_t times)
+	{
+		if (other.counts.size() > counts.size()) {
+			counts.resize(other.counts.size(), 0);
+		}
+		for (size_t i = 0; i < other.counts.size(); i++) {
+			counts[i] += other.counts[i] * times;
+		}
+		total_count += other.total_count * times;
+		if (other.total_count > 0 && times > 0 && other.max_value > max_value) {
+			max_value = other.max_value;
+		}
+	}
+
+	//The maximum is kept, since the values recorded since the earlier state are not known
+	void Latency_Histogram::Subtract(const Latency_Histogram& other)
+	{
+		for (size_t i = 0; i < other.counts.size(); i++) {
+			counts[i] -= other.counts[i];
+		}
+		total_count -= other.total_count;
+	}
+
+	uint64_t Latency_Histogram::Count() const
+	{
+		return total_count;
+	}
+
+	sim_time_type Latency_Histogram::Max() const
+	{
+		return max_value;
+	}
+
+	sim_time_type Latency_Histogram::Value_at_percentile(double percentile) const
+	{
+		if (total_count == 0) {
+			return 0;
+		}
+		uint64_t rank = (uint64_t)std::ceil(percentile / 100.0 * (double)total_count);
+		if (rank == 0) {
+			rank = 1;
+		}
+		uint64_t cumulative = 0;
+		for (size_t i = 0; i < counts.size(); i++) {
+			cumulative += counts[i];
+			if (cumulative >= rank) {
+				sim_time_type value = bucket_highest_value((unsigned int)i);
+				return (value < max_value ? value : max_value);
+			}
+		}
+		return max_value;
+	}
+
+	void Latency_Histogram::Report_percentiles_in_XML(const std::string& name, XmlWriter& xmlwriter) const
+	{
+		for (unsigned int i = 0; i < sizeof(REPORTED_PERCENTILES) / sizeof(REPORTED_PERCENTILES[0]); i++) {
+			std::string attr = name + REPORTED_PERCENTILE_NAMES[i];
+			std::string val = std::to_string((double)Value_at_percentile(REPORTED_PERCENTILES[i]) / SIM_TIME_TO_MICROSECONDS_COEFF);
+			xmlwriter.Write_attribute_string(attr, val);
+		}
+	}
+}
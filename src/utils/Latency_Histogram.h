@@ -0,0 +1,40 @@
+#ifndef LATENCY_HISTOGRAM_H
+#define LATENCY_HISTOGRAM_H
+
+#include <string>
+#include <vector>
+#include <cstdint>
+#include "../sim/Sim_Defs.h"
+#include "XMLWriter.h"
+
+namespace Utils
+{
+	/*
+	* HDR-style log-linear histogram of latencies in nanoseconds. Values below 2^(SUB_BUCKET_BITS + 1)
+	* have their own bucket; above that, every power of two is split into 2^SUB_BUCKET_BITS equal
+	* buckets, so a reported percentile is within 1/128 (0.8%) of the recorded value. Recording is a
+	* bit scan and an increment; the bucket array only grows up to the largest value recorded.
+	*/
+	class Latency_Histogram
+	{
+	public:
+		Latency_Histogram();
+		void Record(sim_time_type value);
+		void Add(const Latency_Histogram& other, uint64_t times = 1);
+		void Subtract(const Latency_Histogram& other);//other must be an earlier state of this histogram
+		uint64_t Count() const;
+		sim_time_type Max() const;
+		sim_time_type Value_at_percentile(double percentile) const;//percentile in [0, 100]; highest value of the bucket holding that rank
+
+		//Writes <name>_P50, _P90, _P99, _P99_9 and _P99_99 in microseconds
+		void Report_percentiles_in_XML(const std::string& name, XmlWriter& xmlwriter) const;
+	private:
+		std::vector<uint64_t> counts;
+		uint64_t total_count;
+		sim_time_type max_value;
+		static unsigned int bucket_index(sim_time_type value);
+		static sim_time_type bucket_highest_value(unsigned int index);
+	};
+}
+
+#endif // !LATENCY_HISTOGRAM_H
@@ -3,22 +3,22 @@
 
 namespace Utils
 {
-	int**** Logical_Address_Partitioning_Unit::resource_list;
-	std::vector<std::vector<flash_channel_ID_type>> Logical_Address_Partitioning_Unit::stream_channel_ids;
-	std::vector<std::vector<flash_chip_ID_type>> Logical_Address_Partitioning_Unit::stream_chip_ids;
-	std::vector<std::vector<flash_die_ID_type>> Logical_Address_Partitioning_Unit::stream_die_ids;
-	std::vector<std::vector<flash_plane_ID_type>> Logical_Address_Partitioning_Unit::stream_plane_ids;
-	HostInterface_Types Logical_Address_Partitioning_Unit::hostinterface_type;
-	bool Logical_Address_Partitioning_Unit::initialized = false;
-	std::vector<LHA_type> Logical_Address_Partitioning_Unit::pdas_per_flow;
-	std::vector<LHA_type> Logical_Address_Partitioning_Unit::start_lhas_per_flow;
-	std::vector<LHA_type> Logical_Address_Partitioning_Unit::end_lhas_per_flow;
-	unsigned int Logical_Address_Partitioning_Unit::channel_count;
-	unsigned int Logical_Address_Partitioning_Unit::chip_no_per_channel;
-	unsigned int Logical_Address_Partitioning_Unit::die_no_per_chip;
-	unsigned int Logical_Address_Partitioning_Unit::plane_no_per_die;
-	LHA_type Logical_Address_Partitioning_Unit::total_pda_no = 0;
-	LHA_type Logical_Address_Partitioning_Unit::total_lha_no = 0;
+	thread_local int**** Logical_Address_Partitioning_Unit::resource_list;
+	thread_local std::vector<std::vector<flash_channel_ID_type>> Logical_Address_Partitioning_Unit::stream_channel_ids;
+	thread_local std::vector<std::vector<flash_chip_ID_type>> Logical_Address_Partitioning_Unit::stream_chip_ids;
+	thread_local std::vector<std::vector<flash_die_ID_type>> Logical_Address_Partitioning_Unit::stream_die_ids;
+	thread_local std::vector<std::vector<flash_plane_ID_type>> Logical_Address_Partitioning_Unit::stream_plane_ids;
+	thread_local HostInterface_Types Logical_Address_Partitioning_Unit::hostinterface_type;
+	thread_local bool Logical_Address_Partitioning_Unit::initialized = false;
+	thread_local std::vector<LHA_type> Logical_Address_Partitioning_Unit::pdas_per_flow;
+	thread_local std::vector<LHA_type> Logical_Address_Partitioning_Unit::start_lhas_per_flow;
+	thread_local std::vector<LHA_type> Logical_Address_Partitioning_Unit::end_lhas_per_flow;
+	thread_local unsigned int Logical_Address_Partitioning_Unit::channel_count;
+	thread_local unsigned int Logical_Address_Partitioning_Unit::chip_no_per_channel;
+	thread_local unsigned int Logical_Address_Partitioning_Unit::die_no_per_chip;
+	thread_local unsigned int Logical_Address_Partitioning_Unit::plane_no_per_die;
+	thread_local LHA_type Logical_Address_Partitioning_Unit::total_pda_no = 0;
+	thread_local LHA_type Logical_Address_Partitioning_Unit::total_lha_no = 0;
 
 	void Logical_Address_Partitioning_Unit::Reset()
 	{
@@ -29,22 +29,22 @@ namespace Utils
 		static double Get_share_of_physcial_pages_in_plane(flash_channel_ID_type channel_id, flash_chip_ID_type chip_id, flash_die_ID_type die_id, flash_plane_ID_type plane_id);
 		static LHA_type Get_total_device_lha_count();
 	private:
-		static HostInterface_Types hostinterface_type;
-		static int****resource_list;
-		static std::vector<std::vector<flash_channel_ID_type>> stream_channel_ids;
-		static std::vector<std::vector<flash_chip_ID_type>> stream_chip_ids;
-		static std::vector<std::vector<flash_die_ID_type>> stream_die_ids;
-		static std::vector<std::vector<flash_plane_ID_type>> stream_plane_ids;
-		static bool initialized;
-		static std::vector<LHA_type> pdas_per_flow;
-		static std::vector<LHA_type> start_lhas_per_flow;
-		static std::vector<LHA_type> end_lhas_per_flow;
-		static LHA_type total_pda_no;
-		static LHA_type total_lha_no;
-		static unsigned int channel_count;
-		static unsigned int chip_no_per_channel;
-		static unsigned int die_no_per_chip;
-		static unsigned int plane_no_per_die;
+		static thread_local HostInterface_Types hostinterface_type;
+		static thread_local int****resource_list;
+		static thread_local std::vector<std::vector<flash_channel_ID_type>> stream_channel_ids;
+		static thread_local std::vector<std::vector<flash_chip_ID_type>> stream_chip_ids;
+		static thread_local std::vector<std::vector<flash_die_ID_type>> stream_die_ids;
+		static thread_local std::vector<std::vector<flash_plane_ID_type>> stream_plane_ids;
+		static thread_local bool initialized;
+		static thread_local std::vector<LHA_type> pdas_per_flow;
+		static thread_local std::vector<LHA_type> start_lhas_per_flow;
+		static thread_local std::vector<LHA_type> end_lhas_per_flow;
+		static thread_local LHA_type total_pda_no;
+		static thread_local LHA_type total_lha_no;
+		static thread_local unsigned int channel_count;
+		static thread_local unsigned int chip_no_per_channel;
+		static thread_local unsigned int die_no_per_chip;
+		static thread_local unsigned int plane_no_per_die;
 	};
 }
 
@@ -0,0 +1,97 @@
+#include <algorithm>
+#include <iomanip>
+#include <new>
+#include "Object_Pool.h"
+#include "../sim/Sim_Defs.h"
+
+namespace Utils
+{
+	Object_Pool::Object_Pool(const std::string& name, size_t block_size) :
+		name(name), free_list(NULL), allocations(0), live_objects(0), high_water_mark(0)
+	{
+		//Every block is aligned like the memory returned by operator new and can hold the free list link
+		const size_t alignment = alignof(std::max_align_t);
+		this->block_size = (std::max(block_size, sizeof(Free_block)) + alignment - 1) / alignment * alignment;
+		thread_pools().push_back(this);
+	}
+
+	Object_Pool::~Object_Pool()
+	{
+		for (auto slab = slabs.begin(); slab != slabs.end(); slab++) {
+			::operator delete(*slab);
+		}
+		std::vector<Object_Pool*>& pools = thread_pools();
+		pools.erase(std::remove(pools.begin(), pools.end(), this), pools.end());
+	}
+
+	void* Object_Pool::Allocate(size_t size)
+	{
+		if (size > block_size) {
+			PRINT_ERROR("Object pool " << name << ": an object of " << size << " bytes does not fit in its " << block_size << "-byte blocks")
+		}
+		if (free_list == NULL) {
+			allocate_slab();
+		}
+		Free_block* block = free_list;
+		free_list = block->Next;
+		allocations++;
+		if (++live_objects > high_water_mark) {
+			high_water_mark = live_objects;
+		}
+		return block;
+	}
+
+	void Object_Pool::Release(void* block)
+	{
+		if (block == NULL) {
+			return;
+		}
+		Free_block* freed = static_cast<Free_block*>(block);
+		freed->Next = free_list;
+		free_list = freed;
+		live_objects--;
+	}
+
+	void Object_Pool::allocate_slab()
+	{
+		char* slab = static_cast<char*>(::operator new(block_size * Blocks_per_slab));
+		slabs.push_back(slab);
+		//The blocks are linked in address order, so consecutive allocations from a new slab are adjacent
+		for (unsigned int i = Blocks_per_slab; i-- > 0;) {
+			Free_block* block = reinterpret_cast<Free_block*>(slab + i * block_size);
+			block->Next = free_list;
+			free_list = block;
+		}
+	}
+
+	std::vector<Object_Pool*>& Object_Pool::thread_pools()
+	{
+		//Constructed before the first pool of the thread, so it is destroyed after the last one
+		static thread_local std::vector<Object_Pool*> pools;
+		return pools;
+	}
+
+	void Object_Pool::Reset_statistics()
+	{
+		std::vector<Object_Pool*>& pools = thread_pools();
+		for (auto pool = pools.begin(); pool != pools.end(); pool++) {
+			(*pool)->allocations = 0;
+			(*pool)->high_water_mark = (*pool)->live_objects;
+		}
+	}
+
+	void Object_Pool::Print_statistics()
+	{
+		std::vector<Object_Pool*>& pools = thread_pools();
+		if (pools.size() == 0) {
+			return;
+		}
+		PRINT_MESSAGE("Object pools (allocations, high-water objects, reserved KB):")
+		for (auto pool = pools.begin(); pool != pools.end(); pool++) {
+			PRINT_MESSAGE("  " << std::left << std::setw(24) << (*pool)->name << std::right
+				<< std::setw(14) << (*pool)->allocations
+				<< std::setw(12) << (*pool)->high_water_mark
+				<< std::setw(12) << (*pool)->slabs.size() * Blocks_per_slab * (*pool)->block_size / 1024)
+		}
+	}
+}
@@ -0,0 +1,51 @@
+#ifndef OBJECT_POOL_H
+#define OBJECT_POOL_H
+
+#include <cstddef>
+#include <string>
+#include <vector>
+
+namespace Utils
+{
+	/*
+	* Free-list allocator for the objects that the simulator creates and deletes at the rate of requests
+	* (simulation events, user requests, flash transactions). Blocks of one fixed size are carved from
+	* slabs of Blocks_per_slab blocks, and a deleted object's block is pushed on an intrusive free list
+	* from which the next allocation is served. Slabs are only returned to the system when the pool is
+	* destroyed.
+	*
+	* A class uses a pool through its own operator new/delete, with the pool defined as a thread_local
+	* object: every simulation thread has its own pools, so an object must be deleted by the thread that
+	* created it and not after that thread has ended.
+	*/
+	class Object_Pool
+	{
+	public:
+		static const unsigned int Blocks_per_slab = 1024;
+
+		Object_Pool(const std::string& name, size_t block_size);
+		~Object_Pool();
+		void* Allocate(size_t size);
+		void Release(void* block);
+
+		//Statistics of the pools of the calling thread
+		static void Reset_statistics();//The high-water marks restart from the current number of live objects
+		static void Print_statistics();
+	private:
+		struct Free_block
+		{
+			Free_block* Next;
+		};
+		std::string name;
+		size_t block_size;
+		Free_block* free_list;
+		std::vector<char*> slabs;
+		unsigned long long allocations;
+		size_t live_objects;
+		size_t high_water_mark;
+		void allocate_slab();
+		static std::vector<Object_Pool*>& thread_pools();
+	};
+}
+
+#endif // !OBJECT_POOL_H
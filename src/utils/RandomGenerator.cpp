@@ -9,6 +9,18 @@ namespace Utils
 		rand = new CMRRandomGenerator(seed / 200 + 1, seed % 200);
 	}
 
+	void RandomGenerator::Save_checkpoint(Checkpoint_Writer& writer)
+	{
+		writer.Write_array(&rand->s[0][0], 6);
+		writer.Write(Normal_z2);
+	}
+
+	void RandomGenerator::Load_checkpoint(Checkpoint_Reader& reader)
+	{
+		reader.Read_array(&rand->s[0][0], 6);
+		Normal_z2 = reader.Read<double>();
+	}
+
 	uint32_t RandomGenerator::Get_uint(uint32_t maxValue)
 	{
 		uint32_t v = (uint32_t)(FloatRandom() * (maxValue + 1));
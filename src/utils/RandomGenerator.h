@@ -3,6 +3,7 @@
 
 #include <cstdint>
 #include "CMRRandomGenerator.h"
+#include "Checkpoint_Stream.h"
 
 namespace Utils
 {
@@ -31,6 +32,8 @@ namespace Utils
 		double Pareto(double alpha, double beta);
 		double Inverse(double min, double max);
 		double Triangular(double min, double middle, double max);
+		void Save_checkpoint(Checkpoint_Writer& writer);
+		void Load_checkpoint(Checkpoint_Reader& reader);
 	private:
 		CMRRandomGenerator* rand;
 		int seed;
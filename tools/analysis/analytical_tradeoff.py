@@ -7,16 +7,31 @@ and demonstrate the fundamental reliability-lifespan trade-off.
 
 Key Insight: We don't need to actually trigger reclaim - we can calculate
 when it WOULD trigger and project the P/E cycle consumption.
+
+--monte-carlo replaces the fixed hot-block model with the per-block engine in
+read_distribution.py (skew from --trace if given).
+
+The read rate and ECC failure rate are fitted to the Exp2 runs in the results
+store at run time (measured_constants.py; result paths and the store's
+--experiment/--model filters select the runs). The output JSON records the
+fitted points and the runs behind each constant.
+
+Usage:
+  python3 tools/analysis/analytical_tradeoff.py -o results/analytical/analytical_tradeoff.json
+  python3 tools/analysis/analytical_tradeoff.py results/exp2_accumulation -o tradeoff.json
+  python3 tools/analysis/analytical_tradeoff.py --published
 """
 
 import json
+import os
 import sys
 
 # ============================================================================
 # MEASURED DATA FROM EXPERIMENT 2 (Llama2-70B)
 # ============================================================================
 
-# Linear fit from Experiment 2: Reads = 0.636 × Tokens
+# Published Exp2 fit, the defaults when no constants are passed in
+# (measured_constants.py fits them to the current results)
 READ_RATE_PER_TOKEN = 0.636  # flash reads per token
 R_SQUARED = 0.999  # fit quality (near-perfect)
 
@@ -24,7 +39,7 @@ R_SQUARED = 0.999  # fit quality (near-perfect)
 ESTIMATED_BLOCKS = 17920  # blocks used for 70B model
 PAGES_PER_BLOCK = 1536  # from ssdconfig.xml
 
-# ECC failure rate (measured)
+# ECC failure rate (published Exp2 measurement)
 ECC_FAILURE_RATE = 0.031  # 3.1% failures per read
 
 # Flash endurance
@@ -85,7 +100,8 @@ def calculate_reclaim_frequency(threshold, tokens_total, read_rate=READ_RATE_PER
     reclaims_per_hot_block = tokens_total / tokens_per_trigger
     return reclaims_per_hot_block
 
-def calculate_pe_cycles_from_reclaim(threshold, tokens_total, hot_block_fraction=0.1):
+def calculate_pe_cycles_from_reclaim(threshold, tokens_total, hot_block_fraction=0.1,
+                                     read_rate=READ_RATE_PER_TOKEN):
     """
     Calculate P/E cycles consumed by read-reclaim.
 
@@ -93,12 +109,13 @@ def calculate_pe_cycles_from_reclaim(threshold, tokens_total, hot_block_fraction
         threshold: Read count threshold for reclaim
         tokens_total: Total tokens generated in campaign
         hot_block_fraction: Fraction of blocks that are "hot" (default 10%)
+        read_rate: Flash reads per token
 
     Returns:
         Average P/E cycles per block
     """
     num_hot_blocks = ESTIMATED_BLOCKS * hot_block_fraction
-    reclaims_per_hot_block = calculate_reclaim_frequency(threshold, tokens_total)
+    reclaims_per_hot_block = calculate_reclaim_frequency(threshold, tokens_total, read_rate)
 
     if reclaims_per_hot_block == 0:
         return 0
@@ -113,7 +130,8 @@ def calculate_pe_cycles_from_reclaim(threshold, tokens_total, hot_block_fraction
 # RELIABILITY PROJECTION
 # ============================================================================
 
-def calculate_ecc_retry_rate(threshold, tokens_total):
+def calculate_ecc_retry_rate(threshold, tokens_total, read_rate=READ_RATE_PER_TOKEN,
+                             ecc_failure_rate=ECC_FAILURE_RATE):
     """
     Estimate ECC retry rate as function of accumulated reads.
 
@@ -121,7 +139,7 @@ def calculate_ecc_retry_rate(threshold, tokens_total):
 
     Simplified model: retry_rate ∝ max_reads_accumulated
     """
-    total_reads = READ_RATE_PER_TOKEN * tokens_total
+    total_reads = read_rate * tokens_total
     avg_reads, max_reads = estimate_max_reads_per_block(total_reads, ESTIMATED_BLOCKS)
 
     # If no reclaim: blocks accumulate up to max_reads
@@ -131,8 +149,8 @@ def calculate_ecc_retry_rate(threshold, tokens_total):
     # ECC retry rate increases with read count (read-disturb BER ∝ reads^q)
     # Simplified: linear relationship for demonstration
     # Base failure rate at 0 reads, increases linearly
-    base_failure_rate = ECC_FAILURE_RATE * 0.5  # baseline
-    failure_rate = base_failure_rate + (ECC_FAILURE_RATE * max_accumulated / 1000)
+    base_failure_rate = ecc_failure_rate * 0.5  # baseline
+    failure_rate = base_failure_rate + (ecc_failure_rate * max_accumulated / 1000)
 
     return failure_rate
 
@@ -194,11 +212,51 @@ def calculate_tbw(tokens_total):
 
     return results
 
+def monte_carlo_tradeoff(thresholds, tokens_campaign, trace=None, trials=None, seed=0, constants=None):
+    """
+    Trade-off rows from the Monte Carlo per-block engine (read_distribution.py).
+
+    Args:
+        thresholds: Read count thresholds to evaluate
+        tokens_campaign: Total tokens generated in campaign
+        trace: Trace whose read LBA histogram sets the access skew
+               (default: the 5% hot / 10x concentration model)
+        constants: Measured constants (measured_constants.py; default: published)
+
+    Returns:
+        List of dicts with the same keys as analyze_tradeoff()
+    """
+    from read_distribution import (DEFAULT_TRIALS, ReadDistributionEngine, hot_cold_weights,
+                                   trace_block_weights)
+
+    weights = trace_block_weights(trace) if trace else hot_cold_weights()
+    constants = constants or _published()
+    engine = ReadDistributionEngine(read_rate=constants['read_rate'],
+                                    ecc_failure_rate=constants['ecc_failure_rate'],
+                                    trials=trials or DEFAULT_TRIALS, seed=seed)
+    r = engine.evaluate(thresholds, weights, tokens_campaign)
+
+    return [{
+        'threshold': int(r['threshold'][i]),
+        'tokens_to_trigger': float(r['tokens_to_trigger'][i]),
+        'reclaims_per_hot_block': float(r['reclaims_per_hot_block'][i]),
+        'avg_pe_cycles': float(r['avg_pe_cycles'][i]),
+        'tbw': float(r['tbw_tb'][i]),
+        'ecc_failure_rate': float(r['ecc_failure_rate'][i]),
+        'lifetime_years': float(r['lifetime_years'][i]),
+    } for i in range(len(thresholds))]
+
 # ============================================================================
 # TRADE-OFF ANALYSIS
 # ============================================================================
 
-def analyze_tradeoff(tokens_campaign=10_000_000):  # 10M token campaign
+THRESHOLDS = [10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 1000000]
+
+def _published():
+    from measured_constants import published_constants
+    return published_constants()
+
+def analyze_tradeoff(tokens_campaign=10_000_000, results=None, constants=None):  # 10M token campaign
     """
     Generate complete trade-off analysis.
 
@@ -208,26 +266,35 @@ def analyze_tradeoff(tokens_campaign=10_000_000):  # 10M token campaign
     3. P/E cycles consumed
     4. ECC retry rate
     5. Projected lifetime
+
+    constants: Measured constants (measured_constants.py; default: published)
     """
+    constants = constants or _published()
+    read_rate = constants['read_rate']
+    ecc_rate = constants['ecc_failure_rate']
+
     print("=" * 80)
     print(f"LLM READ-DISTURB TRADE-OFF ANALYSIS")
     print(f"Campaign: {tokens_campaign:,} tokens")
     print(f"Model: Llama2-70B (70GB, {ESTIMATED_BLOCKS:,} blocks)")
-    print(f"Read Rate: {READ_RATE_PER_TOKEN} reads/token (measured, R²={R_SQUARED})")
+    print(f"Read Rate: {read_rate:.4f} reads/token ({constants['source']}, R²={constants['r_squared']:.4f}, "
+          f"{len(constants['provenance']['read_rate'])} runs)")
+    print(f"ECC Failure Rate: {ecc_rate:.4f}")
     print("=" * 80)
     print()
 
-    # Test different thresholds
-    thresholds = [10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 1000000]
-
-    results = []
+    if results is not None:
+        thresholds = []
+    else:
+        thresholds = THRESHOLDS
+        results = []
 
     for threshold in thresholds:
         # Calculate metrics
-        tokens_to_trigger = calculate_reclaim_trigger_time(threshold)
-        reclaims_per_hot = calculate_reclaim_frequency(threshold, tokens_campaign)
-        avg_pe = calculate_pe_cycles_from_reclaim(threshold, tokens_campaign)
-        retry_rate = calculate_ecc_retry_rate(threshold, tokens_campaign)
+        tokens_to_trigger = calculate_reclaim_trigger_time(threshold, read_rate)
+        reclaims_per_hot = calculate_reclaim_frequency(threshold, tokens_campaign, read_rate)
+        avg_pe = calculate_pe_cycles_from_reclaim(threshold, tokens_campaign, read_rate=read_rate)
+        retry_rate = calculate_ecc_retry_rate(threshold, tokens_campaign, read_rate, ecc_rate)
         lifetime_years = calculate_lifetime_years(avg_pe)
 
         # TBW calculation
@@ -292,22 +359,35 @@ def analyze_tradeoff(tokens_campaign=10_000_000):  # 10M token campaign
 
     return results
 
-def generate_json_for_plotting(tokens_campaign=10_000_000, output_file=None):
-    """Generate JSON data for plotting scripts."""
-    thresholds = [10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 1000000]
+def generate_json_for_plotting(tokens_campaign=10_000_000, output_file=None, results=None, constants=None):
+    """
+    Generate JSON data for plotting scripts (from results, if given).
+
+    The measured constants, the points they were fitted to and the runs behind
+    each of them (provenance) are exported alongside the thresholds.
+    """
+    thresholds = [] if results is not None else THRESHOLDS
+    constants = constants or _published()
+    read_rate = constants['read_rate']
+    ecc_rate = constants['ecc_failure_rate']
 
     data = {
         'campaign_tokens': tokens_campaign,
         'model': 'Llama2-70B',
-        'read_rate': READ_RATE_PER_TOKEN,
-        'r_squared': R_SQUARED,
+        'read_rate': read_rate,
+        'read_rate_intercept': constants['read_rate_intercept'],
+        'r_squared': constants['r_squared'],
+        'ecc_failure_rate': ecc_rate,
+        'constants_source': constants['source'],
+        'measured': constants['points'],
+        'provenance': constants['provenance'],
         'thresholds': []
     }
 
     for threshold in thresholds:
-        reclaims_per_hot = calculate_reclaim_frequency(threshold, tokens_campaign)
-        avg_pe = calculate_pe_cycles_from_reclaim(threshold, tokens_campaign)
-        retry_rate = calculate_ecc_retry_rate(threshold, tokens_campaign)
+        reclaims_per_hot = calculate_reclaim_frequency(threshold, tokens_campaign, read_rate)
+        avg_pe = calculate_pe_cycles_from_reclaim(threshold, tokens_campaign, read_rate=read_rate)
+        retry_rate = calculate_ecc_retry_rate(threshold, tokens_campaign, read_rate, ecc_rate)
 
         hot_blocks = ESTIMATED_BLOCKS * 0.1
         total_reclaims = hot_blocks * reclaims_per_hot
@@ -322,6 +402,16 @@ def generate_json_for_plotting(tokens_campaign=10_000_000, output_file=None):
             'lifetime_years': calculate_lifetime_years(avg_pe)
         })
 
+    for r in results or []:
+        data['thresholds'].append({
+            'threshold': r['threshold'],
+            'reclaims_per_hot_block': r['reclaims_per_hot_block'],
+            'avg_pe_cycles': r['avg_pe_cycles'],
+            'tbw_tb': r['tbw'],
+            'ecc_failure_rate': r['ecc_failure_rate'],
+            'lifetime_years': r['lifetime_years']
+        })
+
     if output_file:
         with open(output_file, 'w') as f:
             json.dump(data, f, indent=2)
@@ -336,16 +426,32 @@ def generate_json_for_plotting(tokens_campaign=10_000_000, output_file=None):
 if __name__ == '__main__':
     import argparse
 
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from measured_constants import add_constants_arguments, constants_from_args
+
     parser = argparse.ArgumentParser(description='Analytical trade-off analysis')
     parser.add_argument('-t', '--tokens', type=int, default=10_000_000,
                        help='Campaign length in tokens (default: 10M)')
     parser.add_argument('-o', '--output', help='Output JSON file for plotting')
+    parser.add_argument('--monte-carlo', action='store_true',
+                       help='Use the per-block Monte Carlo engine instead of the hot-block model')
+    parser.add_argument('--trace', help='Trace whose read LBA histogram sets the skew (implies --monte-carlo)')
+    parser.add_argument('--trials', type=int, help='Monte Carlo trials (default: 8)')
+    parser.add_argument('--seed', type=int, default=0, help='Monte Carlo seed')
+    add_constants_arguments(parser)
 
     args = parser.parse_args()
+    constants = constants_from_args(args)
+    campaign_tokens = args.tokens
+
+    mc_results = None
+    if args.monte_carlo or args.trace:
+        mc_results = monte_carlo_tradeoff(THRESHOLDS, campaign_tokens, args.trace, args.trials, args.seed,
+                                          constants)
 
     # Run analysis
-    results = analyze_tradeoff(args.tokens)
+    results = analyze_tradeoff(campaign_tokens, mc_results, constants)
 
     # Generate plotting data
     if args.output:
-        generate_json_for_plotting(args.tokens, args.output)
+        generate_json_for_plotting(campaign_tokens, args.output, mc_results, constants)
@@ -3,27 +3,88 @@
 LLM Inference Simulation Result Analyzer
 
 Parses MQSim output XML files and extracts key metrics for read-disturb analysis.
+
+Result files reach hundreds of MB once many flows and streams are reported, so
+the analyzer never builds the whole tree: each requested section is located
+with a byte scan over a memory map and only that element is parsed.
 """
 
 import xml.etree.ElementTree as ET
 import json
+import mmap
+import re
 import sys
 import os
 from pathlib import Path
 
+# Sections the analyzer reads; the first occurrence of each is used
+HOST_SECTION = 'Host.IO_Flow'
+FTL_SECTION = 'SSDDevice.FTL'
+
+# Device_Response_Time_<suffix> percentiles of an IO flow -> <key>_response_time_us
+RESPONSE_TIME_PERCENTILES = (('P50', 'p50'), ('P90', 'p90'), ('P99', 'p99'),
+                             ('P99_9', 'p999'), ('P99_99', 'p9999'))
+
+
+def read_result_sections(result_xml_path, tags=(HOST_SECTION, FTL_SECTION)):
+    """
+    Stream the first occurrence of each tag out of an MQSim result XML.
+
+    The start tag is found with a regex over a memory map of the file, then
+    iterparse runs from that offset and stops at the matching end tag, so the
+    cost and memory of a lookup depend on the size of the section rather than
+    the file. Equivalent to root.find('.//tag') for MQSim output, which has no
+    comments or CDATA in which a tag name could appear.
+
+    :param result_xml_path: MQSim result XML
+    :param tags: element tags to extract
+    :return: {tag: Element}; tags that are absent are omitted
+    """
+    sections = {}
+    with open(result_xml_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for tag in tags:
+            match = re.search(b'<' + re.escape(tag.encode()) + rb'[\s/>]', mm)
+            if match is None:
+                continue
+            f.seek(match.start())
+            sections[tag] = _parse_element_at(f)
+    return sections
+
+
+def _parse_element_at(f):
+    """Parse the element whose start tag begins at f's position, ignoring what follows it."""
+    depth = 0
+    for event, elem in ET.iterparse(f, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 0:
+            # Stop before the parser reaches the sibling that follows the section
+            return elem
+    raise ET.ParseError(f"Unterminated section in {f.name}")
+
+
 class LLM_Result_Analyzer:
     def __init__(self, result_xml_path):
         self.result_path = Path(result_xml_path)
         if not self.result_path.exists():
             raise FileNotFoundError(f"Result file not found: {result_xml_path}")
 
-        self.tree = ET.parse(self.result_path)
-        self.root = self.tree.getroot()
+        self.sections = read_result_sections(self.result_path)
         self.metrics = {}
 
     def parse_host_metrics(self):
         """Extract host-level I/O metrics"""
-        host = self.root.find('.//Host.IO_Flow')
+        return self.host_metrics(self.sections.get(HOST_SECTION))
+
+    def parse_ftl_metrics(self):
+        """Extract FTL-level metrics including ECC statistics"""
+        return self.ftl_metrics(self.sections.get(FTL_SECTION))
+
+    @staticmethod
+    def host_metrics(host):
+        """Host metrics from a Host.IO_Flow element"""
         if host is None:
             return {}
 
@@ -36,12 +97,16 @@ class LLM_Result_Analyzer:
             'bandwidth_mbps': float(host.find('Bandwidth').text),
             'avg_response_time_us': float(host.find('Device_Response_Time').text),
         }
+        # Results written before the latency histograms have no percentiles
+        for suffix, key in RESPONSE_TIME_PERCENTILES:
+            elem = host.find('Device_Response_Time_' + suffix)
+            metrics[f'{key}_response_time_us'] = float(elem.text) if elem is not None else None
 
         return metrics
 
-    def parse_ftl_metrics(self):
-        """Extract FTL-level metrics including ECC statistics"""
-        ftl = self.root.find('.//SSDDevice.FTL')
+    @staticmethod
+    def ftl_metrics(ftl):
+        """FTL metrics from an SSDDevice.FTL element"""
         if ftl is None:
             return {}
 
@@ -81,10 +146,27 @@ class LLM_Result_Analyzer:
 
         return metrics
 
+    def parse_block_snapshot(self):
+        """
+        Per-block read statistics from the <result>.blocks.bin snapshot the simulator
+        writes with Enable_Block_Snapshot; empty if there is none.
+        """
+        snapshot_path = self.result_path.with_suffix('.blocks.bin')
+        if not snapshot_path.exists():
+            return {}
+        # NumPy is only needed when a snapshot is present
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from block_snapshot import BlockSnapshot, summarize
+        snapshot = BlockSnapshot(str(snapshot_path))
+        return summarize(snapshot) if len(snapshot) else {}
+
     def analyze_all(self):
         """Parse all metrics and return comprehensive results"""
         self.metrics['host'] = self.parse_host_metrics()
         self.metrics['ftl'] = self.parse_ftl_metrics()
+        flash_operations = self.parse_block_snapshot()
+        if flash_operations:
+            self.metrics['flash_operations'] = flash_operations
 
         # Add metadata
         self.metrics['source_file'] = str(self.result_path)
@@ -107,6 +189,9 @@ class LLM_Result_Analyzer:
         print(f"  IOPS:                {host['iops']:,.2f}")
         print(f"  Bandwidth:           {host['bandwidth_mbps']:.2f} MB/s")
         print(f"  Avg Response Time:   {host['avg_response_time_us']:.2f} μs")
+        if host.get('p99_response_time_us') is not None:
+            print(f"  Response Time Tail:  p50 {host['p50_response_time_us']:.2f}, p99 {host['p99_response_time_us']:.2f}, "
+                  f"p99.9 {host['p999_response_time_us']:.2f}, p99.99 {host['p9999_response_time_us']:.2f} μs")
 
         print("\n🔧 Flash Operations:")
         ftl = metrics['ftl']
@@ -115,6 +200,9 @@ class LLM_Result_Analyzer:
         print(f"  Flash Erases:        {ftl['total_flash_erases']:,}")
         print(f"  GC Executions:       {ftl['total_gc_executions']:,}")
         print(f"  Read-Reclaim Ops:    {ftl['total_read_reclaim']:,}")
+        if 'flash_operations' in metrics:
+            blocks = metrics['flash_operations']
+            print(f"  Reads per Block:     avg {blocks['avg_reads_per_block']:,.2f}, max {blocks['max_reads_per_block']:,}")
 
         print("\n⚠️  ECC Statistics (KEY METRICS):")
         print(f"  ECC Retries:         {ftl['total_ecc_retries']:,}")
@@ -8,38 +8,43 @@ Demonstrates:
 """
 
 import json
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from results_store import ResultsStore
+
 # ============================================================================
 # LOAD EXPERIMENTAL DATA
 # ============================================================================
 
+EXP2_DIR = 'results/exp2_accumulation'
+EXP2_TOKENS = [10000, 50000, 100000]
+
 def load_exp2_data():
-    """Load Experiment 2 results (read accumulation)"""
-    data = []
-
-    files = [
-        ('results/exp2_accumulation/llama70b_10000.json', 10000),
-        ('results/exp2_accumulation/llama70b_50000.json', 50000),
-        ('results/exp2_accumulation/llama70b_100000.json', 100000),
-    ]
-
-    for filepath, tokens in files:
-        try:
-            with open(filepath, 'r') as f:
-                result = json.load(f)
-                data.append({
-                    'tokens': tokens,
-                    'iops': result['host']['iops'],
-                    'avg_response_us': result['host']['avg_response_time_us'],
-                    'ecc_failures': result['ftl']['total_ecc_failures'],
-                    'flash_reads': result['ftl']['total_flash_reads'],
-                    'multiplane_reads': result['ftl']['multiplane_reads']
-                })
-        except FileNotFoundError:
-            print(f"Warning: {filepath} not found", file=sys.stderr)
-
-    return data
+    """Load Experiment 2 results (read accumulation) from the results store"""
+    with ResultsStore() as store:
+        if os.path.isdir(EXP2_DIR):
+            store.ingest_path(EXP2_DIR)
+        runs = store.query(
+            ['tokens', 'iops', 'avg_response_time_us', 'total_ecc_failures',
+             'total_flash_reads', 'multiplane_reads'],
+            {'experiment': os.path.basename(EXP2_DIR), 'model': 'llama70b', 'tokens': EXP2_TOKENS},
+            order_by='tokens')
+
+    found = {r['tokens'] for r in runs}
+    for tokens in EXP2_TOKENS:
+        if tokens not in found:
+            print(f"Warning: llama70b run with {tokens} tokens not found in {EXP2_DIR}", file=sys.stderr)
+
+    return [{
+        'tokens': r['tokens'],
+        'iops': r['iops'],
+        'avg_response_us': r['avg_response_time_us'],
+        'ecc_failures': r['total_ecc_failures'],
+        'flash_reads': r['total_flash_reads'],
+        'multiplane_reads': r['multiplane_reads'],
+    } for r in runs]
 
 # ============================================================================
 # OUTCOME 1: TOKEN GENERATION SLOWDOWN
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the LLM_Result_Analyzer section reader.
+
+Inflates a real MQSim result XML with extra IO flows and streams, then
+compares the full-tree reference (ET.parse + find) against the streaming
+reader used by the analyzer. Reports time and peak memory for both and checks
+that the metrics are identical.
+
+Usage:
+  python3 tools/analysis/bench_result_parser.py results/exp1_baseline.xml
+  python3 tools/analysis/bench_result_parser.py results/exp1_baseline.xml --flows 50000 --streams 50000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from analyze_llm_results import (FTL_SECTION, HOST_SECTION, LLM_Result_Analyzer,
+                                 read_result_sections)
+
+
+def _section_span(text, tag):
+    start = text.index(f'<{tag}>')
+    end = text.index(f'</{tag}>') + len(f'</{tag}>')
+    return start, end
+
+
+def inflate_result(template_path, output_path, flows, streams):
+    """Repeat the first Host.IO_Flow and SSDDevice.IO_Stream of a result XML."""
+    with open(template_path) as f:
+        text = f.read()
+    flow_start, flow_end = _section_span(text, HOST_SECTION)
+    stream_start, stream_end = _section_span(text, 'SSDDevice.IO_Stream')
+    flow = text[flow_start:flow_end]
+    stream = text[stream_start:stream_end]
+    with open(output_path, 'w') as f:
+        f.write(text[:flow_end])
+        for _ in range(flows):
+            f.write(flow)
+        f.write(text[flow_end:stream_end])
+        for _ in range(streams):
+            f.write(stream)
+        f.write(text[stream_end:])
+
+
+def full_tree_metrics(path):
+    root = ET.parse(path).getroot()
+    return (LLM_Result_Analyzer.host_metrics(root.find('.//' + HOST_SECTION)),
+            LLM_Result_Analyzer.ftl_metrics(root.find('.//' + FTL_SECTION)))
+
+
+def streaming_metrics(path):
+    sections = read_result_sections(path)
+    return (LLM_Result_Analyzer.host_metrics(sections.get(HOST_SECTION)),
+            LLM_Result_Analyzer.ftl_metrics(sections.get(FTL_SECTION)))
+
+
+def measure(fn, path):
+    """Time fn untraced, then run it again under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark result XML parsing')
+    parser.add_argument('result_xml', help='MQSim result XML used as the template')
+    parser.add_argument('--flows', type=int, default=20000, help='Extra Host.IO_Flow sections')
+    parser.add_argument('--streams', type=int, default=20000, help='Extra SSDDevice.IO_Stream sections')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big_path = os.path.join(tmp, 'inflated.xml')
+        inflate_result(args.result_xml, big_path, args.flows, args.streams)
+        size_mb = os.path.getsize(big_path) / 1e6
+
+        full, full_s, full_peak = measure(full_tree_metrics, big_path)
+        stream, stream_s, stream_peak = measure(streaming_metrics, big_path)
+
+    print(f"Result XML: {size_mb:.1f} MB ({args.flows:,} extra flows, {args.streams:,} extra streams)")
+    print(f"{'Reader':<10} {'Time (s)':>10} {'Peak MB':>10}")
+    print(f"{'ET.parse':<10} {full_s:>10.3f} {full_peak / 1e6:>10.1f}")
+    print(f"{'streaming':<10} {stream_s:>10.3f} {stream_peak / 1e6:>10.1f}")
+    print(f"Speedup: {full_s / stream_s:.1f}x")
+    print(f"Identical metrics: {full == stream}")
+
+    if full != stream:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Loader for MQSim per-block snapshot files (<result>.blocks.bin).
+
+With <Enable_Block_Snapshot>true</Enable_Block_Snapshot> in the device
+config, the simulator appends a frame of per-block counters at the end of
+the run and, when Block_Snapshot_Period (ns) is non-zero, on the first flash
+read after each period elapses. Each frame holds one record per block,
+ordered by (channel, chip, die, plane, block). The file is memory-mapped, so
+hot-spot statistics over 100K+ blocks never go through the result XML:
+
+    snap = BlockSnapshot('results/run.blocks.bin')
+    reads = snap.frame(-1)['read_count']          # shape (channels, chips, dies, planes, blocks)
+    hottest = np.unravel_index(reads.argmax(), reads.shape)
+
+Usage:
+  python3 tools/analysis/block_snapshot.py results/run.blocks.bin
+  python3 tools/analysis/block_snapshot.py results/run.blocks.bin --top 10 --json hotspots.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+MAGIC = b'MQSIMBLK'
+FORMAT_VERSION = 1
+
+# Flash_Block_Manager_Base::Write_block_snapshot record layout
+RECORD_FIELDS = ('read_count', 'read_count_since_reclaim', 'max_page_read_count',
+                 'erase_count', 'total_ecc_retries', 'uncorrectable_errors')
+RECORD_DTYPE = np.dtype([(name, '<u4') for name in RECORD_FIELDS])
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'), ('version', '<u4'), ('header_size', '<u4'),
+    ('channels', '<u4'), ('chips_per_channel', '<u4'), ('dies_per_chip', '<u4'),
+    ('planes_per_die', '<u4'), ('blocks_per_plane', '<u4'), ('pages_per_block', '<u4'),
+    ('field_count', '<u4'),
+])
+
+GEOMETRY_AXES = ('channel', 'chip', 'die', 'plane', 'block')
+
+
+class BlockSnapshot:
+    def __init__(self, path):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header['magic'][0] != MAGIC:
+            raise ValueError(f"{path} is not an MQSim block snapshot")
+        header = header[0]
+        if header['version'] != FORMAT_VERSION or header['field_count'] != len(RECORD_FIELDS):
+            raise ValueError(f"{path}: unsupported snapshot format version {header['version']}")
+
+        self.shape = tuple(int(header[k]) for k in ('channels', 'chips_per_channel', 'dies_per_chip',
+                                                    'planes_per_die', 'blocks_per_plane'))
+        self.pages_per_block = int(header['pages_per_block'])
+        self.block_count = int(np.prod(self.shape))
+        self.frame_dtype = np.dtype([('time', '<u8'), ('blocks', RECORD_DTYPE, self.shape)])
+
+        # A frame still being written by a running simulation is ignored
+        header_size = int(header['header_size'])
+        frame_count = (os.path.getsize(path) - header_size) // self.frame_dtype.itemsize
+        if frame_count > 0:
+            self.frames = np.memmap(path, dtype=self.frame_dtype, mode='r', offset=header_size, shape=(frame_count,))
+        else:
+            self.frames = np.empty(0, dtype=self.frame_dtype)
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def times_ns(self):
+        return np.asarray(self.frames['time'])
+
+    def frame(self, index=-1):
+        """Structured array of one frame, indexed [channel, chip, die, plane, block]"""
+        if len(self.frames) == 0:
+            raise IndexError(f"{self.path} has no complete snapshot frame")
+        return self.frames[index]['blocks']
+
+    def counter(self, name, index=-1):
+        """One counter of every block in a frame as a flat array (block order of the file)"""
+        return np.asarray(self.frame(index)[name]).reshape(-1)
+
+    def block_address(self, flat_index):
+        """(channel, chip, die, plane, block) of a flat block index"""
+        return tuple(int(i) for i in np.unravel_index(flat_index, self.shape))
+
+
+def read_distribution(reads, bins=None):
+    """
+    Histogram of per-block read counts, as plot_read_counts.py expects it.
+
+    :param bins: bin edges; default is log-spaced from 1 to the maximum, with zero-read blocks in [0, 1)
+    """
+    reads = np.asarray(reads)
+    if bins is None:
+        top = max(int(reads.max()) if reads.size else 1, 1)
+        bins = np.unique(np.concatenate(([0, 1], np.geomspace(1, top + 1, 40).round())))
+    counts, edges = np.histogram(reads, bins=bins)
+    return {'bins': edges.tolist(), 'counts': counts.tolist()}
+
+
+def summarize(snapshot, index=-1, top=0):
+    """Per-block read/ECC summary of one frame, in the analyzer's flash_operations form"""
+    reads = snapshot.counter('read_count', index)
+    retries = snapshot.counter('total_ecc_retries', index)
+    summary = {
+        'snapshot_time_ns': int(snapshot.frames['time'][index]),
+        'snapshot_frames': len(snapshot),
+        'blocks': snapshot.block_count,
+        'avg_reads_per_block': float(reads.mean()),
+        'max_reads_per_block': int(reads.max()),
+        'blocks_read': int(np.count_nonzero(reads)),
+        'max_page_reads': int(snapshot.counter('max_page_read_count', index).max()),
+        'total_ecc_retries': int(retries.sum()),
+        'total_uncorrectable': int(snapshot.counter('uncorrectable_errors', index).sum()),
+        'max_erase_count': int(snapshot.counter('erase_count', index).max()),
+        'read_distribution': read_distribution(reads),
+    }
+    if top > 0:
+        hottest = np.argsort(reads, kind='stable')[::-1][:top]
+        summary['hottest_blocks'] = [
+            dict(zip(GEOMETRY_AXES, snapshot.block_address(i)), read_count=int(reads[i]),
+                 total_ecc_retries=int(retries[i]))
+            for i in hottest]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize an MQSim per-block snapshot file')
+    parser.add_argument('snapshot', help='<result>.blocks.bin written by the simulator')
+    parser.add_argument('--frame', type=int, default=-1, help='Frame index (default: last)')
+    parser.add_argument('--top', type=int, default=0, help='List the N most-read blocks')
+    parser.add_argument('--json', help='Write the summary as JSON')
+    args = parser.parse_args()
+
+    snapshot = BlockSnapshot(args.snapshot)
+    summary = summarize(snapshot, args.frame, args.top)
+
+    print(f"{args.snapshot}: {len(snapshot)} frame(s), {snapshot.block_count:,} blocks "
+          f"{'x'.join(map(str, snapshot.shape))}, frame at {summary['snapshot_time_ns'] / 1e9:.6f} s")
+    print(f"  Reads/block:   avg {summary['avg_reads_per_block']:,.2f}, max {summary['max_reads_per_block']:,} "
+          f"({summary['blocks_read']:,} blocks read)")
+    print(f"  Max page reads: {summary['max_page_reads']:,}")
+    print(f"  ECC retries:   {summary['total_ecc_retries']:,}, uncorrectable: {summary['total_uncorrectable']:,}")
+    for block in summary.get('hottest_blocks', []):
+        print(f"  [{block['channel']},{block['chip']},{block['die']},{block['plane']},{block['block']}] "
+              f"reads {block['read_count']:,} retries {block['total_ecc_retries']:,}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,18 +2,29 @@
 """
 Compare results across multiple LLM inference experiments
 
-Generates comparison tables and summary statistics for experiments.
+Generates comparison tables and summary statistics for experiments. Runs are
+selected from the results store (results_store.py); JSON files or result
+directories given on the command line are ingested first.
 """
 
-import json
 import argparse
-from pathlib import Path
+import os
+import sys
 from tabulate import tabulate
 
-def load_result(result_file):
-    """Load JSON result from analyzer"""
-    with open(result_file, 'r') as f:
-        return json.load(f)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from results_store import add_query_arguments, query_from_args
+
+COLUMNS = ['name', 'tokens', 'iops', 'bandwidth_mbps', 'avg_response_time_us',
+           'total_flash_reads', 'total_flash_writes', 'total_flash_erases',
+           'total_gc_executions', 'total_read_reclaim',
+           'avg_reads_per_block', 'max_reads_per_block', 'blocks_with_reads',
+           'total_ecc_retries', 'total_ecc_failures', 'total_ecc_uncorrectable']
+
+def _value(run, column):
+    """Metric value of a run; counters absent from its result file read as 0"""
+    value = run.get(column)
+    return 0 if value is None else value
 
 def format_number(n, precision=2):
     """Format large numbers with K/M/G suffixes"""
@@ -26,22 +37,18 @@ def format_number(n, precision=2):
     else:
         return f"{n:.{precision}f}"
 
-def compare_performance(result_files):
+def compare_performance(runs):
     """Compare performance metrics across experiments"""
     headers = ["Experiment", "Tokens", "IOPS", "Bandwidth (MB/s)", "Avg Latency (μs)"]
     rows = []
 
-    for rf in result_files:
-        data = load_result(rf)
-        name = data.get('name', Path(rf).stem)
-        io_stats = data.get('host_io_statistics', {})
-
+    for run in runs:
         rows.append([
-            name,
-            format_number(data.get('tokens_generated', 0)),
-            format_number(io_stats.get('iops', 0)),
-            format_number(io_stats.get('bandwidth_mbps', 0)),
-            f"{io_stats.get('avg_response_time_us', 0):.2f}",
+            run['name'],
+            format_number(_value(run, 'tokens')),
+            format_number(_value(run, 'iops')),
+            format_number(_value(run, 'bandwidth_mbps')),
+            f"{_value(run, 'avg_response_time_us'):.2f}",
         ])
 
     print("\n" + "="*80)
@@ -49,24 +56,19 @@ def compare_performance(result_files):
     print("="*80)
     print(tabulate(rows, headers=headers, tablefmt='grid'))
 
-def compare_flash_operations(result_files):
+def compare_flash_operations(runs):
     """Compare flash operation counts"""
     headers = ["Experiment", "Flash Reads", "Flash Writes", "Erases", "GC Execs", "Reclaim Ops"]
     rows = []
 
-    for rf in result_files:
-        data = load_result(rf)
-        name = data.get('name', Path(rf).stem)
-        flash = data.get('flash_operations', {})
-        gc = data.get('gc_wl_statistics', {})
-
+    for run in runs:
         rows.append([
-            name,
-            format_number(flash.get('flash_reads', 0)),
-            format_number(flash.get('flash_writes', 0)),
-            format_number(flash.get('flash_erases', 0)),
-            format_number(gc.get('gc_executions', 0)),
-            format_number(gc.get('read_reclaim_count', 0)),
+            run['name'],
+            format_number(_value(run, 'total_flash_reads')),
+            format_number(_value(run, 'total_flash_writes')),
+            format_number(_value(run, 'total_flash_erases')),
+            format_number(_value(run, 'total_gc_executions')),
+            format_number(_value(run, 'total_read_reclaim')),
         ])
 
     print("\n" + "="*80)
@@ -74,27 +76,22 @@ def compare_flash_operations(result_files):
     print("="*80)
     print(tabulate(rows, headers=headers, tablefmt='grid'))
 
-def compare_ecc_stats(result_files):
+def compare_ecc_stats(runs):
     """Compare ECC statistics (KEY METRICS)"""
     headers = ["Experiment", "ECC Retries", "Failures", "Uncorrectable", "Retry Rate*", "Failure Rate*"]
     rows = []
 
-    for rf in result_files:
-        data = load_result(rf)
-        name = data.get('name', Path(rf).stem)
-        ecc = data.get('ecc_statistics', {})
-        flash = data.get('flash_operations', {})
-
-        total_reads = flash.get('flash_reads', 0)
-        retries = ecc.get('ecc_retries', 0)
-        failures = ecc.get('ecc_failures', 0)
-        uncorrectable = ecc.get('uncorrectable_errors', 0)
+    for run in runs:
+        total_reads = _value(run, 'total_flash_reads')
+        retries = _value(run, 'total_ecc_retries')
+        failures = _value(run, 'total_ecc_failures')
+        uncorrectable = _value(run, 'total_ecc_uncorrectable')
 
         retry_rate = (retries / total_reads * 1000) if total_reads > 0 else 0
         failure_rate = (failures / total_reads * 1000) if total_reads > 0 else 0
 
         rows.append([
-            name,
+            run['name'],
             format_number(retries),
             format_number(failures),
             format_number(uncorrectable),
@@ -108,21 +105,17 @@ def compare_ecc_stats(result_files):
     print(tabulate(rows, headers=headers, tablefmt='grid'))
     print("\n* Per 1000 reads")
 
-def compare_read_counts(result_files):
+def compare_read_counts(runs):
     """Compare read count statistics"""
     headers = ["Experiment", "Avg Reads/Block", "Max Reads/Block", "Blocks w/ Reads"]
     rows = []
 
-    for rf in result_files:
-        data = load_result(rf)
-        name = data.get('name', Path(rf).stem)
-        flash = data.get('flash_operations', {})
-
+    for run in runs:
         rows.append([
-            name,
-            format_number(flash.get('avg_reads_per_block', 0)),
-            format_number(flash.get('max_reads_per_block', 0)),
-            format_number(flash.get('blocks_with_reads', 0)),
+            run['name'],
+            format_number(_value(run, 'avg_reads_per_block')),
+            format_number(_value(run, 'max_reads_per_block')),
+            format_number(_value(run, 'blocks_with_reads')),
         ])
 
     print("\n" + "="*80)
@@ -130,38 +123,35 @@ def compare_read_counts(result_files):
     print("="*80)
     print(tabulate(rows, headers=headers, tablefmt='grid'))
 
-def generate_summary(result_files, output_file=None):
+def generate_summary(runs, output_file=None):
     """Generate comprehensive comparison report"""
     print("\n" + "="*80)
-    print(f"EXPERIMENT COMPARISON REPORT ({len(result_files)} experiments)")
+    print(f"EXPERIMENT COMPARISON REPORT ({len(runs)} experiments)")
     print("="*80)
 
-    compare_performance(result_files)
-    compare_flash_operations(result_files)
-    compare_read_counts(result_files)
-    compare_ecc_stats(result_files)
+    compare_performance(runs)
+    compare_flash_operations(runs)
+    compare_read_counts(runs)
+    compare_ecc_stats(runs)
 
     print("\n" + "="*80)
     print("SUMMARY")
     print("="*80)
 
-    # Find experiment with highest/lowest metrics
-    all_data = [load_result(rf) for rf in result_files]
-
     # Highest ECC retry rate
-    max_retry = max(all_data, key=lambda d: d.get('ecc_statistics', {}).get('ecc_retries', 0))
-    print(f"\n⚠️  Highest ECC retries: {max_retry.get('name', 'Unknown')} "
-          f"({format_number(max_retry.get('ecc_statistics', {}).get('ecc_retries', 0))})")
+    max_retry = max(runs, key=lambda r: _value(r, 'total_ecc_retries'))
+    print(f"\n⚠️  Highest ECC retries: {max_retry['name']} "
+          f"({format_number(_value(max_retry, 'total_ecc_retries'))})")
 
     # Most reclaim operations
-    max_reclaim = max(all_data, key=lambda d: d.get('gc_wl_statistics', {}).get('read_reclaim_count', 0))
-    print(f"🔄 Most reclaim ops: {max_reclaim.get('name', 'Unknown')} "
-          f"({format_number(max_reclaim.get('gc_wl_statistics', {}).get('read_reclaim_count', 0))})")
+    max_reclaim = max(runs, key=lambda r: _value(r, 'total_read_reclaim'))
+    print(f"🔄 Most reclaim ops: {max_reclaim['name']} "
+          f"({format_number(_value(max_reclaim, 'total_read_reclaim'))})")
 
     # Highest read counts
-    max_reads = max(all_data, key=lambda d: d.get('flash_operations', {}).get('max_reads_per_block', 0))
-    print(f"📖 Highest read count: {max_reads.get('name', 'Unknown')} "
-          f"({format_number(max_reads.get('flash_operations', {}).get('max_reads_per_block', 0))} reads/block)")
+    max_reads = max(runs, key=lambda r: _value(r, 'max_reads_per_block'))
+    print(f"📖 Highest read count: {max_reads['name']} "
+          f"({format_number(_value(max_reads, 'max_reads_per_block'))} reads/block)")
 
     print("\n" + "="*80)
 
@@ -179,23 +169,31 @@ Examples:
 
   # Compare trade-off sweep
   python3 compare_experiments.py results/exp3_tradeoff/threshold_*.json
+
+  # Query the results store directly
+  python3 compare_experiments.py --experiment exp2_accumulation --model llama70b
         """
     )
 
-    parser.add_argument('results', nargs='+', help='JSON result files to compare')
+    add_query_arguments(parser)
     parser.add_argument('-o', '--output', help='Save report to file')
 
     args = parser.parse_args()
 
+    runs = query_from_args(args, COLUMNS, order_by=['name'])
+    if not runs:
+        print("No matching runs in the results store", file=sys.stderr)
+        sys.exit(1)
+
     # Redirect output if requested
     if args.output:
-        import sys
         sys.stdout = open(args.output, 'w')
 
-    generate_summary(args.results)
+    generate_summary(runs)
 
     if args.output:
         sys.stdout.close()
+        sys.stdout = sys.__stdout__
         print(f"Report saved to: {args.output}")
 
 if __name__ == '__main__':
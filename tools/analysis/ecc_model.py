@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Batch RBER / ECC retry evaluator mirroring SSD_Components::ECC_Engine.
+
+Evaluates the power-law RBER model, the retry-count / uncorrectable decision
+of ECC_Engine::Attempt_correction and the latency of ECC_Engine::Get_ECC_latency
+over NumPy arrays of (pe_cycles, retention_hours, reads), so millions of
+operating points can be screened without running the simulator. Arguments
+broadcast against each other, e.g. a full grid is
+
+    model.evaluate(pe[:, None, None], hours[None, :, None], reads[None, None, :])
+
+Coefficients are the 72-layer TLC values FTL.cpp passes to ECC_Engine;
+correction capability, decode latency and max retries default to the
+Flash_Parameter_Set values and can be read from a device config.
+
+Usage:
+  python3 tools/analysis/ecc_model.py
+  python3 tools/analysis/ecc_model.py --device configs/device/ssdconfig.xml \\
+      --pe 0:3000:61 --retention 0:8760:53 --reads 0:100000:301
+"""
+
+import argparse
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+# RBER = epsilon + alpha*(cycles^k) + beta*(cycles^m)*(time^n) + gamma*(cycles^p)*(reads^q)
+# 72-layer TLC coefficients, as passed to ECC_Engine in FTL.cpp
+RBER_72_LAYER_TLC = {
+    'epsilon': 1.48e-03,
+    'alpha': 3.90e-10, 'k': 2.05,
+    'beta': 6.28e-05, 'm': 0.14, 'n': 0.54,
+    'gamma': 3.73e-09, 'p': 0.33, 'q': 1.71,
+}
+
+# Flash_Parameter_Set defaults
+PAGE_CAPACITY_BYTES = 16384
+CORRECTION_CAPABILITY = 40
+DECODE_LATENCY_NS = 10000
+MAX_RETRIES = 3
+
+# Each soft-decode retry adds this fraction of the base capability
+RETRY_CAPABILITY_STEP = 0.5
+
+UNCORRECTABLE = -1
+
+
+class ECCModel:
+    def __init__(self, coefficients=None, page_size_in_bits=PAGE_CAPACITY_BYTES * 8,
+                 correction_capability=CORRECTION_CAPABILITY, decode_latency=DECODE_LATENCY_NS,
+                 max_retries=MAX_RETRIES):
+        """
+        :param coefficients: RBER power-law coefficients (default: RBER_72_LAYER_TLC)
+        :param page_size_in_bits: bits per page the expected error count is taken over
+        :param correction_capability: bit errors the first-pass hard decode corrects
+        :param decode_latency: latency of one decode attempt (ns)
+        :param max_retries: soft-decode retries before a read is uncorrectable
+        """
+        self.coefficients = dict(RBER_72_LAYER_TLC, **(coefficients or {}))
+        self.page_size_in_bits = page_size_in_bits
+        self.correction_capability = correction_capability
+        self.decode_latency = decode_latency
+        self.max_retries = max_retries
+
+    @classmethod
+    def from_device_config(cls, device_config, coefficients=None):
+        """Take capability, latency, retries and page size from a device config XML."""
+        root = ET.parse(device_config).getroot()
+
+        def value(tag, default, cast):
+            elem = root.find('.//' + tag)
+            return cast(elem.text.strip()) if elem is not None and elem.text else default
+
+        # FTL.cpp sizes the page as page_size_in_sectors * SECTOR_SIZE_IN_BYTE * 8
+        return cls(coefficients,
+                   page_size_in_bits=value('Page_Capacity', PAGE_CAPACITY_BYTES, int) * 8,
+                   correction_capability=value('ECC_Correction_Capability', CORRECTION_CAPABILITY, int),
+                   decode_latency=value('IFP_ECC_Decode_Latency', DECODE_LATENCY_NS, int),
+                   max_retries=value('IFP_ECC_Max_Retries', MAX_RETRIES, int))
+
+    def rber(self, pe_cycles, retention_hours, reads):
+        """ECC_Engine::Calculate_RBER over broadcast arrays."""
+        c = self.coefficients
+        pe = np.asarray(pe_cycles, dtype=np.float64)
+        hours = np.asarray(retention_hours, dtype=np.float64)
+        reads = np.asarray(reads, dtype=np.float64)
+        # Same association order as the C++ expression
+        return (c['epsilon']
+                + c['alpha'] * pe ** c['k']
+                + c['beta'] * pe ** c['m'] * hours ** c['n']
+                + c['gamma'] * pe ** c['p'] * reads ** c['q'])
+
+    def retry_counts(self, pe_cycles, retention_hours, reads):
+        """
+        ECC_Engine::Attempt_correction over broadcast arrays.
+
+        :return: int16 array of retries needed (0 = first-pass success, -1 = uncorrectable)
+        """
+        expected_errors = self.rber(pe_cycles, retention_hours, reads) * self.page_size_in_bits
+        retries = np.full(expected_errors.shape, UNCORRECTABLE, dtype=np.int16)
+        # Highest level first so each point ends up with the smallest sufficient retry count
+        for retry in range(self.max_retries, 0, -1):
+            capability = self.correction_capability * (1.0 + RETRY_CAPABILITY_STEP * retry)
+            retries[expected_errors <= capability] = retry
+        retries[expected_errors <= self.correction_capability] = 0
+        return retries
+
+    def latency_ns(self, retries):
+        """ECC_Engine::Get_ECC_latency: one decode plus one per retry; uncorrectable pays them all."""
+        retries = np.asarray(retries)
+        attempts = np.where(retries < 0, 1 + self.max_retries, 1 + retries.astype(np.int64))
+        return attempts * self.decode_latency
+
+    def evaluate(self, pe_cycles, retention_hours, reads):
+        """RBER, retry count and ECC latency of every operating point."""
+        rber = self.rber(pe_cycles, retention_hours, reads)
+        retries = self.retry_counts(pe_cycles, retention_hours, reads)
+        return {'rber': rber, 'retries': retries, 'latency_ns': self.latency_ns(retries)}
+
+    def retry_histogram(self, retries, weights=None):
+        """
+        :param weights: optional per-point read counts (e.g. reads served at each point)
+        :return: (counts indexed by retry count 0..max_retries, uncorrectable count)
+        """
+        retries = np.asarray(retries).ravel()
+        w = None if weights is None else np.broadcast_to(weights, np.shape(retries)).ravel()
+        ok = retries >= 0
+        counts = np.bincount(retries[ok], weights=None if w is None else w[ok],
+                             minlength=self.max_retries + 1)
+        uncorrectable = np.count_nonzero(~ok) if w is None else w[~ok].sum()
+        return counts, uncorrectable
+
+    def summarize(self, pe_cycles, retention_hours, reads, weights=None):
+        """
+        Retry histogram and expected ECC latency over a set of operating points.
+
+        :param weights: optional relative frequency of each point (broadcast like the inputs)
+        """
+        result = self.evaluate(pe_cycles, retention_hours, reads)
+        retries = result['retries']
+        if weights is not None:
+            weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), retries.shape)
+        counts, uncorrectable = self.retry_histogram(retries, weights)
+        total = counts.sum() + uncorrectable
+        latency = result['latency_ns']
+        mean_latency = np.average(latency, weights=weights) if total else 0.0
+        return {
+            'points': int(retries.size),
+            'retry_histogram': counts,
+            'uncorrectable': uncorrectable,
+            'uncorrectable_fraction': uncorrectable / total if total else 0.0,
+            'expected_retries': (counts * np.arange(len(counts))).sum() / total if total else 0.0,
+            'expected_latency_ns': float(mean_latency),
+            'max_rber': float(result['rber'].max()),
+        }
+
+
+def _axis(spec):
+    """'start:stop:count' -> linspace, 'a,b,c' -> values, 'x' -> [x]."""
+    if ':' in spec:
+        start, stop, count = spec.split(':')
+        return np.linspace(float(start), float(stop), int(count))
+    return np.array([float(v) for v in spec.split(',')])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch RBER / ECC retry evaluation over an operating-point grid')
+    parser.add_argument('--device', help='Device config XML for capability, latency, retries and page size')
+    parser.add_argument('--pe', default='0:3000:101', help='P/E cycles: start:stop:count or a,b,c')
+    parser.add_argument('--retention', default='0:8760:101', help='Retention time in hours')
+    parser.add_argument('--reads', default='0:100000:101', help='Reads per page')
+    args = parser.parse_args()
+
+    model = ECCModel.from_device_config(args.device) if args.device else ECCModel()
+    pe, hours, reads = _axis(args.pe), _axis(args.retention), _axis(args.reads)
+
+    start = time.perf_counter()
+    summary = model.summarize(pe[:, None, None], hours[None, :, None], reads[None, None, :])
+    elapsed = time.perf_counter() - start
+
+    print(f"Evaluated {summary['points']:,} operating points in {elapsed:.2f} s "
+          f"({summary['points'] / max(elapsed, 1e-9):,.0f} points/s)")
+    print(f"Capability: {model.correction_capability} bits, max retries: {model.max_retries}, "
+          f"decode latency: {model.decode_latency} ns")
+    print(f"{'Retries':>14} {'Points':>14} {'Fraction':>10}")
+    total = summary['retry_histogram'].sum() + summary['uncorrectable']
+    for retry, count in enumerate(summary['retry_histogram']):
+        print(f"{retry:>14} {int(count):>14,} {count / total:>10.4f}")
+    print(f"{'uncorrectable':>14} {int(summary['uncorrectable']):>14,} {summary['uncorrectable_fraction']:>10.4f}")
+    print(f"Expected retries: {summary['expected_retries']:.3f}")
+    print(f"Expected ECC latency: {summary['expected_latency_ns'] / 1000:.2f} us")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
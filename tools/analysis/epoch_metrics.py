@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Loader for MQSim epoch metrics streams (<result>.epochs.csv).
+
+With <Enable_Epoch_Metrics>true</Enable_Epoch_Metrics> in Host_Parameter_Set,
+the simulator appends one row per Epoch_Metrics_Period_Length (ns) of
+simulated time while it runs: requests, bytes, IOPS, bandwidth and device
+response time percentiles of all IO flows, plus the flash reads, ECC
+retries/uncorrectable reads, read-reclaim migrations and GC of the epoch.
+One long run therefore gives the whole bandwidth-vs-time curve:
+
+    epochs = load_epochs('results/run.epochs.csv')
+    plt.plot(epochs['Epoch_End'] / 1e6, epochs['Bandwidth'] / 1e9)   # s, GB/s
+
+Rounds skipped by fast-forward are spread evenly over the epochs they span
+(Fast_Forwarded_Time); those epochs have no latency percentiles (NaN).
+
+Usage:
+  python3 tools/analysis/epoch_metrics.py results/run.epochs.csv
+  python3 tools/analysis/epoch_metrics.py results/run.epochs.csv --json epochs.json
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+# Counters whose column sums equal the run totals of the result XML
+COUNTER_COLUMNS = ('Request_Count', 'Read_Request_Count', 'Write_Request_Count',
+                   'Bytes_Transferred_Read', 'Bytes_Transferred_Write', 'Flash_Read_CMDs',
+                   'ECC_Retries', 'ECC_Uncorrectable', 'Read_Reclaim_Migrations',
+                   'GC_Executions', 'GC_Page_Movements')
+
+
+def load_epochs(path):
+    """
+    Epoch rows as a NumPy structured array. Column names drop the unit suffix
+    of the CSV header, e.g. 'Epoch_Start(us)' becomes 'Epoch_Start'.
+    Times are in microseconds, Bandwidth in bytes/s; empty fields are NaN.
+    """
+    with open(path) as f:
+        header = f.readline().strip().split(',')
+    names = [column.split('(')[0] for column in header]
+    epochs = np.genfromtxt(path, delimiter=',', skip_header=1, names=names, dtype=float,
+                           filling_values=np.nan, ndmin=1)
+    if epochs.size == 0:
+        return np.empty(0, dtype=[(name, float) for name in names])
+    return epochs
+
+
+def time_at_bytes(epochs, targets, column='Bytes_Transferred_Read'):
+    """
+    Simulation time (us) at which the cumulative bytes of `column` reach each target,
+    interpolated linearly within an epoch.
+    """
+    cumulative = np.concatenate(([0.0], np.cumsum(epochs[column])))
+    times = np.concatenate((epochs['Epoch_Start'][:1], epochs['Epoch_End']))
+    # Idle epochs repeat a cumulative value; interpolate against the first time it is reached
+    cumulative, first = np.unique(cumulative, return_index=True)
+    return np.interp(np.asarray(targets, dtype=float), cumulative, times[first])
+
+
+def summarize(epochs):
+    """Run totals and bandwidth/latency envelope of an epoch stream"""
+    if len(epochs) == 0:
+        return {'epochs': 0}
+    duration_s = (epochs['Epoch_End'][-1] - epochs['Epoch_Start'][0]) / 1e6
+    summary = {
+        'epochs': int(len(epochs)),
+        'epoch_length_us': float(epochs['Epoch_End'][0] - epochs['Epoch_Start'][0]),
+        'duration_s': float(duration_s),
+        'fast_forwarded_s': float(np.sum(epochs['Fast_Forwarded_Time']) / 1e6),
+    }
+    for column in COUNTER_COLUMNS:
+        summary[column.lower()] = int(np.sum(epochs[column]))
+
+    bytes_total = summary['bytes_transferred_read'] + summary['bytes_transferred_write']
+    busy = epochs['Request_Count'] > 0
+    summary['mean_bandwidth'] = float(bytes_total / duration_s) if duration_s > 0 else 0.0
+    summary['peak_bandwidth'] = float(np.max(epochs['Bandwidth']))
+    summary['min_busy_bandwidth'] = float(np.min(epochs['Bandwidth'][busy])) if busy.any() else 0.0
+    p99 = epochs['Device_Response_Time_P99']
+    summary['max_epoch_p99_us'] = float(np.nanmax(p99)) if np.any(~np.isnan(p99)) else None
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize an MQSim epoch metrics stream')
+    parser.add_argument('epochs', help='<result>.epochs.csv written by the simulator')
+    parser.add_argument('--json', help='Write the summary as JSON')
+    args = parser.parse_args()
+
+    summary = summarize(load_epochs(args.epochs))
+    if summary['epochs'] == 0:
+        print(f"{args.epochs}: no complete epoch")
+        return 1
+
+    print(f"{args.epochs}: {summary['epochs']:,} epochs of {summary['epoch_length_us']:,.0f} us, "
+          f"{summary['duration_s']:.6f} s simulated ({summary['fast_forwarded_s']:.6f} s fast-forwarded)")
+    print(f"  Requests:    {summary['request_count']:,} ({summary['read_request_count']:,} reads)")
+    print(f"  Bandwidth:   mean {summary['mean_bandwidth'] / 1e9:.3f} GB/s, peak {summary['peak_bandwidth'] / 1e9:.3f} GB/s, "
+          f"lowest busy epoch {summary['min_busy_bandwidth'] / 1e9:.3f} GB/s")
+    if summary['max_epoch_p99_us'] is not None:
+        print(f"  P99 latency: worst epoch {summary['max_epoch_p99_us']:,.1f} us")
+    print(f"  ECC retries: {summary['ecc_retries']:,}, uncorrectable: {summary['ecc_uncorrectable']:,}, "
+          f"read-reclaim migrations: {summary['read_reclaim_migrations']:,}, GC: {summary['gc_executions']:,}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Model constants measured from experiment results.
+
+The analytical trade-off model and the paper figures are driven by two
+measured quantities of the read-disturb accumulation experiment (Exp2):
+
+  read_rate         flash read commands (single + multiplane) per generated
+                    token: least-squares slope of reads over tokens
+  ecc_failure_rate  ECC failures per flash read: least-squares slope of
+                    failures over reads (through the origin)
+
+Both are fitted over every matching run in the results store, so a sweep of
+any size refines them without editing source. The result keeps the fitted
+points and the JSON file of every run that fed each constant (provenance).
+When no runs match, the published Exp2 values are returned and marked as such.
+
+Usage:
+  python3 tools/analysis/measured_constants.py
+  python3 tools/analysis/measured_constants.py results/exp2_accumulation --json
+  python3 tools/analysis/measured_constants.py --experiment exp2_accumulation --model llama70b
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from results_store import DEFAULT_STORE, PROJECT_ROOT, ResultsStore
+
+DEFAULT_EXPERIMENT = 'exp2_accumulation'
+DEFAULT_MODEL = 'llama70b'
+
+# Published Exp2 fit (Llama2-70B, 10K/50K/100K tokens), used when no runs match
+PUBLISHED = {
+    'read_rate': 0.636,
+    'read_rate_intercept': -3218.0,
+    'r_squared': 0.999,
+    'ecc_failure_rate': 0.031,
+}
+
+FIT_COLUMNS = ['name', 'json_file', 'tokens', 'total_flash_reads', 'multiplane_reads',
+               'total_ecc_failures', 'iops', 'avg_response_time_us']
+
+
+def _run_path(json_file):
+    """Run JSON file relative to the project root, if it is inside it."""
+    rel = os.path.relpath(json_file, PROJECT_ROOT)
+    return json_file if rel.startswith('..') else rel
+
+
+def linear_fit(x, y, through_origin=False):
+    """
+    Least-squares line y = slope * x + intercept over any number of points.
+
+    :return: dict with slope, intercept (0 if through_origin) and r_squared
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if through_origin:
+        a = x[:, None]
+    else:
+        a = np.column_stack([x, np.ones_like(x)])
+    coef, _, _, _ = np.linalg.lstsq(a, y, rcond=None)
+    predicted = a @ coef
+    ss_res = float(((y - predicted) ** 2).sum())
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    return {
+        'slope': float(coef[0]),
+        'intercept': 0.0 if through_origin else float(coef[1]),
+        'r_squared': 1.0 - ss_res / ss_tot if ss_tot > 0 else 1.0,
+    }
+
+
+def derive_constants(rows):
+    """
+    Fit the model constants to result rows (FIT_COLUMNS, from the results store).
+
+    :return: constants dict with 'points' (the fitted runs, sorted by tokens)
+             and 'provenance' (run JSON files per constant)
+    :raises ValueError: if the rows cannot determine a fit
+    """
+    runs = sorted((r for r in rows if r['tokens'] and r['total_flash_reads'] is not None),
+                  key=lambda r: (r['tokens'], r['json_file']))
+    if len({r['tokens'] for r in runs}) < 2:
+        raise ValueError(f"Need runs at two or more token counts to fit the read rate, got {len(runs)} run(s)")
+
+    tokens = [r['tokens'] for r in runs]
+    reads = [r['total_flash_reads'] + (r['multiplane_reads'] or 0) for r in runs]
+    read_fit = linear_fit(tokens, reads)
+
+    ecc_runs = [(r, n) for r, n in zip(runs, reads) if r['total_ecc_failures'] is not None and n > 0]
+    if not ecc_runs:
+        raise ValueError('No runs with ECC failure counts to fit the ECC failure rate')
+    ecc_fit = linear_fit([n for _, n in ecc_runs], [r['total_ecc_failures'] for r, _ in ecc_runs],
+                         through_origin=True)
+
+    return {
+        'source': 'fit',
+        'read_rate': read_fit['slope'],
+        'read_rate_intercept': read_fit['intercept'],
+        'r_squared': read_fit['r_squared'],
+        # The trade-off model was calibrated with the failures-per-read ratio
+        # read as a percentage (3.1 -> 0.031); keep that scale
+        'ecc_failure_rate': ecc_fit['slope'] / 100,
+        'ecc_failures_per_read': ecc_fit['slope'],
+        'points': {
+            'tokens': tokens,
+            'flash_reads': reads,
+            'ecc_failures': [r['total_ecc_failures'] for r in runs],
+            'iops': [r['iops'] for r in runs],
+            'response_ms': [r['avg_response_time_us'] / 1000 if r['avg_response_time_us'] is not None else None
+                            for r in runs],
+        },
+        'provenance': {
+            'read_rate': [_run_path(r['json_file']) for r in runs],
+            'ecc_failure_rate': [_run_path(r['json_file']) for r, _ in ecc_runs],
+        },
+    }
+
+
+def published_constants():
+    """The published Exp2 constants, with empty provenance."""
+    return dict(PUBLISHED, source='published', points=None,
+                provenance={'read_rate': [], 'ecc_failure_rate': []})
+
+
+def add_constants_arguments(parser):
+    """
+    Add the options selecting the runs the constants are fitted to.
+
+    Unlike results_store.add_query_arguments there is no --tokens filter (the
+    fit needs several token counts), and the selection defaults to Exp2 on
+    Llama2-70B.
+    """
+    parser.add_argument('results', nargs='*',
+                        help='Analyzer JSON files, sweep reports or result directories to ingest and '
+                             'fit (default: every run in the store matching the filters)')
+    parser.add_argument('--store', default=DEFAULT_STORE, help='Results store (SQLite)')
+    parser.add_argument('--experiment', default=DEFAULT_EXPERIMENT,
+                        help=f'Fit runs of this experiment (default: {DEFAULT_EXPERIMENT})')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help=f'Fit runs of this model (default: {DEFAULT_MODEL})')
+    parser.add_argument('--published', action='store_true',
+                        help='Use the published Exp2 constants instead of fitting the results')
+
+
+def constants_from_args(args):
+    """Fit the constants to the selected runs; fall back to the published values if none match."""
+    if args.published:
+        return published_constants()
+    filters = {'experiment': args.experiment, 'model': args.model}
+    with ResultsStore(args.store) as store:
+        json_files = store.ingest_paths(args.results) if args.results else None
+        rows = store.query(FIT_COLUMNS, filters, json_files, ['tokens'])
+    try:
+        return derive_constants(rows)
+    except ValueError as e:
+        print(f"⚠️  {e}; using the published Exp2 constants", file=sys.stderr)
+        return published_constants()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Fit the trade-off model constants to experiment results',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Usage:', 1)[1],
+    )
+    add_constants_arguments(parser)
+    parser.add_argument('--json', action='store_true', help='Print the constants as JSON')
+    args = parser.parse_args()
+
+    constants = constants_from_args(args)
+    if args.json:
+        print(json.dumps(constants, indent=2))
+        return
+
+    runs = constants['provenance']['read_rate']
+    print(f"Source:           {constants['source']} ({len(runs)} run(s))")
+    print(f"Read rate:        {constants['read_rate']:.4f} reads/token "
+          f"(intercept {constants['read_rate_intercept']:.0f}, R²={constants['r_squared']:.4f})")
+    print(f"ECC failure rate: {constants['ecc_failure_rate']:.4f}")
+    for path in runs:
+        print(f"  - {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo per-block read-distribution engine for the read-reclaim trade-off.
+
+analytical_tradeoff.py describes the hottest block with a single concentration
+factor. This engine instead draws the flash reads of a token campaign onto
+every block from an access-skew profile (multinomial, several trials), applies
+reclaim resets (a block is migrated and its read count restarts from zero each
+time it reaches the threshold) and reports reclaim, wear and read-disturb
+statistics for every threshold at once.
+
+A block that receives N reads under threshold T is reclaimed N // T times, and
+the reads it serves see disturb counts 0..T-1 per cycle plus 0..(N % T)-1, so
+all statistics are closed-form in (N, T). Thresholds are evaluated as one
+(thresholds x distinct read counts) array operation over the read-count
+histogram of all blocks and trials, which keeps 10^3 thresholds x 10^2 skew
+profiles to seconds.
+
+Skew profiles come from a real trace's LBA histogram (trace_block_weights),
+from a Zipf law or from the hot/cold model analytical_tradeoff.py assumes;
+blend_with_uniform() turns one profile into a family of skew strengths.
+
+Usage:
+  python3 tools/analysis/read_distribution.py
+  python3 tools/analysis/read_distribution.py --trace traces/realtraces/trace_opt_7b_mqsim_512tok_cache_drop.txt \\
+      --thresholds 1000 --skews 100 --tokens 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from analytical_tradeoff import (BLOCK_SIZE_MB, ECC_FAILURE_RATE, ESTIMATED_BLOCKS, PAGES_PER_BLOCK,
+                                 PE_CYCLES_LIMIT, READ_RATE_PER_TOKEN)
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+# configs/device/ssdconfig.xml: 16 KB pages, 8 channels x 2 chips x 1 die x 4 planes
+SECTORS_PER_PAGE = 16384 // 512
+PLANE_COUNT = 8 * 2 * 1 * 4
+
+DEFAULT_TRIALS = 8
+
+
+# ============================================================================
+# ACCESS-SKEW PROFILES
+# ============================================================================
+
+def _normalize(weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+
+def uniform_weights(n_blocks=ESTIMATED_BLOCKS):
+    return np.full(n_blocks, 1.0 / n_blocks)
+
+
+def hot_cold_weights(hot_fraction=0.05, concentration=10, n_blocks=ESTIMATED_BLOCKS):
+    """
+    The analytical model's skew: hot_fraction of the blocks are read at
+    concentration x the average rate, the rest share what is left.
+
+    The hot blocks take concentration x hot_fraction of all reads, which must
+    stay below 1 for the cold blocks to be read at all; the default puts half
+    of the reads on 5% of the blocks.
+    """
+    n_hot = max(1, int(round(n_blocks * hot_fraction)))
+    hot = concentration / n_blocks
+    if hot * n_hot >= 1.0:
+        raise ValueError(f"{n_hot} hot blocks at {concentration}x the average rate leave no reads "
+                         f"for the other {n_blocks - n_hot} blocks")
+    weights = np.full(n_blocks, (1.0 - hot * n_hot) / max(n_blocks - n_hot, 1))
+    weights[:n_hot] = hot
+    return _normalize(weights)
+
+
+def zipf_weights(exponent, n_blocks=ESTIMATED_BLOCKS):
+    """Block of rank r is read with probability proportional to r^-exponent."""
+    return _normalize(np.arange(1, n_blocks + 1, dtype=np.float64) ** -float(exponent))
+
+
+def resample_profile(block_reads, n_blocks=ESTIMATED_BLOCKS):
+    """
+    Stretch a measured per-block read histogram onto n_blocks blocks.
+
+    The histogram is sorted hottest-first and its quantile function is
+    interpolated, so the shape of the skew is kept whatever the number of
+    blocks the trace happened to touch.
+    """
+    profile = np.sort(np.asarray(block_reads, dtype=np.float64))[::-1]
+    profile = profile[profile > 0]
+    if len(profile) == 0:
+        return uniform_weights(n_blocks)
+    src = (np.arange(len(profile)) + 0.5) / len(profile)
+    dst = (np.arange(n_blocks) + 0.5) / n_blocks
+    return _normalize(np.interp(dst, src, profile))
+
+
+def _read_block_ids(trace_path, sectors_per_page, pages_per_block, plane_count):
+    """Block of every flash page read by the read requests of an ASCII or binary trace file."""
+    from binary_trace import is_binary_trace, iter_ascii_chunks, read_binary_trace
+
+    if is_binary_trace(trace_path):
+        records = read_binary_trace(trace_path)
+        chunks = [(records['start_lba'].astype(np.int64), records['lba_count'].astype(np.int64),
+                   records['type'].astype(np.int64))]
+    else:
+        chunks = ((cols[:, 2], cols[:, 3], cols[:, 4]) for cols in iter_ascii_chunks(trace_path))
+
+    block_ids = [np.zeros(0, dtype=np.int64)]
+    for lba, size, req_type in chunks:
+        reads = req_type != 0
+        first = lba[reads] // sectors_per_page
+        last = (lba[reads] + np.maximum(size[reads], 1) - 1) // sectors_per_page
+        n_pages = last - first + 1
+        pages = np.repeat(first - np.cumsum(n_pages) + n_pages, n_pages) + np.arange(n_pages.sum())
+        plane = pages % plane_count
+        block_ids.append((pages // plane_count // pages_per_block) * plane_count + plane)
+    return np.concatenate(block_ids)
+
+
+def trace_block_reads(trace_path, sectors_per_page=SECTORS_PER_PAGE, pages_per_block=PAGES_PER_BLOCK,
+                      plane_count=PLANE_COUNT):
+    """
+    Flash page reads per physical block for the read requests of an MQSim trace.
+
+    Consecutive logical pages are striped over plane_count planes, so a block
+    holds pages that share a plane and fall in the same pages_per_block run on
+    that plane. Accepts ASCII and binary traces and trace manifests; the
+    segments of a manifest are read once and weighted by their repeat count.
+
+    :return: read count of every block that was read at least once
+    """
+    sys.path.insert(0, EXAMPLES_DIR)
+    from trace_manifest import is_trace_manifest, read_manifest
+
+    if is_trace_manifest(trace_path):
+        parts = [(s.path, s.repeat) for s in read_manifest(trace_path)]
+    else:
+        parts = [(trace_path, 1)]
+
+    block_ids, repeats = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for path, repeat in parts:
+        ids = _read_block_ids(path, sectors_per_page, pages_per_block, plane_count)
+        block_ids.append(ids)
+        repeats.append(np.full(len(ids), repeat, dtype=np.int64))
+    blocks, inverse = np.unique(np.concatenate(block_ids), return_inverse=True)
+    return np.bincount(inverse, weights=np.concatenate(repeats), minlength=len(blocks)).astype(np.int64)
+
+
+def trace_block_weights(trace_path, n_blocks=ESTIMATED_BLOCKS, **layout):
+    """Access-skew profile over n_blocks blocks measured from a trace's LBA histogram."""
+    return resample_profile(trace_block_reads(trace_path, **layout), n_blocks)
+
+
+def blend_with_uniform(weights, strengths):
+    """
+    Family of profiles from uniform (strength 0) to weights (strength 1).
+
+    :return: (len(strengths), n_blocks) array
+    """
+    weights = _normalize(weights)
+    strengths = np.asarray(strengths, dtype=np.float64)[:, None]
+    return strengths * weights + (1.0 - strengths) / weights.shape[-1]
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class ReadDistributionEngine:
+    def __init__(self, read_rate=READ_RATE_PER_TOKEN, trials=DEFAULT_TRIALS, seed=0,
+                 ecc_failure_rate=ECC_FAILURE_RATE):
+        """
+        :param read_rate: flash reads per generated token, over all blocks
+        :param ecc_failure_rate: base of the linear ECC failure model
+        :param trials: Monte Carlo campaigns drawn per skew profile
+        :param seed: RNG seed
+        """
+        self.read_rate = read_rate
+        self.ecc_failure_rate = ecc_failure_rate
+        self.trials = trials
+        self.rng = np.random.default_rng(seed)
+
+    def sample_block_reads(self, weights, tokens):
+        """Draw the per-block read counts of `trials` campaigns: (trials, n_blocks) int64."""
+        total_reads = int(round(self.read_rate * tokens))
+        return self.rng.multinomial(total_reads, _normalize(weights), size=self.trials)
+
+    def evaluate(self, thresholds, weights, tokens):
+        """
+        Reclaim statistics of one skew profile for every threshold.
+
+        :param thresholds: read-reclaim thresholds (reads per block)
+        :param weights: per-block access probabilities, length n_blocks
+        :param tokens: campaign length in tokens
+        :return: dict of arrays indexed like thresholds, averaged over trials
+        """
+        thresholds = np.asarray(thresholds, dtype=np.int64)
+        weights = _normalize(weights)
+        n_blocks = weights.shape[-1]
+        reads = self.sample_block_reads(weights, tokens)
+
+        # Every statistic depends on a block only through its read count
+        values, counts = np.unique(reads, return_counts=True)
+        t = thresholds[:, None]
+        full_cycles = values[None, :] // t
+        residual = values[None, :] - full_cycles * t
+
+        reclaims = (full_cycles * counts).sum(axis=1) / self.trials
+        reclaimed_blocks = ((values[None, :] >= t) * counts).sum(axis=1) / self.trials
+        # Reads served at disturb counts 0..T-1 per full cycle, then 0..residual-1
+        disturb = (full_cycles * (t * (t - 1) // 2) + residual * (residual - 1) // 2).astype(np.float64)
+        total_reads = max(int(reads.sum()), 1)
+        mean_disturb = (disturb * counts).sum(axis=1) / total_reads
+
+        # Highest count any block reaches before it is reset, per trial
+        peak = np.minimum(reads.max(axis=1)[None, :], t).mean(axis=1)
+
+        avg_pe = reclaims / n_blocks
+        hottest_rate = self.read_rate * weights.max()
+        with np.errstate(divide='ignore'):
+            # analytical_tradeoff.calculate_lifetime_years at 1M tokens/day
+            lifetime_years = np.where(avg_pe > 0, PE_CYCLES_LIMIT / (avg_pe * 1_000_000) / 365, np.inf)
+            reclaims_per_hot = np.where(reclaimed_blocks > 0, reclaims / np.maximum(reclaimed_blocks, 1), 0.0)
+
+        return {
+            'threshold': thresholds,
+            'tokens_to_trigger': thresholds / hottest_rate,
+            'total_reclaims': reclaims,
+            'reclaimed_blocks': reclaimed_blocks,
+            'reclaims_per_hot_block': reclaims_per_hot,
+            'avg_pe_cycles': avg_pe,
+            'tbw_tb': reclaims * BLOCK_SIZE_MB / (1024 * 1024),
+            'max_accumulated_reads': peak,
+            'mean_read_disturb': mean_disturb,
+            # Same linear failure model as analytical_tradeoff.calculate_ecc_retry_rate
+            'ecc_failure_rate': self.ecc_failure_rate * 0.5 + self.ecc_failure_rate * peak / 1000,
+            'lifetime_years': lifetime_years,
+        }
+
+    def sweep(self, thresholds, profiles, tokens):
+        """
+        evaluate() over a stack of skew profiles.
+
+        :param profiles: (n_profiles, n_blocks) access probabilities
+        :return: dict of (n_profiles, n_thresholds) arrays
+        """
+        rows = [self.evaluate(thresholds, weights, tokens) for weights in np.atleast_2d(profiles)]
+        return {key: np.stack([r[key] for r in rows]) for key in rows[0]}
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo read-distribution sweep over thresholds and skews')
+    parser.add_argument('--trace', help='Trace whose read LBA histogram sets the skew (default: hot/cold model)')
+    parser.add_argument('-t', '--tokens', type=int, default=10_000_000, help='Campaign length in tokens')
+    parser.add_argument('--thresholds', type=int, default=1000,
+                        help='Number of log-spaced thresholds between 10 and 10^6')
+    parser.add_argument('--skews', type=int, default=100,
+                        help='Number of skew strengths between uniform and the measured/assumed profile')
+    parser.add_argument('--trials', type=int, default=DEFAULT_TRIALS, help='Monte Carlo trials per profile')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    base = trace_block_weights(args.trace) if args.trace else hot_cold_weights()
+    profile_s = time.perf_counter() - start
+
+    thresholds = np.unique(np.logspace(1, 6, args.thresholds).astype(np.int64))
+    profiles = blend_with_uniform(base, np.linspace(0, 1, args.skews))
+    engine = ReadDistributionEngine(trials=args.trials, seed=args.seed)
+
+    start = time.perf_counter()
+    result = engine.sweep(thresholds, profiles, args.tokens)
+    sweep_s = time.perf_counter() - start
+
+    print(f"Skew source: {args.trace or 'hot/cold model (10% hot, 10x)'} ({profile_s:.2f} s)")
+    print(f"Hottest block: {base.max() * len(base):.1f}x the average rate")
+    print(f"Swept {len(thresholds):,} thresholds x {len(profiles)} skews x {args.trials} trials "
+          f"over {ESTIMATED_BLOCKS:,} blocks in {sweep_s:.2f} s")
+    print()
+    print(f"{'Threshold':>10} {'Reclaims':>12} {'Avg P/E':>10} {'TBW (TB)':>10} {'Peak reads':>11} {'Mean disturb':>13}")
+    for i in np.linspace(0, len(thresholds) - 1, 8).astype(int):
+        print(f"{thresholds[i]:>10,} {result['total_reclaims'][-1, i]:>12,.0f} {result['avg_pe_cycles'][-1, i]:>10.3f} "
+              f"{result['tbw_tb'][-1, i]:>10.3f} {result['max_accumulated_reads'][-1, i]:>11,.0f} "
+              f"{result['mean_read_disturb'][-1, i]:>13,.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Experiment results store.
+
+A single SQLite table holds one row per simulation run: every host, FTL and
+ECC metric produced by LLM_Result_Analyzer as a typed column, plus the
+configuration the run used (model, tokens, Read_Reclaim_Threshold,
+IFP_ECC_Max_Retries, initial occupancy) as indexed dimension columns. The
+plotting and comparison tools select the rows and columns they need instead
+of globbing and loading every per-run JSON file.
+
+Runs are ingested from sweep reports, which take their dimensions from each
+job's config files, or from loose analyzer JSON files, which take them from a
+<name>_config.xml workload config next to the file if there is one and from
+the file name otherwise. Ingestion is incremental: files whose size and mtime
+have not changed are skipped. The current analyzer layout (host/ftl) and the legacy
+layout (host_io_statistics/flash_operations/ecc_statistics/gc_wl_statistics)
+are both accepted.
+
+Usage:
+  python3 tools/analysis/results_store.py ingest results/
+  python3 tools/analysis/results_store.py query --experiment exp3_tradeoff \\
+      --columns name,read_reclaim_threshold,total_ecc_retries --order read_reclaim_threshold
+  python3 tools/analysis/results_store.py stats
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import xml.etree.ElementTree as ET
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+DEFAULT_STORE = os.path.join(PROJECT_ROOT, 'results', 'results.db')
+
+# Bump when the table layout changes; older stores are rebuilt on open
+SCHEMA_VERSION = 2
+
+# Simulator defaults (Flash_Parameter_Set.cpp) for parameters a config may omit
+DEFAULT_READ_RECLAIM_THRESHOLD = 100000
+DEFAULT_ECC_MAX_RETRIES = 3
+
+RUN_COLUMNS = [
+    ('name', 'TEXT'),
+    ('source_file', 'TEXT'),
+    ('json_file', 'TEXT UNIQUE'),
+    ('json_size', 'INTEGER'),
+    ('json_mtime_ns', 'INTEGER'),
+]
+
+# Indexed configuration dimensions
+DIMENSION_COLUMNS = [
+    ('experiment', 'TEXT'),
+    ('model', 'TEXT'),
+    ('tokens', 'INTEGER'),
+    ('read_reclaim_threshold', 'INTEGER'),
+    ('ecc_max_retries', 'INTEGER'),
+    ('initial_occupancy', 'INTEGER'),
+]
+
+# LLM_Result_Analyzer host metrics ('name' is stored as flow_name)
+HOST_COLUMNS = [
+    ('flow_name', 'TEXT'),
+    ('total_requests', 'INTEGER'),
+    ('read_requests', 'INTEGER'),
+    ('write_requests', 'INTEGER'),
+    ('iops', 'REAL'),
+    ('bandwidth_mbps', 'REAL'),
+    ('avg_response_time_us', 'REAL'),
+    ('p50_response_time_us', 'REAL'),
+    ('p90_response_time_us', 'REAL'),
+    ('p99_response_time_us', 'REAL'),
+    ('p999_response_time_us', 'REAL'),
+    ('p9999_response_time_us', 'REAL'),
+]
+
+# LLM_Result_Analyzer FTL metrics
+FTL_COLUMNS = [
+    ('total_flash_reads', 'INTEGER'),
+    ('multiplane_reads', 'INTEGER'),
+    ('total_flash_writes', 'INTEGER'),
+    ('total_flash_erases', 'INTEGER'),
+    ('total_gc_executions', 'INTEGER'),
+    ('total_wl_executions', 'INTEGER'),
+    ('total_read_reclaim', 'INTEGER'),
+    ('total_ecc_retries', 'INTEGER'),
+    ('total_ecc_failures', 'INTEGER'),
+    ('total_ecc_uncorrectable', 'INTEGER'),
+    ('cmt_hits_read', 'INTEGER'),
+    ('cmt_misses_read', 'INTEGER'),
+    ('ecc_retry_rate', 'REAL'),
+    ('ecc_failure_rate', 'REAL'),
+    ('uncorrectable_rate', 'REAL'),
+]
+
+# Only present in legacy result files
+READ_COUNT_COLUMNS = [
+    ('avg_reads_per_block', 'REAL'),
+    ('max_reads_per_block', 'INTEGER'),
+    ('blocks_with_reads', 'INTEGER'),
+]
+
+COLUMNS = RUN_COLUMNS + DIMENSION_COLUMNS + HOST_COLUMNS + FTL_COLUMNS + READ_COUNT_COLUMNS
+COLUMN_NAMES = [c for c, _ in COLUMNS]
+DIMENSIONS = [c for c, _ in DIMENSION_COLUMNS]
+
+# Legacy layout: column -> (section, key)
+LEGACY_FIELDS = {
+    'iops': ('host_io_statistics', 'iops'),
+    'bandwidth_mbps': ('host_io_statistics', 'bandwidth_mbps'),
+    'avg_response_time_us': ('host_io_statistics', 'avg_response_time_us'),
+    'total_flash_reads': ('flash_operations', 'flash_reads'),
+    'total_flash_writes': ('flash_operations', 'flash_writes'),
+    'total_flash_erases': ('flash_operations', 'flash_erases'),
+    'avg_reads_per_block': ('flash_operations', 'avg_reads_per_block'),
+    'max_reads_per_block': ('flash_operations', 'max_reads_per_block'),
+    'blocks_with_reads': ('flash_operations', 'blocks_with_reads'),
+    'total_gc_executions': ('gc_wl_statistics', 'gc_executions'),
+    'total_read_reclaim': ('gc_wl_statistics', 'read_reclaim_count'),
+    'total_ecc_retries': ('ecc_statistics', 'ecc_retries'),
+    'total_ecc_failures': ('ecc_statistics', 'ecc_failures'),
+    'total_ecc_uncorrectable': ('ecc_statistics', 'uncorrectable_errors'),
+}
+
+# Directories under a results tree that never hold per-run metrics
+SKIP_DIRS = {'configs', 'logs', '.mqsim_cache'}
+REPORT_FILE = 'sweep_report.json'
+# Workload config the pre-sweep run_experiments.sh wrote next to each <name>.json
+LEGACY_WORKLOAD_SUFFIX = '_config.xml'
+
+
+# ============================================================
+# Row construction
+# ============================================================
+
+def flatten_metrics(data):
+    """
+    Map an analyzer JSON document onto store columns.
+
+    :return: {column: value}, or None if data is not a per-run result
+    """
+    if 'host' in data or 'ftl' in data:
+        row = {}
+        for key, value in data.get('host', {}).items():
+            row['flow_name' if key == 'name' else key] = value
+        row.update(data.get('ftl', {}))
+        row['source_file'] = data.get('source_file')
+    elif any(section in data for section, _ in LEGACY_FIELDS.values()):
+        row = {}
+        for column, (section, key) in LEGACY_FIELDS.items():
+            if key in data.get(section, {}):
+                row[column] = data[section][key]
+        row['name'] = data.get('name')
+        if 'tokens_generated' in data:
+            row['tokens'] = data['tokens_generated']
+    else:
+        return None
+    return {k: v for k, v in row.items() if k in COLUMN_NAMES}
+
+
+def _parse_count(label):
+    """'100K' -> 100000, '1M' -> 1000000, '50' -> 50; None if not a number."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([kKmM]?)', label)
+    if not match:
+        return None
+    scale = {'': 1, 'k': 1000, 'm': 1000000}[match.group(2).lower()]
+    return int(float(match.group(1)) * scale)
+
+
+def model_from_trace(trace_path):
+    """Model name from a trace file name, e.g. traces/llm/llama70b_iter.txt -> llama70b."""
+    stem = os.path.splitext(os.path.basename(trace_path))[0]
+    match = re.match(r'[A-Za-z]+\d+(?:\.\d+)?[bBmM]', stem)
+    return match.group(0) if match else stem
+
+
+def filename_dimensions(json_file):
+    """
+    Guess dimensions from the naming used by run_experiments.sh:
+    <exp_dir>/threshold_<N>.json and <exp_dir>/<model>_<tokens>.json.
+    """
+    stem = os.path.splitext(os.path.basename(json_file))[0]
+    dims = {'experiment': os.path.basename(os.path.dirname(os.path.abspath(json_file)))}
+    threshold = re.search(r'threshold_([^_]+)', stem)
+    if threshold and _parse_count(threshold.group(1)) is not None:
+        dims['read_reclaim_threshold'] = _parse_count(threshold.group(1))
+    model_tokens = re.match(r'([A-Za-z]+\d+(?:\.\d+)?[bBmM])_(\d+)$', stem)
+    if model_tokens:
+        dims['model'] = model_tokens.group(1)
+        dims['tokens'] = int(model_tokens.group(2))
+    return dims
+
+
+def _config_text(root, tag):
+    elem = root.find('.//' + tag)
+    if elem is None or elem.text is None or not elem.text.strip():
+        return None
+    return elem.text.strip()
+
+
+def config_dimensions(device_config, workload_config):
+    """Dimensions of a run read from the device and workload config XMLs it was made with."""
+    dims = {}
+    if device_config and os.path.exists(device_config):
+        device = ET.parse(device_config).getroot()
+        threshold = _config_text(device, 'Read_Reclaim_Threshold')
+        retries = _config_text(device, 'IFP_ECC_Max_Retries')
+        dims['read_reclaim_threshold'] = int(threshold) if threshold else DEFAULT_READ_RECLAIM_THRESHOLD
+        dims['ecc_max_retries'] = int(retries) if retries else DEFAULT_ECC_MAX_RETRIES
+    if workload_config and os.path.exists(workload_config):
+        workload = ET.parse(workload_config).getroot()
+        trace = _config_text(workload, 'File_Path')
+        relay = _config_text(workload, 'Relay_Count')
+        occupancy = _config_text(workload, 'Initial_Occupancy_Percentage')
+        if trace:
+            dims['model'] = model_from_trace(trace)
+        if relay:
+            dims['tokens'] = int(relay)
+        if occupancy:
+            dims['initial_occupancy'] = int(occupancy)
+    return dims
+
+
+# ============================================================
+# Store
+# ============================================================
+
+class ResultsStore:
+    def __init__(self, path=DEFAULT_STORE):
+        """
+        :param path: SQLite database file; created if missing
+        """
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.execute('DROP TABLE IF EXISTS runs')
+        columns = ', '.join(f"{name} {sql_type}" for name, sql_type in COLUMNS)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, {columns})")
+        for name in DIMENSIONS + ['name']:
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS runs_{name} ON runs ({name})")
+        self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.close()
+
+    # ------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------
+
+    def _is_current(self, json_file, st, dims):
+        row = self.conn.execute(
+            f"SELECT json_size, json_mtime_ns, {', '.join(DIMENSIONS)} FROM runs WHERE json_file = ?",
+            (json_file,)).fetchone()
+        if row is None or row['json_size'] != st.st_size or row['json_mtime_ns'] != st.st_mtime_ns:
+            return False
+        return all(row[k] == v for k, v in (dims or {}).items())
+
+    def ingest_json(self, json_file, dims=None, data=None, force=False):
+        """
+        Add or refresh the row for one analyzer JSON file.
+
+        :param dims: dimensions from the run's configs; override those guessed from the file name
+        :param data: the already loaded document, if the caller has it
+        :return: True if json_file is a per-run result (whether or not it had to be re-read)
+        """
+        json_file = os.path.abspath(json_file)
+        st = os.stat(json_file)
+        if not force and data is None and self._is_current(json_file, st, dims):
+            return True
+        if data is None:
+            with open(json_file) as f:
+                data = json.load(f)
+        row = flatten_metrics(data) if isinstance(data, dict) else None
+        if row is None:
+            return False
+
+        values = filename_dimensions(json_file)
+        values.update({k: v for k, v in row.items() if v is not None})
+        if dims is None:
+            workload_config = os.path.splitext(json_file)[0] + LEGACY_WORKLOAD_SUFFIX
+            dims = config_dimensions(None, workload_config)
+        values.update(dims)
+        values['name'] = values.get('name') or os.path.splitext(os.path.basename(json_file))[0]
+        values.update(json_file=json_file, json_size=st.st_size, json_mtime_ns=st.st_mtime_ns)
+
+        names = list(values)
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO runs ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            [values[n] for n in names])
+        return True
+
+    def ingest_report(self, report_path, report=None, force=False):
+        """
+        Ingest every finished job of a sweep_runner report.
+
+        :return: JSON files of the ingested runs
+        """
+        if report is None:
+            with open(report_path) as f:
+                report = json.load(f)
+        experiment = os.path.basename(os.path.dirname(os.path.abspath(report_path)))
+        ingested = []
+        for job in report.get('jobs', []):
+            json_output = job.get('json_output')
+            if job.get('status') != 'ok' or not json_output or not os.path.exists(json_output):
+                continue
+            dims = config_dimensions(job.get('device_config'), job.get('workload_config'))
+            dims['experiment'] = experiment
+            if self.ingest_json(json_output, dims, force=force):
+                ingested.append(os.path.abspath(json_output))
+        return ingested
+
+    def ingest_path(self, path, force=False):
+        """
+        Ingest a sweep report, an analyzer JSON file or every such file under a directory.
+        Reports are read first so their config-derived dimensions take precedence.
+
+        :return: JSON files of the per-run results found under path
+        """
+        if os.path.isdir(path):
+            files = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+                files.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.json'))
+        else:
+            files = [path]
+        files.sort(key=lambda f: os.path.basename(f) != REPORT_FILE)
+
+        found = []
+        seen = set()
+        for json_file in files:
+            json_file = os.path.abspath(json_file)
+            if json_file in seen:
+                continue
+            if os.path.basename(json_file) == REPORT_FILE:
+                runs = self.ingest_report(json_file, force=force)
+                found.extend(f for f in runs if f not in seen)
+                seen.update(runs)
+            elif self.ingest_json(json_file, force=force):
+                found.append(json_file)
+            seen.add(json_file)
+        self.conn.commit()
+        return found
+
+    def ingest_paths(self, paths, force=False):
+        found = []
+        for path in paths:
+            found.extend(self.ingest_path(path, force=force))
+        return list(dict.fromkeys(found))
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _check_columns(names):
+        unknown = [n for n in names if n not in COLUMN_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+
+    def query(self, columns=None, filters=None, json_files=None, order_by=None):
+        """
+        Select runs.
+
+        :param columns: column names to return (default: all)
+        :param filters: {column: value or list of values}; None values are ignored
+        :param json_files: restrict to these result files (e.g. the ones a tool was given)
+        :param order_by: column name or list of column names
+        :return: list of {column: value} dicts
+        """
+        columns = list(columns or COLUMN_NAMES)
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        order_by = list(order_by or [])
+        self._check_columns(columns + list(filters) + order_by)
+
+        sql = f"SELECT {', '.join('runs.' + c for c in columns)} FROM runs"
+        args = []
+        if json_files is not None:
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS selected (json_file TEXT PRIMARY KEY)')
+            self.conn.execute('DELETE FROM selected')
+            self.conn.executemany('INSERT OR IGNORE INTO selected VALUES (?)',
+                                  ((os.path.abspath(f),) for f in json_files))
+            sql += ' JOIN selected ON selected.json_file = runs.json_file'
+        clauses = []
+        for column, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                clauses.append(f"runs.{column} IN ({', '.join('?' * len(value))})")
+                args.extend(value)
+            else:
+                clauses.append(f"runs.{column} = ?")
+                args.append(value)
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        if order_by:
+            sql += ' ORDER BY ' + ', '.join('runs.' + c for c in order_by)
+        return [dict(row) for row in self.conn.execute(sql, args)]
+
+    def stats(self):
+        total = self.conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+        experiments = self.conn.execute(
+            'SELECT experiment, COUNT(*) AS runs FROM runs GROUP BY experiment ORDER BY experiment').fetchall()
+        return {'runs': total, 'experiments': {r['experiment']: r['runs'] for r in experiments},
+                'path': self.path}
+
+
+# ============================================================
+# Tool integration
+# ============================================================
+
+def add_query_arguments(parser):
+    """Add the result selection options shared by the plotting and comparison tools."""
+    parser.add_argument('results', nargs='*',
+                        help='Analyzer JSON files, sweep reports or result directories to ingest and '
+                             'select (default: every run in the store matching the filters)')
+    parser.add_argument('--store', default=DEFAULT_STORE, help='Results store (SQLite)')
+    parser.add_argument('--experiment', help='Only runs of this experiment (results/ subdirectory)')
+    parser.add_argument('--model', help='Only runs of this model, e.g. llama70b')
+    parser.add_argument('--tokens', type=int, help='Only runs with this token count')
+    parser.add_argument('--threshold', type=int, help='Only runs with this Read_Reclaim_Threshold')
+    parser.add_argument('--retries', type=int, help='Only runs with this IFP_ECC_Max_Retries')
+
+
+def query_from_args(args, columns, order_by=None):
+    """Ingest the paths named on the command line, then select the matching runs."""
+    filters = {
+        'experiment': args.experiment,
+        'model': args.model,
+        'tokens': args.tokens,
+        'read_reclaim_threshold': args.threshold,
+        'ecc_max_retries': args.retries,
+    }
+    with ResultsStore(args.store) as store:
+        json_files = store.ingest_paths(args.results) if args.results else None
+        return store.query(columns, filters, json_files, order_by)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Ingest and query the experiment results store',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Usage:', 1)[1],
+    )
+    parser.add_argument('--store', default=DEFAULT_STORE, help='Results store (SQLite)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_ingest = sub.add_parser('ingest', help='Add result directories, sweep reports or JSON files')
+    p_ingest.add_argument('paths', nargs='+')
+    p_ingest.add_argument('--force', action='store_true', help='Re-read files even if unchanged')
+
+    p_query = sub.add_parser('query', help='Print matching runs as a table or JSON')
+    p_query.add_argument('--columns', help='Comma-separated columns (default: name + dimensions)')
+    p_query.add_argument('--where', action='append', default=[], metavar='COLUMN=VALUE',
+                         help='Equality filter (repeatable)')
+    p_query.add_argument('--experiment')
+    p_query.add_argument('--order', help='Comma-separated sort columns')
+    p_query.add_argument('--json', action='store_true', help='Print rows as JSON')
+
+    sub.add_parser('stats', help='Show run counts per experiment')
+    args = parser.parse_args()
+
+    with ResultsStore(args.store) as store:
+        if args.command == 'ingest':
+            found = store.ingest_paths(args.paths, force=args.force)
+            print(f"{len(found):,} runs from {len(args.paths)} path(s) in {store.path}")
+        elif args.command == 'query':
+            columns = args.columns.split(',') if args.columns else ['name'] + DIMENSIONS
+            filters = dict(w.split('=', 1) for w in args.where)
+            filters['experiment'] = args.experiment
+            order = args.order.split(',') if args.order else None
+            rows = store.query(columns, filters, order_by=order)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                print('\t'.join(columns))
+                for row in rows:
+                    print('\t'.join('' if row[c] is None else str(row[c]) for c in columns))
+        else:
+            s = store.stats()
+            print(f"{s['path']}: {s['runs']:,} runs")
+            for experiment, runs in s['experiments'].items():
+                print(f"  {experiment}: {runs:,}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+In-process MQSim runs through the shared library (ctypes binding of src/exec/MQSim_API.h).
+
+A run takes the device configuration as base XML text plus tag overrides and
+the IO flows as {tag: value} dicts, and returns the host and FTL counters as a
+dict keyed by the attribute names of the result XML, so sweeps of short runs
+pay neither process spawn nor config/result XML files.
+
+The simulator state is per thread and ctypes releases the GIL during a run, so
+runs from a ThreadPoolExecutor proceed in parallel with one device each. Every
+run starts from a full device configuration so that it does not inherit the
+parameters of the previous run of its thread.
+
+Usage:
+  make libmqsim
+  python3 tools/automation/mqsim_api.py \\
+      --device configs/device/ssdconfig.xml --workload configs/workload/llm_test_config.xml \\
+      --device-param Read_Reclaim_Threshold=1000 --workload-param Relay_Count=10
+"""
+
+import argparse
+import ctypes
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_LIBRARY = os.path.join(PROJECT_ROOT, 'libmqsim.so')
+DEFAULT_DEVICE_CONFIG = os.path.join(PROJECT_ROOT, 'configs', 'device', 'ssdconfig.xml')
+
+API_VERSION = 1
+MAX_FLOWS = 8
+FLOW_ID_LENGTH = 64
+
+FLOW_TYPES = {
+    'IO_Flow_Parameter_Set_Synthetic': 0,
+    'IO_Flow_Parameter_Set_Trace_Based': 1,
+}
+
+# Result fields in the order of the C structures; the C field is the lower-cased result XML attribute name
+FLOW_COUNT_FIELDS = ['Request_Count', 'Read_Request_Count', 'Write_Request_Count', 'Serviced_Request_Count']
+FLOW_DOUBLE_FIELDS = [
+    'IOPS', 'IOPS_Read', 'IOPS_Write',
+    'Bytes_Transferred', 'Bytes_Transferred_Read', 'Bytes_Transferred_Write',
+    'Bandwidth', 'Bandwidth_Read', 'Bandwidth_Write',
+    'Device_Response_Time', 'Min_Device_Response_Time', 'Max_Device_Response_Time',
+    'Device_Response_Time_P50', 'Device_Response_Time_P90', 'Device_Response_Time_P99',
+    'Device_Response_Time_P99_9', 'Device_Response_Time_P99_99',
+    'End_to_End_Request_Delay', 'Min_End_to_End_Request_Delay', 'Max_End_to_End_Request_Delay',
+    'End_to_End_Request_Delay_P50', 'End_to_End_Request_Delay_P90', 'End_to_End_Request_Delay_P99',
+    'End_to_End_Request_Delay_P99_9', 'End_to_End_Request_Delay_P99_99',
+]
+FTL_FIELDS = [
+    'Issued_Flash_Read_CMD', 'Issued_Flash_Interleaved_Read_CMD', 'Issued_Flash_Multiplane_Read_CMD',
+    'Issued_Flash_Copyback_Read_CMD', 'Issued_Flash_Multiplane_Copyback_Read_CMD',
+    'Issued_Flash_Program_CMD', 'Issued_Flash_Interleaved_Program_CMD', 'Issued_Flash_Multiplane_Program_CMD',
+    'Issued_Flash_Interleaved_Multiplane_Program_CMD', 'Issued_Flash_Copyback_Program_CMD',
+    'Issued_Flash_Multiplane_Copyback_Program_CMD',
+    'Issued_Flash_Erase_CMD', 'Issued_Flash_Interleaved_Erase_CMD', 'Issued_Flash_Multiplane_Erase_CMD',
+    'Issued_Flash_Interleaved_Multiplane_Erase_CMD',
+    'Issued_Flash_Suspend_Program_CMD', 'Issued_Flash_Suspend_Erase_CMD',
+    'Issued_Flash_Read_CMD_For_Mapping', 'Issued_Flash_Program_CMD_For_Mapping',
+    'CMT_Hits', 'CMT_Hits_For_Read', 'CMT_Hits_For_Write',
+    'CMT_Misses', 'CMT_Misses_For_Read', 'CMT_Misses_For_Write',
+    'Total_CMT_Queries', 'Total_CMT_Queries_For_Reads', 'Total_CMT_Queries_For_Writes',
+    'Total_GC_Executions', 'Total_Page_Movements_For_GC',
+    'Total_WL_Executions', 'Total_Page_Movements_For_WL',
+    'Issued_IFP_GEMV_CMD',
+    'Total_ECC_Retries', 'Total_ECC_Failures', 'Total_ECC_Uncorrectable',
+    'Total_Read_Reclaim_Migrations',
+]
+
+
+class Parameter(ctypes.Structure):
+    _fields_ = [('section', ctypes.c_char_p), ('name', ctypes.c_char_p), ('value', ctypes.c_char_p)]
+
+
+class Flow(ctypes.Structure):
+    _fields_ = [('type', ctypes.c_int), ('parameters', ctypes.POINTER(Parameter)),
+                ('parameter_count', ctypes.c_uint)]
+
+
+class RunConfig(ctypes.Structure):
+    _fields_ = [
+        ('device_config_xml', ctypes.c_char_p),
+        ('device_parameters', ctypes.POINTER(Parameter)),
+        ('device_parameter_count', ctypes.c_uint),
+        ('flows', ctypes.POINTER(Flow)),
+        ('flow_count', ctypes.c_uint),
+        ('output_path_stem', ctypes.c_char_p),
+        ('result_xml_path', ctypes.c_char_p),
+        ('quiet', ctypes.c_int),
+    ]
+
+
+class FlowResult(ctypes.Structure):
+    _fields_ = ([('id', ctypes.c_char * FLOW_ID_LENGTH)]
+                + [(name.lower(), ctypes.c_uint64) for name in FLOW_COUNT_FIELDS]
+                + [(name.lower(), ctypes.c_double) for name in FLOW_DOUBLE_FIELDS])
+
+
+class FTLResult(ctypes.Structure):
+    _fields_ = [(name.lower(), ctypes.c_uint64) for name in FTL_FIELDS]
+
+
+class Result(ctypes.Structure):
+    _fields_ = [
+        ('api_version', ctypes.c_uint32),
+        ('simulated_time', ctypes.c_uint64),
+        ('executed_events', ctypes.c_uint64),
+        ('wall_time', ctypes.c_double),
+        ('ftl', FTLResult),
+        ('flow_count', ctypes.c_uint),
+        ('flows', FlowResult * MAX_FLOWS),
+    ]
+
+
+class MQSimError(RuntimeError):
+    pass
+
+
+def _parameters(items, section=None):
+    """ctypes array of mqsim_parameter from {name: value} or [(section, name, value)]."""
+    if isinstance(items, dict):
+        items = [(section, name, value) for name, value in items.items()]
+    array = (Parameter * max(len(items), 1))()
+    for i, (sec, name, value) in enumerate(items):
+        array[i] = Parameter(sec.encode() if sec else None, name.encode(), str(value).encode())
+    return array, len(items)
+
+
+class MQSimLibrary:
+    def __init__(self, path=DEFAULT_LIBRARY):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; build it with `make libmqsim`")
+        self.lib = ctypes.CDLL(path)
+        self.lib.mqsim_api_version.restype = ctypes.c_int
+        self.lib.mqsim_last_error.restype = ctypes.c_char_p
+        self.lib.mqsim_run.argtypes = [ctypes.POINTER(RunConfig), ctypes.POINTER(Result)]
+        self.lib.mqsim_run.restype = ctypes.c_int
+        version = self.lib.mqsim_api_version()
+        if version != API_VERSION:
+            raise MQSimError(f"{path} implements API version {version}, this binding needs {API_VERSION}")
+
+    def run(self, flows, device_config=DEFAULT_DEVICE_CONFIG, device_params=None, output_stem=None,
+            result_xml=None, quiet=True):
+        """
+        Run one IO scenario in-process.
+
+        :param flows: list of (flow element tag, {tag: value}), see flows_from_workload()
+        :param device_config: SSD configuration file used as the base of the device parameters
+        :param device_params: {tag: value} overrides of device_config, or [(section, tag, value)]
+            for tags that are not in it
+        :param output_stem: path stem of the side files (epoch metrics, block snapshots)
+        :param result_xml: also write the result XML of ./mqsim to this path
+        :return: {'Simulated_Time', 'Executed_Events', 'Wall_Time', 'FTL': {...}, 'IO_Flows': [{...}]}
+        """
+        with open(device_config) as f:
+            device_xml = f.read().encode()
+        device_array, device_count = _parameters(device_params or {})
+
+        flow_array = (Flow * len(flows))()
+        keep_alive = []
+        for i, (tag, params) in enumerate(flows):
+            array, count = _parameters(params)
+            keep_alive.append(array)
+            flow_array[i] = Flow(FLOW_TYPES[tag], array, count)
+
+        config = RunConfig(device_xml, device_array, device_count, flow_array, len(flows),
+                           output_stem.encode() if output_stem else None,
+                           result_xml.encode() if result_xml else None, int(quiet))
+        result = Result()
+        if self.lib.mqsim_run(ctypes.byref(config), ctypes.byref(result)) != 0:
+            raise MQSimError(self.lib.mqsim_last_error().decode())
+        return result_to_dict(result)
+
+
+def result_to_dict(result):
+    ftl = {name: getattr(result.ftl, name.lower()) for name in FTL_FIELDS}
+    for kind in ('GC', 'WL'):
+        executions = ftl[f'Total_{kind}_Executions']
+        ftl[f'Average_Page_Movement_For_{kind}'] = (ftl[f'Total_Page_Movements_For_{kind}'] / executions
+                                                   if executions else float('nan'))
+    flows = []
+    for flow in result.flows[:result.flow_count]:
+        metrics = {'Name': flow.id.decode()}
+        metrics.update({name: getattr(flow, name.lower()) for name in FLOW_COUNT_FIELDS + FLOW_DOUBLE_FIELDS})
+        flows.append(metrics)
+    return {
+        'Simulated_Time': result.simulated_time,
+        'Executed_Events': result.executed_events,
+        'Wall_Time': result.wall_time,
+        'FTL': ftl,
+        'IO_Flows': flows,
+    }
+
+
+def flows_from_workload(workload_config, scenario=0, overrides=None):
+    """
+    IO flows of one <IO_Scenario> of a workload config as (flow element tag, {tag: value}).
+
+    :param overrides: {tag: value} applied to every flow that has the tag
+    """
+    scenarios = ET.parse(workload_config).getroot().findall('IO_Scenario')
+    flows = []
+    for elem in scenarios[scenario]:
+        params = {child.tag: (child.text or '').strip() for child in elem}
+        for tag, value in (overrides or {}).items():
+            if tag in params:
+                params[tag] = str(value)
+        flows.append((elem.tag, params))
+    return flows
+
+
+def _parse_assignments(specs):
+    params = {}
+    for spec in specs or []:
+        if '=' not in spec:
+            raise SystemExit(f"Parameter must look like NAME=VALUE: {spec}")
+        name, value = spec.split('=', 1)
+        params[name] = value
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run one MQSim scenario in-process through libmqsim.so')
+    parser.add_argument('--device', default=DEFAULT_DEVICE_CONFIG, help='SSD configuration file')
+    parser.add_argument('--workload', required=True, help='workload configuration file')
+    parser.add_argument('--scenario', type=int, default=0, help='index of the IO_Scenario to run')
+    parser.add_argument('--device-param', action='append', metavar='NAME=VALUE', help='device config override')
+    parser.add_argument('--workload-param', action='append', metavar='NAME=VALUE', help='flow parameter override')
+    parser.add_argument('--library', default=DEFAULT_LIBRARY, help='path of libmqsim.so')
+    parser.add_argument('--output-stem', help='path stem of the side files')
+    parser.add_argument('--result-xml', help='also write the result XML to this path')
+    parser.add_argument('--verbose', action='store_true', help='show the simulator progress messages')
+    args = parser.parse_args()
+
+    flows = flows_from_workload(args.workload, args.scenario, _parse_assignments(args.workload_param))
+    library = MQSimLibrary(args.library)
+    try:
+        result = library.run(flows, args.device, _parse_assignments(args.device_param), args.output_stem,
+                             args.result_xml, quiet=not args.verbose)
+    except MQSimError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
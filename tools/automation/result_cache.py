@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of mqsim results.
+
+A cache key is the SHA-256 of the canonicalized device config, the
+canonicalized workload config with every File_Path replaced by the digest of
+the trace it points to, and the digest of the mqsim binary. For a trace
+manifest, the digests of its segment traces follow the manifest's own, in
+manifest order. Whitespace,
+comments and trace locations therefore do not matter; any change to a
+parameter, a trace's contents or the simulator does.
+
+A run that restores a device checkpoint is keyed by the checkpoint's digest
+instead of its path. A run that saves one is not cached, since a cache hit
+would not write the checkpoint file.
+
+Each entry stores the result XML, the analyzer JSON and the files mqsim
+writes next to the result (epoch metrics, block snapshots). Entries are evicted
+least-recently-used first once the cache exceeds its size bound. File digests
+are memoized by (size, mtime) so multi-GB traces are only hashed when they
+change.
+
+Usage:
+  python3 tools/automation/result_cache.py stats
+  python3 tools/automation/result_cache.py evict --max-gb 5
+  python3 tools/automation/result_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, 'results', '.mqsim_cache')
+DEFAULT_MAX_BYTES = 20 * 2**30
+
+# Bump when the key derivation or entry layout changes
+CACHE_FORMAT_VERSION = 3
+
+# Trace manifests (src/host/Trace_Manifest_Definition.h)
+TRACE_MANIFEST_MAGIC = b'MQSIM_TRACE_MANIFEST'
+
+RESULT_FILE = 'result.xml'
+METRICS_FILE = 'metrics.json'
+META_FILE = 'meta.json'
+DIGEST_INDEX_FILE = 'file_digests.json'
+# Files mqsim writes next to <result>.xml when the device config enables them
+SIDE_FILE_SUFFIXES = ('.epochs.csv', '.blocks.bin')
+
+
+def side_file_paths(output_xml):
+    """Paths of the optional files mqsim writes next to output_xml, keyed by suffix."""
+    stem = output_xml[:-4] if output_xml.endswith('.xml') else output_xml
+    return {suffix: stem + suffix for suffix in SIDE_FILE_SUFFIXES}
+
+
+def manifest_segment_paths(manifest_path):
+    """
+    Segment trace paths of a trace manifest in manifest order, or None if the
+    file is not a manifest. Paths are resolved like Trace_File_Reader does:
+    relative segment paths are relative to the manifest's directory.
+    """
+    with open(manifest_path, 'rb') as f:
+        if f.read(len(TRACE_MANIFEST_MAGIC)) != TRACE_MANIFEST_MAGIC:
+            return None
+    directory = os.path.dirname(manifest_path)
+    paths = []
+    with open(manifest_path) as f:
+        f.readline()
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            if len(fields) > 2 and fields[2].isdigit() and int(fields[2]) == 0:
+                continue  # Not replayed, so the reader does not open it
+            path = fields[0]
+            absolute = path[0] in '/\\' or (len(path) > 1 and path[1] == ':')
+            paths.append(path if absolute else os.path.join(directory, path))
+    return paths
+
+
+def _canonical_xml(root):
+    return ET.canonicalize(ET.tostring(root, encoding='unicode'), strip_text=True).encode()
+
+
+class ResultCache:
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, cwd=PROJECT_ROOT):
+        """
+        :param root: cache directory
+        :param max_bytes: total size bound enforced after every store
+        :param cwd: directory that relative trace paths are resolved against (mqsim's cwd)
+        """
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.cwd = cwd
+        self.lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self._digest_index_path = os.path.join(self.root, DIGEST_INDEX_FILE)
+        self._digest_index = self._load_digest_index()
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+
+    def _load_digest_index(self):
+        try:
+            with open(self._digest_index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_digest_index(self):
+        tmp = f"{self._digest_index_path}.{uuid.uuid4().hex}"
+        with open(tmp, 'w') as f:
+            json.dump(self._digest_index, f)
+        os.replace(tmp, self._digest_index_path)
+
+    def file_digest(self, path):
+        """SHA-256 of a file's contents, memoized by (size, mtime)."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self.lock:
+            cached = self._digest_index.get(path)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                return cached[2]
+
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 22), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+
+        with self.lock:
+            self._digest_index[path] = [st.st_size, st.st_mtime_ns, digest]
+            self._save_digest_index()
+        return digest
+
+    def _workload_digest_root(self, workload_config):
+        root = ET.parse(workload_config).getroot()
+        for elem in root.iter('File_Path'):
+            trace = elem.text.strip()
+            if not os.path.isabs(trace):
+                trace = os.path.join(self.cwd, trace)
+            digests = [self.file_digest(trace)]
+            for segment in manifest_segment_paths(trace) or []:
+                digests.append(self.file_digest(segment))
+            elem.text = ';'.join('sha256:' + d for d in digests)
+        return root
+
+    def _device_digest_root(self, device_config):
+        """Parsed device config, or None if the run saves a checkpoint and must not be cached."""
+        root = ET.parse(device_config).getroot()
+        mode = root.findtext('.//Checkpoint', 'NONE').strip().upper()
+        if mode == 'SAVE':
+            return None
+        if mode == 'RESTORE':
+            for elem in root.iter('Checkpoint_File_Path'):
+                checkpoint = elem.text.strip()
+                if not os.path.isabs(checkpoint):
+                    checkpoint = os.path.join(self.cwd, checkpoint)
+                elem.text = 'sha256:' + self.file_digest(checkpoint)
+        return root
+
+    def job_key(self, device_config, workload_config, mqsim_bin):
+        """Cache key of a run, or None if the run cannot be cached."""
+        device_root = self._device_digest_root(device_config)
+        if device_root is None:
+            return None
+        h = hashlib.sha256()
+        h.update(f"mqsim-result-cache-v{CACHE_FORMAT_VERSION}\0".encode())
+        h.update(_canonical_xml(device_root) + b'\0')
+        h.update(_canonical_xml(self._workload_digest_root(workload_config)) + b'\0')
+        h.update(self.file_digest(mqsim_bin).encode())
+        return h.hexdigest()
+
+    # ------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def _entries(self):
+        for shard in os.listdir(self.root):
+            shard_dir = os.path.join(self.root, shard)
+            if len(shard) != 2 or not os.path.isdir(shard_dir):
+                continue
+            for key in os.listdir(shard_dir):
+                entry = os.path.join(shard_dir, key)
+                meta = os.path.join(entry, META_FILE)
+                if os.path.exists(meta):
+                    yield key, entry, meta
+
+    def restore(self, key, output_xml, json_output=None):
+        """
+        Copy a cached result to output_xml (and metrics to json_output).
+
+        :return: True on a hit
+        """
+        entry = self._entry_dir(key)
+        meta = os.path.join(entry, META_FILE)
+        if not os.path.exists(meta):
+            return False
+        metrics_path = os.path.join(entry, METRICS_FILE)
+        if json_output and not os.path.exists(metrics_path):
+            return False
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_xml)), exist_ok=True)
+        shutil.copyfile(os.path.join(entry, RESULT_FILE), output_xml)
+        for suffix, path in side_file_paths(output_xml).items():
+            cached = os.path.join(entry, 'result' + suffix)
+            if os.path.exists(cached):
+                shutil.copyfile(cached, path)
+        if json_output:
+            with open(metrics_path) as f:
+                metrics = json.load(f)
+            # Metadata describes the file the metrics are attached to, not the cached copy
+            metrics['source_file'] = str(output_xml)
+            metrics['experiment_name'] = os.path.splitext(os.path.basename(output_xml))[0]
+            with open(json_output, 'w') as f:
+                json.dump(metrics, f, indent=2)
+        os.utime(meta)  # LRU access time
+        return True
+
+    def store(self, key, output_xml, json_output=None, info=None):
+        """Add a finished run to the cache, then enforce the size bound."""
+        entry = self._entry_dir(key)
+        staging = os.path.join(self.root, f".staging-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            shutil.copyfile(output_xml, os.path.join(staging, RESULT_FILE))
+            for suffix, path in side_file_paths(output_xml).items():
+                if os.path.exists(path):
+                    shutil.copyfile(path, os.path.join(staging, 'result' + suffix))
+            if json_output and os.path.exists(json_output):
+                shutil.copyfile(json_output, os.path.join(staging, METRICS_FILE))
+            with open(os.path.join(staging, META_FILE), 'w') as f:
+                json.dump(dict(info or {}, key=key, created=time.time()), f, indent=2)
+
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            with self.lock:
+                if os.path.exists(entry):
+                    shutil.rmtree(entry, ignore_errors=True)
+                os.replace(staging, entry)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def evict(self, max_bytes=None):
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self.lock:
+            entries = []
+            total = 0
+            for key, entry, meta in self._entries():
+                try:
+                    size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+                    entries.append((os.path.getmtime(meta), size, entry))
+                except OSError:
+                    continue  # removed concurrently
+                total += size
+            removed = 0
+            for _, size, entry in sorted(entries):
+                if total <= limit:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                removed += 1
+        return removed
+
+    def stats(self):
+        count = 0
+        total = 0
+        for _, entry, _ in self._entries():
+            count += 1
+            total += sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+        return {'entries': count, 'bytes': total, 'max_bytes': self.max_bytes, 'root': self.root}
+
+    def clear(self):
+        with self.lock:
+            for _, entry, _ in list(self._entries()):
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or trim the mqsim result cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help='Show number of entries and size')
+    p_evict = sub.add_parser('evict', help='Evict LRU entries down to a size bound')
+    p_evict.add_argument('--max-gb', type=float, required=True)
+    sub.add_parser('clear', help='Remove all entries')
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_dir)
+    if args.command == 'stats':
+        s = cache.stats()
+        print(f"{s['root']}: {s['entries']} entries, {s['bytes'] / 2**20:.1f} MB")
+    elif args.command == 'evict':
+        removed = cache.evict(int(args.max_gb * 2**30))
+        print(f"Evicted {removed} entries")
+    else:
+        cache.clear()
+        print("Cache cleared")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
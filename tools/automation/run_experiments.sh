@@ -7,6 +7,8 @@
 #   - Token counts (10K, 50K, 100K)
 #   - Read-reclaim thresholds (10K, 50K, 100K, 500K, 1M, infinity)
 #
+# The points of each experiment run in parallel through sweep_runner.py.
+#
 
 set -e  # Exit on error
 
@@ -40,6 +42,30 @@ if [ ! -d "$PROJECT_ROOT/traces/llm" ] || [ -z "$(ls -A $PROJECT_ROOT/traces/llm
     "$SCRIPT_DIR/generate_llm_traces.sh"
 fi
 
+# Extra sweep_runner.py options, e.g. SWEEP_ARGS="--jobs 16 --mem-per-job-mb 4096"
+SWEEP_ARGS="${SWEEP_ARGS:-}"
+
+# FAST_FORWARD=true skips steady-state token rounds analytically (see docs/features/fast-forward.md)
+FAST_FORWARD="${FAST_FORWARD:-false}"
+# Fast-forward only compares rounds that end drained, so it starts each round once the previous one is serviced
+REPLAY_DRAIN="${REPLAY_DRAIN:-$FAST_FORWARD}"
+
+# Target of the exp3 threshold search (threshold_search.py); extra options via SEARCH_ARGS
+SEARCH_METRIC="${SEARCH_METRIC:-uncorrectable_rate}"
+SEARCH_TARGET="${SEARCH_TARGET:-0.001}"
+SEARCH_ARGS="${SEARCH_ARGS:-}"
+
+# run_sweep <exp_dir> <timeout> <sweep_runner args...>
+# Runs every point of an experiment in parallel; failures are listed in <exp_dir>/sweep_report.json
+run_sweep() {
+    local exp_dir="$1"
+    local timeout="$2"
+    shift 2
+    python3 "$SCRIPT_DIR/sweep_runner.py" --out "$exp_dir" --timeout "$timeout" $SWEEP_ARGS "$@" || {
+        echo -e "${RED}Some simulations failed or timed out! See $exp_dir/sweep_report.json${NC}"
+    }
+}
+
 # ============================================================
 # Experiment 1: Baseline Performance (Quick validation)
 # ============================================================
@@ -56,35 +82,20 @@ run_experiment_1() {
     MODELS=("llama7b" "llama13b" "llama70b")
     TOKENS=10000
 
+    TRACES=""
     for model in "${MODELS[@]}"; do
-        echo -e "${YELLOW}Running $model @ ${TOKENS}K tokens...${NC}"
-
-        # Copy and modify workload config
-        CONFIG="$EXP_DIR/${model}_${TOKENS}k_config.xml"
-        cp "$PROJECT_ROOT/configs/workload/llm_test_config.xml" "$CONFIG"
-
-        # Update trace file and relay count
-        sed -i "s|<File_Path>.*</File_Path>|<File_Path>$PROJECT_ROOT/traces/llm/${model}_iter.txt</File_Path>|" "$CONFIG"
-        sed -i "s|<Relay_Count>.*</Relay_Count>|<Relay_Count>${TOKENS}</Relay_Count>|" "$CONFIG"
-
-        # Run simulation
-        cd "$PROJECT_ROOT"
-        echo "" | timeout 600 ./mqsim -i configs/device/ssdconfig.xml -w "$CONFIG" || {
-            echo -e "${RED}Simulation failed or timed out!${NC}"
-            continue
-        }
-
-        # Move result
-        RESULT_XML="${CONFIG%.*}_scenario_1.xml"
-        if [ -f "$RESULT_XML" ]; then
-            echo -e "${GREEN}✓ Complete${NC}"
-
-            # Analyze and save JSON
-            python3 "$TOOLS_DIR/analysis/analyze_llm_results.py" "$RESULT_XML" \
-                --json "$EXP_DIR/${model}_${TOKENS}k.json" > "$EXP_DIR/${model}_${TOKENS}k.txt"
-        fi
+        TRACES="${TRACES:+$TRACES,}${model}:$PROJECT_ROOT/traces/llm/${model}_iter.txt"
     done
 
+    run_sweep "$EXP_DIR" 600 \
+        --device "$PROJECT_ROOT/configs/device/ssdconfig.xml" \
+        --workload "$PROJECT_ROOT/configs/workload/llm_test_config.xml" \
+        --workload-param "File_Path=$TRACES" \
+        --workload-param "Relay_Count=$TOKENS" \
+        --workload-param "Replay_Drain=$REPLAY_DRAIN" \
+        --workload-param "Fast_Forward=$FAST_FORWARD" \
+        --name "{File_Path}_${TOKENS}k"
+
     echo ""
     echo -e "${GREEN}Experiment 1 complete. Results in: $EXP_DIR${NC}"
 }
@@ -103,30 +114,16 @@ run_experiment_2() {
     mkdir -p "$EXP_DIR"
 
     MODEL="llama70b"
-    TOKEN_COUNTS=(10000 50000 100000)
-
-    for tokens in "${TOKEN_COUNTS[@]}"; do
-        echo -e "${YELLOW}Running ${MODEL} @ ${tokens} tokens...${NC}"
-
-        CONFIG="$EXP_DIR/${MODEL}_${tokens}_config.xml"
-        cp "$PROJECT_ROOT/configs/workload/llm_test_config.xml" "$CONFIG"
+    TOKEN_COUNTS="10000,50000,100000"
 
-        sed -i "s|<File_Path>.*</File_Path>|<File_Path>$PROJECT_ROOT/traces/llm/${MODEL}_iter.txt</File_Path>|" "$CONFIG"
-        sed -i "s|<Relay_Count>.*</Relay_Count>|<Relay_Count>${tokens}</Relay_Count>|" "$CONFIG"
-
-        cd "$PROJECT_ROOT"
-        echo "" | timeout 3600 ./mqsim -i configs/device/ssdconfig.xml -w "$CONFIG" || {
-            echo -e "${RED}Simulation failed or timed out!${NC}"
-            continue
-        }
-
-        RESULT_XML="${CONFIG%.*}_scenario_1.xml"
-        if [ -f "$RESULT_XML" ]; then
-            echo -e "${GREEN}✓ Complete${NC}"
-            python3 "$TOOLS_DIR/analysis/analyze_llm_results.py" "$RESULT_XML" \
-                --json "$EXP_DIR/${MODEL}_${tokens}.json" > "$EXP_DIR/${MODEL}_${tokens}.txt"
-        fi
-    done
+    run_sweep "$EXP_DIR" 3600 \
+        --device "$PROJECT_ROOT/configs/device/ssdconfig.xml" \
+        --workload "$PROJECT_ROOT/configs/workload/llm_test_config.xml" \
+        --workload-param "File_Path=$PROJECT_ROOT/traces/llm/${MODEL}_iter.txt" \
+        --workload-param "Relay_Count=$TOKEN_COUNTS" \
+        --workload-param "Replay_Drain=$REPLAY_DRAIN" \
+        --workload-param "Fast_Forward=$FAST_FORWARD" \
+        --name "${MODEL}_{Relay_Count}"
 
     # Generate plots
     echo ""
@@ -153,41 +150,20 @@ run_experiment_3() {
 
     MODEL="llama70b"
     TOKENS=100000
-    THRESHOLDS=(10 50 100 500 1000 999999999)  # Last = infinity (no reclaim)
-    THRESHOLD_NAMES=("10" "50" "100" "500" "1K" "inf")
-
-    for i in "${!THRESHOLDS[@]}"; do
-        threshold="${THRESHOLDS[$i]}"
-        name="${THRESHOLD_NAMES[$i]}"
-
-        echo -e "${YELLOW}Running threshold=${name}...${NC}"
-
-        # Copy device config and modify reclaim threshold
-        DEV_CONFIG="$EXP_DIR/ssdconfig_threshold_${name}.xml"
-        cp "$PROJECT_ROOT/configs/device/ssdconfig.xml" "$DEV_CONFIG"
-        sed -i "s|<Read_Reclaim_Threshold>.*</Read_Reclaim_Threshold>|<Read_Reclaim_Threshold>${threshold}</Read_Reclaim_Threshold>|" "$DEV_CONFIG"
-
-        # Workload config
-        CONFIG="$EXP_DIR/${MODEL}_threshold_${name}_config.xml"
-        cp "$PROJECT_ROOT/configs/workload/llm_test_config.xml" "$CONFIG"
-        sed -i "s|<File_Path>.*</File_Path>|<File_Path>$PROJECT_ROOT/traces/llm/${MODEL}_iter.txt</File_Path>|" "$CONFIG"
-        sed -i "s|<Relay_Count>.*</Relay_Count>|<Relay_Count>${TOKENS}</Relay_Count>|" "$CONFIG"
-        # CRITICAL: Set initial occupancy to simulate pre-loaded LLM weights
-        sed -i "s|<Initial_Occupancy_Percentage>.*</Initial_Occupancy_Percentage>|<Initial_Occupancy_Percentage>70</Initial_Occupancy_Percentage>|" "$CONFIG"
-
-        cd "$PROJECT_ROOT"
-        echo "" | timeout 7200 ./mqsim -i "$DEV_CONFIG" -w "$CONFIG" || {
-            echo -e "${RED}Simulation failed or timed out!${NC}"
-            continue
-        }
-
-        RESULT_XML="${CONFIG%.*}_scenario_1.xml"
-        if [ -f "$RESULT_XML" ]; then
-            echo -e "${GREEN}✓ Complete${NC}"
-            python3 "$TOOLS_DIR/analysis/analyze_llm_results.py" "$RESULT_XML" \
-                --json "$EXP_DIR/threshold_${name}.json" > "$EXP_DIR/threshold_${name}.txt"
-        fi
-    done
+    # label:value pairs; last = infinity (no reclaim)
+    THRESHOLDS="10,50,100,500,1K:1000,inf:999999999"
+
+    # CRITICAL: Initial occupancy simulates pre-loaded LLM weights
+    run_sweep "$EXP_DIR" 7200 \
+        --device "$PROJECT_ROOT/configs/device/ssdconfig.xml" \
+        --workload "$PROJECT_ROOT/configs/workload/llm_test_config.xml" \
+        --device-param "Read_Reclaim_Threshold=$THRESHOLDS" \
+        --workload-param "File_Path=$PROJECT_ROOT/traces/llm/${MODEL}_iter.txt" \
+        --workload-param "Relay_Count=$TOKENS" \
+        --workload-param "Replay_Drain=$REPLAY_DRAIN" \
+        --workload-param "Fast_Forward=$FAST_FORWARD" \
+        --workload-param "Initial_Occupancy_Percentage=70" \
+        --name "threshold_{Read_Reclaim_Threshold}"
 
     # Generate THE trade-off plot
     echo ""
@@ -200,6 +176,38 @@ run_experiment_3() {
     echo -e "${GREEN}KEY FIGURE: $EXP_DIR/tradeoff.png${NC}"
 }
 
+# ============================================================
+# Experiment 3 (search): operating point instead of the full sweep
+# ============================================================
+run_experiment_3_search() {
+    echo ""
+    echo -e "${GREEN}=== Experiment 3 (search): Read-Reclaim Operating Point ===${NC}"
+    echo "Goal: Largest reclaim threshold with $SEARCH_METRIC <= $SEARCH_TARGET"
+    echo "Config: Llama2-70B, 100K tokens, adaptive threshold search"
+    echo ""
+
+    EXP_DIR="$RESULTS_DIR/exp3_search"
+    mkdir -p "$EXP_DIR"
+
+    MODEL="llama70b"
+    TOKENS=100000
+
+    python3 "$SCRIPT_DIR/threshold_search.py" --out "$EXP_DIR" --timeout 7200 \
+        --device "$PROJECT_ROOT/configs/device/ssdconfig.xml" \
+        --workload "$PROJECT_ROOT/configs/workload/llm_test_config.xml" \
+        --workload-param "File_Path=$PROJECT_ROOT/traces/llm/${MODEL}_iter.txt" \
+        --workload-param "Relay_Count=$TOKENS" \
+        --workload-param "Replay_Drain=$REPLAY_DRAIN" \
+        --workload-param "Fast_Forward=$FAST_FORWARD" \
+        --workload-param "Initial_Occupancy_Percentage=70" \
+        --metric "$SEARCH_METRIC" --target "$SEARCH_TARGET" $SEARCH_ARGS || {
+        echo -e "${RED}The search did not converge! See $EXP_DIR/threshold_search.json${NC}"
+    }
+
+    echo ""
+    echo -e "${GREEN}Experiment 3 search complete. Results in: $EXP_DIR${NC}"
+}
+
 # ============================================================
 # Main menu
 # ============================================================
@@ -210,6 +218,7 @@ show_menu() {
     echo "  2) Experiment 2 - Read-Disturb Accumulation (~30 min)"
     echo "  3) Experiment 3 - Trade-off Analysis (~2 hours)"
     echo "  4) Run all experiments"
+    echo "  5) Experiment 3 search - Reclaim operating point (~6 runs)"
     echo "  q) Quit"
     echo ""
 }
@@ -229,6 +238,7 @@ if [ $# -eq 0 ]; then
                 run_experiment_2
                 run_experiment_3
                 ;;
+            5) run_experiment_3_search ;;
             q|Q) exit 0 ;;
             *) echo -e "${RED}Invalid choice${NC}" ;;
         esac
@@ -239,8 +249,9 @@ else
         exp1|1) run_experiment_1 ;;
         exp2|2) run_experiment_2 ;;
         exp3|3) run_experiment_3 ;;
+        exp3-search) run_experiment_3_search ;;
         all) run_experiment_1; run_experiment_2; run_experiment_3 ;;
-        *) echo "Usage: $0 [exp1|exp2|exp3|all]"; exit 1 ;;
+        *) echo "Usage: $0 [exp1|exp2|exp3|exp3-search|all]"; exit 1 ;;
     esac
 fi
 
@@ -252,7 +263,7 @@ echo ""
 echo "Results saved in: $RESULTS_DIR"
 echo ""
 echo "Next steps:"
-echo "  - Review result summaries (*.txt files)"
+echo "  - Review result metrics (*.json files) and sweep_report.json"
 echo "  - Check generated plots (*.png files)"
 echo "  - Compare across experiments"
 echo ""
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Parallel MQSim sweep runner.
+
+Runs (device config x workload config) jobs concurrently, one ./mqsim process per
+job. Concurrency is bounded by CPU count and by available RAM (each mqsim
+instance allocates per-page FTL state), every job has its own timeout, progress
+is printed as jobs start and finish, and a structured JSON report lists every
+job with its status, runtime and the tail of its log on failure. Finished
+runs are stored in a content-addressed result cache (result_cache.py), so
+unchanged points are restored instead of simulated; --force bypasses it.
+Analyzed runs are added to the results store (analysis/results_store.py) with
+their config parameters as query dimensions.
+
+Parameter sweeps are expressed as XML tag overrides on template configs. Values
+may carry a label (`label:value`) that is used in job names instead of the raw
+value.
+
+Usage:
+  python3 tools/automation/sweep_runner.py \\
+      --device configs/device/ssdconfig.xml \\
+      --workload configs/workload/llm_test_config.xml \\
+      --device-param Read_Reclaim_Threshold=10,50,100,500,1K:1000,inf:999999999 \\
+      --workload-param File_Path=traces/llm/llama70b_iter.txt --workload-param Relay_Count=100000 \\
+      --name 'threshold_{Read_Reclaim_Threshold}' --out results/exp3_tradeoff --timeout 7200
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+from result_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.dirname(SCRIPT_DIR)
+PROJECT_ROOT = os.path.dirname(TOOLS_DIR)
+DEFAULT_MQSIM = os.path.join(PROJECT_ROOT, 'mqsim')
+
+# Resident memory of one mqsim instance is dominated by per-page FTL state
+# (~33 bytes/page measured on configs/device/ssdconfig.xml, 67M pages -> 2.2 GB).
+BYTES_PER_PAGE_ESTIMATE = 40
+BASE_MEMORY_MB = 128
+# Fraction of MemAvailable the sweep may claim
+MEMORY_HEADROOM = 0.8
+
+GEOMETRY_TAGS = ('Flash_Channel_Count', 'Chip_No_Per_Channel', 'Die_No_Per_Chip',
+                 'Plane_No_Per_Die', 'Block_No_Per_Plane', 'Page_No_Per_Block')
+
+LOG_TAIL_LINES = 20
+
+
+class SweepJob:
+    """One mqsim invocation: device config + workload config -> result XML (+ analyzer JSON)."""
+
+    def __init__(self, name, device_config, workload_config, output_xml, json_output=None,
+                 timeout=None, params=None):
+        self.name = name
+        self.device_config = device_config
+        self.workload_config = workload_config
+        self.output_xml = output_xml
+        self.json_output = json_output
+        self.timeout = timeout
+        self.params = params or {}
+
+    def command(self, mqsim_bin):
+        return [mqsim_bin, '-i', self.device_config, '-w', self.workload_config, '-o', self.output_xml]
+
+
+class JobResult:
+    """Outcome of a SweepJob. status is one of ok, failed, timeout, no_output."""
+
+    def __init__(self, job, status, elapsed_s, returncode=None, log_path=None, log_tail=None, error=None,
+                 cached=False):
+        self.job = job
+        self.status = status
+        self.elapsed_s = elapsed_s
+        self.returncode = returncode
+        self.log_path = log_path
+        self.log_tail = log_tail
+        self.error = error
+        self.cached = cached
+
+    @property
+    def ok(self):
+        return self.status == 'ok'
+
+    def as_dict(self):
+        return {
+            'name': self.job.name,
+            'status': self.status,
+            'cached': self.cached,
+            'elapsed_s': round(self.elapsed_s, 3),
+            'returncode': self.returncode,
+            'device_config': self.job.device_config,
+            'workload_config': self.job.workload_config,
+            'output_xml': self.job.output_xml,
+            'json_output': self.job.json_output,
+            'params': self.job.params,
+            'log': self.log_path,
+            'log_tail': self.log_tail,
+            'error': self.error,
+        }
+
+
+# ============================================================
+# Config generation
+# ============================================================
+
+def parse_param(spec):
+    """
+    Parse NAME=v1,v2,label:v3 into (NAME, [(label, value), ...]).
+    """
+    if '=' not in spec:
+        raise ValueError(f"Parameter must look like NAME=v1,v2,...: {spec}")
+    name, values = spec.split('=', 1)
+    parsed = []
+    for item in values.split(','):
+        label, _, value = item.rpartition(':')
+        # A colon inside a path is not a label separator
+        if not label or '/' in label or '\\' in label:
+            label, value = item, item
+        parsed.append((label, value))
+    return name, parsed
+
+
+def write_config_variant(template_path, output_path, overrides):
+    """Copy an XML config, replacing the text of every element named in overrides."""
+    tree = ET.parse(template_path)
+    root = tree.getroot()
+    for tag, value in overrides.items():
+        elements = list(root.iter(tag))
+        if not elements:
+            raise KeyError(f"{template_path} has no <{tag}> element")
+        for elem in elements:
+            elem.text = str(value)
+    tree.write(output_path, encoding='us-ascii', xml_declaration=True)
+
+
+def split_scenarios(workload_config):
+    """
+    Split a workload config with several <IO_Scenario> elements into one file
+    per scenario, next to it.
+
+    mqsim writes one result per scenario (<output>_scenario_N.xml), so every
+    scenario becomes its own job with its own result XML, cache entry and
+    results store row.
+
+    :return: [workload_config] for a single scenario, else the per-scenario files
+    """
+    tree = ET.parse(workload_config)
+    root = tree.getroot()
+    scenarios = root.findall('IO_Scenario')
+    if len(scenarios) <= 1:
+        return [workload_config]
+    paths = []
+    for i, scenario in enumerate(scenarios, 1):
+        single = ET.Element(root.tag, root.attrib)
+        single.append(scenario)
+        path = f"{os.path.splitext(workload_config)[0]}_scenario_{i}.xml"
+        ET.ElementTree(single).write(path, encoding='us-ascii', xml_declaration=True)
+        paths.append(path)
+    return paths
+
+
+def _expand(params):
+    """Cartesian product of {name: [(label, value)]} -> list of (labels, values) dicts."""
+    names = list(params)
+    combos = []
+    for choice in itertools.product(*(params[n] for n in names)):
+        combos.append(({n: c[0] for n, c in zip(names, choice)},
+                       {n: c[1] for n, c in zip(names, choice)}))
+    return combos or [({}, {})]
+
+
+def _stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def expand_grid(device_templates, workload_templates, out_dir, device_params=None,
+                workload_params=None, name_format=None, timeout=None, analyze=True):
+    """
+    Build the job list for every device template x workload template x parameter
+    combination, writing the config variants into out_dir/configs. Workloads
+    with several IO scenarios yield one job per scenario, named <name>_scenario_N.
+
+    :param device_params: {xml_tag: [(label, value), ...]} applied to device configs
+    :param workload_params: {xml_tag: [(label, value), ...]} applied to workload configs
+    :param name_format: str.format template over parameter labels plus {device} and
+                        {workload}; defaults to device__workload plus swept parameters
+    """
+    device_params = device_params or {}
+    workload_params = workload_params or {}
+    out_dir = os.path.abspath(out_dir)
+    device_templates = [os.path.abspath(p) for p in device_templates]
+    workload_templates = [os.path.abspath(p) for p in workload_templates]
+    config_dir = os.path.join(out_dir, 'configs')
+    os.makedirs(config_dir, exist_ok=True)
+
+    swept = [n for n, v in list(device_params.items()) + list(workload_params.items()) if len(v) > 1]
+    jobs = []
+    for device_template, workload_template in itertools.product(device_templates, workload_templates):
+        for (dev_labels, dev_values), (wkd_labels, wkd_values) in itertools.product(
+                _expand(device_params), _expand(workload_params)):
+            labels = dict(dev_labels, **wkd_labels)
+            fields = dict(labels, device=_stem(device_template), workload=_stem(workload_template))
+            if name_format:
+                name = name_format.format(**fields)
+            else:
+                name = '__'.join([fields['device'], fields['workload']] +
+                                 [f"{n}={labels[n]}" for n in swept])
+
+            device_config = device_template
+            if dev_values:
+                device_config = os.path.join(config_dir, f"{name}_device.xml")
+                write_config_variant(device_template, device_config, dev_values)
+            workload_config = os.path.join(config_dir, f"{name}_workload.xml")
+            write_config_variant(workload_template, workload_config, wkd_values)
+
+            scenario_configs = split_scenarios(workload_config)
+            for i, scenario_config in enumerate(scenario_configs, 1):
+                job_name = name if len(scenario_configs) == 1 else f"{name}_scenario_{i}"
+                jobs.append(SweepJob(
+                    name=job_name,
+                    device_config=device_config,
+                    workload_config=scenario_config,
+                    output_xml=os.path.join(out_dir, f"{job_name}.xml"),
+                    json_output=os.path.join(out_dir, f"{job_name}.json") if analyze else None,
+                    timeout=timeout,
+                    params=dict(dev_values, **wkd_values),
+                ))
+
+    names = [j.name for j in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("Job names are not unique; add the swept parameters to --name")
+    return jobs
+
+
+# ============================================================
+# Resource planning
+# ============================================================
+
+def device_page_count(device_config):
+    root = ET.parse(device_config).getroot()
+    pages = 1
+    for tag in GEOMETRY_TAGS:
+        elem = root.find(f'.//{tag}')
+        if elem is None:
+            return None
+        pages *= int(elem.text)
+    return pages
+
+
+def estimate_job_memory_mb(device_config):
+    """Rough peak RSS of one mqsim run for a device config (MB)."""
+    pages = device_page_count(device_config)
+    if pages is None:
+        return None
+    return BASE_MEMORY_MB + pages * BYTES_PER_PAGE_ESTIMATE / 2**20
+
+
+def available_memory_mb():
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def plan_concurrency(jobs, max_workers=None, mem_per_job_mb=None):
+    """
+    Number of jobs to run at once: min(CPUs or max_workers, jobs, RAM budget / per-job RAM).
+
+    :return: (workers, mem_per_job_mb, available_mb)
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs)) or 1
+    if mem_per_job_mb is None:
+        estimates = [estimate_job_memory_mb(c) for c in {j.device_config for j in jobs}]
+        estimates = [e for e in estimates if e is not None]
+        mem_per_job_mb = max(estimates) if estimates else None
+    available = available_memory_mb()
+    if mem_per_job_mb and available:
+        workers = max(1, min(workers, int(available * MEMORY_HEADROOM // mem_per_job_mb)))
+    return workers, mem_per_job_mb, available
+
+
+# ============================================================
+# Execution
+# ============================================================
+
+class _Progress:
+    def __init__(self, total, heartbeat_s):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.running = {}
+        self.start = time.monotonic()
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.heartbeat_s = heartbeat_s
+        if heartbeat_s:
+            threading.Thread(target=self._heartbeat, daemon=True).start()
+
+    def _status(self):
+        elapsed = time.monotonic() - self.start
+        return (f"done {self.done}/{self.total}, running {len(self.running)}, "
+                f"failed {self.failed}, elapsed {_fmt_duration(elapsed)}")
+
+    def started(self, job):
+        with self.lock:
+            self.running[job.name] = time.monotonic()
+            print(f"  [start] {job.name} ({self._status()})", flush=True)
+
+    def finished(self, result):
+        with self.lock:
+            self.running.pop(result.job.name, None)
+            self.done += 1
+            if not result.ok:
+                self.failed += 1
+            tag = ('CACHED' if result.cached else 'OK') if result.ok else result.status.upper()
+            print(f"  [{self.done}/{self.total}] {tag:<9} {result.job.name} "
+                  f"in {_fmt_duration(result.elapsed_s)} ({self._status()})", flush=True)
+
+    def _heartbeat(self):
+        while not self.stop.wait(self.heartbeat_s):
+            with self.lock:
+                now = time.monotonic()
+                longest = sorted(self.running.items(), key=lambda kv: kv[1])[:3]
+                running = ', '.join(f"{n} ({_fmt_duration(now - t)})" for n, t in longest)
+                print(f"  ... {self._status()}" + (f"; longest: {running}" if running else ''), flush=True)
+
+    def close(self):
+        self.stop.set()
+
+
+def _fmt_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _tail(path, lines=LOG_TAIL_LINES):
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 16384))
+            return f.read().decode(errors='replace').splitlines()[-lines:]
+    except OSError:
+        return None
+
+
+def analyze_result(output_xml, json_output):
+    """Write the LLM_Result_Analyzer metrics for a result XML to json_output."""
+    sys.path.insert(0, os.path.join(TOOLS_DIR, 'analysis'))
+    from analyze_llm_results import LLM_Result_Analyzer
+
+    metrics = LLM_Result_Analyzer(output_xml).analyze_all()
+    with open(json_output, 'w') as f:
+        json.dump(metrics, f, indent=2)
+
+
+def store_results(report_path, store_path):
+    """Add the finished runs of a sweep report to the results store."""
+    sys.path.insert(0, os.path.join(TOOLS_DIR, 'analysis'))
+    from results_store import ResultsStore
+
+    with ResultsStore(store_path) as store:
+        runs = store.ingest_report(report_path)
+    print(f"{len(runs)} run(s) added to {store.path}")
+
+
+def run_job(job, mqsim_bin=DEFAULT_MQSIM, cwd=PROJECT_ROOT, log_dir=None, progress=None,
+            cache=None, force=False):
+    """
+    Run one job to completion (or timeout) and return its JobResult.
+
+    With a cache, a stored result for the same inputs is restored instead of
+    simulating unless force is set; successful runs are added to the cache.
+    """
+    start = time.monotonic()
+    key = None
+    if cache is not None:
+        try:
+            key = cache.job_key(job.device_config, job.workload_config, mqsim_bin)
+        except (OSError, ET.ParseError):
+            key = None  # missing trace or broken config: let mqsim report it
+        if key and not force and cache.restore(key, job.output_xml, job.json_output):
+            result = JobResult(job, 'ok', time.monotonic() - start, cached=True)
+            if progress:
+                progress.finished(result)
+            return result
+
+    if progress:
+        progress.started(job)
+    log_dir = log_dir or os.path.dirname(os.path.abspath(job.output_xml))
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{job.name}.log")
+
+    returncode = None
+    error = None
+    try:
+        with open(log_path, 'wb') as log:
+            proc = subprocess.run(job.command(mqsim_bin), cwd=cwd, stdin=subprocess.DEVNULL,
+                                  stdout=log, stderr=subprocess.STDOUT, timeout=job.timeout)
+        returncode = proc.returncode
+        if returncode != 0:
+            status = 'failed'
+        elif not os.path.exists(job.output_xml):
+            status = 'no_output'
+        else:
+            status = 'ok'
+    except subprocess.TimeoutExpired:
+        status = 'timeout'
+    except OSError as e:
+        status = 'failed'
+        error = str(e)
+
+    if status == 'ok' and job.json_output:
+        try:
+            analyze_result(job.output_xml, job.json_output)
+        except Exception as e:  # a malformed result XML should not abort the sweep
+            status = 'failed'
+            error = f"analysis failed: {e}"
+
+    result = JobResult(job, status, time.monotonic() - start, returncode, log_path,
+                       None if status == 'ok' else _tail(log_path), error)
+    if result.ok and key:
+        cache.store(key, job.output_xml, job.json_output,
+                    info={'name': job.name, 'params': job.params, 'elapsed_s': result.elapsed_s})
+    if progress:
+        progress.finished(result)
+    return result
+
+
+def run_sweep(jobs, mqsim_bin=DEFAULT_MQSIM, max_workers=None, mem_per_job_mb=None,
+              cwd=PROJECT_ROOT, log_dir=None, report_path=None, heartbeat_s=60,
+              cache=None, force=False):
+    """
+    Run all jobs on a bounded worker pool and return their JobResults in job order.
+
+    Each worker supervises one mqsim child process at a time, so the number of
+    concurrent simulations equals the pool size chosen by plan_concurrency().
+    """
+    if not jobs:
+        return []
+    if not os.path.exists(mqsim_bin):
+        raise FileNotFoundError(f"mqsim binary not found: {mqsim_bin} (run 'make')")
+
+    workers, per_job, available = plan_concurrency(jobs, max_workers, mem_per_job_mb)
+    mem_note = f", ~{per_job:,.0f} MB/job of {available:,.0f} MB available" if per_job and available else ''
+    print(f"Running {len(jobs)} jobs on {workers} workers{mem_note}", flush=True)
+
+    progress = _Progress(len(jobs), heartbeat_s)
+    start = time.monotonic()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_job, job, mqsim_bin, cwd, log_dir, progress, cache, force)
+                       for job in jobs]
+            results = [f.result() for f in futures]
+    finally:
+        progress.close()
+    wall_s = time.monotonic() - start
+
+    if report_path:
+        write_report(results, report_path, workers, wall_s)
+    print_failures(results)
+    print(f"Sweep finished in {_fmt_duration(wall_s)}: "
+          f"{sum(r.ok for r in results)}/{len(results)} succeeded "
+          f"({sum(r.cached for r in results)} from cache)", flush=True)
+    return results
+
+
+def write_report(results, report_path, workers, wall_s):
+    statuses = {}
+    for r in results:
+        statuses[r.status] = statuses.get(r.status, 0) + 1
+    report = {
+        'summary': {
+            'jobs': len(results),
+            'workers': workers,
+            'wall_time_s': round(wall_s, 3),
+            'job_time_s': round(sum(r.elapsed_s for r in results), 3),
+            'status_counts': statuses,
+            'cache_hits': sum(r.cached for r in results),
+        },
+        'failures': [r.as_dict() for r in results if not r.ok],
+        'jobs': [r.as_dict() for r in results],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {report_path}")
+
+
+def print_failures(results):
+    failures = [r for r in results if not r.ok]
+    if not failures:
+        return
+    print(f"\n{len(failures)} job(s) did not complete:")
+    for r in failures:
+        detail = r.error or (f"rc={r.returncode}" if r.returncode is not None else '')
+        print(f"  - {r.job.name}: {r.status} {detail} (log: {r.log_path})")
+        for line in (r.log_tail or [])[-5:]:
+            print(f"      | {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run MQSim parameter sweeps in parallel',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Usage:', 1)[1],
+    )
+    parser.add_argument('--device', nargs='+', required=True, help='Device config XML template(s)')
+    parser.add_argument('--workload', nargs='+', required=True, help='Workload config XML template(s)')
+    parser.add_argument('--device-param', action='append', default=[], metavar='TAG=V1,V2',
+                        help='Sweep a device config element (repeatable)')
+    parser.add_argument('--workload-param', action='append', default=[], metavar='TAG=V1,V2',
+                        help='Sweep a workload config element (repeatable)')
+    parser.add_argument('--name', help="Job name template, e.g. 'threshold_{Read_Reclaim_Threshold}'")
+    parser.add_argument('--out', required=True, help='Output directory for configs, results and logs')
+    parser.add_argument('--mqsim', default=DEFAULT_MQSIM, help='Path to the mqsim binary')
+    parser.add_argument('-j', '--jobs', type=int, help='Maximum concurrent simulations (default: CPU count)')
+    parser.add_argument('--mem-per-job-mb', type=float,
+                        help='Override the per-job memory estimate used to bound concurrency')
+    parser.add_argument('--timeout', type=float, help='Per-job timeout in seconds')
+    parser.add_argument('--no-analyze', action='store_true', help='Skip analyzer JSON export')
+    parser.add_argument('--report', help='Failure/summary report path (default: <out>/sweep_report.json)')
+    parser.add_argument('--heartbeat', type=float, default=60, help='Seconds between progress heartbeats (0 = off)')
+    parser.add_argument('--force', action='store_true', help='Re-simulate every point, ignoring cached results')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the result cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Result cache directory')
+    parser.add_argument('--cache-max-gb', type=float, default=DEFAULT_MAX_BYTES / 2**30,
+                        help='Result cache size bound; least recently used entries are evicted')
+    parser.add_argument('--store', default=os.path.join(PROJECT_ROOT, 'results', 'results.db'),
+                        help='Results store the analyzed runs are added to')
+    parser.add_argument('--no-store', action='store_true', help='Do not add runs to the results store')
+    args = parser.parse_args()
+
+    device_params = dict(parse_param(p) for p in args.device_param)
+    workload_params = dict(parse_param(p) for p in args.workload_param)
+
+    os.makedirs(args.out, exist_ok=True)
+    jobs = expand_grid(args.device, args.workload, args.out, device_params, workload_params,
+                       args.name, args.timeout, analyze=not args.no_analyze)
+    cache = None if args.no_cache else ResultCache(args.cache_dir, int(args.cache_max_gb * 2**30))
+    report_path = args.report or os.path.join(args.out, 'sweep_report.json')
+    results = run_sweep(jobs, args.mqsim, args.jobs, args.mem_per_job_mb,
+                        log_dir=os.path.join(args.out, 'logs'), report_path=report_path,
+                        heartbeat_s=args.heartbeat, cache=cache, force=args.force)
+    if not args.no_store and not args.no_analyze:
+        store_results(report_path, args.store)
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Adaptive read-reclaim threshold search.
+
+Finds the operating point of Read_Reclaim_Threshold for a target on one
+analyzer metric (e.g. uncorrectable_rate <= 1e-3 or p99_response_time_us <= 500)
+instead of simulating a fixed threshold list. The first point is seeded by the
+analytical model (analysis/analytical_tradeoff.py) with the measured constants
+of its output JSON, or the published ones if it has not been generated; the
+search then steps by --step in log space until the target is bracketed and
+refines the bracket by interpolating the metric between its ends (log-log
+when both are positive, clamped towards bisection). Each point is one mqsim
+run through the sweep runner, so it is cached, analyzed and added to the
+results store like any sweep point.
+
+With --direction increasing (default) the metric grows with the threshold,
+as ECC uncorrectables do once blocks accumulate more reads between reclaims:
+the answer is the largest threshold, i.e. the least reclaim work, that still
+meets the target. With --direction decreasing the metric shrinks as the
+threshold grows (e.g. latency inflated by reclaim migrations) and the answer
+is the smallest threshold that meets it.
+
+Usage:
+  python3 tools/automation/threshold_search.py \\
+      --device configs/device/ssdconfig.xml --workload configs/workload/llm_test_config.xml \\
+      --workload-param File_Path=traces/llm/llama70b_iter.txt --workload-param Relay_Count=100000 \\
+      --metric uncorrectable_rate --target 1e-3 --out results/exp3_search --timeout 7200
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from result_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+from sweep_runner import (DEFAULT_MQSIM, PROJECT_ROOT, TOOLS_DIR, expand_grid, parse_param, run_job,
+                          store_results, write_report)
+
+DEFAULT_PARAM = 'Read_Reclaim_Threshold'
+DEFAULT_LOW = 10
+DEFAULT_HIGH = 1000000
+DEFAULT_STEP = 10.0
+DEFAULT_REL_TOL = 0.25
+DEFAULT_MAX_RUNS = 8
+# Measured model constants written by analysis/analytical_tradeoff.py
+TRADEOFF_JSON = os.path.join(PROJECT_ROOT, 'results', 'analytical', 'analytical_tradeoff.json')
+# An interpolated point stays this far (as a fraction of the log bracket) from either end
+INTERPOLATION_MARGIN = 0.15
+
+# Metrics the analytical model predicts directly; others are seeded at its reclaim onset
+ECC_RATE_METRICS = ('uncorrectable_rate', 'ecc_failure_rate', 'ecc_retry_rate')
+
+
+class SearchPoint:
+    """One evaluated threshold"""
+
+    def __init__(self, threshold, metric, feasible, result):
+        self.threshold = threshold
+        self.metric = metric
+        self.feasible = feasible
+        self.result = result
+
+    def as_dict(self):
+        return {
+            'threshold': self.threshold,
+            'metric': self.metric,
+            'feasible': self.feasible,
+            'name': self.result.job.name if self.result else None,
+            'cached': self.result.cached if self.result else False,
+            'elapsed_s': round(self.result.elapsed_s, 3) if self.result else 0.0,
+        }
+
+
+# ============================================================
+# Search
+# ============================================================
+
+def model_constants(constants_json=TRADEOFF_JSON):
+    """
+    Read rate and ECC failure rate of the analytical model: the measured
+    constants recorded in analytical_tradeoff.py's output JSON when it exists,
+    else the published Exp2 constants.
+    """
+    sys.path.insert(0, os.path.join(TOOLS_DIR, 'analysis'))
+    from analytical_tradeoff import ECC_FAILURE_RATE, READ_RATE_PER_TOKEN
+
+    try:
+        with open(constants_json) as f:
+            data = json.load(f)
+        return data['read_rate'], data['ecc_failure_rate']
+    except (OSError, ValueError, KeyError):
+        return READ_RATE_PER_TOKEN, ECC_FAILURE_RATE
+
+
+def analytical_seed(metric, target, tokens, low, high, constants_json=TRADEOFF_JSON):
+    """
+    First threshold to simulate, from the analytical trade-off model.
+
+    ECC rate metrics are solved for the target on the model's rate curve;
+    for other metrics (and targets beyond the curve) the seed is the
+    threshold at which the model's hottest block first reaches the
+    threshold during the campaign, i.e. where reclaim starts to matter.
+    The model uses the constants of model_constants(constants_json).
+    """
+    sys.path.insert(0, os.path.join(TOOLS_DIR, 'analysis'))
+    from analytical_tradeoff import ESTIMATED_BLOCKS, calculate_ecc_retry_rate, estimate_max_reads_per_block
+
+    read_rate, ecc_failure_rate = model_constants(constants_json)
+
+    def model_rate(threshold):
+        return calculate_ecc_retry_rate(threshold, tokens, read_rate, ecc_failure_rate)
+
+    _, onset = estimate_max_reads_per_block(read_rate * tokens, ESTIMATED_BLOCKS)
+    seed = onset
+    if metric in ECC_RATE_METRICS:
+        lo, hi = float(low), float(min(high, max(onset, low)))
+        if model_rate(lo) >= target:
+            seed = lo
+        elif model_rate(hi) > target:
+            # The model rate is non-decreasing in the threshold; bisect it in log space
+            for _ in range(60):
+                mid = math.sqrt(lo * hi)
+                if model_rate(mid) > target:
+                    hi = mid
+                else:
+                    lo = mid
+            seed = lo
+    return int(round(min(max(seed, low), high)))
+
+
+def _interpolate(good, bad, target):
+    """Threshold between two bracketing points where the metric is estimated to reach target."""
+    x_good, x_bad = math.log(good.threshold), math.log(bad.threshold)
+    if good.metric > 0 and bad.metric > 0 and target > 0:
+        y_good, y_bad, y_target = math.log(good.metric), math.log(bad.metric), math.log(target)
+    else:
+        y_good, y_bad, y_target = good.metric, bad.metric, target
+    fraction = 0.5 if y_bad == y_good else (y_target - y_good) / (y_bad - y_good)
+    fraction = min(max(fraction, INTERPOLATION_MARGIN), 1 - INTERPOLATION_MARGIN)
+    return int(round(math.exp(x_good + fraction * (x_bad - x_good))))
+
+
+def search_threshold(evaluate, target, low, high, seed, increasing=True, step=DEFAULT_STEP,
+                     rel_tol=DEFAULT_REL_TOL, max_runs=DEFAULT_MAX_RUNS, log=print):
+    """
+    Bracket and refine the threshold at which the metric crosses target.
+
+    :param evaluate: threshold -> (metric, result); metric is None if the run failed
+    :return: (answer threshold or None, status, {threshold: SearchPoint})
+             status is one of converged, budget, unconstrained, infeasible, failed
+    """
+    points = {}
+    good = bad = None
+
+    def probe(threshold):
+        nonlocal good, bad
+        metric, result = evaluate(threshold)
+        if metric is None:
+            return None
+        point = SearchPoint(threshold, metric, metric <= target, result)
+        points[threshold] = point
+        if point.feasible:
+            # Keep the feasible point closest to the boundary
+            if good is None or (threshold > good.threshold) == increasing:
+                good = point
+        elif bad is None or (threshold < bad.threshold) == increasing:
+            bad = point
+        log(f"  {threshold:>10,}: {metric:.6g} ({'meets' if point.feasible else 'misses'} target {target:g})")
+        return point
+
+    # Bracket: walk from the seed towards the boundary
+    threshold = seed
+    while len(points) < max_runs:
+        point = probe(threshold)
+        if point is None:
+            return (good.threshold if good else None), 'failed', points
+        if good is not None and bad is not None:
+            break
+        # A feasible point moves towards the infeasible side and vice versa
+        up = point.feasible == increasing
+        threshold = int(round(min(max(threshold * step if up else threshold / step, low), high)))
+        if threshold in points:
+            break
+
+    if bad is None:
+        return (good.threshold if good else None), 'unconstrained', points
+    if good is None:
+        return None, 'infeasible', points
+
+    # Refine the bracket
+    status = 'converged'
+    while max(good.threshold, bad.threshold) > (1 + rel_tol) * min(good.threshold, bad.threshold):
+        if len(points) >= max_runs:
+            status = 'budget'
+            break
+        threshold = _interpolate(good, bad, target)
+        if threshold in points:
+            # Integer thresholds: the bracket cannot shrink any further
+            break
+        if probe(threshold) is None:
+            return good.threshold, 'failed', points
+    return good.threshold, status, points
+
+
+# ============================================================
+# Simulation
+# ============================================================
+
+def job_metric(json_output, metric):
+    """Value of an analyzer metric (host or FTL section) of a finished run."""
+    with open(json_output) as f:
+        data = json.load(f)
+    for section in ('host', 'ftl'):
+        value = data.get(section, {}).get(metric)
+        if value is not None:
+            return float(value)
+    return None
+
+
+def template_text(template_path, tag):
+    elem = ET.parse(template_path).getroot().find('.//' + tag)
+    return elem.text.strip() if elem is not None and elem.text else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Search the read-reclaim threshold that meets a metric target',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Usage:', 1)[1],
+    )
+    parser.add_argument('--device', required=True, help='Device config XML template')
+    parser.add_argument('--workload', required=True, help='Workload config XML template')
+    parser.add_argument('--device-param', action='append', default=[], metavar='TAG=VALUE',
+                        help='Fixed device config override (repeatable)')
+    parser.add_argument('--workload-param', action='append', default=[], metavar='TAG=VALUE',
+                        help='Fixed workload config override (repeatable)')
+    parser.add_argument('--param', default=DEFAULT_PARAM, help='Device config element searched')
+    parser.add_argument('--metric', required=True,
+                        help='Analyzer metric, e.g. uncorrectable_rate or p99_response_time_us')
+    parser.add_argument('--target', type=float, required=True, help='Upper bound on the metric')
+    parser.add_argument('--direction', choices=('increasing', 'decreasing'), default='increasing',
+                        help='How the metric changes as the threshold grows')
+    parser.add_argument('--low', type=int, default=DEFAULT_LOW, help='Smallest threshold considered')
+    parser.add_argument('--high', type=int, default=DEFAULT_HIGH, help='Largest threshold considered')
+    parser.add_argument('--seed', type=int, help='First threshold (default: from the analytical model)')
+    parser.add_argument('--tokens', type=int, help='Tokens of the run for the analytical seed (default: Relay_Count)')
+    parser.add_argument('--step', type=float, default=DEFAULT_STEP, help='Bracketing step factor')
+    parser.add_argument('--rel-tol', type=float, default=DEFAULT_REL_TOL,
+                        help='Stop once the bracket ends are within this relative distance')
+    parser.add_argument('--max-runs', type=int, default=DEFAULT_MAX_RUNS, help='Simulation budget')
+    parser.add_argument('--name', help="Job name template (default: 'threshold_{<param>}')")
+    parser.add_argument('--out', required=True, help='Output directory for configs, results and logs')
+    parser.add_argument('--mqsim', default=DEFAULT_MQSIM, help='Path to the mqsim binary')
+    parser.add_argument('--timeout', type=float, help='Per-run timeout in seconds')
+    parser.add_argument('--force', action='store_true', help='Re-simulate every point, ignoring cached results')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the result cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Result cache directory')
+    parser.add_argument('--cache-max-gb', type=float, default=DEFAULT_MAX_BYTES / 2**30,
+                        help='Result cache size bound; least recently used entries are evicted')
+    parser.add_argument('--store', default=os.path.join(PROJECT_ROOT, 'results', 'results.db'),
+                        help='Results store the runs are added to')
+    parser.add_argument('--no-store', action='store_true', help='Do not add runs to the results store')
+    args = parser.parse_args()
+
+    if not 0 < args.low <= args.high:
+        parser.error('--low and --high must satisfy 0 < low <= high')
+    if not os.path.exists(args.mqsim):
+        raise FileNotFoundError(f"mqsim binary not found: {args.mqsim} (run 'make')")
+    if len(ET.parse(args.workload).getroot().findall('IO_Scenario')) > 1:
+        parser.error('--workload must hold a single IO scenario')
+
+    device_params = {name: values[:1] for name, values in map(parse_param, args.device_param)}
+    workload_params = {name: values[:1] for name, values in map(parse_param, args.workload_param)}
+    name_format = args.name or f"threshold_{{{args.param}}}"
+    increasing = args.direction == 'increasing'
+
+    tokens = args.tokens
+    if tokens is None:
+        relay = workload_params.get('Relay_Count', [(None, template_text(args.workload, 'Relay_Count'))])[0][1]
+        tokens = int(relay) if relay else 1
+    seed = args.seed if args.seed is not None else analytical_seed(args.metric, args.target, tokens,
+                                                                   args.low, args.high)
+    seed = min(max(seed, args.low), args.high)
+
+    os.makedirs(args.out, exist_ok=True)
+    cache = None if args.no_cache else ResultCache(args.cache_dir, int(args.cache_max_gb * 2**30))
+    results = []
+
+    def evaluate(threshold):
+        jobs = expand_grid([args.device], [args.workload], args.out,
+                           dict(device_params, **{args.param: [(str(threshold), str(threshold))]}),
+                           workload_params, name_format, args.timeout)
+        result = run_job(jobs[0], args.mqsim, log_dir=os.path.join(args.out, 'logs'),
+                         cache=cache, force=args.force)
+        results.append(result)
+        if not result.ok:
+            print(f"  {threshold:>10,}: {result.status} (log: {result.log_path})")
+            return None, result
+        metric = job_metric(jobs[0].json_output, args.metric)
+        if metric is None:
+            print(f"  {threshold:>10,}: result has no metric '{args.metric}'")
+        return metric, result
+
+    print(f"Searching {args.param} in [{args.low:,}, {args.high:,}] for {args.metric} <= {args.target:g} "
+          f"({args.direction} with the threshold), seed {seed:,}", flush=True)
+    start = time.monotonic()
+    answer, status, points = search_threshold(evaluate, args.target, args.low, args.high, seed, increasing,
+                                              args.step, args.rel_tol, args.max_runs,
+                                              log=lambda line: print(line, flush=True))
+    wall_s = time.monotonic() - start
+
+    report_path = os.path.join(args.out, 'sweep_report.json')
+    write_report(results, report_path, 1, wall_s)
+    feasible = [p.threshold for p in points.values() if p.feasible]
+    infeasible = [p.threshold for p in points.values() if not p.feasible]
+    search = {
+        'param': args.param,
+        'metric': args.metric,
+        'target': args.target,
+        'direction': args.direction,
+        'range': [args.low, args.high],
+        'seed': seed,
+        'status': status,
+        'answer': answer,
+        'bracket': [answer, (min(infeasible) if increasing else max(infeasible)) if infeasible else None],
+        'simulations': sum(1 for r in results if not r.cached),
+        'cached': sum(1 for r in results if r.cached),
+        'wall_time_s': round(wall_s, 3),
+        'points': [p.as_dict() for _, p in sorted(points.items())],
+    }
+    with open(os.path.join(args.out, 'threshold_search.json'), 'w') as f:
+        json.dump(search, f, indent=2)
+    if not args.no_store:
+        store_results(report_path, args.store)
+
+    runs = f"{search['simulations']} simulation(s), {search['cached']} cached"
+    if answer is None:
+        print(f"No {args.param} in [{args.low:,}, {args.high:,}] meets the target ({status}, {runs})")
+        return 1
+    note = {'unconstrained': ' (target met at the end of the range)',
+            'budget': ' (run budget exhausted before --rel-tol)',
+            'failed': ' (stopped by a failed run)'}.get(status, '')
+    print(f"{args.param} = {answer:,}{note}; {runs}, {len(feasible)} point(s) meet the target")
+    return 0 if status in ('converged', 'unconstrained', 'budget') else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
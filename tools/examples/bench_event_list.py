@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the simulator's pending-event list.
+
+Runs each configuration twice, once with the red-black tree
+(Event_List=RED_BLACK_TREE) and once with the calendar queue
+(Event_List=CALENDAR_QUEUE). For each run it reports executed events/sec and
+checks that both runs wrote byte-identical results. The two event lists
+dispatch same-time events in the same order, so any difference is a bug.
+
+Cases:
+  fast18-*   the FAST'18 contention experiments (flow-1 + flow-2 workloads)
+  llm-read   an LLaMA-7B decode trace replayed through llm_test_config.xml
+  ecc-read   the QD-128 random-read ECC retry evaluation
+
+Usage:
+  python3 tools/examples/bench_event_list.py
+  python3 tools/examples/bench_event_list.py --cases llm-read ecc-read --tokens 2
+"""
+
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from llm_trace_gen import LLMTraceGenerator, llama_7b_config, ssd_config
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+CONFIGS = os.path.join(PROJECT_ROOT, 'configs')
+
+FAST18_CASES = {
+    'fast18-backend': ('fast18/backend-contention/ssdconfig-backend-contention.xml',
+                       'fast18/backend-contention/workload-backend-contention-flow-1-flow-2.xml'),
+    'fast18-datacache': ('fast18/data-cache-contention/ssdconfig-datacache-contention.xml',
+                         'fast18/data-cache-contention/workload-datacache-contention-flow-1-flow-2.xml'),
+    'fast18-queue-fetch': ('fast18/queue-fetch-size/ssdconfig-queue-fetch-size=16.xml',
+                           'fast18/queue-fetch-size/workload-queue-fetch-size-flow-1-flow-2.xml'),
+}
+ECC_READ_CASE = ('device/eval/eval_retry_3.xml', 'workload/eval_ecc_retry_read.xml')
+LLM_READ_CASE = ('device/ssdconfig.xml', 'workload/llm_test_config.xml')
+CASES = list(FAST18_CASES) + ['llm-read', 'ecc-read']
+
+EVENT_LISTS = ['RED_BLACK_TREE', 'CALENDAR_QUEUE']
+
+
+def write_device_config(template, event_list, path):
+    tree = ET.parse(template)
+    device = tree.getroot().find('.//Device_Parameter_Set')
+    elem = device.find('Event_List')
+    if elem is None:
+        elem = ET.Element('Event_List')
+        device.insert(0, elem)
+    elem.text = event_list
+    tree.write(path)
+
+
+def write_workload_config(template, path, scenarios, trace_path=None):
+    """Keep the first `scenarios` IO scenarios and optionally point trace flows at trace_path."""
+    tree = ET.parse(template)
+    root = tree.getroot()
+    for scenario in root.findall('IO_Scenario')[scenarios:]:
+        root.remove(scenario)
+    if trace_path is not None:
+        for elem in root.iter('File_Path'):
+            elem.text = trace_path
+        for elem in root.iter('Relay_Count'):
+            elem.text = '1'
+    tree.write(path)
+
+
+def generate_llm_trace(path, tokens):
+    gen = LLMTraceGenerator(model_config=llama_7b_config, ssd_config=ssd_config, output_file=path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        gen.generate(generation_length=tokens, prefill_model=False)
+
+
+def run_mqsim(mqsim, device, workload, output):
+    start = time.perf_counter()
+    result = subprocess.run([mqsim, '-i', device, '-w', workload, '-o', output],
+                            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            universal_newlines=True, cwd=PROJECT_ROOT)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"mqsim failed on {workload}:\n{result.stdout[-2000:]}")
+    events = sum(int(n) for n in re.findall(r'Executed simulation events: (\d+)', result.stdout))
+    return elapsed, events
+
+
+def output_files(output, scenarios):
+    if scenarios == 1:
+        return [output]
+    return [f"{output}_scenario_{i}.xml" for i in range(1, scenarios + 1)]
+
+
+def bench_case(name, mqsim, tmp, scenarios, tokens):
+    if name in FAST18_CASES:
+        device, workload = FAST18_CASES[name]
+    elif name == 'ecc-read':
+        device, workload = ECC_READ_CASE
+    else:
+        device, workload = LLM_READ_CASE
+
+    trace_path = None
+    if name == 'llm-read':
+        trace_path = os.path.join(tmp, 'llm_read.trace')
+        generate_llm_trace(trace_path, tokens)
+
+    workload_path = os.path.join(tmp, f'{name}_workload.xml')
+    write_workload_config(os.path.join(CONFIGS, workload), workload_path, scenarios, trace_path)
+    scenarios = len(ET.parse(workload_path).getroot().findall('IO_Scenario'))
+
+    runs = {}
+    for event_list in EVENT_LISTS:
+        device_path = os.path.join(tmp, f'{name}_{event_list}.xml')
+        write_device_config(os.path.join(CONFIGS, device), event_list, device_path)
+        output = os.path.join(tmp, f'{name}_{event_list}_out.xml')
+        elapsed, events = run_mqsim(mqsim, device_path, workload_path, output)
+        runs[event_list] = (elapsed, events, output_files(output, scenarios))
+
+    identical = all(filecmp.cmp(a, b, shallow=False)
+                    for a, b in zip(runs['RED_BLACK_TREE'][2], runs['CALENDAR_QUEUE'][2]))
+    return runs, identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the red-black tree and calendar queue event lists')
+    parser.add_argument('--mqsim', default=os.path.join(PROJECT_ROOT, 'mqsim'))
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=CASES)
+    parser.add_argument('--scenarios', type=int, default=1,
+                        help='IO scenarios to run from multi-scenario workloads (default: 1)')
+    parser.add_argument('--tokens', type=int, default=1, help='Decode tokens in the llm-read trace')
+    args = parser.parse_args()
+
+    all_identical = True
+    print(f"{'Case':<20} {'Event list':<16} {'Events':>12} {'Time (s)':>10} {'Events/sec':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.cases:
+            runs, identical = bench_case(name, args.mqsim, tmp, args.scenarios, args.tokens)
+            for event_list in EVENT_LISTS:
+                elapsed, events, _ = runs[event_list]
+                print(f"{name:<20} {event_list:<16} {events:>12,} {elapsed:>10.2f} {events / elapsed:>14,.0f}")
+            speedup = runs['RED_BLACK_TREE'][0] / runs['CALENDAR_QUEUE'][0]
+            print(f"{'':<20} speedup {speedup:.2f}x, byte-identical: {identical}")
+            all_identical = all_identical and identical
+
+    if not all_identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
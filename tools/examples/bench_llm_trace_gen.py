@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for LLMTraceGenerator trace emission.
+
+Generates the same trace with the per-request reference loop
+(generate_scalar) and the batched NumPy engine (generate), reports lines/sec
+for both and checks that the two files are byte-identical.
+
+Usage:
+  python3 tools/examples/bench_llm_trace_gen.py
+  python3 tools/examples/bench_llm_trace_gen.py --model llama70b --tokens 2
+"""
+
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from llm_trace_gen import LLMTraceGenerator, llama_7b_config, ssd_config
+
+MODELS = {
+    'llama7b': llama_7b_config,
+    'llama70b': {
+        'hidden_size': 8192,
+        'intermediate_size': 28672,
+        'num_layers': 80,
+        'layer_compute_time_ns': 20 * 1000 * 1000,
+    },
+}
+
+
+def count_lines(path):
+    with open(path, 'rb') as f:
+        return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+
+
+def time_generation(method_name, model_config, output_file, tokens, prefill):
+    gen = LLMTraceGenerator(model_config=model_config, ssd_config=ssd_config,
+                            output_file=output_file)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        getattr(gen, method_name)(generation_length=tokens, prefill_model=prefill)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark LLM trace generation')
+    parser.add_argument('--model', choices=sorted(MODELS), default='llama7b')
+    parser.add_argument('--tokens', type=int, default=5)
+    parser.add_argument('--no-prefill', action='store_true')
+    args = parser.parse_args()
+
+    model_config = MODELS[args.model]
+    prefill = not args.no_prefill
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scalar_path = os.path.join(tmp, 'scalar.trace')
+        vector_path = os.path.join(tmp, 'vector.trace')
+
+        scalar_s = time_generation('generate_scalar', model_config, scalar_path, args.tokens, prefill)
+        vector_s = time_generation('generate', model_config, vector_path, args.tokens, prefill)
+
+        lines = count_lines(scalar_path)
+        identical = filecmp.cmp(scalar_path, vector_path, shallow=False)
+        size_mb = os.path.getsize(scalar_path) / 1e6
+
+    print(f"Model: {args.model}, tokens: {args.tokens}, prefill: {prefill}")
+    print(f"Trace: {lines:,} lines, {size_mb:.1f} MB")
+    print(f"{'Engine':<10} {'Time (s)':>10} {'Lines/sec':>14}")
+    print(f"{'scalar':<10} {scalar_s:>10.3f} {lines / scalar_s:>14,.0f}")
+    print(f"{'numpy':<10} {vector_s:>10.3f} {lines / vector_s:>14,.0f}")
+    print(f"Speedup: {scalar_s / vector_s:.1f}x")
+    print(f"Byte-identical: {identical}")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+MQSim binary trace format.
+
+A binary trace is a 32-byte header followed by fixed 24-byte little-endian
+records (see src/host/Binary_Trace_Definition.h). MQSim detects the format
+from the magic bytes, so a binary trace can be used anywhere an ASCII trace
+(`arrival_time device LBA size type`) is accepted in File_Path.
+
+Usage:
+  python3 tools/examples/binary_trace.py convert traces/benchmarks/tpcc-small.trace tpcc-small.btrace
+  python3 tools/examples/binary_trace.py to-ascii tpcc-small.btrace tpcc-small.trace
+  python3 tools/examples/binary_trace.py info tpcc-small.btrace
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+MAGIC = b'MQSIMTRC'
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('record_size', '<u4'),
+    ('record_count', '<u8'),
+    ('reserved', '<u8'),
+])
+
+RECORD_DTYPE = np.dtype([
+    ('arrival_time', '<u8'),
+    ('start_lba', '<u8'),
+    ('lba_count', '<u4'),
+    ('device', '<u2'),
+    ('type', '<u2'),
+])
+
+# Bytes read per chunk when converting ASCII traces
+ASCII_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def make_header(record_count):
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = MAGIC
+    header['version'] = VERSION
+    header['record_size'] = RECORD_DTYPE.itemsize
+    header['record_count'] = record_count
+    return header.tobytes()
+
+
+def make_records(arrival_time, device, start_lba, lba_count, req_type):
+    """Pack per-request columns into a structured record array."""
+    records = np.empty(len(arrival_time), dtype=RECORD_DTYPE)
+    records['arrival_time'] = arrival_time
+    records['device'] = device
+    records['start_lba'] = start_lba
+    records['lba_count'] = lba_count
+    records['type'] = req_type
+    return records
+
+
+class BinaryTraceWriter:
+    """
+    Streams record blocks to a binary trace file.
+
+    The record count in the header is patched when the writer is closed, so the
+    total does not need to be known up front.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(make_header(0))
+        self.record_count = 0
+
+    def write(self, records):
+        self.file.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+        self.record_count += len(records)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(make_header(self.record_count))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def is_binary_trace(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_binary_trace(path):
+    """Memory-map a binary trace and return its records as a structured array."""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError(f"{path} is not an MQSim binary trace")
+    if header['version'][0] != VERSION or header['record_size'][0] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported version {header['version'][0]} "
+                         f"or record size {header['record_size'][0]}")
+    count = int(header['record_count'][0])
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+def iter_ascii_chunks(path, chunk_bytes=ASCII_CHUNK_BYTES):
+    """Yield (N, 5) int64 arrays of ASCII trace columns, reading whole lines per chunk."""
+    with open(path, 'rb') as f:
+        tail = b''
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            data = tail + data
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                tail = data
+                continue
+            tail = data[cut:]
+            yield _parse_ascii(data[:cut], path)
+        if tail.strip():
+            yield _parse_ascii(tail, path)
+
+
+def _parse_ascii(data, path):
+    values = np.array(data.split(), dtype=np.int64)
+    if len(values) % 5 != 0:
+        raise ValueError(f"{path}: every trace line must have 5 columns")
+    return values.reshape(-1, 5)
+
+
+def convert_ascii_to_binary(ascii_path, binary_path):
+    """Convert an ASCII trace to the binary format; returns the record count."""
+    with BinaryTraceWriter(binary_path) as writer:
+        for cols in iter_ascii_chunks(ascii_path):
+            writer.write(make_records(cols[:, 0], cols[:, 1], cols[:, 2], cols[:, 3], cols[:, 4]))
+    return writer.record_count
+
+
+def convert_binary_to_ascii(binary_path, ascii_path, block_records=1 << 20):
+    """Write a binary trace back out in the ASCII format; returns the record count."""
+    from llm_trace_gen import format_trace_lines
+
+    records = read_binary_trace(binary_path)
+    with open(ascii_path, 'wb') as f:
+        for start in range(0, len(records), block_records):
+            block = records[start:start + block_records]
+            f.write(format_trace_lines((block['arrival_time'].astype(np.int64), block['device'],
+                                        block['start_lba'].astype(np.int64), block['lba_count'],
+                                        block['type'])))
+    return len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MQSim binary trace utilities')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_convert = sub.add_parser('convert', help='ASCII trace -> binary trace')
+    p_convert.add_argument('input')
+    p_convert.add_argument('output')
+
+    p_ascii = sub.add_parser('to-ascii', help='binary trace -> ASCII trace')
+    p_ascii.add_argument('input')
+    p_ascii.add_argument('output')
+
+    p_info = sub.add_parser('info', help='print binary trace summary')
+    p_info.add_argument('input')
+
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        count = convert_ascii_to_binary(args.input, args.output)
+        in_mb = os.path.getsize(args.input) / 1e6
+        out_mb = os.path.getsize(args.output) / 1e6
+        print(f"Converted {count:,} requests: {in_mb:.2f} MB -> {out_mb:.2f} MB ({args.output})")
+    elif args.command == 'to-ascii':
+        count = convert_binary_to_ascii(args.input, args.output)
+        print(f"Wrote {count:,} requests to {args.output}")
+    else:
+        records = read_binary_trace(args.input)
+        print(f"Records:      {len(records):,}")
+        if len(records):
+            reads = int(np.count_nonzero(records['type'] != 0))
+            print(f"Reads/Writes: {reads:,} / {len(records) - reads:,}")
+            print(f"Time span:    {int(records['arrival_time'][0])} .. {int(records['arrival_time'][-1])} ns")
+            print(f"LBA range:    {int(records['start_lba'].min())} .. "
+                  f"{int((records['start_lba'] + records['lba_count']).max())}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,101 @@
 import math
 import os
 import sys
-import subprocess
 import xml.etree.ElementTree as ET
 import copy
 
+import numpy as np
+
+from binary_trace import BinaryTraceWriter, make_records
+
+# Powers of ten used to count the decimal digits of non-negative int64 values.
+_POW10 = 10 ** np.arange(1, 19, dtype=np.int64)
+
+
+def _digit_counts(values):
+    """Number of decimal digits of each non-negative value (0 has one digit)."""
+    return np.searchsorted(_POW10, values, side='right') + 1
+
+
+def format_trace_lines(columns):
+    """
+    Render integer columns as space-separated ASCII lines, one line per row.
+
+    Produces exactly the bytes of ``' '.join(str(v) for v in row) + '\\n'`` for
+    every row, but builds them with array arithmetic instead of per-line
+    f-strings: each row is laid out right-aligned in a fixed-width byte matrix
+    whose unused (NUL) cells are then dropped.
+
+    :param columns: sequence of equally sized arrays of non-negative integers
+    :return: the encoded lines as a single bytes object
+    """
+    cols = [np.asarray(c, dtype=np.int64) for c in columns]
+    if len(cols[0]) == 0:
+        return b''
+
+    widths = [int(_digit_counts(c.max(keepdims=True))[0]) for c in cols]
+    cells = np.zeros((len(cols[0]), sum(widths) + len(cols)), dtype=np.uint8)
+
+    pos = 0
+    for col_idx, (values, width) in enumerate(zip(cols, widths)):
+        remaining = values
+        for digit in range(width):
+            quotient = remaining // 10
+            ascii_digit = (remaining - quotient * 10).astype(np.uint8) + 48
+            if digit > 0:
+                ascii_digit[remaining == 0] = 0
+            cells[:, pos + width - 1 - digit] = ascii_digit
+            remaining = quotient
+        pos += width
+        cells[:, pos] = 32 if col_idx < len(cols) - 1 else 10
+        pos += 1
+
+    return cells[cells != 0].tobytes()
+
+
+class _TimeShiftedBlockRenderer:
+    """
+    Renders repeated blocks of trace rows that differ only in arrival time.
+
+    The last block whose arrival times all have the same number of digits is
+    kept as a template, so following blocks of that width only rewrite the
+    arrival-time digits in place instead of formatting every column again.
+    """
+
+    def __init__(self, tail_columns):
+        self.tail_columns = tuple(tail_columns)
+        self.tail_len = sum(_digit_counts(c) for c in self.tail_columns) + len(self.tail_columns)
+
+        self.template = None
+        self.time_width = None
+        self.time_positions = None
+
+    def render(self, times):
+        """:param times: non-decreasing arrival times, one per row"""
+        width = int(_digit_counts(times[:1])[0])
+        uniform = width == int(_digit_counts(times[-1:])[0])
+
+        if self.template is not None and uniform and width == self.time_width:
+            digits = np.empty((len(times), width), dtype=np.uint8)
+            remaining = times
+            for digit in range(width - 1, -1, -1):
+                quotient = remaining // 10
+                digits[:, digit] = remaining - quotient * 10
+                remaining = quotient
+            digits += 48
+            self.template[self.time_positions] = digits.ravel()
+            return self.template.tobytes()
+
+        data = format_trace_lines((times,) + self.tail_columns)
+        if uniform:
+            line_len = width + 1 + self.tail_len
+            starts = np.cumsum(line_len) - line_len
+            self.template = np.frombuffer(data, dtype=np.uint8).copy()
+            self.time_positions = (starts[:, None] + np.arange(width)).ravel()
+            self.time_width = width
+        return data
+
+
 class LLMTraceGenerator:
     def __init__(self, model_config, ssd_config, output_file):
         self.model_config = model_config
@@ -27,8 +118,166 @@ class LLMTraceGenerator:
         ffn_params = 3 * (hidden * interim)
         return attn_params + ffn_params
 
-    def generate(self, generation_length=1, prefill_model=True):
+    def _model_layout(self, total_sectors_per_layer, max_req_sectors):
         """
+        Per-request LBAs and sizes for one full pass over the model weights.
+
+        Layers are laid out back to back starting at LBA 0 and each layer is
+        split into requests of at most max_req_sectors sectors.
+        """
+        num_layers = self.model_config['num_layers']
+        reqs_per_layer = -(-total_sectors_per_layer // max_req_sectors)
+
+        sizes = np.full(reqs_per_layer, max_req_sectors, dtype=np.int64)
+        sizes[-1] = total_sectors_per_layer - max_req_sectors * (reqs_per_layer - 1)
+        offsets = np.arange(reqs_per_layer, dtype=np.int64) * max_req_sectors
+
+        layer_base = np.arange(num_layers, dtype=np.int64)[:, None] * total_sectors_per_layer
+        lbas = (layer_base + offsets).ravel()
+        return lbas, np.tile(sizes, num_layers), reqs_per_layer
+
+    def _phase_arrays(self):
+        """
+        Per-request columns shared by the prefill and inference phases.
+
+        :return: (lbas, sizes, devices, token_offsets, token_period_ns), where
+            token_offsets are the arrival times of one token's reads relative
+            to the start of the token
+        """
+        params_per_layer = self.calculate_layer_params()
+        layer_size_bytes = params_per_layer * self.bytes_per_param
+
+        total_sectors_per_layer = math.ceil(layer_size_bytes / self.sector_size)
+        max_req_sectors = self.ssd_config['max_request_size_kb'] * 1024 // self.sector_size
+
+        compute_time_per_layer_ns = self.model_config.get('layer_compute_time_ns', 10000000)
+
+        lbas, sizes, reqs_per_layer = self._model_layout(total_sectors_per_layer, max_req_sectors)
+        devices = np.full(len(lbas), self.DEVICE_NUM, dtype=np.int64)
+        req_index = np.arange(len(lbas), dtype=np.int64)
+
+        request_interval_ns = 100
+        layer_period_ns = reqs_per_layer * request_interval_ns + compute_time_per_layer_ns
+        token_period_ns = self.model_config['num_layers'] * layer_period_ns
+        # Arrival offsets within one token: each layer starts one layer period
+        # after the previous one, requests within a layer are evenly spaced.
+        token_offsets = ((req_index // reqs_per_layer) * layer_period_ns
+                         + (req_index % reqs_per_layer) * request_interval_ns)
+        return lbas, sizes, devices, token_offsets, int(token_period_ns)
+
+    def generate(self, generation_length=1, prefill_model=True, trace_format='ascii'):
+        """
+        Write the trace in whole-phase (prefill) and whole-token (inference) blocks.
+
+        Arrival times, LBAs and sizes are computed as NumPy arrays and emitted
+        one block per write; the ASCII output is byte-identical to
+        generate_scalar().
+
+        :param generation_length: number of token generation iterations
+        :param prefill_model: if True, include model write trace at start
+        :param trace_format: 'ascii' or 'binary' (see binary_trace.py)
+        """
+        if trace_format not in ('ascii', 'binary'):
+            raise ValueError(f"Unknown trace format: {trace_format}")
+
+        lbas, sizes, devices, token_offsets, token_period_ns = self._phase_arrays()
+        num_requests = len(lbas)
+        req_index = np.arange(num_requests, dtype=np.int64)
+
+        current_time_ns = 0
+
+        binary = trace_format == 'binary'
+        with (BinaryTraceWriter(self.output_file) if binary else open(self.output_file, 'wb')) as f:
+
+            # Phase 1: Model Pre-fill (Write Phase)
+            if prefill_model:
+                print("[Phase 1] Generating Model Write (Pre-fill) trace...")
+                request_interval_ns = 150
+                times = current_time_ns + req_index * request_interval_ns
+                ops = np.full(num_requests, self.OP_WRITE, dtype=np.int64)
+                if binary:
+                    f.write(make_records(times, devices, lbas, sizes, ops))
+                else:
+                    f.write(format_trace_lines((times, devices, lbas, sizes, ops)))
+
+                current_time_ns += num_requests * request_interval_ns
+                print(f" -> Model Installed. End LBA: {int(lbas[-1] + sizes[-1])}")
+                current_time_ns += 10_000_000_000  # 10 seconds gap
+
+            # Phase 2: Inference (Read Phase)
+            print(f"[Phase 2] Generating Inference Read trace ({generation_length} tokens)...")
+
+            ops = np.full(num_requests, self.OP_READ, dtype=np.int64)
+            if binary:
+                records = make_records(token_offsets, devices, lbas, sizes, ops)
+            else:
+                renderer = _TimeShiftedBlockRenderer((devices, lbas, sizes, ops))
+
+            for token_idx in range(generation_length):
+                if binary:
+                    records['arrival_time'] = current_time_ns + token_offsets
+                    f.write(records)
+                else:
+                    f.write(renderer.render(current_time_ns + token_offsets))
+                current_time_ns += token_period_ns
+
+        print(f"[Done] Trace saved to {self.output_file}. Total duration: {current_time_ns/1e9:.4f} sec")
+
+    def generate_family(self, generation_lengths, prefill_model=True, trace_format='ascii'):
+        """
+        Write a family of traces that differ only in the number of generated tokens.
+
+        The prefill and the reads of one token are written once as segment files
+        next to output_file; each member of the family is a small manifest (see
+        trace_manifest.py) that replays the token segment N times, so the cost of
+        the family does not depend on its size. MQSim streams a manifest like any
+        trace, and `trace_manifest.py expand` reproduces the bytes of generate().
+
+        :param generation_lengths: token counts of the family members
+        :param prefill_model: if True, start every member with the model write trace
+        :param trace_format: format of the segment files, 'ascii' or 'binary'
+        :return: {generation_length: manifest path}
+        """
+        if trace_format not in ('ascii', 'binary'):
+            raise ValueError(f"Unknown trace format: {trace_format}")
+        from trace_manifest import Segment, write_manifest
+
+        lbas, sizes, devices, token_offsets, token_period_ns = self._phase_arrays()
+        num_requests = len(lbas)
+        prefix = os.path.splitext(self.output_file)[0]
+        binary = trace_format == 'binary'
+
+        def write_segment(path, times, op):
+            ops = np.full(num_requests, op, dtype=np.int64)
+            with (BinaryTraceWriter(path) if binary else open(path, 'wb')) as f:
+                if binary:
+                    f.write(make_records(times, devices, lbas, sizes, ops))
+                else:
+                    f.write(format_trace_lines((times, devices, lbas, sizes, ops)))
+
+        token_start_ns = 0
+        prefill = None
+        if prefill_model:
+            request_interval_ns = 150
+            prefill = Segment(f'{prefix}_prefill.trace')
+            write_segment(prefill.path, np.arange(num_requests, dtype=np.int64) * request_interval_ns, self.OP_WRITE)
+            token_start_ns = num_requests * request_interval_ns + 10_000_000_000  # 10 seconds gap
+        token_path = f'{prefix}_token.trace'
+        write_segment(token_path, token_offsets, self.OP_READ)
+
+        manifests = {}
+        for generation_length in generation_lengths:
+            path = f'{prefix}_gen_{generation_length}_tok.manifest'
+            token = Segment(token_path, token_start_ns, generation_length, token_period_ns)
+            write_manifest(path, [prefill, token] if prefill else [token])
+            manifests[generation_length] = path
+        print(f"[Done] {len(manifests)} manifests over {prefix}_{{prefill,token}}.trace")
+        return manifests
+
+    def generate_scalar(self, generation_length=1, prefill_model=True):
+        """
+        Reference per-request implementation of generate(), one write per line.
+
         :param generation_length: number of token generation iterations
         :param prefill_model: if True, include model write trace at start
         """
@@ -114,23 +363,28 @@ SCENARIOS = {
 
 MAX_TOKENS = 10
 
+# Epoch length of the metrics stream that per-token bandwidth is derived from
+EPOCH_LENGTH_NS = 1000000
+
 
 def generate_traces():
-    """Generate 10 trace files: traces/llama_7b_gen_{1..10}_tok.trace"""
+    """
+    Generate the 1..MAX_TOKENS trace family: the shared segments
+    traces/llama_7b_{prefill,token}.trace and one
+    traces/llama_7b_gen_{n}_tok.manifest per token count.
+    """
     print("=" * 60)
-    print("Step 1: Generating trace files")
+    print("Step 1: Generating trace family")
     print("=" * 60)
     traces_dir = os.path.join(PROJECT_ROOT, 'traces')
     os.makedirs(traces_dir, exist_ok=True)
 
-    for n in range(1, MAX_TOKENS + 1):
-        trace_path = os.path.join(traces_dir, f'llama_7b_gen_{n}_tok.trace')
-        gen = LLMTraceGenerator(
-            model_config=llama_7b_config,
-            ssd_config=ssd_config,
-            output_file=trace_path,
-        )
-        gen.generate(generation_length=n, prefill_model=True)
+    gen = LLMTraceGenerator(
+        model_config=llama_7b_config,
+        ssd_config=ssd_config,
+        output_file=os.path.join(traces_dir, 'llama_7b.trace'),
+    )
+    gen.generate_family(range(1, MAX_TOKENS + 1), prefill_model=True)
 
 
 def generate_ssd_configs():
@@ -154,12 +408,20 @@ def generate_ssd_configs():
         for elem in root.iter('Ideal_Mapping_Table'):
             elem.text = 'true'
 
+        # Per-token bandwidth comes from the epoch metrics stream of a single run
+        host = root.find('Host_Parameter_Set')
+        for tag, value in (('Enable_Epoch_Metrics', 'true'), ('Epoch_Metrics_Period_Length', str(EPOCH_LENGTH_NS))):
+            elem = host.find(tag)
+            if elem is None:
+                elem = ET.SubElement(host, tag)
+            elem.text = value
+
         new_tree.write(out_path, encoding='us-ascii', xml_declaration=True)
         print(f"  Created {out_path} (threshold={threshold})")
 
 
 def generate_workload_configs():
-    """Generate 20 workload config XMLs (10 per scenario)."""
+    """Generate one workload config XML per scenario."""
     print("\n" + "=" * 60)
     print("Step 3: Generating workload config XMLs")
     print("=" * 60)
@@ -167,11 +429,10 @@ def generate_workload_configs():
     os.makedirs(wkdconf_dir, exist_ok=True)
 
     for scenario in SCENARIOS:
-        for n in range(1, MAX_TOKENS + 1):
-            out_path = os.path.join(wkdconf_dir, f'eval_{scenario}_{n}tok.xml')
-            trace_rel = f'traces/llama_7b_gen_{n}_tok.trace'
+        out_path = os.path.join(wkdconf_dir, f'eval_{scenario}_{MAX_TOKENS}tok.xml')
+        trace_rel = f'traces/llama_7b_gen_{MAX_TOKENS}_tok.manifest'
 
-            content = f"""<?xml version="1.0" encoding="us-ascii"?>
+        content = f"""<?xml version="1.0" encoding="us-ascii"?>
 <MQSim_IO_Scenarios>
   <IO_Scenario>
     <IO_Flow_Parameter_Set_Trace_Based>
@@ -190,45 +451,38 @@ def generate_workload_configs():
   </IO_Scenario>
 </MQSim_IO_Scenarios>
 """
-            with open(out_path, 'w') as f:
-                f.write(content)
-            print(f"  Created {out_path}")
+        with open(out_path, 'w') as f:
+            f.write(content)
+        print(f"  Created {out_path}")
 
 
 def run_simulations():
-    """Run 20 simulations (10 per scenario)."""
+    """Run one MAX_TOKENS simulation per scenario in parallel with the sweep runner."""
     print("\n" + "=" * 60)
     print("Step 4: Running simulations")
     print("=" * 60)
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, 'tools', 'automation'))
+    from sweep_runner import SweepJob, run_sweep
+
     results_dir = os.path.join(PROJECT_ROOT, 'results')
     os.makedirs(results_dir, exist_ok=True)
 
-    mqsim_bin = os.path.join(PROJECT_ROOT, 'mqsim')
-    total = 2 * MAX_TOKENS
-    count = 0
-
+    jobs = []
     for scenario in SCENARIOS:
-        for n in range(1, MAX_TOKENS + 1):
-            count += 1
-            ssd_cfg = os.path.join(PROJECT_ROOT, 'devconf', f'eval_{scenario}.xml')
-            wkd_cfg = os.path.join(PROJECT_ROOT, 'wkdconf', f'eval_{scenario}_{n}tok.xml')
-            out_xml = os.path.join(results_dir, f'eval_{scenario}_{n}tok.xml')
-
-            print(f"  [{count}/{total}] Running: {scenario} {n}tok ...", end=' ', flush=True)
-            result = subprocess.run(
-                [mqsim_bin, '-i', ssd_cfg, '-w', wkd_cfg, '-o', out_xml],
-                cwd=PROJECT_ROOT,
-                capture_output=True, text=True,
-            )
-            if result.returncode != 0:
-                print(f"FAILED (rc={result.returncode})")
-                print(f"  stderr: {result.stderr[:500]}")
-            else:
-                print("OK")
+        jobs.append(SweepJob(
+            name=f'eval_{scenario}_{MAX_TOKENS}tok',
+            device_config=os.path.join(PROJECT_ROOT, 'devconf', f'eval_{scenario}.xml'),
+            workload_config=os.path.join(PROJECT_ROOT, 'wkdconf', f'eval_{scenario}_{MAX_TOKENS}tok.xml'),
+            output_xml=os.path.join(results_dir, f'eval_{scenario}_{MAX_TOKENS}tok.xml'),
+        ))
+
+    run_sweep(jobs, mqsim_bin=os.path.join(PROJECT_ROOT, 'mqsim'),
+              log_dir=os.path.join(results_dir, 'logs'),
+              report_path=os.path.join(results_dir, 'eval_sweep_report.json'))
 
 
 def parse_results_and_plot():
-    """Parse result XMLs and generate comparison plot."""
+    """Derive per-token bandwidth from each scenario's epoch metrics stream and plot the comparison."""
     print("\n" + "=" * 60)
     print("Step 5: Parsing results and generating plot")
     print("=" * 60)
@@ -249,59 +503,35 @@ def parse_results_and_plot():
     bytes_per_token = layer_size_bytes * 32  # 32 layers
     print(f"  Bytes per token: {bytes_per_token / 1e9:.4f} GB")
 
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, 'tools', 'analysis'))
+    from epoch_metrics import load_epochs, time_at_bytes
+
     scenario_data = {}
 
     for scenario in SCENARIOS:
-        sim_times = []  # sim_time for n=1..10
-        for n in range(1, MAX_TOKENS + 1):
-            out_xml = os.path.join(results_dir, f'eval_{scenario}_{n}tok.xml')
-            if not os.path.exists(out_xml):
-                print(f"  WARNING: {out_xml} not found, skipping")
-                sim_times.append(None)
-                continue
-
-            tree = ET.parse(out_xml)
-            root = tree.getroot()
-
-            # Find Host.IO_Flow element
-            io_flow = root.find('.//Host.IO_Flow')
-            if io_flow is None:
-                # Try alternative: iterate to find it
-                for elem in root.iter():
-                    if 'IO_Flow' in elem.tag:
-                        io_flow = elem
-                        break
-
-            bytes_transferred = float(io_flow.find('Bytes_Transferred_Read').text)
-            bandwidth = float(io_flow.find('Bandwidth_Read').text)
-
-            if bandwidth > 0:
-                sim_time = bytes_transferred / bandwidth  # seconds
-            else:
-                sim_time = 0.0
-
-            sim_times.append(sim_time)
-            print(f"  {scenario} {n}tok: bytes={bytes_transferred:.0f}, bw={bandwidth:.0f}, sim_time={sim_time:.6f}s")
+        epochs_csv = os.path.join(results_dir, f'eval_{scenario}_{MAX_TOKENS}tok.epochs.csv')
+        if not os.path.exists(epochs_csv):
+            print(f"  WARNING: {epochs_csv} not found, skipping")
+            scenario_data[scenario] = {'sim_times': [None] * MAX_TOKENS,
+                                       'cumulative_times': [None] * MAX_TOKENS,
+                                       'token_bws': [None] * MAX_TOKENS}
+            continue
+
+        # Prefill only writes the model and every token reads the same pages, so token n ends
+        # when n / MAX_TOKENS of the run's read bytes have been transferred
+        epochs = load_epochs(epochs_csv)
+        total_bytes = float(np.sum(epochs['Bytes_Transferred_Read']))
+        token_end_bytes = total_bytes * np.arange(1, MAX_TOKENS + 1) / MAX_TOKENS
+        sim_times = list(time_at_bytes(epochs, token_end_bytes) / 1e6)  # seconds
+        for n, sim_time in enumerate(sim_times, start=1):
+            print(f"  {scenario} token {n}: bytes={token_end_bytes[n - 1]:.0f}, sim_time={sim_time:.6f}s")
 
         # Compute per-token bandwidth
         token_bws = []  # GB/s for each token
         cumulative_times = []  # x-axis: cumulative sim time at end of each token
         for n in range(MAX_TOKENS):
-            if sim_times[n] is None:
-                token_bws.append(None)
-                cumulative_times.append(None)
-                continue
-
             cumulative_times.append(sim_times[n])
-
-            if n == 0:
-                delta_t = sim_times[0]
-            else:
-                if sim_times[n - 1] is None:
-                    token_bws.append(None)
-                    continue
-                delta_t = sim_times[n] - sim_times[n - 1]
-
+            delta_t = sim_times[0] if n == 0 else sim_times[n] - sim_times[n - 1]
             if delta_t > 0:
                 bw = bytes_per_token / delta_t  # bytes/sec
                 token_bws.append(bw / 1e9)  # GB/s
@@ -404,7 +634,7 @@ def main():
     print("=" * 60)
     print(f"Scenarios: {list(SCENARIOS.keys())}")
     print(f"Tokens: 1..{MAX_TOKENS}")
-    print(f"Total simulations: {2 * MAX_TOKENS}")
+    print(f"Total simulations: {len(SCENARIOS)}")
     print()
 
     generate_traces()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+MQSim trace manifests.
+
+A manifest composes a trace from segment trace files (ASCII or binary)
+without materializing it (see src/host/Trace_Manifest_Definition.h):
+
+    MQSIM_TRACE_MANIFEST 1
+    # <segment file> <start time> <repeat count> <period>
+    llama_7b_prefill.trace 0 1 0
+    llama_7b_token.trace 10000036000 100 640032000
+
+Repetition i of a segment arrives at start time + i * period + the record's own
+arrival time. MQSim streams the composition, so a family of traces that share
+a prefill and repeat one per-token segment (1..N generated tokens) costs two
+segment files plus one small manifest per member.
+
+Usage:
+  python3 tools/examples/trace_manifest.py info traces/llama_7b_gen_10_tok.manifest
+  python3 tools/examples/trace_manifest.py expand traces/llama_7b_gen_10_tok.manifest llama_7b_gen_10_tok.trace
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from binary_trace import (RECORD_DTYPE, BinaryTraceWriter, is_binary_trace, iter_ascii_chunks, make_records,
+                          read_binary_trace)
+
+MAGIC = 'MQSIM_TRACE_MANIFEST'
+VERSION = 1
+
+
+class Segment:
+    def __init__(self, path, start_time=0, repeat=1, period=0):
+        """
+        :param path: segment trace file; relative paths are relative to the manifest
+        :param start_time: arrival time offset of the first repetition
+        :param repeat: number of repetitions
+        :param period: arrival time offset between repetitions
+        """
+        self.path = path
+        self.start_time = int(start_time)
+        self.repeat = int(repeat)
+        self.period = int(period)
+
+
+def is_trace_manifest(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC.encode()
+
+
+def write_manifest(path, segments):
+    """Write a manifest; segment paths are stored relative to the manifest's directory."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, 'w') as f:
+        f.write(f"{MAGIC} {VERSION}\n")
+        f.write("# <segment file> <start time> <repeat count> <period>\n")
+        for s in segments:
+            rel = os.path.relpath(os.path.abspath(s.path), base)
+            f.write(f"{rel} {s.start_time} {s.repeat} {s.period}\n")
+
+
+def read_manifest(path):
+    """Segments of a manifest, with paths resolved against the manifest's directory."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        header = f.readline().split()
+        if len(header) < 2 or header[0] != MAGIC:
+            raise ValueError(f"{path} is not an MQSim trace manifest")
+        if int(header[1]) != VERSION:
+            raise ValueError(f"{path}: unsupported manifest version {header[1]}")
+        segments = []
+        for line_no, line in enumerate(f, start=2):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split()
+            if len(fields) != 4:
+                raise ValueError(f"{path}:{line_no}: expected <file> <start time> <repeat count> <period>")
+            segment = Segment(os.path.join(base, fields[0]), *fields[1:])
+            if segment.repeat > 0:
+                segments.append(segment)
+    return segments
+
+
+def read_segment(path):
+    """All records of one segment trace file as a RECORD_DTYPE array."""
+    if is_binary_trace(path):
+        return np.array(read_binary_trace(path))
+    blocks = [make_records(c[:, 0], c[:, 1], c[:, 2], c[:, 3], c[:, 4]) for c in iter_ascii_chunks(path)]
+    return np.concatenate(blocks) if blocks else np.empty(0, dtype=RECORD_DTYPE)
+
+
+def iter_manifest_records(path):
+    """
+    Yield the composed trace one segment repetition at a time (RECORD_DTYPE blocks).
+
+    Each segment file is read once; its repetitions only shift the arrival times.
+    """
+    for segment in read_manifest(path):
+        records = read_segment(segment.path)
+        if len(records) == 0:
+            continue
+        base_times = records['arrival_time'].copy()
+        for i in range(segment.repeat):
+            records['arrival_time'] = base_times + np.uint64(segment.start_time + i * segment.period)
+            yield records
+
+
+def expand_manifest(path, output, binary=False):
+    """Materialize a manifest as a single trace file; returns the record count."""
+    from llm_trace_gen import format_trace_lines
+
+    count = 0
+    with (BinaryTraceWriter(output) if binary else open(output, 'wb')) as f:
+        for block in iter_manifest_records(path):
+            if binary:
+                f.write(block)
+            else:
+                f.write(format_trace_lines((block['arrival_time'].astype(np.int64), block['device'],
+                                            block['start_lba'].astype(np.int64), block['lba_count'],
+                                            block['type'])))
+            count += len(block)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MQSim trace manifest utilities')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_info = sub.add_parser('info', help='print the segments and the composed trace size')
+    p_info.add_argument('input')
+
+    p_expand = sub.add_parser('expand', help='materialize the composed trace')
+    p_expand.add_argument('input')
+    p_expand.add_argument('output')
+    p_expand.add_argument('--binary', action='store_true', help='write the binary trace format')
+
+    args = parser.parse_args()
+
+    if args.command == 'expand':
+        count = expand_manifest(args.input, args.output, args.binary)
+        print(f"Wrote {count:,} requests to {args.output}")
+        return
+
+    total = 0
+    for s in read_manifest(args.input):
+        n = len(read_segment(s.path))
+        total += n * s.repeat
+        print(f"{os.path.relpath(s.path)}: {n:,} records x {s.repeat} "
+              f"(start {s.start_time} ns, period {s.period} ns, {os.path.getsize(s.path) / 1e6:.2f} MB)")
+    print(f"Composed:     {total:,} records")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Incremental build graph for the paper figures.
+
+Every figure declares the data files it reads and the parameters it is drawn
+from. Its stamp is the SHA-256 of those files' contents, the parameters, the
+shared plot style and the code it is drawn with: the source of its render
+function and of every function or class of the render function's module it
+uses (directly or through other helpers), plus the values of the module-level
+constants they read. A figure is only
+re-rendered when its stamp differs from the one recorded at its last
+successful render or one of its output files is missing, so regenerating the
+whole set after one result changed only redraws the figures that read it.
+
+Stale figures render in parallel worker processes with the Agg backend. Each
+worker loads an input file at most once, however many figures read it.
+
+Stamps are kept in <output_dir>/.figure_stamps.json.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+STAMP_FILE = '.figure_stamps.json'
+
+# Bump when the stamp derivation changes
+STAMP_VERSION = 2
+
+# Module-level values whose repr is part of a stamp when drawing code reads them
+_CONSTANT_TYPES = (bool, int, float, str, bytes, tuple, list, dict, set, frozenset, os.PathLike)
+
+
+class Figure:
+    """
+    One node of the build graph.
+
+    render is called as render(**inputs, **params), with every input path
+    replaced by the file's parsed contents (JSON) or its path (other types).
+    It must be a module-level function so worker processes can import it.
+    Helpers it calls from other modules are listed in helpers so that their
+    code is part of the stamp too.
+    """
+
+    def __init__(self, name, render, outputs, inputs=None, params=None, helpers=None):
+        self.name = name
+        self.render = render
+        self.outputs = list(outputs)
+        self.inputs = dict(inputs or {})
+        self.params = dict(params or {})
+        self.helpers = list(helpers or [])
+
+
+@lru_cache(maxsize=None)
+def _load_input(path):
+    if path.endswith('.json'):
+        with open(path) as f:
+            return json.load(f)
+    return path
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _global_names(code):
+    """Global names read by a code object and the functions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _global_names(const)
+    return names
+
+
+def code_dependencies(func):
+    """
+    Source of func and of the functions and classes defined in its module that
+    it reaches through global names, plus the module-level constants they read.
+
+    :return: list of (name, source or repr), sorted by name
+    """
+    module = inspect.getmodule(func)
+    seen = {}
+    pending = [func]
+    while pending:
+        obj = pending.pop()
+        if obj.__name__ in seen:
+            continue
+        seen[obj.__name__] = inspect.getsource(obj)
+        code = getattr(obj, '__code__', None)
+        names = _global_names(code) if code else set()
+        if inspect.isclass(obj):
+            for member in vars(obj).values():
+                if inspect.isfunction(member):
+                    names |= _global_names(member.__code__)
+        for name in names - set(seen):
+            if name not in vars(module):
+                continue  # attribute, builtin or local name
+            value = vars(module)[name]
+            if (inspect.isfunction(value) or inspect.isclass(value)) and inspect.getmodule(value) is module:
+                pending.append(value)
+            elif isinstance(value, _CONSTANT_TYPES) and not inspect.ismodule(value):
+                seen[name] = repr(value)
+    return sorted(seen.items())
+
+
+def figure_stamp(figure, style=None):
+    """Digest of everything the figure's pixels depend on."""
+    h = hashlib.sha256()
+    h.update(f"figure-stamp-v{STAMP_VERSION}\0".encode())
+    for func in [figure.render] + figure.helpers:
+        h.update(f"{func.__module__}\0".encode())
+        for name, source in code_dependencies(func):
+            h.update(f"{name}\0{source}\0".encode())
+    h.update(json.dumps(figure.params, sort_keys=True).encode() + b'\0')
+    h.update(json.dumps(style or {}, sort_keys=True).encode() + b'\0')
+    for key in sorted(figure.inputs):
+        h.update(f"{key}={_file_digest(figure.inputs[key])}\0".encode())
+    return h.hexdigest()
+
+
+def _render(figure):
+    inputs = {key: _load_input(path) for key, path in figure.inputs.items()}
+    figure.render(**inputs, **figure.params)
+    return figure.name
+
+
+class FigureGraph:
+    def __init__(self, figures, output_dir, style=None):
+        """
+        :param figures: Figure nodes; names must be unique
+        :param output_dir: directory the figures' outputs are written to
+        :param style: matplotlib rcParams the figures are drawn with, part of every stamp
+        """
+        names = [f.name for f in figures]
+        if len(names) != len(set(names)):
+            raise ValueError('Figure names must be unique')
+        self.figures = {f.name: f for f in figures}
+        self.output_dir = str(output_dir)
+        self.style = style
+        self.stamp_path = os.path.join(self.output_dir, STAMP_FILE)
+
+    def _load_stamps(self):
+        try:
+            with open(self.stamp_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_stamps(self, stamps):
+        tmp = self.stamp_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(stamps, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.stamp_path)
+
+    def stale(self, names=None, force=False):
+        """Names of the selected figures that need rendering, with their new stamps."""
+        stamps = self._load_stamps()
+        stale = {}
+        for name in names or self.figures:
+            figure = self.figures[name]
+            stamp = figure_stamp(figure, self.style)
+            outputs_exist = all(os.path.exists(os.path.join(self.output_dir, o)) for o in figure.outputs)
+            if force or not outputs_exist or stamps.get(name) != stamp:
+                stale[name] = stamp
+        return stale
+
+    def build(self, names=None, force=False, jobs=None):
+        """
+        Render the stale figures among names (default: all).
+
+        :param jobs: worker processes (default: one per CPU); a single stale
+                     figure is rendered in this process
+        :return: names of the rendered figures
+        """
+        unknown = [n for n in (names or []) if n not in self.figures]
+        if unknown:
+            raise KeyError(f"Unknown figure(s): {', '.join(unknown)}")
+        os.makedirs(self.output_dir, exist_ok=True)
+        stale = self.stale(names, force)
+        for name in names or self.figures:
+            if name not in stale:
+                print(f'· {name} is up to date')
+        if not stale:
+            return []
+
+        stamps = self._load_stamps()
+        rendered = []
+        jobs = min(jobs or os.cpu_count() or 1, len(stale))
+        if jobs == 1:
+            for name in stale:
+                _render(self.figures[name])
+                stamps[name] = stale[name]
+                rendered.append(name)
+        else:
+            # Stamps are only recorded for figures that rendered successfully
+            errors = []
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(_render, self.figures[name]): name for name in stale}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors.append((name, e))
+                        continue
+                    stamps[name] = stale[name]
+                    rendered.append(name)
+            if errors:
+                self._save_stamps(stamps)
+                name, error = errors[0]
+                raise RuntimeError(f"Rendering {name} failed: {error}") from error
+        self._save_stamps(stamps)
+        return rendered
+
+
+def add_build_arguments(parser):
+    """Add the figure selection and rebuild options shared by the figure scripts."""
+    parser.add_argument('figures', nargs='*', help='Figures to build (default: all)')
+    parser.add_argument('--force', action='store_true', help='Re-render even if the inputs are unchanged')
+    parser.add_argument('-j', '--jobs', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--list', action='store_true', help='List the figures and whether they are stale')
+
+
+def build_from_args(graph, args):
+    """Build or list the figures selected on the command line. Returns the rendered names."""
+    unknown = [n for n in args.figures if n not in graph.figures]
+    if unknown:
+        raise SystemExit(f"Unknown figure(s): {', '.join(unknown)}; "
+                         f"available: {', '.join(graph.figures)}")
+    if args.list:
+        stale = graph.stale(args.figures or None)
+        for name, figure in graph.figures.items():
+            if not args.figures or name in args.figures:
+                inputs = ', '.join(figure.inputs.values()) or '-'
+                print(f"{'*' if name in stale else ' '} {name:40s} {inputs}")
+        return []
+    return graph.build(args.figures or None, force=args.force, jobs=args.jobs)
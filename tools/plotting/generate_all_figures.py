@@ -8,67 +8,119 @@ Creates:
 3. Figure 3: Trade-off analysis (Exp3 - THE KEY FIGURE)
 4. Figure 4: Lifetime projection (Exp3)
 5. Figure 5: Baseline performance comparison (Exp1)
+
+Figures 1-4 read the trade-off JSON written by analytical_tradeoff.py; figure 5
+reads the Exp1 runs from the results store (analysis/results_store.py).
+
+Only figures whose input data, parameters or drawing code changed since the
+last run are re-rendered (see figure_graph.py); stale figures render in
+parallel.
+
+Usage:
+    python3 generate_all_figures.py                  # rebuild stale figures
+    python3 generate_all_figures.py figure3_tradeoff # rebuild one figure
+    python3 generate_all_figures.py --force -j 4     # rebuild everything
+    python3 generate_all_figures.py --list           # show stale figures
 """
 
-import json
+import argparse
+import os
+import sys
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 from pathlib import Path
 
-# Set publication-quality defaults
-plt.rcParams['figure.dpi'] = 300
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 11
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['axes.labelsize'] = 12
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['xtick.labelsize'] = 10
-plt.rcParams['ytick.labelsize'] = 10
-plt.rcParams['legend.fontsize'] = 10
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from figure_graph import Figure, FigureGraph, add_build_arguments, build_from_args
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'analysis'))
+from results_store import DEFAULT_STORE, PROJECT_ROOT, ResultsStore
+
+# Publication-quality defaults
+STYLE = {
+    'figure.dpi': 300,
+    'savefig.dpi': 300,
+    'font.size': 11,
+    'font.family': 'serif',
+    'axes.labelsize': 12,
+    'axes.titlesize': 14,
+    'xtick.labelsize': 10,
+    'ytick.labelsize': 10,
+    'legend.fontsize': 10,
+}
+plt.rcParams.update(STYLE)
 
 # Output directory
 OUTPUT_DIR = Path('figures')
-OUTPUT_DIR.mkdir(exist_ok=True)
+
+TRADEOFF_JSON = 'results/analytical/analytical_tradeoff.json'
+
+# Experiment 1: one run per model at EXP1_TOKENS tokens, read from the results store
+EXP1_EXPERIMENT = 'exp1_baseline'
+EXP1_DIR = os.path.join(PROJECT_ROOT, 'results', EXP1_EXPERIMENT)
+EXP1_TOKENS = 10000
+MODEL_LABELS = {'llama7b': 'Llama2-7B', 'llama13b': 'Llama2-13B', 'llama70b': 'Llama2-70B'}
+
+def exp1_baseline(store_path=DEFAULT_STORE):
+    """Figure 5 parameters from the Exp1 runs in the results store, smallest model first."""
+    with ResultsStore(store_path) as store:
+        if os.path.isdir(EXP1_DIR):
+            store.ingest_path(EXP1_DIR)
+        rows = store.query(['model', 'iops', 'avg_response_time_us', 'total_ecc_failures'],
+                           {'experiment': EXP1_EXPERIMENT, 'tokens': EXP1_TOKENS}, order_by=['json_file'])
+    runs = {r['model']: r for r in rows if r['model'] in MODEL_LABELS}
+    runs = [runs[m] for m in MODEL_LABELS if m in runs]
+    return {
+        'models': [MODEL_LABELS[r['model']] for r in runs],
+        'iops': [r['iops'] for r in runs],
+        'latency': [r['avg_response_time_us'] / 1000 for r in runs],
+        'ecc_failures': [r['total_ecc_failures'] for r in runs],
+    }
 
 # ============================================================================
 # FIGURE 1: Read Accumulation (Experiment 2)
 # ============================================================================
 
-def figure1_read_accumulation():
+def figure1_read_accumulation(data):
     """Read count accumulation demonstrating H1"""
 
-    # Data from Experiment 2
-    tokens = np.array([10000, 50000, 100000])
-    flash_reads = np.array([3463, 30197, 63572])
+    if not data.get('measured'):
+        raise ValueError(f'{TRADEOFF_JSON} has no measured points; regenerate it with analytical_tradeoff.py')
+    tokens = np.array(data['measured']['tokens'])
+    flash_reads = np.array(data['measured']['flash_reads'])
+    n = len(tokens)
 
-    # Linear fit
-    slope = 0.636
-    intercept = -3218
-    tokens_fit = np.linspace(0, 110000, 100)
+    # Least-squares fit over all measured runs (analytical_tradeoff.py)
+    slope = data['read_rate']
+    intercept = data['read_rate_intercept']
+    tokens_fit = np.linspace(0, tokens.max() * 1.1, 100)
     reads_fit = slope * tokens_fit + intercept
 
     fig, ax = plt.subplots(figsize=(8, 6))
 
-    # Plot data points
-    ax.scatter(tokens/1000, flash_reads, s=150, c='#2E86AB',
-               marker='o', edgecolors='black', linewidth=1.5,
-               label='Measured', zorder=3)
+    # Plot data points (smaller markers for large sweeps)
+    ax.scatter(tokens/1000, flash_reads, s=150 if n <= 20 else 20, c='#2E86AB',
+               marker='o', edgecolors='black', linewidth=1.5 if n <= 20 else 0.5,
+               label=f'Measured ({n} runs)', zorder=3)
 
     # Plot linear fit
     ax.plot(tokens_fit/1000, reads_fit, '--', color='#A23B72',
-            linewidth=2, label=f'Linear fit (R²=0.999)', zorder=2)
+            linewidth=2, label=f"Linear fit (R²={data['r_squared']:.3f})", zorder=2)
 
     # Extrapolation
-    tokens_extrap = np.array([500000, 1000000])
+    tokens_extrap = tokens.max() * np.array([5, 10])
     reads_extrap = slope * tokens_extrap + intercept
     ax.scatter(tokens_extrap/1000, reads_extrap, s=100, c='white',
                marker='s', edgecolors='#A23B72', linewidth=2,
                label='Projected', zorder=2, alpha=0.7)
 
     # Annotations
-    ax.annotate(f'100K tokens\n→ 63,572 reads\n(18.4× baseline)',
-                xy=(100, 63572), xytext=(70, 45000),
+    last = tokens.argmax()
+    ax.annotate(f'{tokens[last]/1000:,.0f}K tokens\n→ {flash_reads[last]:,} reads\n'
+                f'({flash_reads[last] / flash_reads[tokens.argmin()]:.1f}× baseline)',
+                xy=(tokens[last]/1000, flash_reads[last]),
+                xytext=(tokens[last]/1000 * 0.7, flash_reads[last] * 0.7),
                 fontsize=10, ha='center',
                 bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.3),
                 arrowprops=dict(arrowstyle='->', lw=1.5, color='black'))
@@ -82,7 +134,7 @@ def figure1_read_accumulation():
     ax.legend(loc='upper left', frameon=True, shadow=True)
 
     # Add equation
-    ax.text(0.95, 0.05, f'Reads = {slope:.3f} × Tokens - {abs(intercept):.0f}',
+    ax.text(0.95, 0.05, f"Reads = {slope:.3f} × Tokens {'-' if intercept < 0 else '+'} {abs(intercept):.0f}",
             transform=ax.transAxes, fontsize=10, ha='right',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
 
@@ -96,50 +148,61 @@ def figure1_read_accumulation():
 # FIGURE 2: ECC Failure Scaling (Experiment 2)
 # ============================================================================
 
-def figure2_ecc_scaling():
+def figure2_ecc_scaling(data):
     """ECC failure rate scaling with reads"""
 
-    tokens = np.array([10000, 50000, 100000])
-    flash_reads = np.array([3463, 30197, 63572])
-    ecc_failures = np.array([10822, 93494, 196767])
-    failure_rate = (ecc_failures / flash_reads) * 100  # percentage
+    if not data.get('measured'):
+        raise ValueError(f'{TRADEOFF_JSON} has no measured points; regenerate it with analytical_tradeoff.py')
+    tokens = np.array(data['measured']['tokens'])
+    flash_reads = np.array(data['measured']['flash_reads'])
+    ecc_failures = np.array(data['measured']['ecc_failures'])
+    # Failures per read on the model's percent scale (see measured_constants.py)
+    failure_rate = ecc_failures / flash_reads
+    avg_rate = data['ecc_failure_rate'] * 100
+    labels = len(tokens) <= 10
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
 
     # Left: Absolute failures
-    ax1.bar(tokens/1000, ecc_failures, width=8, color='#E63946',
-            edgecolor='black', linewidth=1.5, alpha=0.8)
+    spacing = np.diff(np.unique(tokens)).min() / 1000 if len(np.unique(tokens)) > 1 else 10
+    ax1.bar(tokens/1000, ecc_failures, width=min(8, spacing * 0.8), color='#E63946',
+            edgecolor='black', linewidth=1.5 if labels else 0.3, alpha=0.8)
     ax1.set_xlabel('Tokens Generated (×1000)', fontweight='bold')
     ax1.set_ylabel('Total ECC Failures', fontweight='bold')
     ax1.set_title('ECC Failure Growth', fontweight='bold')
     ax1.grid(True, alpha=0.3, axis='y')
 
     # Add value labels
-    for i, (t, f) in enumerate(zip(tokens/1000, ecc_failures)):
-        ax1.text(t, f + 5000, f'{f:,}', ha='center', va='bottom',
-                fontweight='bold', fontsize=10)
+    if labels:
+        for t, f in zip(tokens/1000, ecc_failures):
+            ax1.text(t, f + ecc_failures.max() * 0.025, f'{f:,}', ha='center', va='bottom',
+                    fontweight='bold', fontsize=10)
 
     # Add scaling annotation
-    ax1.annotate('18.2× increase', xy=(100, 196767), xytext=(60, 150000),
+    last = tokens.argmax()
+    ax1.annotate(f'{ecc_failures[last] / ecc_failures[tokens.argmin()]:.1f}× increase',
+                xy=(tokens[last]/1000, ecc_failures[last]),
+                xytext=(tokens[last]/1000 * 0.6, ecc_failures[last] * 0.75),
                 fontsize=11, ha='center', color='darkred', fontweight='bold',
                 arrowprops=dict(arrowstyle='->', lw=2, color='darkred'))
 
     # Right: Failure rate
     ax2.plot(tokens/1000, failure_rate, 'o-', color='#F77F00',
-             linewidth=3, markersize=12, markeredgecolor='black',
-             markeredgewidth=1.5)
-    ax2.axhline(y=3.1, color='red', linestyle='--', linewidth=2,
-                label='Avg: 3.1%', alpha=0.7)
+             linewidth=3 if labels else 1.5, markersize=12 if labels else 4,
+             markeredgecolor='black', markeredgewidth=1.5 if labels else 0.5)
+    ax2.axhline(y=avg_rate, color='red', linestyle='--', linewidth=2,
+                label=f'Fit: {avg_rate:.1f}%', alpha=0.7)
     ax2.set_xlabel('Tokens Generated (×1000)', fontweight='bold')
     ax2.set_ylabel('ECC Failure Rate (%)', fontweight='bold')
     ax2.set_title('Consistent Failure Rate', fontweight='bold')
     ax2.grid(True, alpha=0.3)
     ax2.legend(loc='best', frameon=True, shadow=True)
-    ax2.set_ylim([0, 5])
+    ax2.set_ylim([0, max(5, failure_rate.max() * 1.3)])
 
     # Add value labels
-    for t, r in zip(tokens/1000, failure_rate):
-        ax2.text(t, r + 0.2, f'{r:.1f}%', ha='center', fontsize=10)
+    if labels:
+        for t, r in zip(tokens/1000, failure_rate):
+            ax2.text(t, r + 0.2, f'{r:.1f}%', ha='center', fontsize=10)
 
     plt.suptitle('ECC Degradation Under Read-Disturb\nHypothesis 2: Failures Scale with Reads',
                  fontsize=14, fontweight='bold', y=1.02)
@@ -149,17 +212,20 @@ def figure2_ecc_scaling():
     print('✓ Figure 2: ECC scaling saved')
     plt.close()
 
+def _lifetime_label(years):
+    if years > 100:
+        return '>100 year'
+    if years < 0.1:
+        return '~0 year'
+    return f'{years:.1f} year'
+
 # ============================================================================
 # FIGURE 3: Trade-off Analysis (Experiment 3) - THE KEY FIGURE
 # ============================================================================
 
-def figure3_tradeoff():
+def figure3_tradeoff(data):
     """THE KEY FIGURE: Reliability vs. Lifetime Trade-off"""
 
-    # Load analytical data
-    with open('results/analytical/analytical_tradeoff.json', 'r') as f:
-        data = json.load(f)
-
     thresholds = [t['threshold'] for t in data['thresholds']]
     tbw = [t['tbw_tb'] for t in data['thresholds']]
     failure_rate = [t['ecc_failure_rate'] * 100 for t in data['thresholds']]  # to %
@@ -193,14 +259,17 @@ def figure3_tradeoff():
                   fontweight='bold', fontsize=14, pad=20)
 
     # Annotations for extremes
-    ax1.annotate('Low threshold:\n✓ Low failures (1.6%)\n✗ High TBW (14.6 TB)\n✗ ~0 year lifetime',
+    low, high = data['thresholds'][0], data['thresholds'][-1]
+    ax1.annotate(f"Low threshold:\n✓ Low failures ({failure_rate[0]:.1f}%)\n"
+                 f"✗ High TBW ({tbw[0]:.1f} TB)\n✗ {_lifetime_label(low['lifetime_years'])} lifetime",
                 xy=(10, failure_rate[0]), xytext=(100, 2),
                 fontsize=9, ha='center',
                 bbox=dict(boxstyle='round,pad=0.7', fc='#FFB4A2', alpha=0.8,
                          edgecolor='black', linewidth=1.5),
                 arrowprops=dict(arrowstyle='->', lw=2, color='black'))
 
-    ax1.annotate('High threshold:\n✗ High failures (12.6%)\n✓ Low TBW (0 TB)\n✓ >100 year lifetime',
+    ax1.annotate(f"High threshold:\n✗ High failures ({failure_rate[-1]:.1f}%)\n"
+                 f"✓ Low TBW ({tbw[-1]:.0f} TB)\n✓ {_lifetime_label(high['lifetime_years'])} lifetime",
                 xy=(1000000, failure_rate[-1]), xytext=(10000, 9),
                 fontsize=9, ha='center',
                 bbox=dict(boxstyle='round,pad=0.7', fc='#B7E4C7', alpha=0.8,
@@ -229,13 +298,9 @@ def figure3_tradeoff():
 # FIGURE 4: Lifetime Projection (Experiment 3)
 # ============================================================================
 
-def figure4_lifetime():
+def figure4_lifetime(data):
     """Flash lifetime projection under different reclaim policies"""
 
-    # Load analytical data
-    with open('results/analytical/analytical_tradeoff.json', 'r') as f:
-        data = json.load(f)
-
     # Select subset for clarity
     thresholds_display = [10, 50, 100, 500, 1000, 10000]
 
@@ -307,13 +372,14 @@ def figure4_lifetime():
 # FIGURE 5: Baseline Performance (Experiment 1)
 # ============================================================================
 
-def figure5_baseline():
+def figure5_baseline(models, iops, latency, ecc_failures):
     """Baseline performance comparison across models"""
 
-    models = ['Llama2-7B', 'Llama2-13B', 'Llama2-70B']
-    iops = np.array([91052, 97322, 150192])
-    latency = np.array([47.6, 42.7, 30.0])
-    ecc_failures = np.array([18117, 16929, 10822])
+    if not models:
+        raise ValueError(f'The results store has no {EXP1_EXPERIMENT} runs at {EXP1_TOKENS:,} tokens')
+    iops = np.array(iops)
+    latency = np.array(latency)
+    ecc_failures = np.array(ecc_failures)
 
     fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(15, 5))
 
@@ -347,7 +413,7 @@ def figure5_baseline():
         ax3.text(bar.get_x() + bar.get_width()/2, val + 500,
                 f'{val:,}', ha='center', fontsize=9, fontweight='bold')
 
-    plt.suptitle('Baseline Performance Comparison (10K tokens)\n' +
+    plt.suptitle(f'Baseline Performance Comparison ({EXP1_TOKENS // 1000}K tokens)\n' +
                  'Larger Models → Better Parallelism',
                  fontsize=14, fontweight='bold', y=1.02)
     plt.tight_layout()
@@ -356,30 +422,57 @@ def figure5_baseline():
     print('✓ Figure 5: Baseline comparison saved')
     plt.close()
 
+# ============================================================================
+# BUILD GRAPH
+# ============================================================================
+
+def _outputs(name):
+    return [f'{name}.png', f'{name}.pdf']
+
+FIGURES = [
+    Figure('figure1_read_accumulation', figure1_read_accumulation,
+           _outputs('figure1_read_accumulation'), inputs={'data': TRADEOFF_JSON}),
+    Figure('figure2_ecc_scaling', figure2_ecc_scaling,
+           _outputs('figure2_ecc_scaling'), inputs={'data': TRADEOFF_JSON}),
+    Figure('figure3_tradeoff', figure3_tradeoff,
+           _outputs('figure3_tradeoff'), inputs={'data': TRADEOFF_JSON}),
+    Figure('figure4_lifetime', figure4_lifetime,
+           _outputs('figure4_lifetime'), inputs={'data': TRADEOFF_JSON}),
+    Figure('figure5_baseline', figure5_baseline,
+           _outputs('figure5_baseline'), params=exp1_baseline()),
+]
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate the publication figures')
+    add_build_arguments(parser)
+    args = parser.parse_args()
+
+    graph = FigureGraph(FIGURES, OUTPUT_DIR, style=STYLE)
+    if args.list:
+        build_from_args(graph, args)
+        return
+
     print("=" * 80)
     print("GENERATING ALL PUBLICATION FIGURES")
     print("=" * 80)
     print()
 
-    figure1_read_accumulation()
-    figure2_ecc_scaling()
-    figure3_tradeoff()
-    figure4_lifetime()
-    figure5_baseline()
+    rendered = build_from_args(graph, args)
 
     print()
     print("=" * 80)
-    print("✅ ALL FIGURES GENERATED")
+    print(f"✅ {len(rendered)} FIGURE(S) REGENERATED" if rendered else "✅ ALL FIGURES UP TO DATE")
     print("=" * 80)
     print(f"\nOutput directory: {OUTPUT_DIR.absolute()}")
-    print(f"Files created:")
-    for f in sorted(OUTPUT_DIR.glob('*')):
-        print(f"  - {f.name}")
+    if rendered:
+        print("Files created:")
+        for name in sorted(rendered):
+            for output in graph.figures[name].outputs:
+                print(f"  - {output}")
     print()
     print("Figure 3 (Trade-off) is THE KEY FIGURE for the paper! 🌟")
     print()
@@ -3,57 +3,68 @@
 Generate figures demonstrating the two desired outcomes:
 1. Token generation slowdown due to ECC retries
 2. SSD lifespan reduction (in days) from read-reclaim
+
+Like generate_all_figures.py, only figures whose inputs changed are
+re-rendered (see figure_graph.py).
+
+Usage:
+    python3 generate_outcome_figures.py [figure ...] [--force] [-j N] [--list]
 """
 
-import json
+import argparse
+import sys
+from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 import numpy as np
 
-# Set publication-quality defaults
-plt.rcParams['figure.dpi'] = 300
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.labelsize'] = 11
-plt.rcParams['axes.titlesize'] = 12
-plt.rcParams['legend.fontsize'] = 9
-
-# Load data
-with open('results/analytical/analytical_tradeoff.json', 'r') as f:
-    tradeoff_data = json.load(f)
-
-# Exp2 data
-exp2_data = [
-    {'tokens': 10000, 'iops': 150192, 'response_ms': 30.0, 'ecc_fails': 10822, 'flash_reads': 796},
-    {'tokens': 50000, 'iops': 91299, 'response_ms': 249.0, 'ecc_fails': 93494, 'flash_reads': 6170},
-    {'tokens': 100000, 'iops': 87157, 'response_ms': 492.5, 'ecc_fails': 196767, 'flash_reads': 13245},
-]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from figure_graph import Figure, FigureGraph, add_build_arguments, build_from_args
+
+# Publication-quality defaults
+STYLE = {
+    'figure.dpi': 300,
+    'font.family': 'serif',
+    'font.size': 10,
+    'axes.labelsize': 11,
+    'axes.titlesize': 12,
+    'legend.fontsize': 9,
+}
+plt.rcParams.update(STYLE)
+
+OUTPUT_DIR = Path('figures')
+
+TRADEOFF_JSON = 'results/analytical/analytical_tradeoff.json'
 
 # Constants
 PE_LIMIT = 3000
-CAMPAIGN_TOKENS = tradeoff_data['campaign_tokens']
 
 # ============================================================================
 # FIGURE 1: THROUGHPUT DEGRADATION (Outcome 1)
 # ============================================================================
 
-def generate_figure_outcome1():
+def generate_figure_outcome1(tradeoff_data):
     """
     Shows token generation rate slowing down as reads accumulate.
     """
+    measured = tradeoff_data.get('measured')
+    if not measured:
+        raise ValueError(f'{TRADEOFF_JSON} has no measured points; regenerate it with analytical_tradeoff.py')
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4.5))
 
-    tokens = [d['tokens'] for d in exp2_data]
-    iops = [d['iops'] for d in exp2_data]
-    response_ms = [d['response_ms'] for d in exp2_data]
-    ecc_fails = [d['ecc_fails'] for d in exp2_data]
+    tokens = measured['tokens']
+    iops = measured['iops']
+    response_ms = measured['response_ms']
+    ecc_fails = measured['ecc_failures']
 
     baseline_iops = iops[0]
     throughput_pct = [(rate / baseline_iops) * 100 for rate in iops]
 
     # Left: Token generation rate
     ax1.plot(tokens, iops, 'o-', color='#d62728', linewidth=2.5, markersize=8, label='Token generation rate')
-    ax1.axhline(baseline_iops, color='#2ca02c', linestyle='--', linewidth=2, label='Baseline (10K tokens)')
+    ax1.axhline(baseline_iops, color='#2ca02c', linestyle='--', linewidth=2,
+                label=f'Baseline ({tokens[0]/1000:,.0f}K tokens)')
     ax1.fill_between(tokens, iops, baseline_iops, alpha=0.2, color='#d62728')
 
     ax1.set_xlabel('Generated Tokens', fontweight='bold')
@@ -62,9 +73,9 @@ def generate_figure_outcome1():
     ax1.grid(True, alpha=0.3)
     ax1.legend(loc='upper right')
 
-    # Add degradation annotations
+    # Add degradation annotations (the last run only for large sweeps)
     for i, (tok, rate, pct) in enumerate(zip(tokens, iops, throughput_pct)):
-        if i > 0:
+        if i > 0 and (len(tokens) <= 10 or i == len(tokens) - 1):
             ax1.annotate(f'{pct:.1f}%\nof baseline',
                         xy=(tok, rate), xytext=(tok, rate - 15000),
                         ha='center', fontsize=9, color='#d62728', fontweight='bold')
@@ -90,8 +101,8 @@ def generate_figure_outcome1():
     ax2.legend(lines, labels, loc='upper left')
 
     plt.tight_layout()
-    plt.savefig('figures/outcome1_throughput_degradation.png', dpi=300, bbox_inches='tight')
-    plt.savefig('figures/outcome1_throughput_degradation.pdf', bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome1_throughput_degradation.png', dpi=300, bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome1_throughput_degradation.pdf', bbox_inches='tight')
     plt.close()
 
     print("✓ Generated: outcome1_throughput_degradation")
@@ -100,10 +111,11 @@ def generate_figure_outcome1():
 # FIGURE 2: LIFESPAN IN DAYS (Outcome 2)
 # ============================================================================
 
-def generate_figure_outcome2():
+def generate_figure_outcome2(tradeoff_data, pe_limit):
     """
     Shows SSD lifespan (in days) for different workload scenarios and thresholds.
     """
+    campaign_tokens = tradeoff_data['campaign_tokens']
     fig, ax = plt.subplots(figsize=(12, 6))
 
     # Workload scenarios
@@ -127,9 +139,9 @@ def generate_figure_outcome2():
 
         lifespans = []
         for scenario_name, tokens_per_day in scenarios:
-            pe_per_token = avg_pe / CAMPAIGN_TOKENS
+            pe_per_token = avg_pe / campaign_tokens
             pe_per_day = pe_per_token * tokens_per_day
-            lifespan_days = PE_LIMIT / pe_per_day
+            lifespan_days = pe_limit / pe_per_day
             lifespans.append(lifespan_days)
 
         bars = ax.bar(x_pos + i * width, lifespans, width, label=f'Threshold={label}', color=color, alpha=0.8)
@@ -149,7 +161,7 @@ def generate_figure_outcome2():
 
     # Reference line: normal SSD lifespan (5 years = 1825 days)
     ax.axhline(1825, color='#1f77b4', linestyle='--', linewidth=2, label='Normal SSD (5 years)', alpha=0.7)
-    ax.fill_between([-0.5, len(scenarios)-0.5], 1825, max(200, max([l for s_name, tpd in scenarios for l in [PE_LIMIT / ((tradeoff_data['thresholds'][0]['avg_pe_cycles'] / CAMPAIGN_TOKENS) * tpd)]]) * 1.1),
+    ax.fill_between([-0.5, len(scenarios)-0.5], 1825, max(200, max([l for s_name, tpd in scenarios for l in [pe_limit / ((tradeoff_data['thresholds'][0]['avg_pe_cycles'] / campaign_tokens) * tpd)]]) * 1.1),
                     alpha=0.1, color='#1f77b4', label='Acceptable range')
 
     ax.set_xlabel('Workload Scenario', fontweight='bold')
@@ -162,8 +174,8 @@ def generate_figure_outcome2():
     ax.set_yscale('log')
 
     plt.tight_layout()
-    plt.savefig('figures/outcome2_lifespan_days.png', dpi=300, bbox_inches='tight')
-    plt.savefig('figures/outcome2_lifespan_days.pdf', bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome2_lifespan_days.png', dpi=300, bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome2_lifespan_days.pdf', bbox_inches='tight')
     plt.close()
 
     print("✓ Generated: outcome2_lifespan_days")
@@ -172,19 +184,24 @@ def generate_figure_outcome2():
 # FIGURE 3: THE IMPOSSIBLE CHOICE
 # ============================================================================
 
-def generate_figure_impossible_choice():
+def generate_figure_impossible_choice(tradeoff_data, pe_limit):
     """
     Side-by-side comparison showing the impossible choice.
     """
+    campaign_tokens = tradeoff_data['campaign_tokens']
+    measured = tradeoff_data.get('measured')
+    if not measured:
+        raise ValueError(f'{TRADEOFF_JSON} has no measured points; regenerate it with analytical_tradeoff.py')
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
 
-    # Option A: No reclaim (throughput degrades)
-    baseline = exp2_data[0]
-    final = exp2_data[-1]
+    # Option A: No reclaim (throughput degrades): shortest vs. longest run
+    baseline = {'tokens': measured['tokens'][0], 'iops': measured['iops'][0]}
+    final = {'tokens': measured['tokens'][-1], 'iops': measured['iops'][-1]}
 
     degradation_pct = (1 - final['iops'] / baseline['iops']) * 100
 
-    ax1.bar(['Baseline\n(10K tokens)', 'After Read\nAccumulation\n(100K tokens)'],
+    ax1.bar([f"Baseline\n({baseline['tokens']/1000:,.0f}K tokens)",
+             f"After Read\nAccumulation\n({final['tokens']/1000:,.0f}K tokens)"],
             [baseline['iops'], final['iops']],
             color=['#2ca02c', '#d62728'],
             alpha=0.8,
@@ -204,8 +221,8 @@ def generate_figure_impossible_choice():
     threshold_100 = next(t for t in tradeoff_data['thresholds'] if t['threshold'] == 100)
     avg_pe = threshold_100['avg_pe_cycles']
 
-    pe_per_day = (avg_pe / CAMPAIGN_TOKENS) * workload
-    lifespan_days = PE_LIMIT / pe_per_day
+    pe_per_day = (avg_pe / campaign_tokens) * workload
+    lifespan_days = pe_limit / pe_per_day
     normal_lifespan_days = 5 * 365
 
     ax2.bar(['Normal SSD', 'With Read-Reclaim\n(Threshold=100)'],
@@ -233,8 +250,8 @@ def generate_figure_impossible_choice():
                 fontsize=14, fontweight='bold', y=1.02)
 
     plt.tight_layout()
-    plt.savefig('figures/outcome3_impossible_choice.png', dpi=300, bbox_inches='tight')
-    plt.savefig('figures/outcome3_impossible_choice.pdf', bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome3_impossible_choice.png', dpi=300, bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome3_impossible_choice.pdf', bbox_inches='tight')
     plt.close()
 
     print("✓ Generated: outcome3_impossible_choice")
@@ -243,10 +260,11 @@ def generate_figure_impossible_choice():
 # FIGURE 4: COMPREHENSIVE TRADE-OFF MATRIX
 # ============================================================================
 
-def generate_figure_tradeoff_matrix():
+def generate_figure_tradeoff_matrix(tradeoff_data, pe_limit):
     """
     Heatmap showing lifespan for different workloads × thresholds.
     """
+    campaign_tokens = tradeoff_data['campaign_tokens']
     fig, ax = plt.subplots(figsize=(10, 6))
 
     workloads = [100e6, 500e6, 1e9, 5e9, 10e9]  # 0.1B to 10B tokens/day
@@ -263,8 +281,8 @@ def generate_figure_tradeoff_matrix():
             threshold_obj = next((t for t in tradeoff_data['thresholds'] if t['threshold'] == threshold), None)
             if threshold_obj and threshold_obj['avg_pe_cycles'] > 0:
                 avg_pe = threshold_obj['avg_pe_cycles']
-                pe_per_day = (avg_pe / CAMPAIGN_TOKENS) * workload
-                lifespan_days = PE_LIMIT / pe_per_day
+                pe_per_day = (avg_pe / campaign_tokens) * workload
+                lifespan_days = pe_limit / pe_per_day
             else:
                 lifespan_days = 9999  # Infinity placeholder
 
@@ -314,31 +332,59 @@ def generate_figure_tradeoff_matrix():
     cbar.set_ticklabels(['1d', '10d', '100d', '1000d', '10000d'])
 
     plt.tight_layout()
-    plt.savefig('figures/outcome4_tradeoff_matrix.png', dpi=300, bbox_inches='tight')
-    plt.savefig('figures/outcome4_tradeoff_matrix.pdf', bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome4_tradeoff_matrix.png', dpi=300, bbox_inches='tight')
+    plt.savefig(OUTPUT_DIR / 'outcome4_tradeoff_matrix.pdf', bbox_inches='tight')
     plt.close()
 
     print("✓ Generated: outcome4_tradeoff_matrix")
 
+# ============================================================================
+# BUILD GRAPH
+# ============================================================================
+
+def _outputs(name):
+    return [f'{name}.png', f'{name}.pdf']
+
+FIGURES = [
+    Figure('outcome1_throughput_degradation', generate_figure_outcome1,
+           _outputs('outcome1_throughput_degradation'),
+           inputs={'tradeoff_data': TRADEOFF_JSON}),
+    Figure('outcome2_lifespan_days', generate_figure_outcome2,
+           _outputs('outcome2_lifespan_days'),
+           inputs={'tradeoff_data': TRADEOFF_JSON}, params={'pe_limit': PE_LIMIT}),
+    Figure('outcome3_impossible_choice', generate_figure_impossible_choice,
+           _outputs('outcome3_impossible_choice'),
+           inputs={'tradeoff_data': TRADEOFF_JSON}, params={'pe_limit': PE_LIMIT}),
+    Figure('outcome4_tradeoff_matrix', generate_figure_tradeoff_matrix,
+           _outputs('outcome4_tradeoff_matrix'),
+           inputs={'tradeoff_data': TRADEOFF_JSON}, params={'pe_limit': PE_LIMIT}),
+]
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the outcome-focused figures')
+    add_build_arguments(parser)
+    args = parser.parse_args()
+
+    graph = FigureGraph(FIGURES, OUTPUT_DIR, style=STYLE)
+    if args.list:
+        build_from_args(graph, args)
+        sys.exit(0)
+
     print()
     print("=" * 60)
     print("Generating Outcome-Focused Figures")
     print("=" * 60)
     print()
 
-    generate_figure_outcome1()
-    generate_figure_outcome2()
-    generate_figure_impossible_choice()
-    generate_figure_tradeoff_matrix()
+    rendered = build_from_args(graph, args)
 
     print()
     print("=" * 60)
-    print("✅ All outcome figures generated!")
+    print(f"✅ {len(rendered)} outcome figure(s) regenerated!" if rendered else "✅ All outcome figures up to date!")
     print("=" * 60)
     print()
     print("Key figures:")
@@ -9,17 +9,16 @@ Key metrics:
   - Retry rate per 1000 reads (normalized metric)
 """
 
+import os
 import sys
-import json
 import argparse
 import matplotlib.pyplot as plt
 import numpy as np
-from pathlib import Path
 
-def load_result(result_file):
-    """Load JSON result from analyzer"""
-    with open(result_file, 'r') as f:
-        return json.load(f)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analysis'))
+from results_store import add_query_arguments, query_from_args
+
+COLUMNS = ['name', 'tokens', 'total_flash_reads', 'total_ecc_retries', 'total_ecc_uncorrectable']
 
 def plot_ecc_trends(results, output_file=None):
     """
@@ -119,26 +118,22 @@ def plot_ecc_breakdown(results, output_file=None):
     else:
         plt.show()
 
-def plot_comparison(result_files, output_file=None, plot_type='trends'):
-    """Plot comparison across multiple experiments"""
+def plot_comparison(runs, output_file=None, plot_type='trends'):
+    """Plot comparison across multiple experiments (results store rows)"""
     results = []
 
-    for rf in result_files:
-        data = load_result(rf)
-        ecc = data.get('ecc_statistics', {})
-        flash = data.get('flash_operations', {})
-
-        total_reads = flash.get('flash_reads', 0)
-        retries = ecc.get('ecc_retries', 0)
-        uncorrectable = ecc.get('uncorrectable_errors', 0)
+    for run in runs:
+        total_reads = run['total_flash_reads'] or 0
+        retries = run['total_ecc_retries'] or 0
+        uncorrectable = run['total_ecc_uncorrectable'] or 0
 
         # Calculate rates per 1000 reads
         retry_rate = (retries / total_reads * 1000) if total_reads > 0 else 0
         uncorrectable_rate = (uncorrectable / total_reads * 1000) if total_reads > 0 else 0
 
         results.append({
-            'name': data.get('name', Path(rf).stem),
-            'tokens': data.get('tokens_generated', 0),
+            'name': run['name'],
+            'tokens': run['tokens'] or 0,
             'retry_rate': retry_rate,
             'uncorrectable_rate': uncorrectable_rate,
             'total_reads': total_reads,
@@ -162,10 +157,13 @@ Examples:
 
   # Plot breakdown
   python3 plot_ecc_retries.py results/*.json --type breakdown -o figures/ecc_breakdown.png
+
+  # Plot straight from the results store
+  python3 plot_ecc_retries.py --experiment exp2_accumulation --model llama70b -o figures/ecc_trends.png
         """
     )
 
-    parser.add_argument('results', nargs='+', help='JSON result file(s) from analyze_llm_results.py')
+    add_query_arguments(parser)
     parser.add_argument('-o', '--output', help='Output figure file (PNG/PDF)')
     parser.add_argument('--type', choices=['trends', 'breakdown'], default='trends',
                        help='Plot type: trends (default) or breakdown')
@@ -173,7 +171,12 @@ Examples:
 
     args = parser.parse_args()
 
-    plot_comparison(args.results, args.output if not args.show else None, args.type)
+    runs = query_from_args(args, COLUMNS, order_by=['tokens'])
+    if not runs:
+        print("No matching runs in the results store", file=sys.stderr)
+        sys.exit(1)
+
+    plot_comparison(runs, args.output if not args.show else None, args.type)
 
     if args.show and not args.output:
         plt.show()
@@ -10,17 +10,17 @@ a fundamental trade-off between reliability and flash lifetime.
   - NO sweet spot that satisfies both!
 """
 
+import os
 import sys
-import json
 import argparse
 import matplotlib.pyplot as plt
 import numpy as np
-from pathlib import Path
 
-def load_result(result_file):
-    """Load JSON result from analyzer"""
-    with open(result_file, 'r') as f:
-        return json.load(f)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analysis'))
+from results_store import add_query_arguments, query_from_args
+
+COLUMNS = ['name', 'read_reclaim_threshold', 'tokens', 'total_flash_reads',
+           'total_ecc_retries', 'total_read_reclaim']
 
 def plot_tradeoff(results, output_file=None):
     """
@@ -155,37 +155,22 @@ def plot_lifetime_projection(results, base_pe_limit=3000, output_file=None):
     else:
         plt.show()
 
-def extract_metrics(result_files):
-    """Extract trade-off metrics from result files"""
+def extract_metrics(runs):
+    """Extract trade-off metrics from results store rows"""
     results = []
 
-    for rf in result_files:
-        data = load_result(rf)
-        ecc = data.get('ecc_statistics', {})
-        flash = data.get('flash_operations', {})
-        gc = data.get('gc_wl_statistics', {})
-
-        # Extract threshold from filename or config
-        # Assume filename format: *_threshold_100K.json
-        threshold = 100000  # default
-        stem = Path(rf).stem
-        if 'threshold' in stem:
-            parts = stem.split('threshold_')
-            if len(parts) > 1:
-                threshold_str = parts[1].split('_')[0]
-                if threshold_str.endswith('K'):
-                    threshold = int(float(threshold_str[:-1]) * 1000)
-                elif threshold_str.endswith('M'):
-                    threshold = int(float(threshold_str[:-1]) * 1000000)
-                else:
-                    threshold = int(threshold_str)
-
-        total_reads = flash.get('flash_reads', 0)
-        retries = ecc.get('ecc_retries', 0)
+    for run in runs:
+        # Threshold comes from the run's device config (or its threshold_<N> file name)
+        threshold = run['read_reclaim_threshold']
+        if threshold is None:
+            threshold = 100000  # simulator default
+
+        total_reads = run['total_flash_reads'] or 0
+        retries = run['total_ecc_retries'] or 0
         retry_rate = (retries / total_reads * 1000) if total_reads > 0 else 0
 
         # P/E cycles from reclaim (approximation)
-        reclaim_ops = gc.get('read_reclaim_count', 0)
+        reclaim_ops = run['total_read_reclaim'] or 0
         # Each reclaim migrates a block, causing 1 erase + reprogramming
         pe_cycles = reclaim_ops  # Simplified: 1 reclaim ≈ 1 P/E cycle
 
@@ -194,7 +179,7 @@ def extract_metrics(result_files):
             'retry_rate': retry_rate,
             'pe_cycles': pe_cycles,
             'reclaim_ops': reclaim_ops,
-            'tokens': data.get('tokens_generated', 0),
+            'tokens': run['tokens'] or 0,
         })
 
     return results
@@ -210,10 +195,13 @@ Examples:
 
   # Plot lifetime projection
   python3 plot_tradeoff.py results/sweep_*.json --type lifetime -o figures/lifetime.png --pe-limit 3000
+
+  # Plot straight from the results store
+  python3 plot_tradeoff.py --experiment exp3_tradeoff --model llama70b -o figures/tradeoff.png
         """
     )
 
-    parser.add_argument('results', nargs='+', help='JSON result file(s) from threshold sweep')
+    add_query_arguments(parser)
     parser.add_argument('-o', '--output', help='Output figure file (PNG/PDF)')
     parser.add_argument('--type', choices=['tradeoff', 'lifetime'], default='tradeoff',
                        help='Plot type: tradeoff (default) or lifetime projection')
@@ -223,7 +211,11 @@ Examples:
 
     args = parser.parse_args()
 
-    results = extract_metrics(args.results)
+    runs = query_from_args(args, COLUMNS, order_by=['read_reclaim_threshold'])
+    if not runs:
+        print("No matching runs in the results store", file=sys.stderr)
+        sys.exit(1)
+    results = extract_metrics(runs)
 
     if args.type == 'tradeoff':
         plot_tradeoff(results, args.output if not args.show else None)